@@ -17,17 +17,28 @@ To get started, we recommend the `tutorial`_ and then the `test language`_ and
 .. _`api`: api.html
 """
 
-# pylint: disable=no-name-in-module
-from behave.step_registry import given, when, then, step, Given, When, Then, Step
-# pylint: enable=no-name-in-module
-from behave.api.step_matchers import (
-    register_type,
-    use_default_step_matcher, use_step_matcher,
-    step_matcher
-)
+import importlib
 from behave.fixture import fixture, use_fixture
 from behave.version import VERSION as __version__  # noqa: F401
 
+# -- LAZY IMPORTS: Step decorators and step matchers are imported on first use.
+# HINT: Keeps the startup time small (for: behave --version, ...).
+# NOTE: "fixture" is imported directly (name conflicts with "behave.fixture").
+_LAZY_ATTRIBUTES = {
+    "given": "behave.step_registry",
+    "when": "behave.step_registry",
+    "then": "behave.step_registry",
+    "step": "behave.step_registry",
+    "Given": "behave.step_registry",
+    "When": "behave.step_registry",
+    "Then": "behave.step_registry",
+    "Step": "behave.step_registry",
+    "register_type": "behave.api.step_matchers",
+    "use_default_step_matcher": "behave.api.step_matchers",
+    "use_step_matcher": "behave.api.step_matchers",
+    "step_matcher": "behave.api.step_matchers",
+}
+
 # pylint: disable=undefined-all-variable
 __all__ = [
     "given", "when", "then", "step",
@@ -37,3 +48,17 @@ __all__ = [
     # -- DEPRECATING:
     "step_matcher"
 ]
+
+
+def __getattr__(name):
+    """Import lazy attributes on first use (see: PEP 562)."""
+    module_name = _LAZY_ATTRIBUTES.get(name, None)
+    if module_name is None:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -5,6 +5,7 @@ import locale
 import sys
 from behave.version import VERSION as BEHAVE_VERSION
 from behave.configuration import Configuration
+from behave import exception as _exception
 from behave.exception import (
     ClassNotFoundError,
     ConfigError,
@@ -12,14 +13,11 @@ from behave.exception import (
     InvalidClassError,
     InvalidFileLocationError,
     InvalidFilenameError,
-    TagExpressionError,
 )
 from behave.importer import make_scoped_class_name
-from behave.parser import ParserError
-from behave.runner import Runner    # noqa: F401
-from behave.runner_util import print_undefined_step_snippets, reset_runtime
-from behave.runner_plugin import RunnerPlugin
 from behave.textutil import compute_words_maxsize, text as _text
+# -- LAZY IMPORTS: Parser, runner (and their dependencies) are imported
+#    when they are used (keeps the startup time small: behave --version).
 
 
 # ---------------------------------------------------------------------------
@@ -110,6 +108,10 @@ def run_behave(config, runner_class=None):
         return 0
 
     # -- MAIN PART:
+    # pylint: disable=import-outside-toplevel
+    from behave.parser import ParserError
+    from behave.runner_plugin import RunnerPlugin
+    from behave.runner_util import print_undefined_step_snippets, reset_runtime
     runner = None
     failed = True
     try:
@@ -245,6 +247,8 @@ def print_runners(runner_aliases, file=None):
     :param file:  Optional, to redirect print-output to a file.
     """
     # MAYBE: file = file or sys.stdout
+    # pylint: disable=import-outside-toplevel
+    from behave.runner_plugin import RunnerPlugin
     print_ = lambda text: print(text, file=file)
 
     runner_names = sorted(runner_aliases.keys())
@@ -284,7 +288,9 @@ def main(args=None):
     except ConfigError as e:
         exception_class_name = e.__class__.__name__
         print("%s: %s" % (exception_class_name, e))
-    except TagExpressionError as e:
+    except _exception.TagExpressionError as e:
+        # -- HINT: except-clause is only evaluated if an exception occurs.
+        #    TagExpressionError is provided lazily (by: behave.exception module).
         print("TagExpressionError: %s" % e)
     return 1    # FAILED:
 
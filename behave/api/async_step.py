@@ -78,9 +78,10 @@ def async_run_until_complete(astep_func=None, timeout=None,
 
         * If :param:`timeout` is provided, the event loop waits only the
           specified time.
-        * If :param:`loop` is None, the default event loop will be used
-          or a new event loop is created.
+        * If :param:`loop` is None, the event loop of the test run is used
+          (otherwise: the default event loop or a new event loop).
         * :param:`async_context` is only used, if :param:`loop` is None.
+          Then, the event loop of the :param:`async_context` is used.
         * If :param:`async_context` is a name, it will be used to retrieve
           the real async_context object from the context.
 
@@ -13,6 +13,7 @@ Support for "async-steps", that use async-functions/coroutine-functions, like:
 """
 
 import asyncio
+import contextvars
 import functools
 import inspect
 import warnings
@@ -36,6 +37,84 @@ else:
         yield
 
 
+# -----------------------------------------------------------------------------
+# RUNNER EVENT LOOP: One event loop for the test run.
+# -----------------------------------------------------------------------------
+#: Event loop of the test runner (or None) in the current context.
+#: Async-steps, async-hooks and async-fixtures of a test run are run
+#: on this event loop. Therefore, async resources (like: connection pools)
+#: that are created in a hook can be used by all steps.
+#: An async-step function that is called in another thread
+#: is run on this event loop, too (see: :mod:`behave.runner_async`).
+#:
+#: .. versionadded:: 1.4.0
+runner_event_loop = contextvars.ContextVar("behave.runner_event_loop",
+                                           default=None)
+
+
+def get_runner_event_loop():
+    """Provides the event loop of the test run (if it is usable).
+
+    :return: Event loop of the test runner (or None).
+
+    .. versionadded:: 1.4.0
+    """
+    loop = runner_event_loop.get()
+    if loop is None or loop.is_closed():
+        return None
+    return loop
+
+
+def run_coroutine(coroutine, loop=None):
+    """Runs a coroutine until it is completed (from synchronous code).
+
+    If the event loop is running in another thread (like: async runner),
+    the coroutine is scheduled on this event loop and awaited.
+
+    :raises RuntimeError: If called by a coroutine (of the running event loop).
+
+    :param coroutine:   Coroutine to run.
+    :param loop:        Event loop to use (default: event loop of test run).
+    :return: Result of the coroutine.
+
+    .. versionadded:: 1.4.0
+    """
+    if loop is None:
+        loop = get_runner_event_loop() or use_or_assign_event_loop()
+    if loop.is_running():
+        if called_by_coroutine():
+            # -- CASE: Event loop runs in this thread (blocking is impossible).
+            coroutine.close()
+            raise RuntimeError("Event loop is already running "
+                               "(use await in async-functions)")
+        # -- CASE: Called in a worker thread of a concurrent runner.
+        #    Run the coroutine on the event loop of the runner
+        #    (concurrently with the coroutines of other scenarios).
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        return future.result()
+    return loop.run_until_complete(coroutine)
+
+
+def close_event_loop(loop):
+    """Closes an event loop after its pending tasks are cancelled
+    and its async-generators are finalized.
+
+    .. versionadded:: 1.4.0
+    """
+    if loop.is_closed():
+        return  # -- GRACEFULLY IGNORED: Already closed (by user).
+
+    pending_tasks = asyncio.all_tasks(loop)
+    if pending_tasks:
+        for task in pending_tasks:
+            task.cancel()
+        loop.run_until_complete(
+            asyncio.gather(*pending_tasks, return_exceptions=True))
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.run_until_complete(loop.shutdown_default_executor())
+    loop.close()
+
+
 # -----------------------------------------------------------------------------
 # UTILITY FUNCTIONS:
 # -----------------------------------------------------------------------------
@@ -49,10 +128,18 @@ def use_or_assign_event_loop(loop=None):
     """
     Use the provided event loop or use the default event loop.
     If no event loop is provided, create a new one and assign it as default.
+
+    .. versionchanged:: 1.4.0
+        Uses the event loop of the test run (if no event loop is provided).
     """
     if loop and not loop.is_closed():
         return loop
 
+    runner_loop = get_runner_event_loop()
+    if runner_loop is not None and not runner_loop.is_running():
+        # -- CASE: Use the event loop of the test run.
+        return runner_loop
+
     try:
         # -- HINT: asyncio.get_event_loop() -- DEPRECATED SINCE PYTHON 3.13.
         warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -134,6 +221,7 @@ class AsyncStepParams:
 
         async_context_name = None
         loop_name = None
+        self.is_specified = loop is not None or async_context is not None
         if isinstance(async_context, str):
             async_context_name = async_context
             async_context = None
@@ -153,8 +241,29 @@ class AsyncStepParams:
     def get_event_loop_from(self, ctx):
         return getattr(ctx, self.loop_name, self.loop)
 
+    def get_specified_event_loop_from(self, ctx):
+        """Provides the event loop that was explicitly specified
+        (by loop or async_context) for this async-step (or None).
+
+        .. versionadded:: 1.4.0
+        """
+        if not self.is_specified:
+            # -- NORMAL CASE: Uses event loop of test run.
+            return None
+
+        loop = self.get_event_loop_from(ctx)
+        if loop is None:
+            async_context = self.get_async_context_from(ctx)
+            loop = getattr(async_context, "loop", None)
+        if loop is None or loop.is_closed():
+            return None
+        return loop
+
     def assign_to_context(self, ctx):
         self._ctx = ctx
+        if self.loop is None and self.async_context is None:
+            # -- NORMAL CASE: Nothing to assign (uses event loop of test run).
+            return self
 
         async_context = self.get_async_context_from(ctx)
         async_loop = self.get_event_loop_from(ctx)
@@ -192,7 +301,8 @@ class AsyncFunction:
         return self.get_event_loop()
 
     def get_event_loop(self):
-        return use_or_assign_event_loop()
+        # -- HINT: Event loop of test run may run in another thread.
+        return get_runner_event_loop() or use_or_assign_event_loop()
 
     async def _coro_with_timeout(self, *args, **kwargs):
         this_coroutine = self.coro_func(*args, **kwargs)
@@ -206,15 +316,18 @@ class AsyncFunction:
             # -- USE FAILED-ASSERTION: For compact error description.
             assert False, "TIMEOUT-OCCURRED: timeout=%s" % self.timeout
 
-    def __call__(self, *args, **kwargs):
-        """Function call operator to call the async-step function."""
+    def run_on_event_loop(self, loop, args, kwargs):
+        """Runs the async-function with these args on the event loop."""
         coro_func = self.coro_func
         if self.timeout is not None:
             coro_func = self._coro_with_timeout
 
-        this_loop = self.get_event_loop()
         this_coroutine = coro_func(*args, **kwargs)
-        return this_loop.run_until_complete(this_coroutine)
+        return run_coroutine(this_coroutine, loop)
+
+    def __call__(self, *args, **kwargs):
+        """Function call operator to call the async-step function."""
+        return self.run_on_event_loop(self.get_event_loop(), args, kwargs)
 
     # -- PREPARED:
     # def _run_coro_with_timeout(self, *args, **kwargs):
@@ -252,7 +365,11 @@ class AsyncStepFunction(AsyncFunction):
     def __call__(self, ctx, *args, **kwargs):
         """Function call operator to call the async-step function."""
         self._params.assign_to_context(ctx)
-        return super(AsyncStepFunction, self).__call__(ctx, *args, **kwargs)
+        # -- HINT: Prefer an explicitly specified event loop.
+        this_loop = self._params.get_specified_event_loop_from(ctx)
+        if this_loop is None:
+            this_loop = self.get_event_loop()
+        return self.run_on_event_loop(this_loop, (ctx,) + args, kwargs)
 
 
 # -----------------------------------------------------------------------------
@@ -280,6 +397,7 @@ class AsyncContext:
 
     .. attribute:: should_close
         Indicates if the :attr:`loop` (event-loop) should be closed or not.
+        The event loop of the test run is never closed by this object.
 
     EXAMPLE:
 
@@ -319,6 +437,8 @@ class AsyncContext:
             raise TypeError("name: {!r} (expected: string)".format(name))
 
         self.loop = use_or_assign_event_loop(loop)
+        # -- HINT: Event loop of test run is owned (and closed) by the runner.
+        self.uses_runner_loop = self.loop is runner_event_loop.get()
         self.tasks = tasks or []
         self.name = name or self.default_name
         self.should_close = should_close
@@ -329,7 +449,7 @@ class AsyncContext:
             self.close()
 
     def close(self):
-        if self.loop and not self.loop.is_closed():
+        if self.loop and not self.loop.is_closed() and not self.uses_runner_loop:
             # print("DIAG: AsyncContext.close: {}".format(self.name))
             self.loop.close()
         self.loop = None
@@ -8,11 +8,11 @@ Capture output (like: stdout, stderr, log output).
 """
 
 from contextlib import contextmanager
-from io import StringIO
-import sys
 import warnings
 
 from behave._types import require_type
+from behave.capture_buffer import ChunkedTextBuffer, SpilledText
+from behave.capture_local import get_output_stream, set_output_stream
 from behave.constant import (
     CAPTURE_SINK_STORE_CAPTURED_ON_SUCCESS,
     CAPTURE_SINK_SHOW_CAPTURED_ON_SUCCESS,
@@ -35,6 +35,27 @@ def add_text_to(value, more_text, separator="\n"):
     return value
 
 
+def capture_position(capture_source):
+    """Current position of a capture source (used as bookmark offset).
+
+    * :class:`ChunkedTextBuffer`: Size of the captured text.
+    * :class:`LoggingCapture`: Number of captured log records.
+    * Other capture sources: Size of the captured text.
+    """
+    if isinstance(capture_source, ChunkedTextBuffer):
+        return capture_source.size
+    elif isinstance(capture_source, LoggingCapture):
+        return capture_source.position
+    return len(_text(capture_source.getvalue()))
+
+
+def captured_text_since(capture_source, position):
+    """Captured text of a capture source since the position."""
+    if isinstance(capture_source, (ChunkedTextBuffer, LoggingCapture)):
+        return capture_source.getvalue_since(position)
+    return _text(capture_source.getvalue())[position:]
+
+
 # -----------------------------------------------------------------------------
 # CAPTURED CLASSES as VALUE OBJECTS
 # -----------------------------------------------------------------------------
@@ -77,9 +98,18 @@ NO_CAPTURED_DATA = NoCaptured()
 
 
 class Captured(ICaptured):
-    """Immutable data structure that stores the snapshot of captured output."""
+    """Immutable data structure that stores the snapshot of captured output.
+
+    Captured stdout/stderr output that is larger than :attr:`spill_size`
+    (in characters) is moved into a temporary file (as :class:`SpilledText`).
+    It is only read back when it is used (by a formatter or reporter).
+
+    .. versionchanged:: 1.4.0
+        Large captured stdout/stderr output is spilled to a temporary file.
+    """
     __slots__ = [
-        "stdout", "stderr", "log", "name", "failed", "_output",
+        "_stdout", "_stderr", "log", "name", "failed", "_output",
+        "spill_size",
     ]
     # -- REPORT-PLACEHOLDERS: this=captured, output
     REPORT_TEMPLATE = "----\n{output}\n----"
@@ -88,9 +118,13 @@ class Captured(ICaptured):
     CAPTURED_STDOUT_SCHEMA = "CAPTURED STDOUT: {}"
     CAPTURED_STDERR_SCHEMA = "CAPTURED STDERR: {}"
     CAPTURED_LOG_SCHEMA = "CAPTURED LOG: {}"
+    SPILL_SIZE = 1024 * 1024
 
     def __init__(self, stdout=None, stderr=None, log=None,
-                 name=None, failed=False):
+                 name=None, failed=False, spill_size=None):
+        if spill_size is None:
+            spill_size = self.SPILL_SIZE
+        self.spill_size = spill_size
         self.name = name
         self.failed = failed
         self.stdout = stdout or ""
@@ -98,6 +132,39 @@ class Captured(ICaptured):
         self.log = log or ""
         self._output = None
 
+    def _make_stored_text(self, text):
+        """Spills the text to a temporary file if it is too large."""
+        if (self.spill_size and isinstance(text, str)
+                and len(text) > self.spill_size):
+            return SpilledText(text)
+        return text
+
+    @property
+    def stdout(self):
+        if isinstance(self._stdout, SpilledText):
+            return self._stdout.read()
+        return self._stdout
+
+    @stdout.setter
+    def stdout(self, value):
+        self._stdout = self._make_stored_text(value)
+
+    @property
+    def stderr(self):
+        if isinstance(self._stderr, SpilledText):
+            return self._stderr.read()
+        return self._stderr
+
+    @stderr.setter
+    def stderr(self, value):
+        self._stderr = self._make_stored_text(value)
+
+    @property
+    def spilled(self):
+        """Indicates if captured output is stored in a temporary file."""
+        return (isinstance(self._stdout, SpilledText) or
+                isinstance(self._stderr, SpilledText))
+
     def reset(self):
         self.name = None
         self.failed = False
@@ -109,6 +176,10 @@ class Captured(ICaptured):
     def _reset_cached(self):
         self._output = None
 
+    def _add_stored_text(self, stored_text, more_text):
+        stored_text = add_text_to(stored_text, more_text)
+        return self._make_stored_text(stored_text)
+
     @property
     def status(self):
         this_status = "OK"
@@ -120,8 +191,12 @@ class Captured(ICaptured):
     def output(self):
         """Basic capture report of the captured output."""
         if self._output is None:
+            output = self.make_output()
+            if self.spilled:
+                # -- NOT CACHED: Keep large captured output out of memory.
+                return output
             # -- CACHED-PROPERTY: Compute once
-            self._output = self.make_output()
+            self._output = output
         return self._output
 
     # @property
@@ -146,8 +221,8 @@ class Captured(ICaptured):
                        other.name, self.name))
 
         self.failed = self.failed or other.failed
-        self.stdout = add_text_to(self.stdout, other.stdout)
-        self.stderr = add_text_to(self.stderr, other.stderr)
+        self._stdout = self._add_stored_text(self._stdout, other.stdout)
+        self._stderr = self._add_stored_text(self._stderr, other.stderr)
         self.log = add_text_to(self.log, other.log)
         self._reset_cached()
 
@@ -200,7 +275,7 @@ class Captured(ICaptured):
 
     # -- SINCE: behave v1.2.7
     def has_output(self):
-        return bool(self.stdout or self.stderr or self.log)
+        return bool(self._stdout or self._stderr or self.log)
 
     def __bool__(self):
         return self.has_output()
@@ -240,6 +315,21 @@ class ManyCaptured(ICaptured):
         parts = [getattr(x, name) for x in self.captures]
         return "\n".join(parts)
 
+    def _cached_output_for(self, name):
+        cached_name = "_" + name
+        output = getattr(self, cached_name)
+        if output is None:
+            output = self._combine_output_for(name)
+            if not self.spilled:
+                setattr(self, cached_name, output)
+        return output
+
+    @property
+    def spilled(self):
+        """Indicates if any captured output is stored in a temporary file."""
+        return any(getattr(captured, "spilled", False) is True
+                   for captured in self.captures)
+
     # -- SPECIAL:
     def add_captured(self, other, use_merge=True):
         if not other.has_output():
@@ -308,28 +398,26 @@ class ManyCaptured(ICaptured):
     # XXX_JE_CHECK_IF_NEEDED
     @property
     def stdout(self):
-        if self._stdout is None:
-            self._stdout = self._combine_output_for("stdout")
-        return self._stdout
+        return self._cached_output_for("stdout")
 
     # XXX_JE_CHECK_IF_NEEDED
     @property
     def stderr(self):
-        if self._stderr is None:
-            self._stderr = self._combine_output_for("stderr")
-        return self._stderr
+        return self._cached_output_for("stderr")
 
     # XXX_JE_CHECK_IF_NEEDED
     @property
     def log(self):
-        if self._log is None:
-            self._log = self._combine_output_for("log")
-        return self._log
+        return self._cached_output_for("log")
 
     @property
     def output(self):
         if self._output is None:
-            self._output = self.make_output()
+            output = self.make_output()
+            if self.spilled:
+                # -- NOT CACHED: Keep large captured output out of memory.
+                return output
+            self._output = output
         return self._output
 
     def reset(self):
@@ -497,7 +585,9 @@ class CaptureSink2Print(ICaptureSink):
 # CAPTURE CONTROLLERS:
 # -----------------------------------------------------------------------------
 class CaptureBookmark:
-    """Provides a reference point in time what was captured until now."""
+    """Provides a reference point in time what was captured until now.
+    The offsets are text offsets in the captured data (as :class:`Captured`).
+    """
     __slots__ = ("offset_stdout", "offset_stderr", "offset_log")
 
     def __init__(self, offset_stdout=0, offset_stderr=0, offset_log=0):
@@ -550,6 +640,32 @@ class CaptureBookmark:
         return not self.__eq__(other)
 
 
+class CapturePositionBookmark(CaptureBookmark):
+    """Bookmark of a :class:`CaptureController` (see: :meth:`~CaptureController.make_bookmark()`).
+    The offsets are capture positions (see: :func:`capture_position()`):
+
+    * ``offset_stdout``, ``offset_stderr``: Size of the captured text.
+    * ``offset_log``: Number of captured log records.
+
+    Therefore, it can only be used with :meth:`CaptureController.make_captured_since()`
+    (and not with the captured data).
+
+    .. versionadded:: 1.4.0
+    """
+    __slots__ = ()
+
+    def make_captured_since(self, captured):
+        raise TypeError("%r: Use CaptureController.make_captured_since()" % self)
+
+    @classmethod
+    def from_captured(cls, captured):
+        raise TypeError("%s: Use CaptureController.make_bookmark()" % cls.__name__)
+
+    def __repr__(self):
+        return "<CapturePositionBookmark: stdout={}, stderr={}, log={}>".format(
+            self.offset_stdout, self.offset_stderr, self.offset_log
+        )
+
 
 class CaptureController:
     """Simplifies the lifecycle to capture output from various sources."""
@@ -560,9 +676,20 @@ class CaptureController:
         self.capture_stdout = None
         self.capture_stderr = None
         self.capture_log = None
-        self.delta_bookmark = CaptureBookmark()
+        self.delta_bookmark = CapturePositionBookmark()
         self.old_stdout = None
         self.old_stderr = None
+        self.spill_size = self._select_spill_size(config)
+
+    @staticmethod
+    def _select_spill_size(config):
+        """Size threshold (in characters) to spill captured stdout/stderr
+        into a temporary file (or None, to use the default).
+        """
+        spill_size = getattr(config, "capture_spill_size", None)
+        if isinstance(spill_size, int) and not isinstance(spill_size, bool):
+            return spill_size
+        return None
 
     def should_capture(self):
         return self.config.should_capture()
@@ -573,10 +700,10 @@ class CaptureController:
             if self.capture_log.buffer:
                 return True
         if self.capture_stdout is not None:
-            if self.capture_stdout.getvalue():
+            if capture_position(self.capture_stdout):
                 return True
         if self.capture_stderr is not None:
-            if self.capture_stderr.getvalue():
+            if capture_position(self.capture_stderr):
                 return True
         # -- OTHERWISE:
         return False
@@ -599,13 +726,38 @@ class CaptureController:
         if name is None:
             name = self.name
         captured = Captured(stdout=stdout, stderr=stderr, log=log,
-                            name=name, failed=failed)
+                            name=name, failed=failed,
+                            spill_size=self.spill_size)
         return captured
 
     def make_captured_since(self, bookmark, failed=None, name=None):
-        # -- NOT-EFFICIENT, but SIMPLE
-        captured = self.make_captured(failed=failed, name=name)
-        return bookmark.make_captured_since(captured)
+        """
+        Make captured data since this bookmark
+        (without building the complete captured text first).
+
+        :param bookmark:  Bookmark to use (from: :meth:`make_bookmark()`).
+        :return: Captured data since this bookmark or NO_CAPTURED_DATA.
+        """
+        stdout = None
+        stderr = None
+        log = None
+        if self.config.capture_stdout and self.capture_stdout:
+            stdout = captured_text_since(self.capture_stdout,
+                                         bookmark.offset_stdout)
+        if self.config.capture_stderr and self.capture_stderr:
+            stderr = captured_text_since(self.capture_stderr,
+                                         bookmark.offset_stderr)
+        if self.config.capture_log and self.capture_log:
+            log = captured_text_since(self.capture_log, bookmark.offset_log)
+
+        has_output = bool(stdout or stderr or log)
+        if not has_output:
+            return NO_CAPTURED_DATA
+
+        if name is None:
+            name = self.name
+        return Captured(stdout=stdout, stderr=stderr, log=log,
+                        name=name, failed=failed, spill_size=self.spill_size)
 
     def make_captured_delta(self, failed=None, name=None):
         """
@@ -614,30 +766,33 @@ class CaptureController:
         * :method:`~behave.capture:CaptureController.make_captured()`
         * :method:`~behave.capture:CaptureController.make_captured_delta()`
         """
-        # -- NOT-EFFICIENT, but SIMPLE:
-        captured = self.make_captured(failed=failed, name=name)
-        if captured is NO_CAPTURED_DATA:
-            return NO_CAPTURED_DATA
-
-        captured_delta = self.delta_bookmark.make_captured_since(captured)
+        captured_delta = self.make_captured_since(self.delta_bookmark,
+                                                  failed=failed, name=name)
         if captured_delta is NO_CAPTURED_DATA:
             return NO_CAPTURED_DATA
 
-        self.delta_bookmark = CaptureBookmark.from_captured(captured)
+        self.delta_bookmark = self.make_bookmark()
         return captured_delta
 
     def make_bookmark(self):
         """
-        Store the current captured offsets as bookmark.
+        Store the current capture positions as bookmark.
 
-        A bookmark can be referenced in :meth:`make_captured_since()` or
-        can be used in :meth:`CaptureBookmark.make_captured_since()`
+        A bookmark can be referenced in :meth:`make_captured_since()`
         to determine what was captured since this bookmark was created.
 
-        :return: Bookmark object (as :class:`CaptureBookmark`).
+        :return: Bookmark object (as :class:`CapturePositionBookmark`).
         """
-        captured = self.make_captured()
-        return CaptureBookmark.from_captured(captured)
+        offset_stdout = 0
+        offset_stderr = 0
+        offset_log = 0
+        if self.config.capture_stdout and self.capture_stdout:
+            offset_stdout = capture_position(self.capture_stdout)
+        if self.config.capture_stderr and self.capture_stderr:
+            offset_stderr = capture_position(self.capture_stderr)
+        if self.config.capture_log and self.capture_log:
+            offset_log = capture_position(self.capture_log)
+        return CapturePositionBookmark(offset_stdout, offset_stderr, offset_log)
 
     def update_delta_bookmark(self):
         self.delta_bookmark = self.make_bookmark()
@@ -661,47 +816,51 @@ class CaptureController:
         if self.config.capture_stdout:
             # XXX: if self.capture_stdout is not None:
             # XXX:     self.capture_stdout.close()
-            self.capture_stdout = StringIO()
+            self.capture_stdout = ChunkedTextBuffer()
         if self.config.capture_stderr:
             # XXX: if self.capture_stderr is not None:
             # XXX:     self.capture_stderr.close()
-            self.capture_stderr = StringIO()
+            self.capture_stderr = ChunkedTextBuffer()
         if self.config.capture_log:
             self.capture_log = LoggingCapture(self.config)
             self.capture_log.inveigle()
+        # -- NEW CAPTURE BUFFERS: Offsets of old delta bookmark are invalid.
+        self.delta_bookmark = CaptureBookmark()
         self._stdout_offset = 0
         self._stderr_offset = 0
         self._log_offset = 0
 
     def start_capture(self):
+        # -- HINT: Streams are only replaced in the current context
+        #    if the context-local capture is used (by concurrent runners).
         if self.config.capture_stdout:
             # -- REPLACE ONLY: In non-capturing mode.
             if not self.old_stdout:
-                self.old_stdout = sys.stdout
-                sys.stdout = self.capture_stdout
-            assert sys.stdout is self.capture_stdout
+                self.old_stdout = get_output_stream("stdout")
+                set_output_stream("stdout", self.capture_stdout)
+            assert get_output_stream("stdout") is self.capture_stdout
 
         if self.config.capture_stderr:
             # -- REPLACE ONLY: In non-capturing mode.
             if not self.old_stderr:
-                self.old_stderr = sys.stderr
-                sys.stderr = self.capture_stderr
-            assert sys.stderr is self.capture_stderr
+                self.old_stderr = get_output_stream("stderr")
+                set_output_stream("stderr", self.capture_stderr)
+            assert get_output_stream("stderr") is self.capture_stderr
 
     def stop_capture(self):
         if self.config.capture_stdout:
             # -- RESTORE ONLY: In capturing mode.
             if self.old_stdout:
-                sys.stdout = self.old_stdout
+                set_output_stream("stdout", self.old_stdout)
                 self.old_stdout = None
-            assert sys.stdout is not self.capture_stdout
+            assert get_output_stream("stdout") is not self.capture_stdout
 
         if self.config.capture_stderr:
             # -- RESTORE ONLY: In capturing mode.
             if self.old_stderr:
-                sys.stderr = self.old_stderr
+                set_output_stream("stderr", self.old_stderr)
                 self.old_stderr = None
-            assert sys.stderr is not self.capture_stderr
+            assert get_output_stream("stderr") is not self.capture_stderr
 
     def teardown_capture(self):
         # -- DISABLED DUE TO: Support .getvalue() after teardown.
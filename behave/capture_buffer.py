@@ -0,0 +1,211 @@
+"""
+Provides append-only text buffers for captured output.
+
+A :class:`ChunkedTextBuffer` stores the written text as a list of chunks
+(with their start offsets). Therefore, the text since an offset (bookmark)
+can be provided without building the complete text first.
+This keeps the per-step cost of capturing proportional to the output
+of the step (and not to the output of the whole scenario).
+
+A :class:`SpilledText` stores a large captured text in a temporary file.
+The text is only read back (via :mod:`mmap`) when it is used.
+
+.. versionadded:: 1.4.0
+"""
+
+from bisect import bisect_right
+import io
+import mmap
+import os
+import tempfile
+import weakref
+
+
+# -----------------------------------------------------------------------------
+# CLASSES:
+# -----------------------------------------------------------------------------
+class ChunkedTextBuffer(io.TextIOBase):
+    """
+    Append-only text stream that can be used instead of :class:`io.StringIO`
+    to capture output (as replacement for ``sys.stdout``, ``sys.stderr``).
+
+    Written text is collected in pending parts. The pending parts are joined
+    into one chunk when the text is read. A chunk is never changed afterwards.
+
+    .. code-block:: python
+
+        buffer = ChunkedTextBuffer()
+        buffer.write("Hello ")
+        offset = buffer.size
+        buffer.write("Alice")
+        assert buffer.getvalue_since(offset) == "Alice"
+        assert buffer.getvalue() == "Hello Alice"
+    """
+
+    def __init__(self):
+        super(ChunkedTextBuffer, self).__init__()
+        self._chunks = []
+        self._offsets = []
+        self._pending = []
+        self._size = 0
+        self._chunked_size = 0
+
+    @property
+    def size(self):
+        """Size of the written text (in characters)."""
+        return self._size
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if not isinstance(text, str):
+            raise TypeError("string argument expected, got %r" %
+                            type(text).__name__)
+        if text:
+            self._pending.append(text)
+            self._size += len(text)
+        return len(text)
+
+    def tell(self):
+        return self._size
+
+    def _make_chunk(self):
+        """Join the pending parts into a new chunk."""
+        if not self._pending:
+            return
+        chunk = "".join(self._pending)
+        self._chunks.append(chunk)
+        self._offsets.append(self._chunked_size)
+        self._chunked_size += len(chunk)
+        self._pending = []
+
+    def getvalue(self):
+        """Provides the complete text (and merges all chunks into one)."""
+        self._make_chunk()
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+            self._offsets = [0]
+        if not self._chunks:
+            return ""
+        return self._chunks[0]
+
+    def getvalue_since(self, offset):
+        """Provides the text that was written after this offset.
+
+        :param offset:  Text offset, like: ``buffer.size`` (as bookmark).
+        :return: Text since this offset (as string).
+        """
+        if offset <= 0:
+            return self.getvalue()
+        elif offset >= self._size:
+            return ""
+
+        self._make_chunk()
+        index = bisect_right(self._offsets, offset) - 1
+        first_part = self._chunks[index][offset - self._offsets[index]:]
+        return first_part + "".join(self._chunks[index+1:])
+
+    def clear(self):
+        self._chunks = []
+        self._offsets = []
+        self._pending = []
+        self._size = 0
+        self._chunked_size = 0
+
+
+class SpilledText:
+    """
+    Stores a (large) captured text in a temporary file instead of in memory.
+    The text is read back from the file (via :mod:`mmap`) when it is used,
+    like: ``str(spilled_text)``.
+
+    The temporary file is not kept open between uses
+    (to avoid running out of file descriptors with many spilled texts).
+    It is removed when this object is garbage collected.
+
+    .. code-block:: python
+
+        spilled_text = SpilledText("Hello ")
+        spilled_text.append("Alice")
+        assert str(spilled_text) == "Hello Alice"
+    """
+    ENCODING = "utf-8"
+    FILE_PREFIX = "behave_captured_"
+    TAIL_SIZE = 16
+
+    def __init__(self, text=""):
+        fd, self.filename = tempfile.mkstemp(prefix=self.FILE_PREFIX,
+                                             suffix=".txt")
+        os.close(fd)
+        self._size = 0
+        self._tail = ""
+        self._remove_file = weakref.finalize(self, _remove_file,
+                                             self.filename)
+        self.append(text)
+
+    @property
+    def size(self):
+        """Size of the spilled text (in characters)."""
+        return self._size
+
+    @property
+    def closed(self):
+        return not self._remove_file.alive
+
+    def append(self, text):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        if not text:
+            return
+        with open(self.filename, "ab") as f:
+            f.write(text.encode(self.ENCODING))
+        self._size += len(text)
+        self._tail = (self._tail + text)[-self.TAIL_SIZE:]
+
+    def endswith(self, suffix):
+        """Checks the end of the spilled text (without reading it back).
+        Supports only a short suffix (up to :attr:`TAIL_SIZE` characters).
+        """
+        return self._tail.endswith(suffix)
+
+    def read(self):
+        """Reads the spilled text back from its temporary file."""
+        if not self._size or self.closed:
+            # -- HINT: mmap cannot map an empty file.
+            return ""
+        with open(self.filename, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return data[:].decode(self.ENCODING)
+
+    def close(self):
+        """Removes the temporary file (and the spilled text)."""
+        self._remove_file()
+        self._size = 0
+        self._tail = ""
+
+    def __iadd__(self, text):
+        self.append(text)
+        return self
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __str__(self):
+        return self.read()
+
+    def __repr__(self):
+        return "<SpilledText: size={size}, filename={filename}>".format(
+            size=self._size, filename=self.filename)
+
+
+def _remove_file(filename):
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
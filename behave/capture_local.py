@@ -0,0 +1,237 @@
+"""
+Context-local output capture (used by concurrent test runners).
+
+The output capture replaces ``sys.stdout`` and ``sys.stderr``
+(and the log handler of the root logger) while a step or hook runs.
+This does not work if several scenarios run at the same time
+(in worker threads or as asyncio tasks).
+
+If the context-local capture is installed:
+
+* ``sys.stdout`` and ``sys.stderr`` are replaced by stream proxies
+  (once for the test run). A stream proxy writes to the stream that is
+  selected in the current context (or to the original stream otherwise).
+* One log handler of the root logger dispatches the log records
+  to the log capture that is selected in the current context.
+* Stream handlers of the root logger that write to the original
+  ``sys.stdout`` or ``sys.stderr`` (like: the console log handler of
+  :meth:`behave.configuration.Configuration.setup_logging()`) write to
+  the not-captured output stream of the current context instead.
+  Like with the default runner, their log output is not captured.
+
+The current context is a :mod:`contextvars` context: Each thread and
+each asyncio task uses its own context.
+The :class:`behave.capture.CaptureController` and
+the :class:`behave.log_capture.LoggingCapture` select their streams and
+log capture in the current context (instead of replacing them globally).
+
+.. versionadded:: 1.4.0
+"""
+
+import contextvars
+import logging
+import sys
+
+
+# -----------------------------------------------------------------------------
+# CLASSES:
+# -----------------------------------------------------------------------------
+class ContextLocalStream:
+    """
+    Stream proxy that writes to the stream of the current context
+    (or to its fallback stream, if no stream is selected).
+
+    :param name:      Name of the stream (as string: stdout, stderr).
+    :param fallback:  Stream to use if no stream is selected (original stream).
+    """
+
+    def __init__(self, name, fallback):
+        self.name = name
+        self.fallback = fallback
+        self._target = contextvars.ContextVar("behave.capture.%s" % name,
+                                              default=None)
+
+    @property
+    def target(self):
+        """Stream of the current context (or the fallback stream)."""
+        stream = self._target.get()
+        if stream is None:
+            return self.fallback
+        return stream
+
+    def use_target(self, stream):
+        """Select the stream of the current context."""
+        if stream is self.fallback:
+            stream = None
+        self._target.set(stream)
+
+    def write(self, text):
+        return self.target.write(text)
+
+    def writelines(self, lines):
+        self.target.writelines(lines)
+
+    def flush(self):
+        self.target.flush()
+
+    def isatty(self):
+        return self.target.isatty()
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+
+class ContextLocalLogHandler(logging.Handler):
+    """Dispatches a log record to the log capture of the current context."""
+
+    def __init__(self):
+        super(ContextLocalLogHandler, self).__init__()
+        self.old_level = None
+        self._log_capture = contextvars.ContextVar("behave.capture.log",
+                                                   default=None)
+
+    @property
+    def log_capture(self):
+        """Log capture of the current context (or None)."""
+        return self._log_capture.get()
+
+    def use_log_capture(self, log_capture):
+        """Select the log capture of the current context.
+
+        :return: Log capture that was selected before (or None).
+        """
+        old_log_capture = self._log_capture.get()
+        self._log_capture.set(log_capture)
+        return old_log_capture
+
+    def emit(self, record):
+        log_capture = self._log_capture.get()
+        if log_capture is not None and record.levelno >= log_capture.level:
+            log_capture.handle(record)
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS:
+# -----------------------------------------------------------------------------
+_log_handler = None
+_uncaptured_streams = {}        # MAPS: name -> ContextLocalStream
+_redirected_log_handlers = []   # ITEMS: (log_handler, original_stream)
+
+
+def is_installed():
+    """Indicates if the context-local capture is installed."""
+    return _log_handler is not None
+
+
+def install(log_level=logging.NOTSET):
+    """Install the context-local capture (for a concurrent test run).
+
+    :param log_level:  Log level to use for the root logger.
+    """
+    global _log_handler     # pylint: disable=global-statement
+    if _log_handler is not None:
+        return
+
+    for name in ("stdout", "stderr"):
+        stream = getattr(sys, name)
+        _uncaptured_streams[name] = ContextLocalStream("%s.uncaptured" % name,
+                                                       stream)
+        setattr(sys, name, ContextLocalStream(name, stream))
+    root_logger = logging.getLogger()
+    redirect_log_handlers(root_logger, _uncaptured_streams.values())
+    _log_handler = ContextLocalLogHandler()
+    _log_handler.old_level = root_logger.level
+    root_logger.addHandler(_log_handler)
+    root_logger.setLevel(log_level)
+
+
+def uninstall():
+    """Restore the original streams and log handlers."""
+    global _log_handler     # pylint: disable=global-statement
+    if _log_handler is None:
+        return
+
+    for name in ("stdout", "stderr"):
+        stream = getattr(sys, name)
+        if isinstance(stream, ContextLocalStream):
+            setattr(sys, name, stream.fallback)
+    root_logger = logging.getLogger()
+    root_logger.removeHandler(_log_handler)
+    root_logger.setLevel(_log_handler.old_level)
+    _log_handler = None
+    while _redirected_log_handlers:
+        log_handler, stream = _redirected_log_handlers.pop()
+        if isinstance(log_handler.stream, ContextLocalStream):
+            log_handler.setStream(stream)
+    _uncaptured_streams.clear()
+
+
+def redirect_log_handlers(logger, stream_proxies):
+    """Stream handlers of a logger, that write to an original stream,
+    write to its stream proxy instead (until :func:`uninstall()` is called).
+    Therefore, their log output is written to the stream of the current context.
+
+    :param logger:          Logger to use (like: root logger).
+    :param stream_proxies:  Stream proxies to use (as ContextLocalStream).
+    """
+    for log_handler in logger.handlers:
+        if not isinstance(log_handler, logging.StreamHandler):
+            continue
+        for stream_proxy in stream_proxies:
+            if log_handler.stream is stream_proxy.fallback:
+                log_handler.setStream(stream_proxy)
+                _redirected_log_handlers.append((log_handler,
+                                                 stream_proxy.fallback))
+                break
+
+
+def get_output_stream(name):
+    """Provides the output stream of the current context.
+
+    :param name:  Name of the stream (as string: stdout, stderr).
+    :return: Stream object (like: ``sys.stdout``).
+    """
+    stream = getattr(sys, name)
+    if isinstance(stream, ContextLocalStream):
+        return stream.target
+    return stream
+
+
+def set_output_stream(name, stream):
+    """Replaces the output stream (like: ``sys.stdout``).
+    Only the stream of the current context is replaced
+    if the context-local capture is installed.
+
+    :param name:    Name of the stream (as string: stdout, stderr).
+    :param stream:  Stream object to use.
+    """
+    current_stream = getattr(sys, name)
+    if isinstance(current_stream, ContextLocalStream):
+        current_stream.use_target(stream)
+    else:
+        setattr(sys, name, stream)
+
+
+def set_task_output_stream(name, stream):
+    """Selects the output stream of a task (in the current context).
+    It is used as output stream (until the output capture replaces it)
+    and for the log output that is not captured (see: :func:`install()`).
+
+    :param name:    Name of the stream (as string: stdout, stderr).
+    :param stream:  Stream object to use.
+    """
+    set_output_stream(name, stream)
+    uncaptured_stream = _uncaptured_streams.get(name, None)
+    if uncaptured_stream is not None:
+        uncaptured_stream.use_target(stream)
+
+
+def use_log_capture(log_capture):
+    """Select the log capture of the current context
+    (requires: installed context-local capture).
+
+    :return: Log capture that was selected before (or None).
+    """
+    if _log_handler is None:
+        return None     # -- GRACEFULLY IGNORED: Already uninstalled.
+    return _log_handler.use_log_capture(log_capture)
@@ -14,6 +14,7 @@ This module provides the configuration for :mod:`behave`:
 from collections import namedtuple
 from configparser import ConfigParser
 import argparse
+import importlib.util
 import json
 import logging
 import os
@@ -39,21 +40,25 @@ from behave.userdata import UserData, parse_user_define
 # from behave.tag_expression import  make_tag_expression
 
 # -- OPTIONAL TOML SUPPORT: Using "pyproject.toml" as config-file
-_TOML_AVAILABLE = True
-if _TOML_AVAILABLE:  # pragma: no cover
-    try:
-        if sys.version_info >= (3, 11):
-            import tomllib
-        else:
-            import tomli as tomllib
-    except ImportError:
-        _TOML_AVAILABLE = False
+# HINT: TOML module is only imported if a "pyproject.toml" file is read.
+if sys.version_info >= (3, 11):
+    _TOML_MODULE_NAME = "tomllib"
+else:
+    _TOML_MODULE_NAME = "tomli"
+_TOML_AVAILABLE = importlib.util.find_spec(_TOML_MODULE_NAME) is not None
 
 
 # -----------------------------------------------------------------------------
 # CONSTANTS:
 # -----------------------------------------------------------------------------
 DEFAULT_RUNNER_CLASS_NAME = "behave.runner:Runner"
+SCENARIO_OUTLINE_ANNOTATION_SCHEMA = "{name} -- @{row.id} {examples.name}"
+PARALLEL_RUNNER_CLASS_NAME = "behave.runner_parallel:ParallelRunner"
+ASYNC_RUNNER_CLASS_NAME = "behave.runner_async:AsyncRunner"
+THREADS_RUNNER_CLASS_NAME = "behave.runner_threads:ThreadPoolRunner"
+DISTRIBUTED_RUNNER_CLASS_NAME = "behave.runner_distributed:DistributedRunner"
+DISTRIBUTED_WORKER_CLASS_NAME = "behave.runner_distributed:DistributedWorker"
+DEFAULT_COORDINATOR_ADDRESS = "127.0.0.1:8733"
 
 
 # -----------------------------------------------------------------------------
@@ -106,6 +111,8 @@ COLOR_DEFAULT = os.getenv("BEHAVE_COLOR", "auto")
 COLOR_DEFAULT_OFF = "off"
 COLOR_ON_VALUES = ("on", "always")
 COLOR_OFF_VALUES = ("off", "never")
+CONTEXT_ORIGIN_CHOICES = ["eager", "lazy", "off"]
+CONTEXT_ORIGIN_DEFAULT = "lazy"
 
 
 OPTIONS = [
@@ -118,6 +125,16 @@ OPTIONS = [
           default=COLOR_DEFAULT, const=COLOR_DEFAULT, nargs="?",
           help="""Use colored mode or not (default: %(default)s).""")),
 
+    (("--context-origin",),
+     dict(metavar="MODE", dest="context_origin",
+          choices=CONTEXT_ORIGIN_CHOICES, default=CONTEXT_ORIGIN_DEFAULT,
+          help="""How the origin of context attributes is tracked
+                  (default: %(default)s). The origin is shown in
+                  masking warnings. Use one of: eager, lazy, off.
+                  The "eager" mode extracts the stack for each assignment
+                  (slow). The "off" mode shows no origin.
+                  """)),
+
     (("-d", "--dry-run"),
      dict(action="store_true",
           help="Invokes formatters without executing the steps.")),
@@ -149,15 +166,91 @@ OPTIONS = [
                   regardless of the "--capture" and "--no-capture" options.
                   """)),
 
+    (("--parse-cache",),
+     dict(dest="parse_cache", action="store_true",
+          help="""Use the parse cache for feature files.
+                  Parsed features are stored in the cache directory
+                  and reused if the feature file was not changed.""")),
+
+    (("--no-parse-cache",),
+     dict(dest="parse_cache", action="store_false",
+          help="""Disable the parse cache for feature files (default).""")),
+
+    (("--clear-parse-cache",),
+     dict(dest="clear_parse_cache", action="store_true",
+          help="""Remove the cached feature files (before they are parsed).""")),
+
+    (("--lazy-step-modules",),
+     dict(dest="lazy_step_modules", action="store_true",
+          help="""Load only the step modules that are needed by the selected
+                  scenarios (by using the step manifest in the cache
+                  directory). Other step modules are loaded on demand
+                  if an undefined step is detected.""")),
+
+    (("--no-lazy-step-modules",),
+     dict(dest="lazy_step_modules", action="store_false",
+          help="""Load all step modules before the test run (default).""")),
+
+    (("--scenario-index",),
+     dict(dest="scenario_index", action="store_true",
+          help="""Use the scenario index (in the cache directory) to parse
+                  and run only feature files that contain scenarios
+                  selected by tags or by name. Feature files without
+                  selected scenarios are not reported.""")),
+
+    (("--no-scenario-index",),
+     dict(dest="scenario_index", action="store_false",
+          help="""Disable the scenario index (default).""")),
+
+    (("--parse-jobs",),
+     dict(metavar="NUMBER", dest="parse_jobs", type=positive_number,
+          default=1,
+          help="""Number of processes to parse the feature files
+                  (default: %(default)s, use 0 for the number of CPUs).""")),
+
+    ((),  # -- CONFIGFILE only
+     dict(dest="cache_dir", default=".behave_cache",
+          help="""Directory for cached data, like parsed feature files
+                  (default: %(default)s).""")),
+
     (("--junit-directory",),
      dict(metavar="PATH", dest="junit_directory",
           default="reports",
           help="""Directory in which to store JUnit reports.""")),
 
+    (("--junit-aggregate",),
+     dict(action="store_true", dest="junit_aggregate",
+          help="""Write also one aggregated JUnit report with all testsuites
+                  (as "TESTS-all.xml" in the JUnit directory).""")),
+
     (("-j", "--jobs", "--parallel"),
      dict(metavar="NUMBER", dest="jobs", default=1, type=positive_number,
           help="""Number of concurrent jobs to use (default: %(default)s).
-                  Only supported by test runners that support parallel execution.
+                  Only supported by test runners that support parallel execution,
+                  like: --runner=parallel, --runner=async, --runner=threads
+                  (concurrency limit), --runner=distributed (expected workers)
+                  """)),
+
+    (("--parallel-durations",),
+     dict(metavar="FILE", dest="parallel_durations",
+          help="""JSON file (from the "json" formatter) with the durations of
+                  an earlier test run. Used by the parallel runner
+                  to run the longest scenarios first.
+                  """)),
+
+    (("--coordinator",),
+     dict(metavar="[HOST:]PORT", dest="coordinator",
+          default=DEFAULT_COORDINATOR_ADDRESS,
+          help="""Network address where the coordinator of a distributed
+                  test run (--runner=distributed) waits for its workers
+                  (default: %(default)s). Use port 0 to select a free port.
+                  """)),
+
+    (("--worker",),
+     dict(metavar="HOST:PORT", dest="worker",
+          help="""Run as worker of a distributed test run:
+                  Connect to the coordinator at this network address
+                  and run the work units that it provides.
                   """)),
 
     ((),  # -- CONFIGFILE only
@@ -176,6 +269,36 @@ OPTIONS = [
           help="""Show a catalog of all available step definitions.
                   SAME AS: "--format=steps.catalog --dry-run --no-summary -q".""")),
 
+    (("--steps-load-report",),
+     dict(dest="steps_load_report", action="store_true",
+          help="""Show how long each step module took to import and
+                  to register its step definitions (slowest first).""")),
+
+    (("--step-durations",),
+     dict(dest="step_durations", action="store_true",
+          help="""Show the duration statistics (count, total, p50, p95, max)
+                  of each step definition and each hook after the test run
+                  (slowest total duration first).""")),
+
+    (("--step-durations-output",),
+     dict(metavar="FILE", dest="step_durations_output",
+          help="""Store the duration statistics of each step definition
+                  and each hook in this JSON file (implies: --step-durations).
+                  """)),
+
+    (("--profile",),
+     dict(dest="profile", action="store_true",
+          help="""Profile the test run: Show the time spent in each phase
+                  (parsing, step loading, hooks, step matching, step execution,
+                  capture, formatters and reporters) after the test run.""")),
+
+    (("--profile-output",),
+     dict(metavar="FILE", dest="profile_output",
+          help="""Store the profile in this file (implies: --profile).
+                  Use a "*.speedscope.json" file for the phases
+                  (for: https://www.speedscope.app) or any other file
+                  for the cProfile statistics (in pstats format).""")),
+
     ((),  # -- CONFIGFILE only
      dict(dest="scenario_outline_annotation_schema",
           help="""Specify name annotation schema for scenario outline
@@ -260,6 +383,13 @@ OPTIONS = [
      dict(dest="capture_log", action="store_false",
           help="""Disable capture of logging output.""")),
 
+    (("--capture-spill-size",),
+     dict(metavar="SIZE", dest="capture_spill_size",
+          type=positive_number, default=1048576,
+          help="""Move captured stdout/stderr output that is larger than SIZE
+                  characters into a temporary file until it is used
+                  (default: %(default)s; use 0 to disable).""")),
+
     (("--capture-hooks",),
      dict(dest="capture_hooks", action="store_true",
           help="""Enable capture of hooks (except: before_all).""")),
@@ -308,6 +438,26 @@ OPTIONS = [
                          ``logging_filter = -foo``, it will be excluded rather
                          than included.""")),
 
+    (("--logging-capture-max-records",),
+     dict(metavar="NUMBER", dest="logging_capture_max_records",
+          type=positive_number, default=0,
+          help="""Keep only the newest NUMBER captured log records in memory
+                  (default: 0, unlimited). Older log records are
+                  dropped (or spilled to disk).""")),
+
+    (("--logging-capture-max-bytes",),
+     dict(metavar="SIZE", dest="logging_capture_max_bytes",
+          type=positive_number, default=0,
+          help="""Keep only the newest captured log records in memory whose
+                  log messages have at most SIZE characters
+                  (default: 0, unlimited).""")),
+
+    (("--logging-capture-spill",),
+     dict(dest="logging_capture_spill", action="store_true",
+          help="""Spill older captured log records to a temporary file
+                  (instead of dropping them) if a capture limit is reached.
+                  """)),
+
     (("--logging-clear-handlers",),
      dict(action="store_true",
           help="Clear existing logging handlers (during capture-log).")),
@@ -366,6 +516,15 @@ Only tag-expressions v2 are supported (since: behave v1.4.0).
                   file and the steps directory (instead of default path names).
                   """)),
 
+    (("--step-match-cache",),
+     dict(metavar="SIZE", dest="step_match_cache", type=positive_number,
+          default=0,
+          help="""Cache the step-definition (and its step parameters) that
+                  matches a step text (default: 0, disabled).
+                  SIZE is the maximal number of cached step texts.
+                  Type conversion is redone for non-pure type converters.
+                  """)),
+
     (("--stop",),
      dict(action="store_true",
           help="Stop running tests at the first failure.")),
@@ -438,6 +597,7 @@ CONFIGFILE_EXCLUDED_OPTIONS = set([
     "tags_help", "lang_list", "lang_help",
     "version",
     "userdata_defines",
+    "worker",
 ])
 CONFIGFILE_EXCLUDED_ACTIONS = set(["store_false", "store_const"])
 
@@ -595,6 +755,7 @@ def read_toml_config(path):
     SEE: https://www.python.org/dev/peps/pep-0518/#tool-table
     """
     # pylint: disable=too-many-locals, too-many-branches
+    tomllib = importlib.import_module(_TOML_MODULE_NAME)
     with open(path, "rb") as toml_file:
         # -- HINT: Use simple dictionary for "config".
         config = json.loads(json.dumps(tomllib.load(toml_file)))
@@ -766,18 +927,37 @@ class Configuration:
         dry_run=False,
         show_source=True,
         show_timings=True,
+        context_origin=CONTEXT_ORIGIN_DEFAULT,
         capture=None,
         capture_stdout=True,
         capture_stderr=True,
         capture_log=True,
         capture_hooks=True,
+        capture_spill_size=1048576,
         logging_format="LOG_%(levelname)s:%(name)s: %(message)s",
         logging_level=logging.INFO,
+        logging_capture_max_records=0,
+        logging_capture_max_bytes=0,
+        logging_capture_spill=False,
         runner=DEFAULT_RUNNER_CLASS_NAME,
+        coordinator=DEFAULT_COORDINATOR_ADDRESS,
         steps_catalog=False,
+        step_match_cache=0,
+        steps_load_report=False,
+        profile=False,
+        profile_output=None,
+        step_durations=False,
+        step_durations_output=None,
         summary=True,
         tag_expression_protocol=TagExpressionProtocol.DEFAULT,
         junit=False,
+        junit_aggregate=False,
+        parse_cache=False,
+        scenario_index=False,
+        lazy_step_modules=False,
+        clear_parse_cache=False,
+        parse_jobs=1,
+        cache_dir=".behave_cache",
         stage=None,
         tags=None,
         userdata={},
@@ -785,7 +965,7 @@ class Configuration:
         default_format="pretty",    # -- Used when no formatters are configured.
         default_tags="",            # -- Used when no tags are defined.
         config_tags=None,
-        scenario_outline_annotation_schema="{name} -- @{row.id} {examples.name}",
+        scenario_outline_annotation_schema=SCENARIO_OUTLINE_ANNOTATION_SCHEMA,
         use_nested_step_modules=False,
     )
 
@@ -825,6 +1005,8 @@ class Configuration:
             self.setup_steps_catalog_mode()
         if self.wip:
             self.setup_wip_mode()
+        if self.worker:
+            self.setup_worker_mode()
         if self.quiet:
             self.show_source = False
             self.show_snippets = False
@@ -872,6 +1054,7 @@ class Configuration:
         self.default_tags = None
         self.userdata = None
         self.wip = None
+        self.worker = None
         self.verbose = verbose or False
         self.formatters = []
         self.reporters = []
@@ -887,7 +1070,11 @@ class Configuration:
         self.more_formatters = None
         self.more_runners = None
         self.runner_aliases = {
-            "default": DEFAULT_RUNNER_CLASS_NAME
+            "default": DEFAULT_RUNNER_CLASS_NAME,
+            "parallel": PARALLEL_RUNNER_CLASS_NAME,
+            "async": ASYNC_RUNNER_CLASS_NAME,
+            "threads": THREADS_RUNNER_CLASS_NAME,
+            "distributed": DISTRIBUTED_RUNNER_CLASS_NAME,
         }
 
     @classmethod
@@ -968,6 +1155,11 @@ class Configuration:
         else:
             self.tags = "@wip"
 
+    def setup_worker_mode(self):
+        # -- DISTRIBUTED TEST RUN: Run the work units of a coordinator
+        #    (instead of the features that are selected by this process).
+        self.runner = DISTRIBUTED_WORKER_CLASS_NAME
+
     def setup_steps_catalog_mode(self):
         # -- SHOW STEP-CATALOG: As step summary.
         self.default_format = "steps.catalog"
@@ -990,19 +1182,43 @@ class Configuration:
             # -- SELECT: Scenario-by-name, build regular expression.
             self.name_re = self.build_name_re(self.name)
 
+    @property
+    def reporters(self):
+        """Reporters to use (created on first use).
+
+        .. versionchanged:: 1.4.0
+            Reporters are created on first use (keeps the startup time small).
+        """
+        if self._reporters is None:
+            self._reporters = self.make_reporters()
+        return self._reporters
+
+    @reporters.setter
+    def reporters(self, value):
+        self._reporters = value
+
     def setup_reporters(self):
         if self.junit:
             # -- APPLY-CONFIG:
             # Buffer the output (it will be put into Junit report)
-            from .reporter.junit import JUnitReporter
             self.capture_stdout = True
             self.capture_stderr = True
             self.capture_log = True
-            self.reporters.append(JUnitReporter(self))
+        # -- LAZY INIT: Reporters are created on first use.
+        self._reporters = None
+
+    def make_reporters(self):
+        reporters = []
+        if self.junit:
+            from .reporter.junit import JUnitReporter
+            reporters.append(JUnitReporter(self))
         if self.summary:
-            # -- APPLY-CONFIG:
             from .reporter.summary import SummaryReporter
-            self.reporters.append(SummaryReporter(self))
+            reporters.append(SummaryReporter(self))
+        if self.step_durations or self.step_durations_output:
+            from .reporter.step_durations import StepDurationsReporter
+            reporters.append(StepDurationsReporter(self))
+        return reporters
 
     def show_bad_formats_and_fail(self, parser):
         """
@@ -1029,7 +1245,7 @@ class Configuration:
         * config-file tags (as tag-expression text)
         """
         # -- APPLY-CONFIG:
-        from .tag_expression import make_tag_expression
+        from .tag_expression import compile_tag_expression, make_tag_expression
         config_tags = self.config_tags or self.default_tags or ""
         tags = tags or self.tags or config_tags
         # DISABLED: tags = self._normalize_tags(tags)
@@ -1044,8 +1260,8 @@ class Configuration:
         if placeholder in tags:
             tags = tags.replace(placeholder, placeholder_value)
 
-        # -- STEP: Make tag-expression
-        self.tag_expression = make_tag_expression(tags)
+        # -- STEP: Make tag-expression (compiled for a fast evaluation)
+        self.tag_expression = compile_tag_expression(make_tag_expression(tags))
         self.tags = tags
         if self.verbose:
             print(f"USING: tag_expression: {self.tag_expression}")
@@ -1189,10 +1405,15 @@ class Configuration:
 
     def setup_model(self):
         if self.scenario_outline_annotation_schema:
+            name_schema = str(self.scenario_outline_annotation_schema).strip()
+            if ("behave.model" not in sys.modules and
+                    name_schema == SCENARIO_OUTLINE_ANNOTATION_SCHEMA):
+                # -- LAZY IMPORT: Model is not imported, yet (and uses the default).
+                return
+
             # -- APPLY-CONFIG:
             from .model import ScenarioOutline
-            name_schema = str(self.scenario_outline_annotation_schema)
-            ScenarioOutline.annotation_schema = name_schema.strip()
+            ScenarioOutline.annotation_schema = name_schema
 
     def setup_stage(self, stage=None):
         """
@@ -12,6 +12,7 @@ from behave.exception import NotSupportedWarning
 from behave.matchers import (
     Matcher,
     has_registered_step_matcher_class,
+    make_literal_prefix,
     register_step_matcher_class,
     use_step_matcher
 )
@@ -97,6 +98,13 @@ class StepMatcher4CucumberExpressions(Matcher):
         # -- ENSURE: No BAD STEP-DEFINITION problem exists.
         pass
 
+    def compute_literal_prefix(self) -> str:
+        if type(self).check_match is not StepMatcher4CucumberExpressions.check_match:
+            # -- CASE: Derived class uses another matching strategy.
+            return ""
+        # -- HINT: Regex stops at first parameter, optional or alternative.
+        return make_literal_prefix(self.regex_pattern)
+
     def check_match(self, step_text: str) -> Optional[List[Argument]]:
         matched = self.cucumber_expression.match(step_text)
         if matched is None:
@@ -4,9 +4,6 @@ Behave exception classes.
 .. versionadded:: 1.2.7
 """
 
-from behave.tag_expression.parser import TagExpressionError
-
-
 __all__ = [
     "ClassNotFoundError",
     "CleanupError",
@@ -106,3 +103,16 @@ class NotSupportedWarning(Warning):
 
     .. versionadded:: 1.2.7
     """
+
+
+# ---------------------------------------------------------------------------
+# LAZY IMPORTS:
+# ---------------------------------------------------------------------------
+def __getattr__(name):
+    # -- HINT: TagExpressionError is provided by "cucumber-tag-expressions".
+    # It is only imported when it is used (keeps the startup time small).
+    if name == "TagExpressionError":
+        # pylint: disable=import-outside-toplevel
+        from behave.tag_expression.parser import TagExpressionError
+        return TagExpressionError
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -137,12 +137,46 @@ def is_context_manager(func):
     return genfunc and not iscoroutinefunction(func)
 
 
+def is_async_context_manager(func):
+    """Checks if a fixture function is an async-generator function
+    (with setup part and cleanup part), like:
+
+    .. code-block:: python
+
+        @fixture
+        async def db_pool(context, *args, **kwargs):
+            context.db_pool = await create_db_pool()
+            yield context.db_pool
+            await context.db_pool.close()
+
+    :param func:    Function to check.
+    :return: True, if function is an async-generator function.
+             False, otherwise.
+
+    .. versionadded:: 1.4.0
+    """
+    return inspect.isasyncgenfunction(func)
+
+
+async def _run_next_part(async_func_it):
+    """Runs the next part (setup or cleanup part) of an async-generator.
+
+    :return: Tuple (finished, result) with finished=True at the end.
+    """
+    try:
+        result = await async_func_it.__anext__()
+        return (False, result)
+    except StopAsyncIteration:
+        return (True, None)
+
+
 # -------------------------------------------------------------------------------
 # EXCEPTIONS:
 # -------------------------------------------------------------------------------
 class InvalidFixtureError(RuntimeError):
     """Raised when a fixture is invalid.
     This occurs when a generator-function with more than one yield statement
+    (or an async-generator-function without yield statement)
     is used as fixture-function.
     """
 
@@ -176,6 +210,39 @@ def _setup_fixture(fixture_func, context, *fixture_args, **fixture_kwargs):
         func_it = fixture_func(context, *fixture_args, **fixture_kwargs)
         context.add_cleanup(cleanup_fixture)
         setup_result = next(func_it) # SETUP-FIXTURE PART (may raise error)
+    elif is_async_context_manager(fixture_func):
+        # -- CASE: Fixture function is a two-step async-generator.
+        #  Setup and cleanup part run on the event loop of the test run.
+        # pylint: disable=import-outside-toplevel
+        from behave.async_step import run_coroutine
+
+        def cleanup_async_fixture():
+            if async_func_it.ag_frame is None or not setup_started:
+                # -- CASE: Setup part was not started (or generator finished).
+                return False
+            finished, _ = run_coroutine(_run_next_part(async_func_it))
+            if not finished:
+                message = "Has more than one yield: %r" % fixture_func
+                raise InvalidFixtureError(message)
+            return False
+
+        async def setup_async_fixture():
+            setup_started.append(True)
+            return await _run_next_part(async_func_it)
+
+        setup_started = []
+        async_func_it = fixture_func(context, *fixture_args, **fixture_kwargs)
+        context.add_cleanup(cleanup_async_fixture)
+        finished, setup_result = run_coroutine(setup_async_fixture())
+        if finished:
+            message = "Has no yield: %r" % fixture_func
+            raise InvalidFixtureError(message)
+    elif iscoroutinefunction(fixture_func):
+        # -- CASE: Fixture is an async-function (setup-only).
+        # pylint: disable=import-outside-toplevel
+        from behave.async_step import run_coroutine
+        setup_result = run_coroutine(fixture_func(context, *fixture_args,
+                                                  **fixture_kwargs))
     else:
         # -- CASE: Fixture is a simple function (setup-only)
         # NOTE: No cleanup is registered (not needed by intention of user)
@@ -196,6 +263,11 @@ def use_fixture(fixture_func, context, *fixture_args, **fixture_kwargs):
     Therefore, fixture-cleanup is performed after scenario, feature or test-run
     (depending when its fixture-setup is performed).
 
+    An async fixture-function (``async def`` with or without yield-statement)
+    is run on the event loop of the test run. Therefore, an async resource
+    (like: a connection pool) that is created in the ``before_all()`` hook
+    can be used by all async-steps.
+
     .. code-block:: python
 
         # -- FILE: behave4my_project/fixtures.py (or: features/environment.py)
@@ -226,6 +298,9 @@ def use_fixture(fixture_func, context, *fixture_args, **fixture_kwargs):
     :param fixture_kwargs: Positional args, passed to the fixture function.
     :param fixture_kwargs: Additional kwargs, passed to the fixture function.
     :return: Setup result object (may be None).
+
+    .. versionchanged:: 1.4.0
+        Async fixture-functions are supported.
     """
     return _setup_fixture(fixture_func, context, *fixture_args, **fixture_kwargs)
 
@@ -374,6 +449,14 @@ def fixture(func=None, name=None, pattern=None):
             context.add_cleanup(cleanup_fixture_bar, the_fixture.cleanup)
             return the_fixture
 
+        # CASE ASYNC-FIXTURE-GENERATOR-FUNCTION: Uses event loop of test run.
+        @fixture
+        async def baz(context, *args, **kwargs):
+            the_fixture = await setup_fixture_baz(*args, **kwargs)
+            context.baz = the_fixture
+            yield the_fixture
+            await cleanup_fixture_baz(the_fixture)
+
     :param name:    Specifies the fixture tag name (as string).
 
     .. seealso::
@@ -15,6 +15,7 @@ _BUILTIN_FORMATS = [
     ("pretty",  "behave.formatter.pretty:PrettyFormatter"),
     ("json",    "behave.formatter.json:JSONFormatter"),
     ("json.pretty", "behave.formatter.json:PrettyJSONFormatter"),
+    ("json.stream", "behave.formatter.json:StreamJSONFormatter"),
     ("null",      "behave.formatter.null:NullFormatter"),
     ("progress",  "behave.formatter.progress:ScenarioProgressFormatter"),
     ("progress2", "behave.formatter.progress:StepProgressFormatter"),
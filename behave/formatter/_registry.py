@@ -1,4 +1,3 @@
-import inspect
 import sys
 import warnings
 from behave.formatter.base import Formatter, StreamOpener
@@ -20,7 +19,7 @@ class BadFormatterClass:
     def error(self):
         if self._error_text is None:
             error_text = ""
-            if not inspect.isclass(self.formatter_class):
+            if not isinstance(self.formatter_class, type):
                 error_text = "InvalidClassError: is not a class"
             elif not is_formatter_class_valid(self.formatter_class):
                 error_text = "InvalidClassError: is not a subclass-of Formatter"
@@ -147,7 +146,7 @@ def select_formatter_class(formatter_name):
 
 
 def is_formatter_class_valid(formatter_class):
-    return inspect.isclass(formatter_class) and issubclass(formatter_class, Formatter)
+    return isinstance(formatter_class, type) and issubclass(formatter_class, Formatter)
 
 
 def is_formatter_valid(formatter_name):
@@ -3,6 +3,7 @@ This module provides `JSON`_ formatters for :mod:`behave`:
 
 * json: Generates compact JSON output
 * json.pretty: Generates readable JSON output
+* json.stream: Generates compact JSON output (written per scenario)
 
 .. _JSON: https://json.org
 """
@@ -22,6 +23,8 @@ class JSONFormatter(Formatter):
     dumps_kwargs = {}
     split_text_into_lines = True   # EXPERIMENT for better readability.
 
+    stream_elements = False     # Write each feature element when finished.
+
     json_number_types = (int, float)
     json_scalar_types = json_number_types + (str, bool, type(None))
 
@@ -34,12 +37,14 @@ class JSONFormatter(Formatter):
         self.current_feature_data = None
         self.current_scenario = None
         self._step_index = 0
+        self._feature_head_written = False
 
     def reset(self):
         self.current_feature = None
         self.current_feature_data = None
         self.current_scenario = None
         self._step_index = 0
+        self._feature_head_written = False
 
     # -- FORMATTER API:
     def uri(self, uri):
@@ -182,18 +187,20 @@ class JSONFormatter(Formatter):
         self.finish_current_scenario()
         self.update_status_data()
 
-        if self.feature_count == 0:
-            # -- FIRST FEATURE:
-            self.write_json_header()
+        if self._feature_head_written:
+            # -- STREAM MODE: Feature head and elements are already written.
+            self.write_pending_feature_element()
+            self.write_json_feature_tail(self.current_feature_data)
         else:
-            # -- NEXT FEATURE:
-            self.write_json_feature_separator()
-
-        self.write_json_feature(self.current_feature_data)
+            self.write_json_feature_start()
+            self.write_json_feature(self.current_feature_data)
         self.reset()
         self.feature_count += 1
 
     def close(self):
+        if self.stream_elements and self.current_feature_data:
+            # -- CASE: Aborted test run -- Finish the current feature.
+            self.eof()
         if self.feature_count == 0:
             # -- FIRST FEATURE: Corner case when no features are provided.
             self.write_json_header()
@@ -203,6 +210,9 @@ class JSONFormatter(Formatter):
     # -- JSON-DATA COLLECTION:
     def add_feature_element(self, element):
         assert self.current_feature_data is not None
+        if self.stream_elements:
+            # -- STREAM MODE: Previous feature element is finished.
+            self.write_pending_feature_element()
         if "elements" not in self.current_feature_data:
             self.current_feature_data["elements"] = []
         self.current_feature_data["elements"].append(element)
@@ -223,6 +233,23 @@ class JSONFormatter(Formatter):
             status_name = self.current_scenario.status.name
             self.current_feature_element["status"] = status_name
 
+    def write_pending_feature_element(self):
+        """Write the last feature element (if any) and drop its data.
+        The feature head is written before the first feature element.
+        """
+        elements = self.current_feature_data.get("elements", None)
+        if not elements:
+            return
+
+        element = elements.pop()
+        if not self._feature_head_written:
+            self.write_json_feature_start()
+            self.write_json_feature_head(self.current_feature_data)
+            self._feature_head_written = True
+        else:
+            self.write_json_element_separator()
+        self.write_json_element(element)
+
     # -- JSON-WRITER:
     def write_json_header(self):
         self.stream.write("[\n")
@@ -237,6 +264,41 @@ class JSONFormatter(Formatter):
     def write_json_feature_separator(self):
         self.stream.write(",\n\n")
 
+    def write_json_feature_start(self):
+        if self.feature_count == 0:
+            # -- FIRST FEATURE:
+            self.write_json_header()
+        else:
+            # -- NEXT FEATURE:
+            self.write_json_feature_separator()
+
+    # -- JSON-WRITER: For stream mode (feature is written in parts).
+    def write_json_feature_head(self, feature_data):
+        """Write the feature data without its elements and status
+        (and opens the JSON array for the feature elements).
+        """
+        head_data = dict((name, value) for name, value in feature_data.items()
+                         if name not in ("elements", "status"))
+        text = json.dumps(head_data, **self.dumps_kwargs)
+        assert text.endswith("}")
+        separator = ", "
+        if self.dumps_kwargs.get("indent", None) is not None:
+            separator = ",\n  "
+        self.stream.write(text[:-1].rstrip() + separator + '"elements": [\n')
+
+    def write_json_element(self, element):
+        self.stream.write(json.dumps(element, **self.dumps_kwargs))
+        self.stream.flush()
+
+    def write_json_element_separator(self):
+        self.stream.write(",\n")
+
+    def write_json_feature_tail(self, feature_data):
+        """Closes the JSON array of feature elements and the feature."""
+        status = json.dumps(feature_data["status"])
+        self.stream.write('\n], "status": %s}' % status)
+        self.stream.flush()
+
 
 # -----------------------------------------------------------------------------
 # CLASS: PrettyJSONFormatter
@@ -248,3 +310,86 @@ class PrettyJSONFormatter(JSONFormatter):
     name = "json.pretty"
     description = "JSON dump of test run (human readable)"
     dumps_kwargs = {"indent": 2, "sort_keys": True}
+
+
+# -----------------------------------------------------------------------------
+# CLASS: StreamJSONFormatter
+# -----------------------------------------------------------------------------
+class StreamJSONFormatter(JSONFormatter):
+    """
+    Provides compact JSON output where each feature element (scenario, ...)
+    is written (and dropped from memory) when it is finished.
+    This keeps the memory usage low for features with many scenarios
+    (or large embeddings).
+
+    The JSON schema is the same as for the "json" formatter
+    (only the order of feature keys differs). The output of a killed test run
+    can be repaired with :func:`recover_json_text()`.
+
+    .. versionadded:: 1.4.0
+    """
+    name = "json.stream"
+    description = "JSON dump of test run (written per scenario)"
+    stream_elements = True
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS:
+# -----------------------------------------------------------------------------
+def recover_json_text(text, max_depth=3):
+    """Recover the JSON output of a killed/aborted test run.
+    The text is cut after the last complete feature element and
+    all open JSON arrays/objects are closed.
+
+    .. code-block:: python
+
+        # -- OUTPUT: [{"keyword": "Feature", ..., "elements": [{...}, {"key
+        recovered_text = recover_json_text(text)
+        features = json.loads(recovered_text)
+
+    :param text:        JSON output of a (killed) test run (as string).
+    :param max_depth:   Nesting depth of feature elements (3: features array,
+                        feature object, elements array).
+    :return: Recovered JSON text (as string).
+
+    .. note:: The last (incomplete) feature has no "status" information.
+
+    .. versionadded:: 1.4.0
+    """
+    closing_chars = {"[": "]", "{": "}"}
+    stack = []
+    cut_position = 0
+    cut_stack = []
+    in_string = False
+    escaped = False
+    for position, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in closing_chars:
+            stack.append(char)
+            if len(stack) <= max_depth:
+                cut_position = position + 1
+                cut_stack = list(stack)
+        elif char in "]}":
+            if not stack:
+                # -- CASE: Text is complete (or broken).
+                break
+            stack.pop()
+            if len(stack) <= max_depth:
+                cut_position = position + 1
+                cut_stack = list(stack)
+
+    if not cut_position:
+        # -- CASE: Empty output (no features were written).
+        return "[]\n"
+    closing = "".join(closing_chars[char] for char in reversed(cut_stack))
+    return text[:cut_position] + closing + "\n"
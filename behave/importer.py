@@ -5,7 +5,6 @@ REQUIRES: importlib (provided in Python2.7, Python3.2...)
 """
 
 import importlib
-import inspect
 from behave._types import Unknown
 from behave.exception import ClassNotFoundError
 
@@ -33,7 +32,7 @@ def make_scoped_class_name(obj):
     :param obj:  Object or class.
     :return Scoped-class-name (as string).
     """
-    if inspect.isclass(obj):
+    if isinstance(obj, type):
         class_name = obj.__name__
     else:
         class_name = obj.__class__.__name__
@@ -1,8 +1,13 @@
+from array import array
+from collections import deque
+from itertools import islice
 from logging.handlers import BufferingHandler
 import logging
 import functools
 import re
+import tempfile
 
+from behave import capture_local
 from behave.log_config import (
     LoggingConfigurator as _LoggingConfigurator
 )
@@ -59,14 +64,49 @@ class LoggingCapture(BufferingHandler):
     configuration variable ``logging_filter``.
 
     .. __: behave.html#command-line-arguments
+
+    CAPTURE LIMITS (since: behave v1.4.0):
+
+    The number of log records in memory can be limited with the configuration
+    variables ``logging_capture_max_records`` and ``logging_capture_max_bytes``
+    (size of the log messages). Older records are dropped, or are spilled
+    to a temporary file if ``logging_capture_spill`` is enabled.
+    Log records are only formatted when the captured output is used.
+    The captured output notes how many records were dropped/spilled.
+
+    .. attribute:: dropped_count
+
+        Number of log records that were dropped (due to capture limits).
+
+    .. attribute:: spilled_count
+
+        Number of log records that were spilled to the temporary file.
     """
     DEFAULT_FORMAT = "LOG.%(levelname)s:%(name)s:%(message)s"
+    DROPPED_RECORDS_NOTE = "LOG_CAPTURE: {count} log records dropped (capture limit)"
+    SPILLED_RECORDS_NOTE = "LOG_CAPTURE: {count} log records spilled to disk (capture limit)"
+    SPILL_ENCODING = "utf-8"
 
     def __init__(self, config, level=None):
         BufferingHandler.__init__(self, 1000)
         self.config = config
         self.old_handlers = []
         self.old_level = None
+        self.old_context_capture = None
+        self.context_local = False
+
+        # -- CAPTURE LIMITS: HINT: Mock configs use defaults.
+        self.max_records = self._select_limit(config, "logging_capture_max_records")
+        self.max_bytes = self._select_limit(config, "logging_capture_max_bytes")
+        self.spill = getattr(config, "logging_capture_spill", False) is True
+        self.dropped_count = 0
+        self.spilled_count = 0
+        self._spill_file = None
+        self._spill_offsets = array("q")
+        self._message_sizes = deque()
+        self._message_bytes = 0
+        if self.has_limits():
+            self.buffer = deque()
 
         # -- STEP: Create log-formatter
         log_format = self.DEFAULT_FORMAT
@@ -92,9 +132,19 @@ class LoggingCapture(BufferingHandler):
         if config.logging_filter:
             self.addFilter(RecordFilter(config.logging_filter))
 
+    @staticmethod
+    def _select_limit(config, name):
+        value = getattr(config, name, 0)
+        if isinstance(value, int) and value > 0:
+            return value
+        return 0
+
+    def has_limits(self):
+        return bool(self.max_records or self.max_bytes)
+
     def clear_buffer(self):
         # -- SINCE: behave v1.2.7
-        self.buffer = []
+        self.truncate()
 
     def __bool__(self):
         return bool(self.buffer)
@@ -102,11 +152,136 @@ class LoggingCapture(BufferingHandler):
     def flush(self):
         pass  # do nothing
 
+    def close(self):
+        self._close_spill_file()
+        BufferingHandler.close(self)
+
     def truncate(self):
         self.buffer = []
+        if self.has_limits():
+            self.buffer = deque()
+        self.dropped_count = 0
+        self.spilled_count = 0
+        self._message_sizes.clear()
+        self._message_bytes = 0
+        self._close_spill_file()
+
+    def emit(self, record):
+        self.buffer.append(record)
+        if not self.has_limits():
+            return
+
+        # -- CAPTURE LIMITS: Remove oldest records from memory.
+        if self.max_bytes:
+            message_size = len(record.getMessage())
+            self._message_sizes.append(message_size)
+            self._message_bytes += message_size
+        while self._should_remove_record():
+            self._remove_oldest_record()
+
+    def _should_remove_record(self):
+        if self.max_records and len(self.buffer) > self.max_records:
+            return True
+        # -- HINT: Last record is kept, even if it exceeds the limit.
+        return (self.max_bytes and self._message_bytes > self.max_bytes
+                and len(self.buffer) > 1)
+
+    def _remove_oldest_record(self):
+        record = self.buffer.popleft()
+        if self.max_bytes:
+            self._message_bytes -= self._message_sizes.popleft()
+        if self.spill:
+            self._spill_record(record)
+        else:
+            self.dropped_count += 1
+
+    def _spill_record(self, record):
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix="behave_log_",
+                                                      suffix=".log")
+        data = self.formatter.format(record).encode(self.SPILL_ENCODING)
+        self._spill_offsets.append(self._spill_file.tell())
+        self._spill_file.write(data)
+        self.spilled_count += 1
+
+    def _close_spill_file(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        self._spill_offsets = array("q")
+
+    def _read_spilled_records(self, start_index):
+        """Read the formatted records from the spill file (since this index)."""
+        spill_file = self._spill_file
+        start_offset = self._spill_offsets[start_index]
+        end_offset = spill_file.tell()
+        try:
+            spill_file.seek(start_offset)
+            data = spill_file.read(end_offset - start_offset)
+        finally:
+            spill_file.seek(end_offset)
+
+        offsets = self._spill_offsets[start_index:]
+        for index, offset in enumerate(offsets):
+            begin = offset - start_offset
+            end = end_offset - start_offset
+            if index + 1 < len(offsets):
+                end = offsets[index+1] - start_offset
+            yield data[begin:end].decode(self.SPILL_ENCODING)
+
+    @property
+    def removed_count(self):
+        """Number of log records that are no longer in memory."""
+        return self.dropped_count + self.spilled_count
+
+    @property
+    def position(self):
+        """Number of captured log records (used as bookmark).
+
+        .. versionadded:: 1.4.0
+        """
+        return self.removed_count + len(self.buffer)
 
     def getvalue(self):
-        return '\n'.join(self.formatter.format(r) for r in self.buffer)
+        return self.getvalue_since(0)
+
+    def getvalue_since(self, position):
+        """Provides the formatted log output of the log records
+        that were captured since this position (formatted on demand).
+
+        The log output since a position (after the first record) starts
+        with a newline (like the tail of the complete log output does).
+
+        :param position:  Record position (from: :attr:`position`).
+        :return: Formatted log output since this position (as string).
+
+        .. versionadded:: 1.4.0
+        """
+        parts = []
+        start = max(position, 0)
+        removed_count = self.removed_count
+        if start >= removed_count and start > 0:
+            # -- SAME AS: Tail of the complete log output (with separator).
+            parts.append("")
+        elif start < removed_count:
+            # -- CASE: Some records are no longer in memory.
+            if self.dropped_count:
+                count = self.dropped_count - start
+                parts.append(self.DROPPED_RECORDS_NOTE.format(count=count))
+            else:
+                count = self.spilled_count - start
+                parts.append(self.SPILLED_RECORDS_NOTE.format(count=count))
+                parts.extend(self._read_spilled_records(start))
+            start = removed_count
+
+        format_record = self.formatter.format
+        records = self.buffer
+        if start > removed_count:
+            records = islice(records, start - removed_count, None)
+        parts.extend(format_record(record) for record in records)
+        if parts == [""]:
+            return ""
+        return "\n".join(parts)
 
     def find_event(self, pattern):
         """Search through the buffer for a message that matches the given
@@ -138,7 +313,17 @@ class LoggingCapture(BufferingHandler):
         We also set the level of the root logger.
 
         The opposite of this is :meth:`~LoggingCapture.abandon`.
+
+        .. versionchanged:: 1.4.0
+            Only the log records of the current context are captured
+            if the context-local capture is used (by concurrent runners).
         """
+        if capture_local.is_installed():
+            # -- CONCURRENT RUNNER: Select log capture of the current context.
+            self.old_context_capture = capture_local.use_log_capture(self)
+            self.context_local = True
+            return
+
         root_logger = logging.getLogger()
         if self.config.logging_clear_handlers:
             # kill off all the other log handlers
@@ -169,6 +354,12 @@ class LoggingCapture(BufferingHandler):
         If other handlers were removed by :meth:`~LoggingCapture.inveigle` then
         they are reinstated.
         """
+        if self.context_local:
+            capture_local.use_log_capture(self.old_context_capture)
+            self.old_context_capture = None
+            self.context_local = False
+            return
+
         root_logger = logging.getLogger()
         for handler in root_logger.handlers[:]:
             if handler is self:
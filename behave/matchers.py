@@ -7,12 +7,18 @@ step definition (as text) with step-functions that implement this step.
 """
 
 import copy
+import datetime
+import decimal
+import enum
+import fractions
 import inspect
 import re
 import warnings
 
 import parse
 from parse_type import cfparse
+from parse_type.cardinality_field import CardinalityField
+from parse_type.parse_util import FieldParser
 
 from behave.exception_util import ExceptionUtil, ChainedExceptionUtil
 from behave.exception import NotSupportedWarning, ResourceExistsError
@@ -183,9 +189,154 @@ class TypeRegistryNotSupported():
         pass
 
 
+def non_pure_type_converter(func):
+    r"""
+    Marks a type converter as *non-pure*.
+    A non-pure type converter may return another value for the same text,
+    like: a new, mutable object or a value that depends on the current time.
+    Therefore, its type conversion is redone each time a step is matched
+    (even if the step-match cache is used).
+
+    .. code-block:: python
+
+        from behave import register_type
+        from behave.matchers import non_pure_type_converter
+        import parse
+
+        @non_pure_type_converter
+        @parse.with_pattern(r"[\w,]+")
+        def parse_names(text):
+            return text.split(",")   # -- MUTABLE: Provides a new list.
+
+        register_type(Names=parse_names)
+
+    .. versionadded:: 1.4.0
+    """
+    func.pure = False
+    return func
+
+
+def is_pure_type_converter(converter):
+    """Checks if a type converter is pure (default: True)."""
+    return getattr(converter, "pure", True)
+
+
+IMMUTABLE_VALUE_TYPES = (
+    type(None), bool, int, float, complex, str, bytes,
+    decimal.Decimal, fractions.Fraction,
+    datetime.date, datetime.time, datetime.timedelta, enum.Enum,
+)
+
+
+def is_immutable_value(value):
+    """Checks if a matched (and type-converted) value is immutable.
+    Only immutable values may be shared by several matches of a step text
+    (when the step-match cache is used).
+
+    .. versionadded:: 1.4.0
+    """
+    if isinstance(value, (tuple, frozenset)):
+        return all(is_immutable_value(item) for item in value)
+    return isinstance(value, IMMUTABLE_VALUE_TYPES)
+
+
 # -----------------------------------------------------------------------------
 # SECTION: Step Matchers
 # -----------------------------------------------------------------------------
+REGEX_SPECIAL_CHARS = ".^$*+?{}[]()|"
+REGEX_QUANTIFIER_CHARS = "*+?{"
+
+
+def _has_toplevel_alternatives(regex_pattern):
+    """Checks if a regular expression pattern uses alternatives ("|")
+    outside of any group.
+    """
+    if "|" not in regex_pattern:
+        return False
+
+    depth = 0
+    in_char_class = False
+    position = 0
+    while position < len(regex_pattern):
+        char = regex_pattern[position]
+        if char == "\\":
+            position += 1   # -- SKIP: Escaped character.
+        elif in_char_class:
+            in_char_class = (char != "]")
+        elif char == "[":
+            in_char_class = True
+            if regex_pattern[position+1:position+2] == "^":
+                position += 1
+            if regex_pattern[position+1:position+2] == "]":
+                position += 1   # -- SKIP: Literal "]" as first character.
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth <= 0:
+            return True
+        position += 1
+    return False
+
+
+def make_literal_prefix(regex_pattern, flags=0):
+    r"""
+    Extracts the leading literal text of a regular expression pattern.
+    A text must start with this literal text to be matched by this pattern
+    (when the pattern is matched at the start of the text).
+
+    The extraction is conservative: It stops at the first regex construct
+    that is not a plain (or escaped) character. An empty string is returned
+    if the pattern uses alternatives or flags that affect literal text.
+
+    EXAMPLES::
+
+        make_literal_prefix(r"^a step with (?P<number>\d+)$")  # = "a step with "
+        make_literal_prefix(r"\Aa step\.$")                  # = "a step."
+        make_literal_prefix(r"^an? apple$")                   # = "a"
+
+    :param regex_pattern:   Regular expression pattern (as text).
+    :param flags:           Regular expression flags (used with this pattern).
+    :return: Leading literal text (or empty string).
+
+    .. versionadded:: 1.4.0
+    """
+    if (flags & (re.IGNORECASE | re.VERBOSE) or
+            _has_toplevel_alternatives(regex_pattern)):
+        # -- CASE: Alternatives or case-insensitive/verbose pattern.
+        return ""
+
+    position = 0
+    for anchor in ("\\A", "^"):
+        if regex_pattern.startswith(anchor):
+            position = len(anchor)
+            break
+
+    chars = []
+    pattern_size = len(regex_pattern)
+    while position < pattern_size:
+        char = regex_pattern[position]
+        size = 1
+        if char == "\\":
+            if position + 1 >= pattern_size:
+                break
+            char = regex_pattern[position + 1]
+            if char.isalnum() or char == "_":
+                # -- CASE: Character class, anchor or back-reference, like: \d
+                break
+            size = 2
+        elif char in REGEX_SPECIAL_CHARS:
+            break
+
+        next_char = regex_pattern[position + size:position + size + 1]
+        if next_char and next_char in REGEX_QUANTIFIER_CHARS:
+            # -- CASE: Character is optional or repeated, like: "a?"
+            break
+        chars.append(char)
+        position += size
+    return "".join(chars)
+
+
 class Matcher:
     """
     Provides an abstract base class for step-matcher classes.
@@ -269,6 +420,49 @@ class Matcher:
         # NOTE: Method must be overridden if assumption is not met.
         return self.pattern
 
+    @property
+    def literal_prefix(self):
+        """Return the leading literal text that a step text must start with
+        to be matched by this step-matcher (or an empty string if unknown).
+        Used by the step registry to select plausible step-matchers for a step.
+
+        .. versionadded:: 1.4.0
+        """
+        literal_prefix = getattr(self, "_literal_prefix", None)
+        if literal_prefix is None:
+            literal_prefix = self._literal_prefix = self.compute_literal_prefix()
+        return literal_prefix
+
+    def compute_literal_prefix(self):
+        """Computes the :attr:`literal_prefix` (if possible).
+        Should be overridden by derived classes.
+
+        :return: Leading literal text (or empty string, if unknown).
+        """
+        return ""
+
+    @property
+    def has_pure_type_converters(self):
+        """Indicates if the matched arguments of a step text may be reused
+        for the same step text (because any type conversion is pure).
+        Used by the step-match cache of the step registry.
+
+        .. versionadded:: 1.4.0
+        """
+        pure = getattr(self, "_has_pure_type_converters", None)
+        if pure is None:
+            pure = self._has_pure_type_converters = \
+                self.check_pure_type_converters()
+        return pure
+
+    def check_pure_type_converters(self):
+        """Checks if all type converters (of this step-matcher) are pure.
+        Should be overridden by derived classes.
+
+        :return: True, if matched arguments may be reused. False, otherwise.
+        """
+        return False
+
     def describe(self, schema=None):
         """Provide a textual description of the step function/matcher object.
 
@@ -398,6 +592,28 @@ class ParseMatcher(Matcher):
         # -- OVERWRITTEN: Pattern as regex text.
         return self.parser._expression  # pylint: disable=protected-access
 
+    def compute_literal_prefix(self):
+        if type(self).check_match is not ParseMatcher.check_match:
+            # -- CASE: Derived class uses another matching strategy.
+            return ""
+        flags = 0 if self.CASE_SENSITIVE else re.IGNORECASE
+        return make_literal_prefix(self.regex_pattern, flags)
+
+    def check_pure_type_converters(self):
+        if type(self).check_match is not ParseMatcher.check_match:
+            # -- CASE: Derived class uses another matching strategy.
+            return False
+        extra_types = self.parser._extra_types  # pylint: disable=protected-access
+        for type_name in FieldParser.extract_types(self.pattern):
+            basename, _ = CardinalityField.split_type(type_name)
+            if basename != type_name:
+                # -- CASE: Cardinality-field -- Provides a new (mutable) list.
+                return False
+            converter = extra_types.get(type_name, None)
+            if converter and not is_pure_type_converter(converter):
+                return False
+        return True
+
     def compile(self):
         """
         Compiles internal regular-expression.
@@ -507,6 +723,16 @@ class RegexMatcher(Matcher):
         """Return the regex pattern that is used for matching steps."""
         return self.regex.pattern
 
+    def compute_literal_prefix(self):
+        if type(self).check_match is not RegexMatcher.check_match:
+            # -- CASE: Derived class uses another matching strategy.
+            return ""
+        return make_literal_prefix(self.regex.pattern, self.regex.flags)
+
+    def check_pure_type_converters(self):
+        # -- HINT: Type conversion is not supported (matched text is used).
+        return type(self).check_match is RegexMatcher.check_match
+
     def compile(self):
         # -- HINT: Compiles "parser._match_re" which may lead to error (always).
         _ = self.regex  # -- HINT: IMPLICIT-COMPILE
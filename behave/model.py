@@ -359,7 +359,29 @@ class ScenarioContainer(TagAndStatusStatement, Replayable):
         :param runner:  Runner to use.
         :return: True, if test-run failed.
         """
-        # pylint: disable=too-many-branches, too-many-locals, too-many-statements
+        run_state = self.start_run(runner)
+        if not run_state.skip_untested:
+            # -- RUN: Rules, Scenarios or ScenarioOutlines
+            for run_item in self.run_items:
+                failed = self.run_contained_item(run_item, runner)
+                if failed:
+                    run_state.failed_count += 1
+                    if runner.config.stop or runner.aborted:
+                        # -- FAIL-EARLY: Stop after first failure.
+                        break
+        return self.finish_run(runner, run_state)
+
+    def start_run(self, runner):
+        """First part of :meth:`run()`: Notifies the formatters,
+        runs the before-hooks and pushes a new context layer.
+        The contained run items are run afterwards
+        (by using :meth:`run_contained_item()`).
+
+        :param runner:  Runner to use.
+        :return: Run state (needed by :meth:`finish_run()`).
+
+        .. versionadded:: 1.4.0
+        """
         # MAYBE: self.reset()
         self.clear_status()
         self.hook_failed = False
@@ -367,19 +389,17 @@ class ScenarioContainer(TagAndStatusStatement, Replayable):
 
         entity_name = self.type # VALUE: "feature" or "rule"
         hook_before_entity = "before_{0}".format(entity_name)
-        hook_after_entity = "after_{0}".format(entity_name)
 
         runner.context._push(layer=entity_name)      # pylint: disable=protected-access
         runner.context.tags = set(self.tags)
         self._setup_context_for_run(runner.context)
 
-        skip_entity_untested = runner.aborted
-        should_run_entity = self.should_run(runner.config)
-        failed_count = 0
-        hooks_called = False
+        run_state = ScenarioContainerRunState()
+        run_state.skip_untested = runner.aborted
+        run_state.should_run = self.should_run(runner.config)
 
         # run this entity if the tags say so or any one of its scenarios
-        if should_run_entity or runner.config.show_skipped:
+        if run_state.should_run or runner.config.show_skipped:
             for formatter in runner.formatters:
                 formatter_func = getattr(formatter, entity_name, None)
                 if formatter_func:
@@ -388,44 +408,59 @@ class ScenarioContainer(TagAndStatusStatement, Replayable):
                 for formatter in runner.formatters:
                     formatter.background(self.background)
 
-        if not runner.config.dry_run and should_run_entity:
-            hooks_called = True
+        if not runner.config.dry_run and run_state.should_run:
+            run_state.hooks_called = True
             runner.run_hook_tags_with_capture("before_tag", self.tags,
                                               capture_sink=self.capture_sink)
             runner.run_hook_with_capture(hook_before_entity, self,
                                          capture_sink=self.capture_sink)
             if self.hook_failed:
-                failed_count += 1
+                run_state.failed_count += 1
 
             # -- RE-EVALUATE SHOULD-RUN STATE:
             # Hook may call entity.mark_skipped() to exclude it.
-            skip_entity_untested = self.hook_failed or runner.aborted
-            should_run_entity = self.should_run()
+            run_state.skip_untested = self.hook_failed or runner.aborted
+            run_state.should_run = self.should_run()
+        return run_state
 
-        if not skip_entity_untested:
-            # -- RUN: Rules, Scenarios or ScenarioOutlines
-            for run_item in self.run_items:
-                # -- OPTIONAL: Select scenario by name (regular expressions).
-                should_run_with_name = \
-                    getattr(run_item, "should_run_with_name_select", None)
-                if (runner.config.name and should_run_with_name and
-                        not should_run_with_name(runner.config)):
-                    run_item.mark_skipped()
-                    continue
-
-                failed = run_item.run(runner)
-                if failed:
-                    failed_count += 1
-                    if runner.config.stop or runner.aborted:
-                        # -- FAIL-EARLY: Stop after first failure.
-                        break
+    def run_contained_item(self, run_item, runner):
+        """Runs one of the contained run items (Rule, Scenario, ScenarioOutline)
+        between :meth:`start_run()` and :meth:`finish_run()`.
+
+        :param run_item:  Run item to run (should be contained in this entity).
+        :param runner:  Runner to use.
+        :return: True, if test-run failed.
+
+        .. versionadded:: 1.4.0
+        """
+        # -- OPTIONAL: Select scenario by name (regular expressions).
+        should_run_with_name = \
+            getattr(run_item, "should_run_with_name_select", None)
+        if (runner.config.name and should_run_with_name and
+                not should_run_with_name(runner.config)):
+            run_item.mark_skipped()
+            return False
+        return run_item.run(runner)
+
+    def finish_run(self, runner, run_state):
+        """Last part of :meth:`run()`: Runs the after-hooks,
+        pops the context layer and notifies the formatters.
+
+        :param runner:  Runner to use.
+        :param run_state:  Run state from :meth:`start_run()`.
+        :return: True, if test-run failed.
+
+        .. versionadded:: 1.4.0
+        """
+        entity_name = self.type # VALUE: "feature" or "rule"
+        hook_after_entity = "after_{0}".format(entity_name)
 
         self.clear_status()  # -- ENFORCE: compute_status() after run.
-        if not self.run_items and not should_run_entity:
+        if not self.run_items and not run_state.should_run:
             # -- SPECIAL CASE: Feature without scenarios
             self.set_status(Status.skipped)
 
-        if hooks_called:
+        if run_state.hooks_called:
             runner.run_hook_with_capture(hook_after_entity, self,
                                          capture_sink=self.capture_sink)
             runner.run_hook_tags_with_capture("after_tag", self.tags,
@@ -433,7 +468,7 @@ class ScenarioContainer(TagAndStatusStatement, Replayable):
             if self.hook_failed:
                 # MAYBE BETTER: self.set_status(Status.error)
                 self.set_status(Status.hook_error)
-                failed_count += 1
+                run_state.failed_count += 1
 
         # -- PERFORM CONTEXT CLEANUP: May raise cleanup errors.
         try:
@@ -442,9 +477,9 @@ class ScenarioContainer(TagAndStatusStatement, Replayable):
         except Exception:               # pylint: disable=broad-except
             # -- CLEANUP-ERROR:
             self.set_status(Status.cleanup_error)
-            failed_count += 1
+            run_state.failed_count += 1
 
-        if should_run_entity or runner.config.show_skipped:
+        if run_state.should_run or runner.config.show_skipped:
             callback_name = "{0}_finished".format(entity_name)
             if entity_name == "feature":
                 callback_name = "eof"
@@ -455,10 +490,26 @@ class ScenarioContainer(TagAndStatusStatement, Replayable):
                     formatter_callback()
 
         self.run_endtime = time.time()
-        failed = (failed_count > 0)
+        failed = (run_state.failed_count > 0)
         return failed
 
 
+class ScenarioContainerRunState:
+    """Runtime state of a :class:`ScenarioContainer` while it is running
+    (between :meth:`ScenarioContainer.start_run()` and
+    :meth:`ScenarioContainer.finish_run()`).
+
+    .. versionadded:: 1.4.0
+    """
+    __slots__ = ("should_run", "skip_untested", "hooks_called", "failed_count")
+
+    def __init__(self):
+        self.should_run = False
+        self.skip_untested = False
+        self.hooks_called = False
+        self.failed_count = 0
+
+
 class Feature(ScenarioContainer):
     """A `feature`_ parsed from a *feature file*.
 
@@ -2393,6 +2444,10 @@ class Tag(str):
         o.line = line
         return o
 
+    def __getnewargs__(self):
+        # -- SUPPORT: pickle (used by the parse cache).
+        return (str(self), self.line)
+
     @classmethod
     def make_name(cls, text, unescape=False, allowed_chars=None):
         """Translate text into a "valid tag" without whitespace, etc.
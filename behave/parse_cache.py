@@ -0,0 +1,337 @@
+"""
+This module provides a persistent cache for parsed feature files.
+
+A parsed feature (as :class:`~behave.model.Feature` model object) is stored
+in the cache directory (default: ``.behave_cache/``). It is reused in the next
+test run if the feature file was not changed. This is faster than parsing
+the feature file again. The parse cache is only used if it is enabled
+(with: ``--parse-cache``).
+
+A cache entry is keyed by:
+
+* the content hash of the feature file (and its filename)
+* the (default) language
+* the behave version (and the Python version)
+
+EXAMPLE:
+
+.. code-block:: sh
+
+    # -- ENABLE OR CLEAR THE PARSE CACHE:
+    $ behave --parse-cache features/
+    $ behave --parse-cache --clear-parse-cache features/
+
+.. warning::
+
+    The cache files are loaded with :mod:`pickle`.
+    Use only a cache directory that was created by your own test runs
+    (and do not put it under version control).
+
+.. versionadded:: 1.4.0
+"""
+
+import gc
+from hashlib import sha256
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+
+from behave import parser as gherkin
+from behave.model import Feature
+from behave.version import VERSION as BEHAVE_VERSION
+
+
+# -----------------------------------------------------------------------------
+# CONSTANTS:
+# -----------------------------------------------------------------------------
+DEFAULT_CACHE_DIR = ".behave_cache"
+
+
+PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS:
+# -----------------------------------------------------------------------------
+def dump_feature(feature):
+    """Serializes a parsed feature (without its parser object).
+
+    :param feature:  Feature object to serialize.
+    :return: Serialized feature (as bytes).
+    """
+    # -- HINT: Parser object is not needed (recreated on load).
+    feature_parser = feature.parser
+    try:
+        feature.parser = None
+        return pickle.dumps(feature, protocol=PICKLE_PROTOCOL)
+    finally:
+        feature.parser = feature_parser
+
+
+def load_feature(data):
+    """Loads a serialized feature (and provides a new parser object).
+
+    :param data:  Serialized feature (as bytes).
+    :return: Feature object.
+    :raises ValueError: If data does not contain a feature.
+    """
+    # -- HINT: Pause the garbage collector while many model objects are created.
+    # Otherwise, loading many features is dominated by GC runs.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        feature = pickle.loads(data)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if not isinstance(feature, Feature):
+        raise ValueError("Feature expected (but was: %s)" %
+                         type(feature).__name__)
+    feature.parser = gherkin.Parser(feature.language)
+    return feature
+
+
+def load_cache_file(filename, signature):
+    """Load the data of a cache file (if it has this signature).
+    A missing, broken or outdated cache file is ignored.
+
+    :param filename:   Cache file to load.
+    :param signature:  Expected signature of the cache file (as text).
+    :return: Stored data (or None).
+    """
+    try:
+        with open(filename, "rb") as f:
+            data = pickle.load(f)
+        if data["signature"] == signature:
+            return data["data"]
+    except Exception:   # pylint: disable=broad-except
+        # -- CASE: Missing, broken or incompatible cache file.
+        pass
+    return None
+
+
+def store_cache_file(filename, signature, data):
+    """Store data in a cache file (together with its signature).
+    Problems to store the data are ignored (best effort).
+
+    :param filename:   Cache file to store.
+    :param signature:  Signature of the cache file (as text).
+    :param data:       Data to store (must be serializable).
+    :return: True, if the data was stored. False, otherwise.
+    """
+    try:
+        contents = pickle.dumps(dict(signature=signature, data=data),
+                                protocol=PICKLE_PROTOCOL)
+    except Exception:   # pylint: disable=broad-except
+        # -- CASE: Data contains something that can not be serialized.
+        return False
+
+    try:
+        os.makedirs(os.path.dirname(filename) or os.curdir, exist_ok=True)
+    except OSError:
+        return False
+    return write_file_atomically(filename, contents)
+
+
+def write_file_atomically(filename, contents):
+    """Write the contents of a file atomically (by using a temporary file).
+    Parallel test runs may store the same file at the same time.
+    Problems to write the file are ignored (best effort).
+
+    :param filename:  File to write (its directory must exist).
+    :param contents:  Contents to write (as bytes).
+    :return: True, if the file was written. False, otherwise.
+    """
+    temp_filename = None
+    try:
+        fd, temp_filename = tempfile.mkstemp(
+            suffix=".tmp", dir=os.path.dirname(filename) or os.curdir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(contents)
+        os.replace(temp_filename, filename)
+        temp_filename = None
+        return True
+    except OSError:
+        return False
+    finally:
+        if temp_filename:
+            remove_temp_file(temp_filename)
+
+
+def remove_temp_file(filename):
+    """Remove a temporary file (if it still exists)."""
+    try:
+        os.remove(filename)
+    except OSError:
+        pass
+
+
+# -----------------------------------------------------------------------------
+# CLASSES:
+# -----------------------------------------------------------------------------
+class FeatureParseCache:
+    """
+    Persistent cache of parsed feature files (in a cache directory).
+
+    RESPONSIBILITIES:
+
+    * Provides the parsed feature of a feature file (cached or parsed)
+    * Stores a parsed feature as serialized model object
+    * Ignores broken or outdated cache entries (feature file is parsed again)
+
+    .. attribute:: hits
+
+        Number of features that were loaded from the cache.
+
+    .. attribute:: misses
+
+        Number of features that were parsed (and stored in the cache).
+    """
+    SUBDIRECTORY = "features"
+    SUFFIX = ".pickle"
+    SCHEMA_VERSION = 1
+    # -- HINT: Changes of these modules (development version) invalidate entries.
+    MODEL_MODULES = ("behave.model", "behave.model_core", "behave.model_type",
+                     "behave.parser")
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = DEFAULT_CACHE_DIR
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._signature = None
+
+    @property
+    def features_directory(self):
+        return os.path.join(self.directory, self.SUBDIRECTORY)
+
+    @property
+    def signature(self):
+        """Signature of the serialized model format (as text)."""
+        if self._signature is None:
+            self._signature = self.make_signature()
+        return self._signature
+
+    @classmethod
+    def make_signature(cls):
+        parts = [
+            "schema=%s" % cls.SCHEMA_VERSION,
+            "behave=%s" % BEHAVE_VERSION,
+            "python=%s.%s" % sys.version_info[:2],
+        ]
+        for module_name in cls.MODEL_MODULES:
+            module = sys.modules.get(module_name, None)
+            filename = getattr(module, "__file__", None)
+            if filename:
+                try:
+                    stat = os.stat(filename)
+                    parts.append("%s=%s:%s" % (module_name, stat.st_size,
+                                               stat.st_mtime_ns))
+                except OSError:
+                    pass
+        return "|".join(parts)
+
+    def make_key(self, data, filename, language=None):
+        """Make the cache key for the contents of a feature file.
+
+        :param data:        Contents of the feature file (as bytes).
+        :param filename:    Filename of the feature file.
+        :param language:    Default language to use (or None).
+        :return: Cache key (as hex-digest string).
+        """
+        # -- HINT: Model locations use the filename relative to the CWD.
+        header = "%s|language=%s|cwd=%s|filename=%s\n" % (
+            self.signature, language, os.getcwd(), os.path.abspath(filename))
+        hasher = sha256(header.encode("utf-8"))
+        hasher.update(data)
+        return hasher.hexdigest()
+
+    def make_filename(self, key):
+        return os.path.join(self.features_directory, key + self.SUFFIX)
+
+    def load(self, key):
+        """Load a parsed feature from the cache.
+
+        :param key:  Cache key to use.
+        :return: Feature object (if cached). None, otherwise.
+        """
+        filename = self.make_filename(key)
+        try:
+            with open(filename, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        try:
+            return load_feature(data)
+        except Exception:   # pylint: disable=broad-except
+            # -- CASE: Broken or incompatible cache entry -- Parse it again.
+            self.remove(key)
+            return None
+
+    def store(self, key, feature):
+        """Store a parsed feature in the cache.
+        Problems to store the feature are ignored (best effort).
+
+        :param key:      Cache key to use.
+        :param feature:  Feature object to store.
+        """
+        try:
+            data = dump_feature(feature)
+        except Exception:   # pylint: disable=broad-except
+            # -- CASE: Model contains something that can not be serialized.
+            return
+
+        try:
+            self.ensure_directory_exists()
+        except OSError:
+            return
+        write_file_atomically(self.make_filename(key), data)
+
+    def remove(self, key):
+        try:
+            os.remove(self.make_filename(key))
+        except OSError:
+            pass
+
+    def ensure_directory_exists(self):
+        if os.path.isdir(self.features_directory):
+            return
+        os.makedirs(self.features_directory, exist_ok=True)
+        gitignore_filename = os.path.join(self.directory, ".gitignore")
+        if not os.path.exists(gitignore_filename):
+            with open(gitignore_filename, "w") as f:
+                f.write("# -- CREATED BY: behave (cache directory)\n*\n")
+
+    def clear(self):
+        """Remove all cached features."""
+        shutil.rmtree(self.features_directory, ignore_errors=True)
+
+    def parse_file(self, filename, language=None):
+        """Provides the parsed feature of a feature file
+        (from the cache, if the feature file was not changed).
+
+        :param filename:  Feature file to parse.
+        :param language:  Default language to use (or None).
+        :return: Feature object (or None, if the file contains no feature).
+        :raises ParserError: If the feature file could not be parsed.
+        """
+        with open(filename, "rb") as f:
+            data = f.read()
+
+        key = self.make_key(data, filename, language)
+        feature = self.load(key)
+        if feature is not None:
+            self.hits += 1
+            return feature
+
+        # -- CACHE MISS: Parse feature file and store the parsed feature.
+        # file encoding is assumed to be utf8 (same as: parser.parse_file()).
+        self.misses += 1
+        feature = gherkin.parse_feature(data.decode("utf8"), language, filename)
+        if feature:
+            self.store(key, feature)
+        return feature
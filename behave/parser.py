@@ -195,6 +195,11 @@ class ParserError(Exception):
         self.line_text = line_text
         self.filename = filename
 
+    def __reduce__(self):
+        # -- SUPPORT: pickle (used by parsing with a process pool).
+        return (self.__class__, (self.args[0], self.line, self.filename,
+                                 self.line_text, None, False))
+
     def __str__(self):
         arg0 = _text(self.args[0])
         if self.filename:
@@ -0,0 +1,357 @@
+"""
+This module provides a profiler for a test run (``behave --profile``).
+
+The profiler attributes the time of a test run to its phases:
+
+* ``parse``:             Select and parse the feature files
+* ``environment.load``:  Load the environment file (hooks)
+* ``steps.load``:        Load the step modules
+* ``hook.<HOOK_NAME>``:  Run a hook (like: ``hook.before_scenario``)
+* ``step.match``:        Find the step definition of a step
+* ``step.execute``:      Run a step function (time of the system-under-test)
+* ``capture``:           Capture handling (stdout, stderr, log)
+* ``formatter.<NAME>``:  Formatter calls (like: ``formatter.pretty``)
+* ``reporter.<NAME>``:   Reporter calls (like: ``reporter.junit``)
+* ``runner``:            Remaining time of the test runner
+
+Only the self time of a phase is counted (without the time of nested phases).
+Only the phases of the main thread are measured (not the phases of the
+worker threads of a concurrent runner, like: ``--runner=async``).
+Therefore, the time of steps that are executed by a hook
+(with ``context.execute_steps()``) is counted as ``step.execute`` time.
+
+A summary table is shown after the test run. The profile can be stored
+in a file with ``--profile-output=FILE``:
+
+* ``*.speedscope.json``: Phases as evented profile (for: https://www.speedscope.app)
+* ``*`` (any other file): :mod:`cProfile` statistics (for: :mod:`pstats`)
+
+EXAMPLE:
+
+.. code-block:: sh
+
+    $ behave --profile features/
+    $ behave --profile-output=behave.speedscope.json features/
+    $ behave --profile-output=behave.pstats features/
+    $ python -m pstats behave.pstats
+
+.. versionadded:: 1.4.0
+"""
+
+from contextlib import contextmanager, nullcontext
+import functools
+import json
+import sys
+import threading
+import time
+
+from behave.step_registry import registry as the_step_registry
+from behave.version import VERSION as BEHAVE_VERSION
+
+
+# -----------------------------------------------------------------------------
+# CONSTANTS:
+# -----------------------------------------------------------------------------
+SPEEDSCOPE_SUFFIX = ".speedscope.json"
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+# -----------------------------------------------------------------------------
+# CLASSES:
+# -----------------------------------------------------------------------------
+class PhaseStats:
+    """Number of calls and self time (in seconds) of a phase."""
+    __slots__ = ("name", "calls", "duration")
+
+    def __init__(self, name, calls=0, duration=0.0):
+        self.name = name
+        self.calls = calls
+        self.duration = duration
+
+    def __repr__(self):
+        return "<PhaseStats: %s calls=%d, duration=%.6f>" % \
+            (self.name, self.calls, self.duration)
+
+
+class NullProfiler:
+    """Profiler that measures nothing (used if profiling is disabled)."""
+    enabled = False
+
+    def __init__(self):
+        self._null_context = nullcontext()
+
+    def measure(self, phase):
+        return self._null_context
+
+    def start_run(self):
+        pass
+
+    def stop_run(self):
+        pass
+
+    def install(self, runner):
+        pass
+
+    def uninstall(self):
+        pass
+
+    def report(self, stream=None):
+        pass
+
+
+class RunProfiler:
+    """
+    Measures the self time of the phases of a test run.
+
+    Phases are measured by the runner (parse, load step modules, ...) or
+    by instrumenting the runner objects (:meth:`install()`), like:
+    hooks, step registry, capture controller, formatters and reporters.
+
+    :param output:  Profile output file (or None).
+    :param timer:   Timer function to use (default: time.perf_counter).
+    """
+    ROOT_PHASE = "runner"
+    FORMATTER_METHODS = (
+        "uri", "feature", "rule", "background", "scenario", "step",
+        "match", "result", "eof", "close",
+    )
+    REPORTER_METHODS = ("feature", "end")
+    RUNNER_CAPTURE_METHODS = (
+        "setup_capture", "start_capture", "stop_capture", "teardown_capture",
+    )
+    CAPTURE_CONTROLLER_METHODS = (
+        "make_captured", "make_captured_delta", "update_delta_bookmark",
+    )
+    enabled = True
+
+    def __init__(self, output=None, timer=None):
+        self.output = output
+        self.timer = timer or time.perf_counter
+        self.stats = {}
+        self.start_time = None
+        self.end_time = None
+        self.events = None
+        self.frames = None
+        self.cprofile = None
+        self.thread_id = threading.get_ident()
+        self._stack = []
+        self._patched = []
+        if output and output.endswith(SPEEDSCOPE_SUFFIX):
+            self.events = []
+            self.frames = {}
+
+    @property
+    def duration(self):
+        if self.start_time is None:
+            return 0.0
+        end_time = self.end_time
+        if end_time is None:
+            end_time = self.timer()
+        return end_time - self.start_time
+
+    def _record_event(self, event_type, phase, at):
+        frame = self.frames.setdefault(phase, len(self.frames))
+        self.events.append((event_type, frame, at - self.start_time))
+
+    def start(self, phase, now=None):
+        if now is None:
+            now = self.timer()
+        self._stack.append([phase, now, 0.0])
+        if self.events is not None:
+            self._record_event("O", phase, now)
+
+    def stop(self, now=None):
+        if now is None:
+            now = self.timer()
+        phase, start_time, nested_duration = self._stack.pop()
+        duration = now - start_time
+        stats = self.stats.get(phase, None)
+        if stats is None:
+            stats = self.stats[phase] = PhaseStats(phase)
+        stats.calls += 1
+        stats.duration += duration - nested_duration
+        if self._stack:
+            self._stack[-1][2] += duration
+        if self.events is not None:
+            self._record_event("C", phase, now)
+
+    @contextmanager
+    def measure(self, phase):
+        """Measure the time of a phase (as context manager)."""
+        self.start(phase)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def start_run(self):
+        self.start_time = self.timer()
+        self.start(self.ROOT_PHASE, self.start_time)
+        if self.output and self.events is None:
+            # pylint: disable=import-outside-toplevel
+            import cProfile
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def stop_run(self):
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        self.end_time = self.timer()
+        while self._stack:
+            self.stop(self.end_time)
+
+    # -- INSTRUMENTATION:
+    def wrap(self, func, phase):
+        """Wrap a function to measure its calls as phase."""
+        @functools.wraps(func)
+        def profiled_func(*args, **kwargs):
+            if threading.get_ident() != self.thread_id:
+                # -- OTHER THREAD: Like a worker thread of a concurrent runner.
+                return func(*args, **kwargs)
+            self.start(phase)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.stop()
+        return profiled_func
+
+    def wrap_find_match(self, find_match):
+        """Wrap ``StepRegistry.find_match()`` to measure step matching
+        and the step execution (by wrapping ``Match.run()``).
+        """
+        @functools.wraps(find_match)
+        def profiled_find_match(step):
+            if threading.get_ident() != self.thread_id:
+                return find_match(step)
+            self.start("step.match")
+            try:
+                match = find_match(step)
+            finally:
+                self.stop()
+            if match is not None:
+                match.run = self.wrap(match.run, "step.execute")
+            return match
+        return profiled_find_match
+
+    def patch(self, obj, name, func):
+        """Replace an attribute of an object (restored by: :meth:`uninstall()`)."""
+        original = vars(obj).get(name, self)
+        self._patched.append((obj, name, original, func))
+        setattr(obj, name, func)
+
+    def patch_methods(self, obj, names, phase):
+        for name in names:
+            method = getattr(obj, name, None)
+            if callable(method):
+                self.patch(obj, name, self.wrap(method, phase))
+
+    def install(self, runner):
+        """Instrument the runner objects to measure their phases."""
+        step_registry = runner.step_registry or the_step_registry
+        self.patch(step_registry, "find_match",
+                   self.wrap_find_match(step_registry.find_match))
+        if step_registry.step_loader is not None:
+            self.patch(step_registry, "step_loader",
+                       self.wrap(step_registry.step_loader, "steps.load"))
+
+        hooks = dict((hook_name, self.wrap(hook, "hook.%s" % hook_name))
+                     for hook_name, hook in runner.hooks.items())
+        self.patch(runner, "hooks", hooks)
+        self.patch_methods(runner, self.RUNNER_CAPTURE_METHODS, "capture")
+        self.patch_methods(runner.capture_controller,
+                           self.CAPTURE_CONTROLLER_METHODS, "capture")
+        for formatter in runner.formatters:
+            phase = "formatter.%s" % getattr(formatter, "name", None)
+            self.patch_methods(formatter, self.FORMATTER_METHODS, phase)
+        for reporter in runner.config.reporters:
+            # -- REPORTER NAME: From its module, like: behave.reporter.junit
+            reporter_name = reporter.__class__.__module__.rsplit(".", 1)[-1]
+            self.patch_methods(reporter, self.REPORTER_METHODS,
+                               "reporter.%s" % reporter_name)
+
+    def uninstall(self):
+        """Restore the instrumented runner objects."""
+        while self._patched:
+            obj, name, original, func = self._patched.pop()
+            if vars(obj).get(name, None) is not func:
+                # -- CASE: Attribute was changed/reset (like: step_loader).
+                continue
+            if original is self:
+                # -- CASE: Attribute was provided by the class.
+                delattr(obj, name)
+            else:
+                setattr(obj, name, original)
+
+    # -- REPORTING:
+    def report(self, stream=None):
+        """Show the summary table and store the profile output file."""
+        if stream is None:
+            stream = sys.stdout
+        self.print_summary(stream)
+        if self.output:
+            if self.events is not None:
+                self.store_speedscope(self.output)
+            elif self.cprofile is not None:
+                self.cprofile.dump_stats(self.output)
+            stream.write(u"PROFILE OUTPUT: %s\n" % self.output)
+
+    def print_summary(self, stream):
+        total_duration = self.duration or 1e-9
+        schema = u"  {0:>8}  {1:>9}  {2:>6}  {3}\n"
+        stream.write(u"PROFILE (self time per phase):\n")
+        stream.write(schema.format("CALLS", "DURATION", "TIME", "PHASE"))
+        for stats in sorted(self.stats.values(),
+                            key=lambda x: x.duration, reverse=True):
+            stream.write(schema.format(
+                stats.calls, u"%.3fs" % stats.duration,
+                u"%.1f%%" % (stats.duration * 100.0 / total_duration),
+                stats.name))
+        stream.write(schema.format("", u"%.3fs" % self.duration, u"100.0%",
+                                   "TOTAL"))
+
+    def make_speedscope_data(self):
+        """Provides the phases as evented profile (in speedscope format)."""
+        frames = sorted(self.frames.items(), key=lambda item: item[1])
+        events = [dict(type=event_type, frame=frame, at=at)
+                  for event_type, frame, at in self.events]
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "shared": {
+                "frames": [dict(name=phase) for phase, _ in frames],
+            },
+            "profiles": [{
+                "type": "evented",
+                "name": "behave",
+                "unit": "seconds",
+                "startValue": 0.0,
+                "endValue": self.duration,
+                "events": events,
+            }],
+            "name": "behave",
+            "activeProfileIndex": 0,
+            "exporter": "behave %s" % BEHAVE_VERSION,
+        }
+
+    def store_speedscope(self, filename):
+        with open(filename, "w") as f:
+            json.dump(self.make_speedscope_data(), f)
+
+
+# -----------------------------------------------------------------------------
+# FUNCTIONS:
+# -----------------------------------------------------------------------------
+NO_PROFILER = NullProfiler()
+
+
+def make_profiler(config):
+    """Provides the profiler for a test run (as selected by the configuration).
+
+    :param config:  Configuration object (with: profile, profile_output).
+    :return: Profiler object (or NO_PROFILER, if profiling is disabled).
+    """
+    output = getattr(config, "profile_output", None)
+    if not isinstance(output, str):
+        output = None
+    if getattr(config, "profile", False) is True or output:
+        return RunProfiler(output=output)
+    return NO_PROFILER
@@ -84,15 +84,6 @@ from behave.textutil import indent, make_indentation, text as _text
 from behave.userdata import UserDataNamespace
 
 
-def CDATA(text=None):   # pylint: disable=invalid-name
-    # -- issue #70: remove_ansi_escapes(text)
-    element = ElementTree.Element('![CDATA[')
-    this_text = escape_CDATA(ansi_escapes.strip_escapes(text))
-    element.text = this_text
-    # OLD: element.text = ansi_escapes.strip_escapes(text)
-    return element
-
-
 def _compile_invalid_re():
     # https://stackoverflow.com/questions/1707890/fast-way-to-filter-illegal-xml-unicode-chars-in-python
     illegal_unichrs = [
@@ -130,35 +121,68 @@ def escape_CDATA(text):  # pylint: disable=invalid-name
     return _escape_invalid_xml_chars(text)
 
 
-class ElementTreeWithCDATA(ElementTree.ElementTree):
-    # pylint: disable=redefined-builtin, no-member
-    def _write(self, file, node, encoding, namespaces):
-        """This method is for ElementTree <= 1.2.6"""
+def iter_text_chunks(text, size):
+    """Splits a text into chunks of about this size.
+    A chunk ends at a line boundary (if possible), so that a CDATA end marker
+    or an ANSI escape sequence is never split into two chunks.
+    """
+    start = 0
+    text_size = len(text)
+    while start < text_size:
+        end = start + size
+        if end < text_size:
+            newline_pos = text.rfind("\n", start, end)
+            if newline_pos < 0:
+                newline_pos = text.find("\n", end)
+            end = text_size if newline_pos < 0 else newline_pos + 1
+        yield text[start:end]
+        start = end
+
+
+class JUnitXMLWriter:
+    """
+    Writes a JUnit XML report incrementally (element by element)
+    instead of building an ElementTree for the whole report first.
+    CDATA sections are escaped in chunks.
+
+    The same output can be written to several (binary) streams at once.
 
-        if node.tag == '![CDATA[':
-            text = node.text.encode(encoding)
-            file.write("\n<![CDATA[%s]]>\n" % text)
-        else:
-            ElementTree.ElementTree._write(self, file, node, encoding,
-                                           namespaces)
-
-if hasattr(ElementTree, '_serialize'):
-    # pylint: disable=protected-access
-    def _serialize_xml3(write, elem, qnames, namespaces,
-                        short_empty_elements=None,
-                        orig=ElementTree._serialize_xml):
-        if elem.tag == '![CDATA[':
-            write("\n<{tag}{text}]]>\n".format(
-                tag=elem.tag, text=escape_CDATA(elem.text)))
-            return
-        if short_empty_elements:
-            # python >=3.3
-            return orig(write, elem, qnames, namespaces, short_empty_elements)
-        else:
-            # python <3.3
-            return orig(write, elem, qnames, namespaces)
+    .. versionadded:: 1.4.0
+    """
+    encoding = "utf-8"
+    CDATA_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, *streams):
+        self.streams = list(streams)
+
+    def write(self, text):
+        data = text.encode(self.encoding, "xmlcharrefreplace")
+        for stream in self.streams:
+            stream.write(data)
+
+    @staticmethod
+    def make_attributes(attrib=None):
+        if not attrib:
+            return ""
+        # pylint: disable=protected-access
+        return "".join(' %s="%s"' % (name, ElementTree._escape_attrib(value))
+                       for name, value in attrib.items())
+
+    def start_element(self, tag, attrib=None):
+        self.write("<%s%s>" % (tag, self.make_attributes(attrib)))
+
+    def end_element(self, tag):
+        self.write("</%s>" % tag)
+
+    def write_empty_element(self, tag, attrib=None):
+        self.write("<%s%s />" % (tag, self.make_attributes(attrib)))
 
-    ElementTree._serialize_xml = ElementTree._serialize['xml'] = _serialize_xml3
+    def write_cdata(self, text):
+        # -- issue #70: remove_ansi_escapes(text)
+        self.write("\n<![CDATA[")
+        for chunk in iter_text_chunks(text or "", self.CDATA_CHUNK_SIZE):
+            self.write(escape_CDATA(ansi_escapes.strip_escapes(chunk)))
+        self.write("]]>\n")
 
 
 class FeatureReportData:
@@ -171,14 +195,12 @@ class FeatureReportData:
         self.feature = feature
         self.filename = filename
         self.classname = classname
-        self.testcases = []
         self.counts_tests = 0
         self.counts_errors = 0
         self.counts_failed = 0
         self.counts_skipped = 0
 
     def reset(self):
-        self.testcases = []
         self.counts_tests = 0
         self.counts_errors = 0
         self.counts_failed = 0
@@ -198,12 +220,32 @@ class JUnitReporter(Reporter):
     show_scenarios = True   # Show scenario descriptions.
     show_tags = True
     show_multiline = True
+    # -- SCENARIO STATUS GROUPS:
+    skipped_statuses = (Status.skipped, Status.untested)
+    problematic_statuses = (Status.pending, Status.undefined)
+
+    aggregated_report_basename = "TESTS-all.xml"
 
     def __init__(self, config):
         super(JUnitReporter, self).__init__(config)
         self._summary_collector = SummaryCollector()
+        self._aggregated_report = None
+        self.aggregate = getattr(config, "junit_aggregate", False) is True
         self.setup_with_userdata(config.userdata)
 
+    def open_aggregated_report(self):
+        """Opens the aggregated report file that contains all testsuites
+        (if it is not already open).
+
+        .. versionadded:: 1.4.0
+        """
+        if self._aggregated_report is None:
+            report_filename = self.make_report_filename(
+                self.aggregated_report_basename)
+            self._aggregated_report = open(report_filename, "wb")
+            self._aggregated_report.write(b"<testsuites>")
+        return self._aggregated_report
+
     def setup_with_userdata(self, userdata):
         """Setup JUnit reporter with userdata information.
         A user can now tweak the output format of this reporter.
@@ -256,6 +298,13 @@ class JUnitReporter(Reporter):
     def show_skipped(self):
         return self.config.show_skipped or self.show_skipped_always
 
+    def make_report_filename(self, basename):
+        report_dirname = self.config.junit_directory
+        if not os.path.exists(report_dirname):
+            # -- ENSURE: Create multiple directory levels at once.
+            os.makedirs(report_dirname)
+        return os.path.join(report_dirname, basename)
+
     # -- REPORTER-API:
     def feature(self, feature):
         if feature.status == Status.skipped and not self.show_skipped:
@@ -268,38 +317,49 @@ class JUnitReporter(Reporter):
         report = FeatureReportData(feature, feature_filename)
         now = datetime.now()
 
-        suite = ElementTree.Element('testsuite')
-        feature_name = feature.name or feature_filename
-        suite.set('name', '%s.%s' % (classname, feature_name))
+        # -- STEP: Count testcases first (testsuite attributes need them).
+        scenarios = list(self._iter_scenarios_for(feature))
+        for scenario in scenarios:
+            self._count_scenario(scenario, report)
+        testcases = [scenario for scenario in scenarios
+                     if self._should_show_scenario(scenario)]
 
-        # -- BUILD-TESTCASES: From run_items (and scenarios)
-        self._process_run_items_for(feature, report)
-
-        # -- ADD TESTCASES to testsuite:
-        for testcase in report.testcases:
-            suite.append(testcase)
-
-        suite.set('tests', _text(report.counts_tests))
-        suite.set('errors', _text(report.counts_errors))
-        suite.set('failures', _text(report.counts_failed))
-        suite.set('skipped', _text(report.counts_skipped))  # WAS: skips
-        suite.set('time', _text(round(feature.duration, 6)))
+        feature_name = feature.name or feature_filename
+        suite_attrib = {
+            "name": "%s.%s" % (classname, feature_name),
+            "tests": _text(report.counts_tests),
+            "errors": _text(report.counts_errors),
+            "failures": _text(report.counts_failed),
+            "skipped": _text(report.counts_skipped),  # WAS: skips
+            "time": _text(round(feature.duration, 6)),
+        }
         # -- SINCE: behave-1.2.6.dev0
         if self.show_timestamp:
-            suite.set('timestamp', _text(now.isoformat()))
+            suite_attrib["timestamp"] = _text(now.isoformat())
         if self.show_hostname:
-            suite.set('hostname', _text(gethostname()))
+            suite_attrib["hostname"] = _text(gethostname())
 
-        if not os.path.exists(self.config.junit_directory):
-            # -- ENSURE: Create multiple directory levels at once.
-            os.makedirs(self.config.junit_directory)
-
-        tree = ElementTreeWithCDATA(suite)
-        report_dirname = self.config.junit_directory
-        report_basename = 'TESTS-%s.xml' % feature_filename
-        report_filename = os.path.join(report_dirname, report_basename)
+        # -- STEP: Write testsuite (one testcase after the other).
+        report_basename = "TESTS-%s.xml" % feature_filename
+        report_filename = self.make_report_filename(report_basename)
         with open(report_filename, "wb") as f:
-            tree.write(f, "UTF-8")
+            writer = JUnitXMLWriter(f)
+            if self.aggregate:
+                writer.streams.append(self.open_aggregated_report())
+            if not testcases:
+                writer.write_empty_element("testsuite", suite_attrib)
+                return
+
+            writer.start_element("testsuite", suite_attrib)
+            for scenario in testcases:
+                self._write_testcase(writer, scenario, report)
+            writer.end_element("testsuite")
+
+    def end(self):
+        if self.aggregate:
+            self.open_aggregated_report().write(b"</testsuites>")
+            self._aggregated_report.close()
+            self._aggregated_report = None
 
     # -- MORE:
     # pylint: disable=line-too-long
@@ -387,9 +447,35 @@ class JUnitReporter(Reporter):
         step_indentation = make_indentation(4)
         return header_line + indent(text, step_indentation) + footer_line
 
-    def _process_scenario(self, scenario, report):
-        """Process a scenario and append information to JUnit report object.
-        This corresponds to a JUnit testcase:
+    def _should_show_scenario(self, scenario):
+        return scenario.status != Status.skipped or self.show_skipped
+
+    def _count_scenario(self, scenario, report):
+        """Count a scenario (as JUnit testcase) in the JUnit report object.
+
+        :param scenario:  Scenario to count.
+        :param report:    Context object to store/add info to (outgoing param).
+        """
+        assert isinstance(scenario, Scenario)
+        assert not isinstance(scenario, ScenarioOutline)
+        if self._should_show_scenario(scenario):
+            # -- NOTE: Count only if not-skipped or skipped should be shown.
+            report.counts_tests += 1
+
+        if scenario.status.is_error():
+            report.counts_errors += 1
+        elif scenario.status.is_failure():
+            report.counts_failed += 1
+        elif scenario.status in self.skipped_statuses and self.show_skipped:
+            report.counts_skipped += 1
+            step = self.select_step_with_any_status(self.problematic_statuses,
+                                                    scenario.all_steps)
+            if step:
+                # -- UNDEFINED-STEP:
+                report.counts_failed += 1
+
+    def _write_testcase(self, writer, scenario, report):
+        """Write a scenario as JUnit testcase:
 
           * testcase.@classname = f(filename) +'.'+ feature.name
           * testcase.@name   = scenario.name
@@ -403,95 +489,82 @@ class JUnitReporter(Reporter):
         If a failure/error occurs, the step, that caused the failure,
         and its location are provided now.
 
-        :param scenario:  Scenario to process.
-        :param report:    Context object to store/add info to (outgoing param).
+        :param writer:    XML writer to use (as :class:`JUnitXMLWriter`).
+        :param scenario:  Scenario to write.
+        :param report:    Context object with the JUnit report info.
         """
-        # pylint: disable=too-many-locals, too-many-branches, too-many-statements
-        assert isinstance(scenario, Scenario)
-        assert not isinstance(scenario, ScenarioOutline)
-        if scenario.status != Status.skipped or self.show_skipped:
-            # -- NOTE: Count only if not-skipped or skipped should be shown.
-            report.counts_tests += 1
         classname = report.classname
         feature = report.feature
         feature_name = feature.name
         if not feature_name:
             feature_name = self.make_feature_filename(feature)
 
-        case = ElementTree.Element("testcase")
-        case.set("classname", "%s.%s" % (classname, feature_name))
-        case.set("name", scenario.name or "")
-        case.set("status", scenario.status.name)
-        case.set("time", _text(round(scenario.duration, 6)))
+        writer.start_element("testcase", {
+            "classname": "%s.%s" % (classname, feature_name),
+            "name": scenario.name or "",
+            "status": scenario.status.name,
+            "time": _text(round(scenario.duration, 6)),
+        })
 
-        step = None
         failed_statuses = (Status.failed, )
         error_statuses = (Status.error, Status.hook_error, Status.pending, Status.undefined)
-        skipped_statuses = (Status.skipped, Status.untested)
-
         if scenario.status.is_error():
             # -- NOTE: Scenario may fail now due to hook-errors.
             # UNEXPECTED RUNTIME-ERROR:
-            report.counts_errors += 1
             step = self.select_step_with_any_status(error_statuses, scenario.all_steps)
-            error = self._make_error_element_for(scenario, step)
-            case.append(error)
+            self._write_problem_description_for(writer, "error", scenario, step)
         elif scenario.status.is_failure():
             # -- NOTE: Scenario may fail due to ...
-            report.counts_failed += 1
             step = self.select_step_with_any_status(failed_statuses, scenario.all_steps)
-            failure = self._make_failure_element_for(scenario, step)
-            case.append(failure)
-        elif scenario.status in skipped_statuses and self.show_skipped:
-            report.counts_skipped += 1
-            problematic_statuses = [Status.pending, Status.undefined]
-            step = self.select_step_with_any_status(problematic_statuses, scenario.all_steps)
+            self._write_problem_description_for(writer, "failure", scenario, step)
+        elif scenario.status in self.skipped_statuses and self.show_skipped:
+            step = self.select_step_with_any_status(self.problematic_statuses,
+                                                    scenario.all_steps)
             if step:
                 # -- UNDEFINED-STEP:
-                report.counts_failed += 1
                 message = "Undefined Step: %s" % step.name.strip()
-                failure = ElementTree.Element("failure")
-                failure.set("type", "undefined")
-                failure.set("message", message)
-                case.append(failure)
+                writer.write_empty_element("failure", {
+                    "type": "undefined",
+                    "message": message,
+                })
 
             # -- ALWAYS ADD TO THE REPORT:
-            skip = ElementTree.Element('skipped')
-            case.append(skip)
+            writer.write_empty_element("skipped")
 
         # Create stdout section for each test case
-        stdout = ElementTree.Element("system-out")
         text = ""
         if self.show_scenarios:
             text = self.describe_scenario(scenario)
 
         # Append the captured standard output
-        if scenario.captured.stdout:
-            output = _text(scenario.captured.stdout)
-            text += "\nCaptured stdout:\n%s\n" % output
-        stdout.append(CDATA(text))
-        case.append(stdout)
+        captured = scenario.captured
+        output = captured.stdout
+        if output:
+            text += "\nCaptured stdout:\n%s\n" % _text(output)
+        writer.start_element("system-out")
+        writer.write_cdata(text)
+        writer.end_element("system-out")
 
         # Create stderr section for each test case
-        if scenario.captured.stderr:
-            stderr = ElementTree.Element("system-err")
-            output = _text(scenario.captured.stderr)
-            text = "\nCaptured stderr:\n%s\n" % output
-            stderr.append(CDATA(text))
-            case.append(stderr)
-
-        if scenario.status != Status.skipped or self.show_skipped:
-            report.testcases.append(case)
-
-    def _make_problem_description_for(self, element_name, scenario, step):
-        xml_element = ElementTree.Element(element_name)
+        output = captured.stderr
+        if output:
+            text = "\nCaptured stderr:\n%s\n" % _text(output)
+            writer.start_element("system-err")
+            writer.write_cdata(text)
+            writer.end_element("system-err")
+        writer.end_element("testcase")
+
+    def _write_problem_description_for(self, writer, element_name,
+                                       scenario, step):
         if step:
             step_text = self.describe_step(step).rstrip()
             text = "\nFailing step: %s\nLocation: %s\n" % \
                    (step_text, step.location)
             message = _text(step.exception).strip()
-            xml_element.set('type', step.exception.__class__.__name__)
-            xml_element.set('message', message)
+            attrib = {
+                "type": step.exception.__class__.__name__,
+                "message": message,
+            }
             text += _text(step.error_message)
         else:
             # -- MAYBE: Hook failure before any step is executed.
@@ -501,38 +574,29 @@ class JUnitReporter(Reporter):
             scenario_error_message = scenario.error_message
             if scenario_error_message:
                 scenario_error_message = scenario_error_message.strip()
-            xml_element.set('type', failure_type)
-            xml_element.set('message', scenario_error_message or "")
+            attrib = {
+                "type": failure_type,
+                "message": scenario_error_message or "",
+            }
             traceback_lines = traceback.format_tb(scenario.exc_traceback)
             traceback_lines.insert(0, "Traceback:\n")
             text = _text("".join(traceback_lines))
-        xml_element.append(CDATA(text))
-        return xml_element
-
-    def _make_failure_element_for(self, scenario, step):
-        return self._make_problem_description_for("failure", scenario, step)
+        writer.start_element(element_name, attrib)
+        writer.write_cdata(text)
+        writer.end_element(element_name)
 
-    def _make_error_element_for(self, scenario, step):
-        return self._make_problem_description_for("error", scenario, step)
-
-    def _process_run_items_for(self, parent, report):
+    def _iter_scenarios_for(self, parent):
         for run_item in parent.run_items:
             if isinstance(run_item, Rule):
-                self._process_rule(run_item, report)
+                for scenario in self._iter_scenarios_for(run_item):
+                    yield scenario
             elif isinstance(run_item, ScenarioOutline):
-                self._process_scenario_outline(run_item, report)
+                for scenario in run_item:
+                    assert isinstance(scenario, Scenario)
+                    yield scenario
             else:
                 assert isinstance(run_item, Scenario)
-                self._process_scenario(run_item, report)
-
-    def _process_rule(self, rule, report):
-        self._process_run_items_for(rule, report)
-
-    def _process_scenario_outline(self, scenario_outline, report):
-        assert isinstance(scenario_outline, ScenarioOutline)
-        for scenario in scenario_outline:
-            assert isinstance(scenario, Scenario)
-            self._process_scenario(scenario, report)
+                yield run_item
 
 # -----------------------------------------------------------------------------
 # SUPPORT:
@@ -0,0 +1,256 @@
+"""
+This module provides a reporter with duration statistics
+for each step definition and for each hook (``--step-durations``).
+
+The durations are recorded during the test run:
+
+* step definition: Duration of each executed step that is matched by it
+  (identified by: step definition location and step pattern)
+* hook: Duration of each hook call (identified by: hook name and location)
+
+For each step definition and hook, the number of calls,
+the total duration, the median (p50), the 95th percentile (p95) and
+the maximum duration is reported (as text table, slowest total first).
+The statistics can be stored as JSON file with ``--step-durations-output=FILE``.
+
+EXAMPLE:
+
+.. code-block:: sh
+
+    $ behave --step-durations --step-durations-output=step_durations.json
+
+.. code-block:: none
+
+    STEP DURATIONS (slowest total first):
+         COUNT     TOTAL       P50       P95       MAX  STEP DEFINITION
+           120   12.031s    0.100s    0.105s    0.152s  features/steps/db.py:12  @given('the database has {count:d} users')
+            60    0.412s    0.006s    0.011s    0.015s  features/environment.py:8  hook:before_scenario
+
+.. versionadded:: 1.4.0
+"""
+
+from collections import OrderedDict
+import json
+import math
+import sys
+
+from behave.formatter.base import StreamOpener
+from behave.model_type import FileLocation, Status
+from behave.reporter.base import Reporter
+from behave.step_registry import registry as the_step_registry
+
+
+# -----------------------------------------------------------------------------
+# UTILITY FUNCTIONS:
+# -----------------------------------------------------------------------------
+def percentile(sorted_values, percent):
+    """Provides the percentile of sorted values (by using the nearest rank).
+
+    :param sorted_values:  Sorted list of values (not empty).
+    :param percent:        Percentile to use (as number: 0..100).
+    :return: Value at this percentile.
+    """
+    rank = int(math.ceil(percent * len(sorted_values) / 100.0))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def is_executed_step(step):
+    status = step.status
+    return not (status.is_untested() or status.is_undefined() or
+                status in (Status.unknown, Status.executing, Status.skipped))
+
+
+# -----------------------------------------------------------------------------
+# CLASSES:
+# -----------------------------------------------------------------------------
+class DurationStats:
+    """
+    Durations of a step definition or hook.
+
+    :param kind:      Kind of the measured item (as string: step, hook).
+    :param location:  Location of the step definition or hook function.
+    :param name:      Step type and pattern of a step definition
+                      (or name of a hook).
+    """
+
+    def __init__(self, kind, location, name):
+        self.kind = kind
+        self.location = location
+        self.name = name
+        self.durations = []
+        self._sorted = True
+
+    def add(self, duration):
+        if self.durations and duration < self.durations[-1]:
+            self._sorted = False
+        self.durations.append(duration)
+
+    @property
+    def sorted_durations(self):
+        if not self._sorted:
+            self.durations.sort()
+            self._sorted = True
+        return self.durations
+
+    @property
+    def count(self):
+        return len(self.durations)
+
+    @property
+    def total(self):
+        return sum(self.durations)
+
+    @property
+    def p50(self):
+        return percentile(self.sorted_durations, 50)
+
+    @property
+    def p95(self):
+        return percentile(self.sorted_durations, 95)
+
+    @property
+    def max(self):
+        return self.sorted_durations[-1]
+
+    def describe(self):
+        return u"%s  %s" % (self.location, self.name)
+
+    def as_dict(self):
+        return OrderedDict([
+            ("kind", self.kind),
+            ("location", str(self.location)),
+            ("name", self.name),
+            ("count", self.count),
+            ("total", self.total),
+            ("p50", self.p50),
+            ("p95", self.p95),
+            ("max", self.max),
+        ])
+
+
+class StepDurationsReporter(Reporter):
+    """
+    Reporter that records the durations of each step definition and
+    of each hook during the test run.
+
+    Step durations are recorded after a feature is run.
+    Hook durations are recorded by the runner
+    (see: :meth:`record_hook_duration()`). Only the hooks of the environment
+    file are recorded. Workers of the ``parallel`` and ``distributed`` runners
+    send their hook durations back (see: :meth:`add_hook_durations_data()`).
+    """
+    output_stream_name = "stdout"
+
+    def __init__(self, config):
+        super(StepDurationsReporter, self).__init__(config)
+        stream = getattr(sys, self.output_stream_name, sys.stdout)
+        self.stream = StreamOpener.ensure_stream_with_encoder(stream)
+        self.output = getattr(config, "step_durations_output", None)
+        self.step_registry = the_step_registry
+        self.stats = {}
+        self._step_definitions = {}
+        self._hook_locations = {}
+
+    def get_stats(self, kind, location, name):
+        key = (kind, str(location), name)
+        stats = self.stats.get(key, None)
+        if stats is None:
+            stats = self.stats[key] = DurationStats(kind, location, name)
+        return stats
+
+    def find_step_definition(self, step):
+        # -- HINT: Step definition of a step text is looked up only once.
+        key = (step.step_type, step.name)
+        if key not in self._step_definitions:
+            self._step_definitions[key] = \
+                self.step_registry.find_step_definition(step)
+        return self._step_definitions[key]
+
+    def record_step_duration(self, step):
+        step_definition = self.find_step_definition(step)
+        if step_definition is None:
+            return
+        stats = self.get_stats("step", step_definition.location,
+                               step_definition.describe())
+        stats.add(step.duration)
+
+    def record_hook_duration(self, hook_name, hook, duration):
+        """Record the duration of a hook call (called by the runner).
+
+        :param hook_name:   Name of the hook (like: before_scenario).
+        :param hook:        Hook function.
+        :param duration:    Duration of the hook call (in seconds).
+        """
+        location = self._hook_locations.get(hook, None)
+        if location is None:
+            try:
+                location = FileLocation.for_function(hook)
+            except (AttributeError, TypeError):
+                location = FileLocation("<unknown>")
+            self._hook_locations[hook] = location
+        stats = self.get_stats("hook", location, u"hook:%s" % hook_name)
+        stats.add(duration)
+
+    def make_hook_durations_data(self):
+        """Provides the recorded hook durations (as serializable data).
+        Used by a worker to send them back to its parent process.
+
+        :return: List of (name, location, durations) items.
+        """
+        return [[stats.name, str(stats.location), list(stats.durations)]
+                for stats in self.stats.values() if stats.kind == "hook"]
+
+    def add_hook_durations_data(self, data):
+        """Add the hook durations from a worker.
+
+        :param data: Hook durations data (see: :meth:`make_hook_durations_data()`).
+        """
+        for name, location, durations in data:
+            stats = self.get_stats("hook", location, name)
+            for duration in durations:
+                stats.add(duration)
+
+    # -- REPORTER API:
+    def feature(self, feature):
+        for scenario in feature.walk_scenarios():
+            for step in scenario.all_steps:
+                if is_executed_step(step):
+                    self.record_step_duration(step)
+
+    def end(self):
+        self.print_table(self.stream)
+        if self.output:
+            self.store_json(self.output)
+
+    # -- REPORTING:
+    def select_stats(self):
+        """Provides the duration statistics (slowest total duration first)."""
+        return sorted(self.stats.values(), key=lambda x: x.total, reverse=True)
+
+    def print_table(self, stream):
+        schema = u"  {0:>8}  {1:>8}  {2:>8}  {3:>8}  {4:>8}  {5}\n"
+        duration_schema = u"{0:.3f}s"
+        stream.write(u"\nSTEP DURATIONS (slowest total first):\n")
+        stream.write(schema.format("COUNT", "TOTAL", "P50", "P95", "MAX",
+                                   "STEP DEFINITION"))
+        for stats in self.select_stats():
+            stream.write(schema.format(
+                stats.count, duration_schema.format(stats.total),
+                duration_schema.format(stats.p50),
+                duration_schema.format(stats.p95),
+                duration_schema.format(stats.max), stats.describe()))
+        stream.flush()
+
+    def make_data(self):
+        return OrderedDict([
+            ("step_definitions", [stats.as_dict()
+                                  for stats in self.select_stats()
+                                  if stats.kind == "step"]),
+            ("hooks", [stats.as_dict() for stats in self.select_stats()
+                       if stats.kind == "hook"]),
+        ])
+
+    def store_json(self, filename):
+        with open(filename, "w") as f:
+            json.dump(self.make_data(), f, indent=2)
+            f.write("\n")
@@ -6,7 +6,6 @@ Provides a summary after each test run.
 import sys
 from time import time as time_now
 
-from behave.model import Rule, ScenarioOutline
 from behave.model_type import Status
 from behave.reporter.base import Reporter
 from behave.formatter.base import StreamOpener
@@ -411,6 +410,9 @@ class SummaryReporterV1(AbstractSummaryReporter):
 
     # -- INTERNAL PROCESSING:
     def process_run_items_for(self, parent):
+        # -- LAZY IMPORT: Model is not needed to set up this reporter.
+        # pylint: disable=import-outside-toplevel
+        from behave.model import Rule, ScenarioOutline
         for run_item in parent:
             if isinstance(run_item, Rule):
                 self.process_rule(run_item)
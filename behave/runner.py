@@ -2,9 +2,13 @@
 This module provides Runner class to run behave feature files (or model elements).
 """
 
+import asyncio
 import contextlib
+import copy
+import inspect
 import os.path
 import sys
+import time
 import traceback
 import warnings
 import weakref
@@ -18,6 +22,9 @@ from behave._types import (
     require_not_none,
 )
 from behave.api.runner import ITestRunner
+from behave.async_step import (
+    close_event_loop, run_coroutine, runner_event_loop
+)
 from behave.exception_util import ExceptionUtil
 from behave.capture import (
     CaptureController,
@@ -27,12 +34,17 @@ from behave.capture import (
 )
 from behave.exception import ConfigError
 from behave.formatter._registry import make_formatters
+from behave.parse_cache import FeatureParseCache
 from behave.pathutil import select_subdirectories
+from behave.profiler import NO_PROFILER, make_profiler
 from behave.runner_util import (
-    collect_feature_locations, parse_features,
-    exec_file, load_step_modules, PathManager
+    collect_feature_locations, collect_feature_tags, parse_features,
+    exec_file, load_step_modules, print_step_module_load_times, PathManager
 )
+from behave.scenario_index import ScenarioIndex
+from behave.step_manifest import LazyStepModuleLoader, StepManifest
 from behave.step_registry import registry as the_step_registry
+from behave.tag_expression.model import CompiledExpression
 from enum import Enum
 
 
@@ -152,6 +164,8 @@ class Context:
     # pylint: disable=too-many-instance-attributes
     LAYER_NAMES = ["testrun", "feature", "rule", "scenario"]
     FAIL_ON_CLEANUP_ERRORS = True
+    ORIGIN_TRACKING_MODES = ("eager", "lazy", "off")
+    ORIGIN_TRACKING = "lazy"
 
     def __init__(self, runner):
         self._runner = weakref.proxy(runner)
@@ -166,9 +180,13 @@ class Context:
             "@layer": "testrun",
         }
         self._stack = [root_data]
+        # -- LOOKUP VIEW: Merged stack frames (the upper frame wins).
+        # Updated on _push(), _pop(), __setattr__(), __delattr__().
+        self._lookup = dict(root_data)
         self._record = {}
         self._origin = {}
         self._mode = ContextMode.BEHAVE
+        self._origin_tracking = self.select_origin_tracking(self._config)
 
         # -- MODEL ENTITY REFERENCES/SUPPORT:
         # DISABLED: self.rule = None
@@ -180,6 +198,30 @@ class Context:
         # -- RUNTIME SUPPORT:
         self.fail_on_cleanup_errors = self.FAIL_ON_CLEANUP_ERRORS
 
+    @classmethod
+    def select_origin_tracking(cls, config):
+        """Select how the origin of a context attribute is tracked.
+        The origin (filename, line, function) of an attribute assignment
+        is only used in :class:`ContextMaskWarning` messages.
+
+        * ``eager``: Extract the caller stack frame on each assignment.
+        * ``lazy``:  Store the caller code object and line (default).
+          The filename and function are resolved when a warning is shown.
+        * ``off``:   Origin is not tracked (warnings show unknown origin).
+
+        :param config:  Configuration object (with "context_origin" param).
+        :return: Origin tracking mode to use (as string).
+
+        .. versionadded:: 1.4.0
+        """
+        tracking = getattr(config, "context_origin", None)
+        if tracking == "lazy" and not hasattr(sys, "_getframe"):
+            # -- CASE: Python implementation without sys._getframe()
+            tracking = "eager"
+        if tracking not in cls.ORIGIN_TRACKING_MODES:
+            tracking = cls.ORIGIN_TRACKING
+        return tracking
+
     def abort(self, reason=None):
         """Abort the test run.
 
@@ -280,10 +322,12 @@ class Context:
             except Exception as e: # pylint: disable=broad-except
                 # pylint: disable=protected-access
                 context._root["cleanup_errors"] += 1
+                context._update_lookup("cleanup_errors")
                 cleanup_errors.append(sys.exc_info())
                 on_cleanup_error(context, cleanup_func, e)
 
         current_layer["@cleanups"] = []
+        self._update_lookup("@cleanups")
         if self.fail_on_cleanup_errors and cleanup_errors:
             first_cleanup_erro_info = cleanup_errors[0]
             del cleanup_errors  # -- ENSURE: Release other exception frames.
@@ -322,6 +366,7 @@ class Context:
         if layer:
             initial_data["@layer"] = layer
         self._stack.insert(0, initial_data)
+        self._lookup.update(initial_data)
 
     def _pop(self, capture_sink=None):
         """
@@ -346,7 +391,42 @@ class Context:
                 self._do_cleanups()
         finally:
             # -- ENSURE: Layer is removed even if cleanup-errors occur.
-            self._stack.pop(0)
+            frame = self._stack.pop(0)
+            for attr in frame:
+                self._update_lookup(attr)
+
+    def _fork(self, runner):
+        """Provides a new context for a concurrently running part of
+        the test run (like: a scenario that runs as asyncio task).
+
+        The new context uses its own copy of the root layer and
+        shares the other context layers (feature, rule) with this context.
+        Layers that are pushed afterwards are only used by one of them.
+
+        :param runner:  Runner that uses the new context.
+        :return: New context object.
+
+        .. versionadded:: 1.4.0
+        """
+        # pylint: disable=protected-access
+        context = copy.copy(self)
+        context._runner = weakref.proxy(runner)
+        context._root = dict(self._root)
+        context._stack = self._stack[:-1] + [context._root]
+        context._lookup = dict(self._lookup)
+        context._record = dict(self._record)
+        context._origin = dict(self._origin)
+        return context
+
+    def _update_lookup(self, attr):
+        """Update the lookup view for an attribute
+        (after the stack frames were changed).
+        """
+        for frame in self._stack:
+            if attr in frame:
+                self._lookup[attr] = frame[attr]
+                return
+        self._lookup.pop(attr, None)
 
 
 
@@ -368,19 +448,34 @@ class Context:
             if frame is self.__dict__["_root"]:
                 continue
             if attr in frame:
-                record = self.__dict__["_record"][attr]
-                params = {
-                    "attr": attr,
-                    "filename": record[0],
-                    "line": record[1],
-                    "function": record[3],
-                }
-                self._emit_warning(attr, params)
+                self._emit_warning(attr, self._make_origin_params(attr))
 
         self.__dict__["_root"][attr] = value
+        self._update_lookup(attr)
         if attr not in self._origin:
             self._origin[attr] = self._mode
 
+    def _make_origin_params(self, attr):
+        filename = function = "<unknown>"
+        line = "?"
+        record = self.__dict__["_record"].get(attr, None)
+        if record is None:
+            # -- CASE: Origin tracking is off.
+            pass
+        elif len(record) == 2:
+            # -- CASE: Lazy origin tracking -- (code, line)
+            code, line = record
+            filename = code.co_filename
+            function = code.co_name
+        else:
+            filename, line, function = record
+        return {
+            "attr": attr,
+            "filename": filename,
+            "line": line,
+            "function": function,
+        }
+
     def _emit_warning(self, attr, params):
         msg = ""
         if self._mode is ContextMode.BEHAVE and self._origin[attr] is not ContextMode.BEHAVE:
@@ -414,9 +509,10 @@ class Context:
             except KeyError:
                 raise AttributeError(attr)
 
-        for frame in self._stack:
-            if attr in frame:
-                return frame[attr]
+        try:
+            return self._lookup[attr]
+        except KeyError:
+            pass
         msg = "'{0}' object has no attribute '{1}'"
         msg = msg.format(self.__class__.__name__, attr)
         raise AttributeError(msg)
@@ -426,22 +522,25 @@ class Context:
             self.__dict__[attr] = value
             return
 
-        for frame in self._stack[1:]:
-            if attr in frame:
-                record = self._record[attr]
-                params = {
-                    "attr": attr,
-                    "filename": record[0],
-                    "line": record[1],
-                    "function": record[3],
-                }
-                self._emit_warning(attr, params)
-
-        stack_limit = 2
-        stack_frame = traceback.extract_stack(limit=stack_limit)[0]
-        self._record[attr] = stack_frame
+        if attr in self._lookup:
+            # -- CASE: Attribute exists -- Check if it is masked.
+            for frame in self._stack[1:]:
+                if attr in frame:
+                    self._emit_warning(attr, self._make_origin_params(attr))
+
+        # -- ORIGIN TRACKING: Used only for ContextMaskWarning messages.
+        # HINT: Extracting the stack is expensive (for each assignment).
+        origin_tracking = self._origin_tracking
+        if origin_tracking == "lazy":
+            caller = sys._getframe(1)   # pylint: disable=protected-access
+            self._record[attr] = (caller.f_code, caller.f_lineno)
+        elif origin_tracking == "eager":
+            stack_frame = traceback.extract_stack(limit=2)[0]
+            self._record[attr] = (stack_frame.filename, stack_frame.lineno,
+                                  stack_frame.name)
         frame = self._stack[0]
         frame[attr] = value
+        self._lookup[attr] = value
         if attr not in self._origin:
             self._origin[attr] = self._mode
 
@@ -449,7 +548,8 @@ class Context:
         frame = self._stack[0]
         if attr in frame:
             del frame[attr]
-            del self._record[attr]
+            self._record.pop(attr, None)
+            self._update_lookup(attr)
         else:
             msg = "'{0}' object has no attribute '{1}' at the current level"
             msg = msg.format(self.__class__.__name__, attr)
@@ -458,10 +558,7 @@ class Context:
     def __contains__(self, attr):
         if attr[0] == "_":
             return attr in self.__dict__
-        for frame in self._stack:
-            if attr in frame:
-                return True
-        return False
+        return attr in self._lookup
 
     def execute_steps(self, steps_text):
         """The steps identified in the "steps" text string will be parsed and
@@ -680,6 +777,10 @@ class ModelRunner:
         self.context = None
         self.feature = None
         self.hook_failures = 0
+        self.hook_observers = []
+        self.profiler = NO_PROFILER
+        self.event_loop = None
+        self._event_loop_token = None
 
     @property
     def undefined_steps(self):
@@ -719,11 +820,44 @@ class ModelRunner:
         # -- SINCE: behave v1.2.7
         return not self.config.dry_run and (hook_name in self.hooks)
 
+    def setup_hook_observers(self):
+        """Select the reporters that record the duration of each hook call
+        (like: step durations reporter).
+
+        .. versionadded:: 1.4.0
+        """
+        self.hook_observers = [reporter.record_hook_duration
+                               for reporter in self.config.reporters
+                               if hasattr(reporter, "record_hook_duration")]
+
+    @staticmethod
+    def is_default_hook(hook):
+        """Checks if a hook is a default hook of the runner
+        (and not a hook from the environment file).
+
+        .. versionadded:: 1.4.0
+        """
+        return inspect.ismethod(hook) and isinstance(hook.__self__, ModelRunner)
+
     # OLD: def run_hook(self, hook_name, context, *args):
     def run_hook(self, hook_name, *args):
         if not self.should_run_hook(hook_name):
             # -- SHORTCUT: No need to run-hook -- HOOK_PASSED (gracefully)
             return True
+        hook = self.hooks[hook_name]
+        if not self.hook_observers or self.is_default_hook(hook):
+            return self._run_hook(hook_name, *args)
+
+        # -- CASE: Record hook duration (of a hook from the environment file).
+        start_time = time.perf_counter()
+        try:
+            return self._run_hook(hook_name, *args)
+        finally:
+            duration = time.perf_counter() - start_time
+            for record_hook_duration in self.hook_observers:
+                record_hook_duration(hook_name, hook, duration)
+
+    def _run_hook(self, hook_name, *args):
         if ("all" in hook_name and len(args) > 0) or len(args) > 1:
             # -- DEPRECATED: context parameter was provided.
             # SINCE: behave v1.2.7
@@ -757,7 +891,10 @@ class ModelRunner:
         raise_exception_enabled = False
         try:
             with ctx.use_with_user_mode():
-                self.hooks[hook_name](ctx, *args)
+                result = self.hooks[hook_name](ctx, *args)
+                if inspect.iscoroutine(result):
+                    # -- CASE: async-hook, like: async def before_all(ctx)
+                    run_coroutine(result)
                 return True  # -- HOOK_PASSED
         except (KeyboardInterrupt, SystemExit) as e:
             e_type = type(e).__name__
@@ -902,25 +1039,105 @@ class ModelRunner:
         #     self._captured.add_captured(captured)
         # return self._captured
 
+    def setup_step_match_cache(self):
+        """Enables the step-match cache of the step registry (if configured).
+
+        .. versionadded:: 1.4.0
+        """
+        cache_size = getattr(self.config, "step_match_cache", 0)
+        if isinstance(cache_size, int) and cache_size > 0:
+            self.step_registry.setup_match_cache(cache_size)
+
+    def setup_event_loop(self):
+        """Creates the event loop of the test run.
+        Async-steps, async-hooks and async-fixtures use this event loop
+        until the test run is finished.
+
+        .. versionadded:: 1.4.0
+        """
+        self.event_loop = asyncio.new_event_loop()
+        self._event_loop_token = runner_event_loop.set(self.event_loop)
+
+    def teardown_event_loop(self):
+        """Closes the event loop of the test run.
+
+        .. versionadded:: 1.4.0
+        """
+        if self.event_loop is None:
+            return
+
+        runner_event_loop.reset(self._event_loop_token)
+        close_event_loop(self.event_loop)
+        self.event_loop = None
+        self._event_loop_token = None
+
     def run_model(self, features=None):
         # pylint: disable=too-many-branches
         if not self.context:
             self.context = Context(self)
         if self.step_registry is None:
             self.step_registry = the_step_registry
+        self.setup_step_match_cache()
+        self.setup_hook_observers()
         if features is None:
             features = self.features
 
         # -- ENSURE: context.execute_steps() works in weird cases (hooks, ...)
         self.hook_failures = 0
-        # -- DISABLED:
-        # self.setup_capture()
-        # self.run_hook_with_capture("before_all")
-        self.run_hook("before_all")
+        self.setup_event_loop()
+        try:
+            # -- DISABLED:
+            # self.setup_capture()
+            # self.run_hook_with_capture("before_all")
+            self.run_hook("before_all")
+
+            undefined_steps_initial_size = len(self.undefined_steps)
+            failed_count = self.run_features(features)
+
+            # -- AFTER-ALL:
+            # pylint: disable=protected-access, broad-except
+            cleanups_failed = False
+            self.run_hook_with_capture("after_all")
+            try:
+                # -- PERFORM CLEANUPS: Without dropping the last context layer.
+                self.context._do_remaining_cleanups()
+            except Exception:
+                cleanups_failed = True
+        finally:
+            self.teardown_event_loop()
+
+        # -- DUPLICATES CAPTURE-OUTPUT:
+        #   Using capture_controller instead captured/capture_sink
+        # if self.captured.has_output():
+        #    captured_output = self.captured.make_report()
+        #    print(captured_output)
+
+        if self.aborted:
+            print("\nABORTED: By user.")
+        for formatter in self.formatters:
+            formatter.close()
+        for reporter in self.config.reporters:
+            reporter.end()
+
+        # -- MAYBE: BAD STEP-DEFINITIONS: Unused BAD STEPS should not cause FAILURE.
+        # bad_step_definitions = self.step_registry.error_handler.bad_step_definitions
+        failed = ((failed_count > 0) or self.aborted or (self.hook_failures > 0)
+                  or (len(self.undefined_steps) > undefined_steps_initial_size)
+                  or cleanups_failed)
+                  # -- MAYBE: or context.failed)
+        return failed
 
+    def run_features(self, features):
+        """Runs the features (after the ``before_all()`` hook) and
+        reports each feature to the reporters.
+
+        :param features:  Features to run.
+        :return: Number of failed features.
+
+        .. versionadded:: 1.4.0
+        """
         run_feature = not self.aborted
         failed_count = 0
-        undefined_steps_initial_size = len(self.undefined_steps)
         for feature in features:
             if run_feature:
                 try:
@@ -943,37 +1160,7 @@ class ModelRunner:
             # REQUIRED-FOR: Summary to keep track of untested features.
             for reporter in self.config.reporters:
                 reporter.feature(feature)
-
-        # -- AFTER-ALL:
-        # pylint: disable=protected-access, broad-except
-        cleanups_failed = False
-        self.run_hook_with_capture("after_all")
-        try:
-            # -- PERFORM CLEANUPS: Without dropping the last context layer.
-            self.context._do_remaining_cleanups()
-        except Exception:
-            cleanups_failed = True
-
-        # -- DUPLICATES CAPTURE-OUTPUT:
-        #   Using capture_controller instead captured/capture_sink
-        # if self.captured.has_output():
-        #    captured_output = self.captured.make_report()
-        #    print(captured_output)
-
-        if self.aborted:
-            print("\nABORTED: By user.")
-        for formatter in self.formatters:
-            formatter.close()
-        for reporter in self.config.reporters:
-            reporter.end()
-
-        # -- MAYBE: BAD STEP-DEFINITIONS: Unused BAD STEPS should not cause FAILURE.
-        # bad_step_definitions = self.step_registry.error_handler.bad_step_definitions
-        failed = ((failed_count > 0) or self.aborted or (self.hook_failures > 0)
-                  or (len(self.undefined_steps) > undefined_steps_initial_size)
-                  or cleanups_failed)
-                  # -- MAYBE: or context.failed)
-        return failed
+        return failed_count
 
     def run(self):
         """
@@ -1107,6 +1294,16 @@ class Runner(ModelRunner):
         NOTE: Default matcher can be overridden in "environment.py" hook.
         Collect directories containing step files
         """
+        step_paths = self.make_step_paths(extra_step_paths)
+        load_times = None
+        if self.config.steps_load_report is True:
+            load_times = []
+        load_step_modules(step_paths, load_times)
+        if load_times is not None:
+            print_step_module_load_times(load_times)
+
+    def make_step_paths(self, extra_step_paths=None):
+        """Collect directories containing step files."""
         if extra_step_paths is None:
             extra_step_paths = []
 
@@ -1116,37 +1313,154 @@ class Runner(ModelRunner):
             print("USE_NESTED_STEP_MODULES: yes")
             step_subdirectories = select_subdirectories(steps_dir)
             step_paths.extend(step_subdirectories)
+        return list(step_paths) + list(extra_step_paths)
+
+    def load_step_definitions_for(self, features):
+        """Load only the step modules that are needed by the selected
+        scenarios of these features (by using the step manifest).
+        The remaining step modules are loaded on demand
+        (if an undefined step is detected).
+
+        :param features:  Features to run (parsed feature files).
+
+        .. versionadded:: 1.4.0
+        """
+        steps = []
+        for feature in features:
+            for scenario in feature.walk_scenarios():
+                if not scenario.should_run(self.config):
+                    continue
+                steps.extend(scenario.steps)
+                # -- HINT: Avoid lazy-init of background steps (via all_steps).
+                # Fixtures may disable the background (inheritance) later.
+                background = scenario.background
+                while background is not None:
+                    steps.extend(background.steps)
+                    background = background.inherited_background
+
+        load_times = None
+        if self.config.steps_load_report is True:
+            load_times = []
+        step_loader = LazyStepModuleLoader(self.make_step_paths(),
+                                           StepManifest(self.config.cache_dir),
+                                           the_step_registry, load_times)
+        step_loader.load_for_steps(steps)
+        if step_loader.remaining:
+            the_step_registry.step_loader = step_loader.load_remaining
+        if load_times is not None:
+            print_step_module_load_times(load_times)
+
+    def make_parse_cache(self):
+        """Provides the parse cache for feature files (if enabled).
+
+        :return: Parse cache object (or None, if disabled).
+
+        .. versionadded:: 1.4.0
+        """
+        if self.config.parse_cache is not True:
+            return None
+        return FeatureParseCache(self.config.cache_dir)
+
+    def clear_parse_cache(self):
+        """Removes the cached feature files (if "--clear-parse-cache" is used).
+
+        .. versionadded:: 1.4.0
+        """
+        if self.config.clear_parse_cache is True:
+            FeatureParseCache(self.config.cache_dir).clear()
+            ScenarioIndex(self.config.cache_dir).clear()
+            StepManifest(self.config.cache_dir).clear()
+
+    def precompute_tag_expression(self, features):
+        """Precomputes the tag matchers (with wildcards) of the tag-expression
+        for the tags that are used in the parsed features.
+
+        .. versionadded:: 1.4.0
+        """
+        tag_expression = self.config.tag_expression
+        if isinstance(tag_expression, CompiledExpression) and tag_expression.matchers:
+            tag_expression.use_known_tags(collect_feature_tags(features))
+
+    def make_scenario_index(self):
+        """Provides the scenario index for feature files (if enabled).
 
-        step_paths = list(step_paths) + list(extra_step_paths)
-        load_step_modules(step_paths)
+        :return: Scenario index object (or None, if disabled).
+
+        .. versionadded:: 1.4.0
+        """
+        if self.config.scenario_index is not True:
+            return None
+        return ScenarioIndex(self.config.cache_dir,
+                             parse_cache=self.make_parse_cache())
 
     def feature_locations(self):
         return collect_feature_locations(self.config.paths)
 
+    def select_feature_locations(self):
+        """Provides the feature file locations that should be parsed/run.
+        If the scenario index is enabled, only feature files with selected
+        scenarios (by tags or by name) are used.
+
+        .. versionadded:: 1.4.0
+        """
+        feature_locations = [filename for filename in self.feature_locations()
+                             if not self.config.exclude(filename)]
+        scenario_index = self.make_scenario_index()
+        if scenario_index is not None:
+            feature_locations = scenario_index.select_locations(
+                feature_locations, self.config)
+        return feature_locations
+
     def run(self):
         with self.path_manager:
             self.setup_paths()
             return self.run_with_paths()
 
     def run_with_paths(self):
+        self.profiler = make_profiler(self.config)
+        self.profiler.start_run()
+        try:
+            return self._run_with_paths()
+        finally:
+            self.profiler.stop_run()
+            self.profiler.report()
+
+    def _run_with_paths(self):
+        profiler = self.profiler
         self.context = Context(self)
-        self.load_hooks()
-        self.load_step_definitions()
+        with profiler.measure("environment.load"):
+            self.load_hooks()
+        use_lazy_step_modules = self.config.lazy_step_modules is True
+        if not use_lazy_step_modules:
+            with profiler.measure("steps.load"):
+                self.load_step_definitions()
 
         # -- ENSURE: context.execute_steps() works in weird cases (hooks, ...)
         # self.setup_capture()
         # self.run_hook("before_all")
 
         # -- STEP: Parse all feature files (by using their file location).
-        feature_locations = [filename for filename in self.feature_locations()
-                             if not self.config.exclude(filename)]
-        features = parse_features(feature_locations, language=self.config.lang)
+        with profiler.measure("parse"):
+            self.clear_parse_cache()
+            feature_locations = self.select_feature_locations()
+            features = parse_features(feature_locations,
+                                      language=self.config.lang,
+                                      parse_cache=self.make_parse_cache(),
+                                      jobs=self.config.parse_jobs)
+            self.precompute_tag_expression(features)
         self.features.extend(features)
+        if use_lazy_step_modules:
+            with profiler.measure("steps.load"):
+                self.load_step_definitions_for(features)
 
         # -- STEP: Run all features.
         stream_openers = self.config.outputs
         self.formatters = make_formatters(self.config, stream_openers)
-        return self.run_model()
+        profiler.install(self)
+        try:
+            return self.run_model()
+        finally:
+            profiler.uninstall()
 
 
 # -----------------------------------------------------------------------------
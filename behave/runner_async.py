@@ -0,0 +1,444 @@
+"""
+This module provides a test runner that runs scenarios concurrently
+as asyncio tasks on one event loop (``--runner=async``).
+
+PRINCIPLE:
+
+* Each feature, rule and scenario runs as an asyncio task on the event loop
+  of the runner. The scenarios (and rules) of a feature run concurrently.
+* The model elements and hooks use the synchronous runner API.
+  Therefore, a task runs a scenario (or the hooks of a feature/rule)
+  in a worker thread. The number of worker threads is the concurrency limit
+  (``--jobs``).
+* An async-step (``async def`` step function) is run on the event loop
+  of the runner (and awaited by its worker thread).
+  Async-steps of different scenarios interleave on this event loop.
+* Each task uses its own context layer (on top of the context layers of its
+  feature and rule), its own output capture and its own undefined steps
+  (see: :mod:`behave.capture_local`).
+* The formatter events and the (not captured) output of each task are
+  recorded and replayed in the original order of the features and scenarios
+  (deterministic output).
+
+EXAMPLE:
+
+.. code-block:: sh
+
+    $ behave --runner=async --jobs=10 features/
+
+.. note::
+
+    The ``before_all()`` and ``after_all()`` hooks run once (in the main thread).
+    Context attributes that are assigned in the ``before_all()`` hook
+    (or in a feature/rule hook) are shared by the scenarios.
+    Async resources (like: a connection pool) that are created in an
+    async ``before_all()`` hook can be used by async-steps, because all of
+    them use the event loop of the test run.
+
+.. versionadded:: 1.4.0
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import functools
+import logging
+import sys
+import threading
+
+from behave import capture_local
+from behave.api.runner import ITestRunner
+from behave.model import Rule
+from behave.runner import ModelRunner, Runner
+from behave.runner_parallel import (
+    iter_run_item_scenarios, run_scenario_in_container
+)
+
+
+# -----------------------------------------------------------------------------
+# CLASSES:
+# -----------------------------------------------------------------------------
+class RecordedStream:
+    """Output stream of a task that records the written text as event."""
+    encoding = "utf-8"
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def write(self, text):
+        self.recorder.events.append(("output", self.name, text))
+        return len(text)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+class TaskEventRecorder:
+    """Records the formatter events and the (not captured) output of a task
+    while it runs. The events are replayed later by the runner
+    (in the original order of the model elements).
+    """
+    name = "async.recorder"
+
+    def __init__(self):
+        self.events = []
+        self.stdout = RecordedStream(self, "stdout")
+        self.stderr = RecordedStream(self, "stderr")
+
+    def uri(self, uri):
+        self.events.append(("uri", uri))
+
+    def feature(self, feature):
+        self.events.append(("feature", feature))
+
+    def rule(self, rule):
+        self.events.append(("rule", rule))
+
+    def background(self, background):
+        self.events.append(("background", background))
+
+    def scenario(self, scenario):
+        self.events.append(("scenario", scenario))
+
+    def step(self, step):
+        self.events.append(("step", step))
+
+    def match(self, match):
+        self.events.append(("match", match))
+
+    def result(self, step):
+        self.events.append(("result", step))
+
+    def embedding(self, mime_type, data):
+        self.events.append(("embedding", mime_type, data))
+
+    def rule_finished(self):
+        self.events.append(("rule_finished",))
+
+    def eof(self):
+        self.events.append(("eof",))
+
+    def close(self):
+        pass
+
+    def take_events(self):
+        """Provides the recorded events and forgets them afterwards."""
+        events = self.events
+        self.events = []
+        return events
+
+
+class SynchronizedStepRegistry:
+    """Step registry proxy that serializes the step matching
+    (for scenarios that run in several threads).
+    """
+
+    def __init__(self, step_registry):
+        self.step_registry = step_registry
+        self.lock = threading.Lock()
+
+    def find_match(self, step):
+        with self.lock:
+            return self.step_registry.find_match(step)
+
+    def find_step_definition(self, step):
+        with self.lock:
+            return self.step_registry.find_step_definition(step)
+
+    def __getattr__(self, name):
+        return getattr(self.step_registry, name)
+
+
+class TaskResult:
+    """Result of a task (feature, rule or scenario) with its recorded events."""
+    __slots__ = ("failed", "events")
+
+    def __init__(self, failed, events):
+        self.failed = failed
+        self.events = events
+
+
+class TaskRunner(ModelRunner):
+    """Runs the part of a test run that belongs to one task
+    (a feature, rule or scenario).
+
+    A task runner uses its own context (with an own root layer),
+    output capture, formatter event recorder and undefined steps.
+    The hooks, the step registry and the configuration are shared
+    with the concurrent runner (like: :class:`AsyncRunner`).
+
+    :param runner:   Concurrent runner that runs the task.
+    :param context:  Context of the outer task (or the runner) to fork.
+    """
+
+    def __init__(self, runner, context):
+        super(TaskRunner, self).__init__(runner.config,
+                                         step_registry=runner.task_step_registry)
+        self.runner = runner
+        self.hooks = runner.hooks
+        self.hook_observers = runner.hook_observers
+        self.recorder = TaskEventRecorder()
+        self.formatters = [self.recorder]
+        self.context = context._fork(self)   # pylint: disable=protected-access
+
+    @property
+    def aborted(self):
+        """Indicates that test run is aborted (by this task or the runner)."""
+        return self.context.aborted or self.runner.aborted
+
+    @aborted.setter
+    def aborted(self, value):
+        # pylint: disable=protected-access
+        self.context._set_root_attribute("aborted", bool(value))
+
+
+class ConcurrentRunner(Runner):
+    """Base class for test runners that run scenarios concurrently
+    in worker threads. The number of worker threads is specified
+    with the ``--jobs`` option.
+
+    Each scenario is run by a :class:`TaskRunner` (with its own context layer,
+    output capture and formatter event recorder). The recorded events are
+    replayed in the original order of the features and scenarios.
+
+    Falls back to the behaviour of the :class:`behave.runner.Runner`
+    if only one job is used or in dry-run mode.
+
+    .. versionadded:: 1.4.0
+    """
+    THREAD_NAME_PREFIX = "behave-worker"
+
+    def __init__(self, config):
+        super(ConcurrentRunner, self).__init__(config)
+        self.executor = None
+        self.task_step_registry = None
+        self.stopped = False
+
+    @property
+    def jobs(self):
+        return self.config.jobs
+
+    def should_run_concurrently(self):
+        return self.jobs > 1 and not self.config.dry_run
+
+    def should_stop(self):
+        return self.stopped or self.aborted
+
+    def setup_workers(self):
+        """Creates the worker threads and installs the context-local capture."""
+        self.stopped = False
+        self.task_step_registry = SynchronizedStepRegistry(self.step_registry)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.jobs, thread_name_prefix=self.THREAD_NAME_PREFIX)
+        capture_local.install(log_level=self.config.logging_level or
+                              logging.NOTSET)
+
+    def teardown_workers(self):
+        """Waits until the worker threads are finished (after their scenarios)
+        and uninstalls the context-local capture.
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.executor = None
+        capture_local.uninstall()
+
+    def make_task_runner(self, outer_runner):
+        task_runner = TaskRunner(self, outer_runner.context)
+        task_runner.feature = outer_runner.feature
+        return task_runner
+
+    def run_scenario(self, runner, container, scenario):
+        """Runs a scenario of a task (in a worker thread).
+
+        :return: True, if scenario failed (or None, if it was not run).
+        """
+        if self.should_stop():
+            return None
+        return run_scenario_in_container(runner, container, scenario)
+
+    @staticmethod
+    def _call_with_task_output(runner, func, *args):
+        capture_local.set_task_output_stream("stdout", runner.recorder.stdout)
+        capture_local.set_task_output_stream("stderr", runner.recorder.stderr)
+        return func(*args)
+
+    def make_task_result(self, runner, failed, events):
+        """Collects the results of a finished task."""
+        # pylint: disable=protected-access
+        events.extend(("undefined_step", step)
+                      for step in runner.undefined_steps)
+        del runner.undefined_steps[:]
+        self.hook_failures += runner.hook_failures
+        runner.hook_failures = 0
+        for name in ("failed", "aborted"):
+            if runner.context._root.get(name) and not self.context._root[name]:
+                self.context._set_root_attribute(name, True)
+        if failed and self.config.stop:
+            # -- FAIL-EARLY: Tasks that are not started yet are not run.
+            self.stopped = True
+        return TaskResult(failed, events)
+
+    # -- REPLAY:
+    def replay_events(self, events):
+        """Replays the recorded events of a task to the formatters
+        (and its output to the output streams).
+        """
+        for event in events:
+            event_name = event[0]
+            if event_name == "output":
+                stream = getattr(sys, event[1])
+                stream.write(event[2])
+                continue
+            if event_name == "undefined_step":
+                self.undefined_steps.append(event[1])
+                continue
+
+            for formatter in self.formatters:
+                formatter_func = getattr(formatter, event_name, None)
+                if formatter_func:
+                    formatter_func(*event[1:])
+
+
+class AsyncRunner(ConcurrentRunner):
+    """Test runner that runs scenarios concurrently
+    (as asyncio tasks on one event loop).
+    The concurrency limit is specified with the ``--jobs`` option.
+
+    Falls back to the behaviour of the :class:`behave.runner.Runner`
+    if only one job is used or in dry-run mode.
+    """
+    THREAD_NAME_PREFIX = "behave-async"
+
+    def run_features(self, features):
+        if not self.should_run_concurrently():
+            return super(AsyncRunner, self).run_features(features)
+
+        self.setup_workers()
+        try:
+            # -- HINT: Uses the event loop of the test run (see: run_model()).
+            return self.event_loop.run_until_complete(
+                self.run_features_async(features))
+        except KeyboardInterrupt:
+            self.abort(reason="KeyboardInterrupt")
+            return 1
+        finally:
+            self.teardown_workers()
+
+    def teardown_workers(self):
+        loop = self.event_loop
+        # -- ENSURE: Running scenarios are completed.
+        # HINT: Their async-steps need the running event loop.
+        shutdown = functools.partial(self.executor.shutdown, wait=True,
+                                     cancel_futures=True)
+        loop.run_until_complete(loop.run_in_executor(None, shutdown))
+        pending_tasks = asyncio.all_tasks(loop)
+        if pending_tasks:
+            # -- CASE: Aborted test run (KeyboardInterrupt).
+            for task in pending_tasks:
+                task.cancel()
+            loop.run_until_complete(
+                asyncio.gather(*pending_tasks, return_exceptions=True))
+        self.executor = None
+        capture_local.uninstall()
+
+    # -- TASKS:
+    async def run_features_async(self, features):
+        """Runs the features concurrently (at most ``jobs`` features at once)
+        and reports their results in the original order of the features.
+
+        :return: Number of failed features.
+        """
+        feature_slots = asyncio.Semaphore(self.jobs)
+        tasks = [asyncio.ensure_future(self.run_feature_task(feature,
+                                                             feature_slots))
+                 for feature in features]
+        failed_count = 0
+        for feature, task in zip(features, tasks):
+            result = await task
+            if result is not None:
+                self.feature = feature
+                self.replay_events(result.events)
+                if result.failed:
+                    failed_count += 1
+
+            # -- ALWAYS: Report run/not-run feature to reporters.
+            for reporter in self.config.reporters:
+                reporter.feature(feature)
+        return failed_count
+
+    async def run_feature_task(self, feature, feature_slots):
+        async with feature_slots:
+            runner = self.make_task_runner(self)
+            runner.feature = feature
+            runner.recorder.uri(feature.filename)
+            return await self.run_container_task(feature, runner)
+
+    async def run_container_task(self, container, runner):
+        """Runs a feature or rule: Its hooks run in a worker thread,
+        its scenarios and rules run concurrently (as tasks).
+
+        :return: Task result (or None, if it was not run).
+        """
+        if self.should_stop():
+            return None
+
+        run_state = await self.run_in_thread(runner, container.start_run,
+                                             runner)
+        events = runner.recorder.take_events()
+        if not run_state.skip_untested:
+            tasks = []
+            for run_item in container.run_items:
+                if isinstance(run_item, Rule):
+                    rule_runner = self.make_task_runner(runner)
+                    tasks.append(self.run_container_task(run_item,
+                                                         rule_runner))
+                    continue
+                for scenario in iter_run_item_scenarios(run_item):
+                    tasks.append(self.run_scenario_task(container, scenario,
+                                                        runner))
+
+            for result in await asyncio.gather(*tasks):
+                if result is None:
+                    continue    # -- NOT RUN: After failure (or aborted).
+                events.extend(result.events)
+                if result.failed:
+                    run_state.failed_count += 1
+
+        failed = await self.run_in_thread(runner, container.finish_run,
+                                          runner, run_state)
+        events.extend(runner.recorder.take_events())
+        return self.make_task_result(runner, failed, events)
+
+    async def run_scenario_task(self, container, scenario, outer_runner):
+        runner = self.make_task_runner(outer_runner)
+        failed = await self.run_in_thread(runner, self.run_scenario,
+                                          runner, container, scenario)
+        if failed is None:
+            return None
+        return self.make_task_result(runner, failed,
+                                     runner.recorder.take_events())
+
+    def run_in_thread(self, runner, func, *args):
+        """Runs a function of a task in a worker thread
+        (by using the output streams of the task).
+
+        :return: Future of the function result.
+        """
+        context = contextvars.copy_context()
+        return self.event_loop.run_in_executor(
+            self.executor, context.run,
+            functools.partial(self._call_with_task_output, runner, func, *args))
+
+
+# -----------------------------------------------------------------------------
+# REGISTER RUNNER-CLASSES:
+# -----------------------------------------------------------------------------
+ITestRunner.register(ConcurrentRunner)
+ITestRunner.register(AsyncRunner)
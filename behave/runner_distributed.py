@@ -0,0 +1,690 @@
+"""
+This module provides a test runner that distributes the scenarios
+of a test run to worker processes on other hosts (``--runner=distributed``).
+
+PRINCIPLE:
+
+* The coordinator (``behave --runner=distributed``) parses the features
+  and splits them into work units (in the same way as the parallel runner,
+  see: :mod:`behave.runner_parallel`). It waits for its workers
+  on a TCP port (see: ``--coordinator=HOST:PORT``).
+* A worker (``behave --worker=HOST:PORT``) connects to the coordinator.
+  It loads the hooks and step definitions from its own working directory
+  (a checkout of the same project), runs the work units that it receives
+  and streams back their results.
+* Workers may connect (and disconnect) while the test run is running.
+  The ``--jobs`` option specifies the number of expected workers
+  (that is used to distribute the work units in advance).
+* The work units of a lost worker (connection is closed or broken)
+  are re-queued and run by another worker.
+* The coordinator replays the results to its formatters and reporters
+  in the original order of the features and scenarios.
+
+PROTOCOL:
+
+A message is a JSON object (with a "type" key) that is prefixed
+with its size (as 4-byte unsigned integer in network byte order).
+
+* worker -> coordinator: ``hello``, then the messages of
+  the :class:`behave.runner_parallel.ParallelWorker`
+  (``container_started``, ``container_finished``, ``unit_done``, ...)
+* coordinator -> worker: ``welcome`` (or ``reject``), then ``unit``
+  (one work unit at a time), ``stop`` (fail early) and ``end``
+
+EXAMPLE:
+
+.. code-block:: sh
+
+    # -- ON HOST "ci-main": Coordinator waits for 2 workers on port 8733.
+    $ behave --runner=distributed --coordinator=0.0.0.0:8733 --jobs=2 features/
+
+    # -- ON OTHER HOSTS (in the project directory):
+    $ behave --worker=ci-main:8733
+
+.. warning::
+
+    The protocol provides no authentication or encryption.
+    Use it only in a trusted network.
+
+.. versionadded:: 1.4.0
+"""
+
+from collections import deque
+import json
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+
+from behave.api.runner import ITestRunner
+from behave.exception import ConfigError
+from behave.runner_parallel import (
+    FeatureResultCollector, ParallelRunner, ParallelWorker,
+    WorkStealingScheduler
+)
+from behave.tag_expression import compile_tag_expression, make_tag_expression
+
+
+# -----------------------------------------------------------------------------
+# CONSTANTS:
+# -----------------------------------------------------------------------------
+PROTOCOL_VERSION = 1
+DEFAULT_HOST = "127.0.0.1"
+MESSAGE_HEADER = struct.Struct("!I")
+MAX_MESSAGE_SIZE = 256 * 1024 * 1024    # -- UNIT: bytes
+RECEIVE_SIZE = 65536                    # -- UNIT: bytes
+POLL_TIMEOUT = 0.5      # -- UNIT: seconds
+SOCKET_TIMEOUT = 30.0   # -- UNIT: seconds
+MAX_UNIT_ATTEMPTS = 3   # -- Work unit is re-queued up to 2 times.
+
+
+# -----------------------------------------------------------------------------
+# PROTOCOL SUPPORT:
+# -----------------------------------------------------------------------------
+class ProtocolError(Exception):
+    """Received data violates the message protocol."""
+
+
+def parse_address(text, default_host=DEFAULT_HOST):
+    """Parses a network address, like: ``HOST:PORT`` or ``PORT``.
+
+    :param text: Network address (as string).
+    :param default_host: Host to use if it is missing.
+    :return: Tuple ``(host, port)``.
+    :raises ConfigError: If the network address is invalid.
+    """
+    host, _, port = text.rpartition(":")
+    # -- SUPPORT: IPv6 addresses, like: [::1]:8733
+    host = host.strip("[]") or default_host
+    if not port.isdigit() or int(port) > 65535:
+        raise ConfigError("%s (expected: [HOST:]PORT)" % text)
+    return host, int(port)
+
+
+def enable_keepalive(sock):
+    # -- DETECT: Lost connections to hosts that are gone.
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+
+class MessageChannel:
+    """Sends and receives messages over a stream socket (connection).
+    A message is a dict with serializable data and a "type" key.
+    """
+
+    def __init__(self, sock):
+        self.socket = sock
+        self.buffer = bytearray()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def fileno(self):
+        return self.socket.fileno()
+
+    def close(self):
+        self.socket.close()
+
+    def send(self, message):
+        payload = json.dumps(message).encode("utf-8")
+        self.socket.sendall(MESSAGE_HEADER.pack(len(payload)) + payload)
+
+    def receive(self):
+        """Receives the next message (blocking).
+
+        :return: Message (as dict) or None (if the connection was closed).
+        :raises ProtocolError: If bad data is received.
+        """
+        message = self.take_message()
+        while message is None:
+            if not self.receive_data():
+                return None
+            message = self.take_message()
+        return message
+
+    def receive_data(self):
+        """Reads the available data into the receive buffer
+        (blocks until data is available).
+
+        :return: False, if the connection was closed by the other side.
+        """
+        data = self.socket.recv(RECEIVE_SIZE)
+        if not data:
+            return False
+        self.buffer.extend(data)
+        return True
+
+    def take_message(self):
+        """Takes the next complete message from the receive buffer.
+
+        :return: Message (as dict) or None (if no complete message exists).
+        :raises ProtocolError: If bad data is received.
+        """
+        header_size = MESSAGE_HEADER.size
+        if len(self.buffer) < header_size:
+            return None
+        size = MESSAGE_HEADER.unpack_from(self.buffer)[0]
+        if size > MAX_MESSAGE_SIZE:
+            raise ProtocolError("Message is too large (%d bytes)" % size)
+        if len(self.buffer) < header_size + size:
+            return None
+
+        payload = bytes(self.buffer[header_size:header_size + size])
+        del self.buffer[:header_size + size]
+        try:
+            message = json.loads(payload.decode("utf-8"))
+        except ValueError as e:
+            raise ProtocolError("Bad message (%s)" % e)
+        if not isinstance(message, dict) or "type" not in message:
+            raise ProtocolError("Bad message (without type)")
+        return message
+
+
+# -----------------------------------------------------------------------------
+# WORKER SIDE:
+# -----------------------------------------------------------------------------
+def apply_worker_settings(config, settings):
+    """Applies the settings of the coordinator to the configuration
+    of a worker (to select and parse scenarios in the same way).
+
+    :param config: Configuration of the worker.
+    :param settings: Settings (as dict) from the coordinator.
+    """
+    config.lang = settings["lang"]
+    config.stop = settings["stop"]
+    config.tags = settings["tags"]
+    config.tag_expression = compile_tag_expression(
+        make_tag_expression(config.tags or ""))
+    config.name = settings["name"]
+    config.step_durations = settings["step_durations"]
+    config.name_re = None
+    if config.name:
+        config.name_re = config.build_name_re(config.name)
+
+
+class CoordinatorConnection:
+    """Connection of a worker to its coordinator.
+    Provides the work units (as task queue) and sends the results
+    (as result queue) for :meth:`ParallelWorker.run_worker()`.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.stop_event = threading.Event()
+        self.lost = False
+        self.worker_error = False
+        self.units_count = 0
+
+    def get(self):
+        """Receives the next work unit (blocking).
+
+        :return: Work unit or None (if no more work units are provided).
+        """
+        while not self.lost:
+            try:
+                message = self.channel.receive()
+            except (OSError, ProtocolError):
+                message = None
+            if message is None:
+                self.lost = True
+                break
+
+            message_type = message["type"]
+            if message_type == "unit":
+                self.units_count += 1
+                return message["unit"]
+            if message_type == "stop":
+                self.stop_event.set()
+            elif message_type == "end":
+                break
+        return None
+
+    def put(self, message):
+        if message["type"] == "worker_error":
+            self.worker_error = True
+        if self.lost:
+            return
+        try:
+            self.channel.send(message)
+        except OSError:
+            self.lost = True
+
+
+class DistributedWorker(ParallelWorker):
+    """Worker of a distributed test run (``behave --worker=HOST:PORT``).
+
+    Connects to the coordinator, runs the work units that it receives
+    and sends back their results (see: :class:`ParallelWorker`).
+    """
+
+    def run(self):
+        # -- HINT: Undefined steps are reported by the coordinator.
+        self.config.show_snippets = False
+        address = parse_address(self.config.worker)
+        try:
+            sock = socket.create_connection(address, timeout=SOCKET_TIMEOUT)
+        except OSError as e:
+            print("WORKER-ERROR: Cannot connect to coordinator at %s:%d (%s: %s)" % \
+                  (address + (e.__class__.__name__, e)), file=sys.stderr)
+            return True
+
+        # -- HINT: Worker waits (without timeout) until it receives work.
+        sock.settimeout(None)
+        enable_keepalive(sock)
+        with MessageChannel(sock) as channel:
+            try:
+                channel.send(dict(type="hello", version=PROTOCOL_VERSION,
+                                  name="%s:%d" % (socket.gethostname(),
+                                                  os.getpid())))
+                message = channel.receive()
+            except (OSError, ProtocolError) as e:
+                message = dict(type="reject",
+                               reason="%s: %s" % (e.__class__.__name__, e))
+            if message is None or message["type"] != "welcome":
+                reason = (message or {}).get("reason", "connection closed")
+                print("WORKER-ERROR: Rejected by coordinator at %s:%d (%s)" % \
+                      (address + (reason,)), file=sys.stderr)
+                return True
+
+            self.worker_id = message["worker"]
+            apply_worker_settings(self.config, message["settings"])
+            print("WORKER: Connected to coordinator at %s:%d (as worker-%d)" % \
+                  (address + (self.worker_id,)))
+            connection = CoordinatorConnection(channel)
+            self.run_worker(connection, connection, connection.stop_event)
+
+        if connection.lost:
+            print("WORKER-ERROR: Lost connection to coordinator at %s:%d" % \
+                  address, file=sys.stderr)
+        else:
+            print("WORKER: %d work unit(s) done" % connection.units_count)
+        return connection.lost or connection.worker_error
+
+
+# -----------------------------------------------------------------------------
+# COORDINATOR SIDE:
+# -----------------------------------------------------------------------------
+def make_relative_filename(filename):
+    """Makes a filename relative to the current working directory
+    (if it is located below it).
+    """
+    if os.path.isabs(filename):
+        relative_filename = os.path.relpath(filename)
+        if not relative_filename.startswith(os.pardir):
+            return relative_filename
+    return filename
+
+
+class DistributedScheduler(WorkStealingScheduler):
+    """Work-stealing scheduler for workers that connect (and disconnect)
+    while the test run is running.
+
+    * The work units are assigned in advance to the number of expected workers.
+      A worker that connects uses a free worker slot (or a new one).
+    * The current work unit of a lost worker is re-queued (in its worker slot).
+      The work units of a free worker slot are stolen by the other workers.
+    * If the remaining work units can only be run by re-entering
+      a feature/rule (that a worker has already left), the scheduler
+      is ``relaxed``: A worker may run the feature hooks again.
+    """
+
+    def __init__(self, units, workers_count):
+        super(DistributedScheduler, self).__init__(units, workers_count)
+        self.free_slots = list(range(workers_count))
+        self.relaxed = False
+
+    def add_worker(self):
+        """Assigns a worker slot to a new worker.
+
+        :return: Worker slot (as index) to use as worker_id.
+        """
+        if self.free_slots:
+            return self.free_slots.pop(0)
+
+        self.queues.append(deque())
+        self.loads.append(0.0)
+        self.entered.append([])
+        self.left.append(set())
+        return len(self.queues) - 1
+
+    def remove_worker(self, worker_id, unit=None):
+        """Frees the worker slot of a lost worker.
+
+        :param worker_id: Worker slot of the lost worker.
+        :param unit: Current work unit of the lost worker (to re-queue).
+        """
+        if unit is not None:
+            self.queues[worker_id].appendleft(unit)
+            self.loads[worker_id] += unit["duration"]
+        self.entered[worker_id] = []
+        self.left[worker_id] = set()
+        self.free_slots.append(worker_id)
+        self.free_slots.sort()
+
+    def is_eligible(self, worker_id, unit):
+        if self.relaxed:
+            return True
+        return super(DistributedScheduler, self).is_eligible(worker_id, unit)
+
+
+class RemoteWorker:
+    """Connection of the coordinator to a worker."""
+
+    def __init__(self, channel, name):
+        self.channel = channel
+        self.name = name
+        self.worker_id = None   # -- ASSIGNED: After "hello" message.
+        self.unit = None        # -- CURRENT WORK UNIT (that is running).
+        self.entered = set()    # -- CONTAINERS: (feature, element) pairs.
+        self.idle = False
+        self.closed = False
+
+    def __str__(self):
+        return "worker-%s (%s)" % (self.worker_id, self.name)
+
+
+class DistributedRunner(ParallelRunner):
+    """Test runner that acts as coordinator of a distributed test run.
+    It distributes the scenarios to workers (``behave --worker=HOST:PORT``)
+    that connect to it over the network (see: ``--coordinator=HOST:PORT``).
+    The number of expected workers is specified with the ``--jobs`` option.
+
+    Falls back to the behaviour of the :class:`behave.runner.Runner`
+    in dry-run mode.
+    """
+
+    def __init__(self, config):
+        super(DistributedRunner, self).__init__(config)
+        self.server = None
+        self.selector = None
+        self.expected_workers = 0
+        self.remote_workers = {}    # MAPS: worker_id -> RemoteWorker
+        self.scheduler = None
+        self.collectors = []
+        self.unit_attempts = {}     # MAPS: unit_id -> number of attempts
+        self.remaining_units = 0
+        self.run_feature = True
+        self.failed_count = 0
+        self.workers_hook_failures = 0
+        self.cleanups_failed = False
+
+    def should_run_in_parallel(self):
+        return not self.config.dry_run
+
+    def make_units(self, feature_indexes):
+        # -- HINT: Workers resolve the feature files in their working directory.
+        self.feature_locations_data = [
+            [[make_relative_filename(filename), line]
+             for filename, line in locations]
+            for locations in self.feature_locations_data
+        ]
+        return super(DistributedRunner, self).make_units(feature_indexes)
+
+    def make_worker_settings(self):
+        """Provides the settings that the workers must use
+        (to select and parse the scenarios in the same way).
+        """
+        config = self.config
+        step_durations = bool(config.step_durations or
+                              config.step_durations_output)
+        return dict(lang=config.lang, stop=config.stop, tags=config.tags,
+                    name=config.name, step_durations=step_durations)
+
+    # -- WORKER MANAGEMENT:
+    def start_workers(self, count):
+        """Starts to listen for workers (instead of starting them)."""
+        address = parse_address(self.config.coordinator)
+        try:
+            self.server = socket.create_server(address)
+        except OSError as e:
+            raise ConfigError("Cannot listen on %s:%d (%s: %s)" % \
+                              (address + (e.__class__.__name__, e)))
+        self.server.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server, selectors.EVENT_READ)
+        self.expected_workers = count
+        print("COORDINATOR: Listening on %s:%d (expecting %d worker(s))" % \
+              (self.server.getsockname()[:2] + (count,)))
+        sys.stdout.flush()
+
+    def terminate_workers(self):
+        if self.selector is not None:
+            for key in list(self.selector.get_map().values()):
+                if key.data is not None:
+                    self.close_worker(key.data)
+            self.selector.close()
+            self.selector = None
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+
+    def accept_worker(self):
+        try:
+            sock, address = self.server.accept()
+        except OSError:
+            return  # -- CASE: Connection attempt was already aborted.
+        sock.settimeout(SOCKET_TIMEOUT)
+        enable_keepalive(sock)
+        worker = RemoteWorker(MessageChannel(sock), "%s:%s" % address[:2])
+        self.selector.register(sock, selectors.EVENT_READ, worker)
+
+    def welcome_worker(self, worker, message):
+        reason = None
+        if message["type"] != "hello":
+            reason = "Expected hello message"
+        elif message.get("version") != PROTOCOL_VERSION:
+            reason = "Unsupported protocol version: %s" % message.get("version")
+        elif not (self.run_feature and self.remaining_units):
+            reason = "Test run is finished"
+        if reason:
+            self.send_to_worker(worker, "reject", reason=reason)
+            self.close_worker(worker)
+            return
+
+        worker.worker_id = self.scheduler.add_worker()
+        worker.name = message.get("name") or worker.name
+        worker.idle = True
+        self.remote_workers[worker.worker_id] = worker
+        self.send_to_worker(worker, "welcome", worker=worker.worker_id,
+                            settings=self.make_worker_settings())
+
+    def close_worker(self, worker):
+        if worker.closed:
+            return
+        worker.closed = True
+        if self.selector is not None:
+            self.selector.unregister(worker.channel.socket)
+        worker.channel.close()
+        self.remote_workers.pop(worker.worker_id, None)
+
+    def drop_worker(self, worker, reason):
+        """Drops a lost worker and re-queues its current work unit."""
+        self.close_worker(worker)
+        if worker.worker_id is None:
+            return  # -- CASE: Connection without "hello" message.
+
+        print("WORKER-ERROR: %s lost (%s)" % (worker, reason), file=sys.stderr)
+        for feature_id, _ in worker.entered:
+            self.collectors[feature_id].entered_count -= 1
+        unit = worker.unit
+        if unit is not None:
+            attempts = self.unit_attempts.get(unit["id"], 0) + 1
+            self.unit_attempts[unit["id"]] = attempts
+            if not self.run_feature or attempts >= MAX_UNIT_ATTEMPTS:
+                failed = self.run_feature
+                if failed:
+                    print("WORK-UNIT-ERROR: Not run (%d workers were lost)" % \
+                          attempts, file=sys.stderr)
+                self.add_unit_result(unit, dict(executed=False, failed=failed))
+                unit = None
+        self.scheduler.remove_worker(worker.worker_id, unit)
+        if self.run_feature and self.remaining_units and not self.remote_workers:
+            print("COORDINATOR: Waiting for workers (%d work unit(s) remaining)" % \
+                  self.remaining_units)
+            sys.stdout.flush()
+
+    def send_to_worker(self, remote_worker, message_type, **data):
+        data.update(type=message_type)
+        try:
+            remote_worker.channel.send(data)
+        except OSError as e:
+            self.drop_worker(remote_worker,
+                             "%s: %s" % (e.__class__.__name__, e))
+
+    def has_running_units(self):
+        return any(worker.unit is not None
+                   for worker in self.remote_workers.values())
+
+    def dispatch_unit(self, worker):
+        unit = None
+        if self.run_feature:
+            unit = self.scheduler.next_unit(worker.worker_id)
+            if unit is None and self.has_running_units():
+                # -- WAIT: Running work units may be re-queued (lost worker).
+                return
+            if unit is None and len(self.scheduler):
+                # -- CASE: Remaining work units of left features/rules.
+                self.scheduler.relaxed = True
+                unit = self.scheduler.next_unit(worker.worker_id)
+
+        worker.idle = False
+        if unit is None:
+            # -- NO MORE WORK: Worker should finish (after_all hook).
+            self.send_to_worker(worker, "end")
+            return
+        worker.unit = unit
+        self.send_to_worker(worker, "unit", unit=unit)
+
+    def stop_workers(self):
+        """Stops the test run early (after first failure or if aborted)."""
+        self.run_feature = False
+        for unit in self.scheduler.clear():
+            self.add_unit_result(unit, dict(executed=False, failed=False))
+        for worker in list(self.remote_workers.values()):
+            self.send_to_worker(worker, "stop")
+
+    # -- RUN MODEL:
+    def add_unit_result(self, unit, result):
+        self.collectors[unit["feature"]].add_unit_result(unit, result)
+        self.remaining_units -= 1
+
+    def receive_messages(self, worker):
+        try:
+            connected = worker.channel.receive_data()
+            while connected and not worker.closed:
+                message = worker.channel.take_message()
+                if message is None:
+                    break
+                self.handle_message(worker, message)
+        except (OSError, ProtocolError) as e:
+            self.drop_worker(worker, "%s: %s" % (e.__class__.__name__, e))
+            return
+        if not connected:
+            self.drop_worker(worker, "connection closed")
+
+    def handle_message(self, worker, message):
+        if worker.worker_id is None:
+            self.welcome_worker(worker, message)
+            return
+
+        message_type = message["type"]
+        if message_type == "container_started":
+            self.collectors[message["feature"]].add_container_started(message)
+            worker.entered.add((message["feature"], message["element"]))
+        elif message_type == "container_finished":
+            self.collectors[message["feature"]].add_container_finished(message)
+            worker.entered.discard((message["feature"], message["element"]))
+            if message["failed"]:
+                self.failed_count += 1
+        elif message_type == "unit_done":
+            unit = worker.unit
+            if unit is None or message["unit"] != unit["id"]:
+                raise ProtocolError("Unexpected work unit: %s" % message["unit"])
+            worker.unit = None
+            worker.idle = True
+            self.add_unit_result(unit, message)
+            if message.get("error"):
+                print(message["error"], file=sys.stderr)
+            if message["failed"]:
+                self.failed_count += 1
+            if message["aborted"] and not self.aborted:
+                self.abort(reason="ABORTED in worker")
+        elif message_type == "worker_error":
+            self.drop_worker(worker, "worker error\n%s" % message["message"])
+        elif message_type == "worker_done":
+            self.workers_hook_failures += message["hook_failures"]
+            self.add_hook_durations_data(message["hook_durations"])
+            self.cleanups_failed = (self.cleanups_failed or
+                                    message["cleanups_failed"])
+            if message["aborted"] and not self.aborted:
+                self.abort(reason="ABORTED in worker")
+            self.close_worker(worker)
+        else:
+            raise ProtocolError("Unknown message type: %s" % message_type)
+
+    def run_model_with_workers(self, feature_indexes, units):
+        self.collectors = [FeatureResultCollector(feature_index)
+                           for feature_index in feature_indexes]
+        for unit in units:
+            self.collectors[unit["feature"]].remaining_units += 1
+        self.scheduler = DistributedScheduler(units, self.expected_workers)
+        self.remaining_units = len(units)
+        undefined_steps_initial_size = len(self.undefined_steps)
+        next_index = 0
+        try:
+            while self.remaining_units or self.remote_workers:
+                try:
+                    for key, _ in self.selector.select(timeout=POLL_TIMEOUT):
+                        if key.data is None:
+                            self.accept_worker()
+                        elif not key.data.closed:
+                            self.receive_messages(key.data)
+                except KeyboardInterrupt:
+                    if self.aborted:
+                        # -- CASE: Interrupted twice, do not wait for workers.
+                        for worker in list(self.remote_workers.values()):
+                            self.drop_worker(worker, "KeyboardInterrupt")
+                    self.abort(reason="KeyboardInterrupt")
+
+                if self.run_feature and ((self.failed_count and self.config.stop)
+                                         or self.aborted):
+                    # -- FAIL-EARLY: After first failure (or if aborted).
+                    self.stop_workers()
+                for worker in list(self.remote_workers.values()):
+                    if worker.idle:
+                        self.dispatch_unit(worker)
+
+                # -- REPORT RESULTS: In the original order of the features.
+                while (next_index < len(self.collectors) and
+                       self.collectors[next_index].is_completed()):
+                    self.report_feature_result(self.collectors[next_index])
+                    next_index += 1
+        finally:
+            self.terminate_workers()
+
+        for collector in self.collectors[next_index:]:
+            self.report_feature_result(collector)
+        self.hook_failures += self.workers_hook_failures
+        if self.aborted:
+            print("\nABORTED: By user.")
+        for formatter in self.formatters:
+            formatter.close()
+        for reporter in self.config.reporters:
+            reporter.end()
+
+        failed = ((self.failed_count > 0) or self.aborted
+                  or (self.hook_failures > 0)
+                  or (len(self.undefined_steps) > undefined_steps_initial_size)
+                  or self.cleanups_failed
+                  or any(c.failed for c in self.collectors))
+        return failed
+
+
+# -----------------------------------------------------------------------------
+# REGISTER RUNNER-CLASSES:
+# -----------------------------------------------------------------------------
+ITestRunner.register(DistributedRunner)
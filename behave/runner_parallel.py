@@ -0,0 +1,1385 @@
+"""
+This module provides a test runner that runs features in parallel
+by using a pool of worker processes.
+
+PRINCIPLE:
+
+* The parent process parses the features and splits them into work units.
+  A work unit is a scenario, a row of a scenario outline or
+  a feature/rule without any scenarios.
+* The work units are distributed to the workers (longest first).
+  The durations of an earlier test run are used for this purpose
+  (if they are provided, see: ``--parallel-durations``).
+* An idle worker steals queued work units from a busy worker.
+* Each worker process loads the hooks and step definitions on its own,
+  runs the work units that it receives and sends back their results.
+  A worker enters a feature (and rule) only once:
+  The ``before_feature()``/``after_feature()`` hooks run once per feature
+  in each worker that runs scenarios of this feature.
+* A result contains the formatter events and the final run state
+  (status, duration, captured output, ...) of each model element.
+* The parent process replays the results to its formatters and reporters
+  in the original order of the features and scenarios (deterministic output).
+
+EXAMPLE:
+
+.. code-block:: sh
+
+    $ behave --runner=parallel --jobs=4 features/
+
+    # -- USE: Durations from an earlier test run (to run longest scenarios first).
+    $ behave -f json -o reports/durations.json features/
+    $ behave --runner=parallel --jobs=4 --parallel-durations=reports/durations.json
+
+.. note::
+
+    Hooks run in the worker processes. The ``before_all()`` and
+    ``after_all()`` hooks run once per worker process.
+
+.. versionadded:: 1.4.0
+"""
+
+import base64
+import builtins
+from collections import deque
+import copy
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import traceback
+
+from behave.api.runner import ITestRunner
+from behave.capture import Captured
+from behave.formatter._registry import make_formatters
+from behave.matchers import Match, NoMatch
+from behave.model import (
+    Background, Feature, Rule, Scenario, ScenarioOutline, Step
+)
+from behave.model_core import TagAndStatusStatement
+from behave.model_type import Argument, FileLocation, Status
+from behave.reporter.step_durations import StepDurationsReporter
+from behave.runner import Context, Runner
+# -- HINT: Use the same step registry as the Runner (see: Runner.run_model()).
+from behave.runner import the_step_registry
+from behave.runner_util import parse_features
+from behave.textutil import text as _text
+
+
+# -----------------------------------------------------------------------------
+# CONSTANTS:
+# -----------------------------------------------------------------------------
+POLL_TIMEOUT = 0.5      # -- UNIT: seconds
+SHUTDOWN_TIMEOUT = 10.0 # -- UNIT: seconds
+DEFAULT_SCENARIO_DURATION = 1.0  # -- UNIT: seconds (if durations are unknown)
+JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+# -----------------------------------------------------------------------------
+# MODEL SUPPORT: Walk model elements and transfer their run state
+# -----------------------------------------------------------------------------
+def iter_model_elements(feature):
+    """Walks over the model elements of a feature in a deterministic order
+    (without steps). The position of a model element in this sequence is used
+    to identify the same model element in another process
+    (that parsed the same feature).
+
+    :param feature: Feature to use.
+    :return: Iterator over model elements.
+    """
+    yield feature
+    if feature.background:
+        yield feature.background
+    for run_item in feature.run_items:
+        for model_element in _iter_run_item_elements(run_item):
+            yield model_element
+
+
+def _iter_run_item_elements(run_item):
+    yield run_item
+    if isinstance(run_item, Rule):
+        if run_item.background:
+            yield run_item.background
+        for inner_run_item in run_item.run_items:
+            for model_element in _iter_run_item_elements(inner_run_item):
+                yield model_element
+    elif isinstance(run_item, ScenarioOutline):
+        for scenario in run_item.scenarios:
+            yield scenario
+
+
+def iter_run_item_scenarios(run_item):
+    """Provides the scenarios of a run item (scenario or scenario outline)."""
+    if isinstance(run_item, ScenarioOutline):
+        return iter(run_item.scenarios)
+    return iter([run_item])
+
+
+class FeatureIndex:
+    """Provides keys for the model elements of a feature that are stable
+    between processes that parsed the same feature.
+
+    A key is a pair ``[element_index, step_index]``:
+
+    * ``element_index``: Position in :func:`iter_model_elements()`
+    * ``step_index``: Position of a step in ``scenario.all_steps`` (or None).
+
+    .. note::
+
+        Steps are addressed relative to their scenario.
+        The steps of a scenario depend on its run state,
+        like: ``scenario.use_background``.
+    """
+
+    def __init__(self, feature):
+        self.feature = feature
+        self.elements = list(iter_model_elements(feature))
+        self._element_index_map = {}
+        for index, model_element in enumerate(self.elements):
+            self._element_index_map.setdefault(id(model_element), index)
+        self._steps_map = {}
+
+    def index_of(self, model_element):
+        return self._element_index_map[id(model_element)]
+
+    def make_key_map(self, scenario=None):
+        """Builds a mapping from model elements (by id) to their key.
+
+        :param scenario: Scenario whose steps should be included (optional).
+        :return: Key mapping (as dict).
+        """
+        key_map = {}
+        for model_element_id, index in self._element_index_map.items():
+            key_map[model_element_id] = [index, None]
+        if scenario is not None:
+            scenario_index = self.index_of(scenario)
+            for step_index, step in enumerate(scenario.all_steps):
+                key_map.setdefault(id(step), [scenario_index, step_index])
+        return key_map
+
+    def get_element(self, key):
+        """Provides the model element for a key.
+
+        :param key: Element key (as pair) from :meth:`make_key_map()`.
+        :return: Model element (feature, scenario, step, ...).
+        """
+        index, step_index = key
+        model_element = self.elements[index]
+        if step_index is not None:
+            steps = self._steps_map.get(index, None)
+            if steps is None:
+                steps = self._steps_map[index] = list(model_element.all_steps)
+            model_element = steps[step_index]
+        return model_element
+
+
+class WorkerException(Exception):
+    """Placeholder for an exception that was raised in a worker process
+    if the exception class is unknown in the parent process.
+    Subclasses of this class provide the name of the original exception class.
+    """
+
+
+_worker_exception_classes = {}
+
+
+def exception_to_data(exception):
+    if exception is None:
+        return None
+    message = ""
+    if exception.args:
+        message = _text(exception)
+    return dict(type=exception.__class__.__name__, message=message)
+
+
+def make_exception_from_data(data):
+    """Rebuilds an exception object that was raised in a worker process.
+    Builtin exception classes are reused. Other exception classes are
+    emulated by a :class:`WorkerException` subclass with the same name.
+
+    :param data: Exception data (as dict) or None.
+    :return: Exception object (or None).
+    """
+    if data is None:
+        return None
+
+    name = data["type"]
+    message = data["message"]
+    exception_class = getattr(builtins, name, None)
+    if not (isinstance(exception_class, type) and
+            issubclass(exception_class, BaseException)):
+        exception_class = _worker_exception_classes.get(name, None)
+        if exception_class is None:
+            exception_class = type(name, (WorkerException,), {})
+            _worker_exception_classes[name] = exception_class
+
+    args = (message,) if message else ()
+    try:
+        return exception_class(*args)
+    except Exception:   # pylint: disable=broad-except
+        # -- CASE: Builtin exception with other constructor, like:
+        #    UnicodeDecodeError
+        exception_class = _worker_exception_classes.get(name, None)
+        if exception_class is None:
+            exception_class = type(name, (WorkerException,), {})
+            _worker_exception_classes[name] = exception_class
+        return exception_class(*args)
+
+
+def captured_to_data(captured):
+    return [dict(name=part.name, failed=part.failed, stdout=part.stdout,
+                 stderr=part.stderr, log=part.log)
+            for part in captured.captures]
+
+
+def make_element_state(model_element):
+    """Collects the run state of a model element after its test run.
+
+    :param model_element: Model element to use (feature, scenario, step, ...)
+    :return: Run state (as dict with serializable data).
+    """
+    if isinstance(model_element, Background):
+        return dict(use_inheritance=model_element.use_inheritance)
+
+    state = dict(status=model_element.status.name)
+    if isinstance(model_element, Step):
+        state["duration"] = model_element.duration
+    elif isinstance(model_element, TagAndStatusStatement):
+        state["should_skip"] = model_element.should_skip
+        state["skip_reason"] = model_element.skip_reason
+    if isinstance(model_element, Scenario):
+        state["use_background"] = model_element.use_background
+        state["was_dry_run"] = model_element.was_dry_run
+    elif hasattr(model_element, "run_starttime"):
+        # -- CASE: Feature, Rule
+        state["run_starttime"] = model_element.run_starttime
+        state["run_endtime"] = model_element.run_endtime
+
+    state["hook_failed"] = model_element.hook_failed
+    state["error_message"] = model_element.error_message
+    state["exception"] = exception_to_data(model_element.exception)
+    state["captured"] = captured_to_data(model_element.captured)
+    return state
+
+
+def apply_element_state(model_element, state):
+    """Applies the run state (from another process) to a model element.
+
+    :param model_element: Model element to use (feature, scenario, step, ...)
+    :param state: Run state (as dict) from :func:`make_element_state()`.
+    """
+    if isinstance(model_element, Background):
+        if model_element.use_inheritance != state["use_inheritance"]:
+            model_element.use_inheritance = state["use_inheritance"]
+        return
+
+    if isinstance(model_element, Scenario):
+        if model_element.use_background != state["use_background"]:
+            model_element.use_background = state["use_background"]
+        model_element.was_dry_run = state["was_dry_run"]
+    for name in ("duration", "should_skip", "skip_reason",
+                 "run_starttime", "run_endtime"):
+        if name in state:
+            setattr(model_element, name, state[name])
+
+    model_element.hook_failed = state["hook_failed"]
+    model_element.error_message = state["error_message"]
+    model_element.exception = make_exception_from_data(state["exception"])
+    model_element.captured.reset()
+    for part in state["captured"]:
+        model_element.captured.add_captured(Captured(**part), use_merge=False)
+    model_element.set_status(Status.from_name(state["status"]))
+
+
+def make_container_state(container):
+    """Collects the run state of a feature/rule after its (partial) test run
+    in a worker. The status is only provided if it does not depend on the
+    contained scenarios (that may have run in other workers).
+
+    :param container: Feature or Rule.
+    :return: Run state (as dict with serializable data).
+    """
+    state = make_element_state(container)
+    if container.run_items and container.status not in (Status.hook_error,
+                                                         Status.cleanup_error):
+        state["status"] = None
+    return state
+
+
+def apply_container_states(container, states):
+    """Merges the run states of a feature/rule from several workers
+    (each worker runs the hooks of a feature/rule on its own).
+
+    :param container: Feature or Rule.
+    :param states: List of run states from :func:`make_container_state()`.
+    """
+    if not states:
+        return
+
+    container.hook_failed = any(state["hook_failed"] for state in states)
+    container.should_skip = any(state["should_skip"] for state in states)
+    container.skip_reason = None
+    container.error_message = None
+    container.exception = None
+    container.captured.reset()
+    for state in states:
+        for name in ("skip_reason", "error_message"):
+            if getattr(container, name) is None:
+                setattr(container, name, state[name])
+        if container.exception is None:
+            container.exception = make_exception_from_data(state["exception"])
+        for part in state["captured"]:
+            container.captured.add_captured(Captured(**part), use_merge=False)
+    container.run_starttime = min(state["run_starttime"] for state in states)
+    container.run_endtime = max(state["run_endtime"] for state in states)
+
+    statuses = [Status.from_name(state["status"])
+                for state in states if state["status"]]
+    for status in (Status.hook_error, Status.cleanup_error):
+        if status in statuses:
+            container.set_status(status)
+            return
+    if statuses:
+        container.set_status(statuses[0])
+    else:
+        container.clear_status()
+
+
+def match_to_data(match):
+    if match is None or isinstance(match, NoMatch):
+        # -- CASE: Undefined step
+        return None
+
+    arguments = []
+    for argument in match.arguments or []:
+        value = argument.value
+        if not isinstance(value, JSON_SCALAR_TYPES):
+            value = argument.original
+        arguments.append([argument.start, argument.end, argument.original,
+                          value, argument.name])
+    location = None
+    if match.location:
+        location = [match.location.filename, match.location.line]
+    return dict(location=location, arguments=arguments)
+
+
+def make_match_from_data(data):
+    """Rebuilds a step match (without step function) for formatters.
+
+    :param data: Match data (as dict) or None (for: NoMatch).
+    :return: Match object.
+    """
+    if data is None:
+        return NoMatch()
+
+    arguments = [Argument(*params) for params in data["arguments"]]
+    match = Match(func=None, arguments=arguments)
+    if data["location"]:
+        match.location = FileLocation(*data["location"])
+    return match
+
+
+class FormatterEventRecorder:
+    """Records the formatter events (in a worker process)
+    while a feature is running.
+
+    A recorded event refers to its model element by its key
+    (see: :class:`FeatureIndex`).
+    """
+    name = "parallel.recorder"
+    ELEMENT_EVENTS = ("feature", "rule", "background", "scenario",
+                      "step", "result")
+
+    def __init__(self):
+        self.events = []
+
+    def uri(self, uri):
+        pass
+
+    def feature(self, feature):
+        self.events.append(("feature", feature))
+
+    def rule(self, rule):
+        self.events.append(("rule", rule))
+
+    def background(self, background):
+        self.events.append(("background", background))
+
+    def scenario(self, scenario):
+        self.events.append(("scenario", scenario))
+
+    def step(self, step):
+        self.events.append(("step", step))
+
+    def match(self, match):
+        self.events.append(("match", match_to_data(match)))
+
+    def result(self, step):
+        self.events.append(("result", step))
+
+    def embedding(self, mime_type, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        encoded_data = base64.b64encode(data).decode("ascii")
+        self.events.append(("embedding", mime_type, encoded_data))
+
+    def rule_finished(self):
+        self.events.append(("rule_finished",))
+
+    def eof(self):
+        self.events.append(("eof",))
+
+    def close(self):
+        pass
+
+    def take_events_data(self, key_map):
+        """Converts the recorded events into serializable data
+        and forgets them afterwards.
+
+        :param key_map: Key mapping from :meth:`FeatureIndex.make_key_map()`.
+        :return: List of events (as lists).
+        """
+        events_data = []
+        for event in self.events:
+            if event[0] in self.ELEMENT_EVENTS:
+                # -- HINT: Unknown model element is ignored in replay.
+                key = key_map.get(id(event[1]), None)
+                events_data.append([event[0], key])
+            else:
+                events_data.append(list(event))
+        self.events = []
+        return events_data
+
+
+def step_to_data(step, key_map):
+    key = key_map.get(id(step), None)
+    if key is not None:
+        return dict(element=key)
+    return dict(element=None, filename=step.filename, line=step.line,
+                keyword=step.keyword, step_type=step.step_type,
+                name=step.name, text=step.text)
+
+
+# -----------------------------------------------------------------------------
+# WORK UNITS AND SCHEDULING:
+# -----------------------------------------------------------------------------
+def iter_feature_units(feature_index):
+    """Splits a feature into work units.
+
+    A work unit is described by the path of its containers
+    (feature and rule) and its scenario (or None for a container
+    without any run items). Both use element indices of the feature index.
+
+    :param feature_index: Feature index (of the feature) to use.
+    :return: Iterator over pairs ``(container_path, scenario_index)``.
+    """
+    feature = feature_index.feature
+    feature_path = [feature_index.index_of(feature)]
+    if not feature.run_items:
+        yield feature_path, None
+    for run_item in feature.run_items:
+        if isinstance(run_item, Rule):
+            rule_path = feature_path + [feature_index.index_of(run_item)]
+            if not run_item.run_items:
+                yield rule_path, None
+            for inner_run_item in run_item.run_items:
+                for scenario in iter_run_item_scenarios(inner_run_item):
+                    yield rule_path, feature_index.index_of(scenario)
+        else:
+            for scenario in iter_run_item_scenarios(run_item):
+                yield feature_path, feature_index.index_of(scenario)
+
+
+def run_scenario_in_container(runner, container, scenario):
+    """Runs a scenario (or scenario outline row) in the same way as
+    its container (feature, rule) or scenario outline would do it.
+
+    :param runner:     Runner to use (that entered the container).
+    :param container:  Feature or rule that contains the scenario.
+    :param scenario:   Scenario to run.
+    :return: True, if scenario failed.
+    """
+    outline = scenario.parent
+    if not isinstance(outline, ScenarioOutline):
+        return container.run_contained_item(scenario, runner)
+
+    # -- CASE: Scenario of a ScenarioOutline (see: ScenarioOutline.run())
+    # pylint: disable=protected-access
+    config = runner.config
+    if config.name and not outline.should_run_with_name_select(config):
+        scenario.mark_skipped()
+        return False
+    runner.context._set_root_attribute("active_outline", scenario._row)
+    try:
+        return scenario.run(runner)
+    finally:
+        runner.context._set_root_attribute("active_outline", None)
+
+
+def load_scenario_durations(filename):
+    """Loads the scenario durations of an earlier test run
+    from a JSON file (as written by the "json" formatter).
+    The duration of a scenario is the sum of its step durations.
+
+    :param filename: JSON file to use.
+    :return: Scenario durations (as dict: scenario_location -> duration).
+    """
+    with open(filename, encoding="UTF-8") as f:
+        features_data = json.load(f)
+
+    durations = {}
+    for feature_data in features_data:
+        for element in feature_data.get("elements", []):
+            if element.get("type") != "scenario":
+                continue
+            duration = 0.0
+            for step_data in element.get("steps", []):
+                result = step_data.get("result", None) or {}
+                duration += result.get("duration", None) or 0.0
+            durations[element["location"]] = duration
+    return durations
+
+
+def unit_containers(unit):
+    return [(unit["feature"], element_index) for element_index in unit["path"]]
+
+
+class WorkStealingScheduler:
+    """Distributes work units to workers and balances their load.
+
+    * The work units of a feature are assigned to the same worker
+      (the least loaded one, longest feature first).
+      The work units of a feature are ordered by their container
+      (feature, rule) and by their duration (longest first).
+    * An idle worker steals work units from the tail of the queue
+      of the worker with the largest remaining load.
+      Work units of the currently entered feature/rule are preferred.
+    * A worker never receives a work unit of a feature/rule that it has
+      already left. Therefore, the ``before_feature()`` and
+      ``after_feature()`` hooks run only once per feature in each worker.
+
+    A work unit is a dict with the following items:
+
+    * ``feature``: Index of the feature.
+    * ``path``: Element indices of its containers (feature and rule).
+    * ``duration``: Estimated duration (in seconds).
+    """
+
+    def __init__(self, units, workers_count):
+        self.queues = [deque() for _ in range(workers_count)]
+        self.loads = [0.0] * workers_count
+        self.entered = [[] for _ in range(workers_count)]
+        self.left = [set() for _ in range(workers_count)]
+        self.assign_units(units)
+
+    @property
+    def workers_count(self):
+        return len(self.queues)
+
+    def __len__(self):
+        return sum(len(units) for units in self.queues)
+
+    def assign_units(self, units):
+        feature_groups = {}
+        for unit in units:
+            feature_groups.setdefault(unit["feature"], []).append(unit)
+
+        def total_duration(units_):
+            return sum(unit["duration"] for unit in units_)
+
+        for group in sorted(feature_groups.values(),
+                            key=total_duration, reverse=True):
+            worker_id = self.loads.index(min(self.loads))
+            container_groups = {}
+            for unit in group:
+                container_groups.setdefault(tuple(unit["path"]), []).append(unit)
+            for container_group in container_groups.values():
+                container_group.sort(key=lambda unit: unit["duration"],
+                                     reverse=True)
+                self.queues[worker_id].extend(container_group)
+            self.loads[worker_id] += total_duration(group)
+
+    def is_eligible(self, worker_id, unit):
+        left_containers = self.left[worker_id]
+        return not any(container in left_containers
+                       for container in unit_containers(unit))
+
+    def next_unit(self, worker_id):
+        """Selects the next work unit for a worker (that is idle).
+
+        :param worker_id: Worker to use (as index).
+        :return: Work unit (or None, if no work unit is left for this worker).
+        """
+        unit = self._take_own_unit(worker_id) or self._steal_unit(worker_id)
+        if unit is not None:
+            self._enter_containers(worker_id, unit_containers(unit))
+        return unit
+
+    def clear(self):
+        """Removes all remaining work units.
+
+        :return: List of removed work units.
+        """
+        units = []
+        for worker_id, worker_units in enumerate(self.queues):
+            units.extend(worker_units)
+            worker_units.clear()
+            self.loads[worker_id] = 0.0
+        return units
+
+    def _take_unit_at(self, worker_id, position):
+        units = self.queues[worker_id]
+        unit = units[position]
+        del units[position]
+        self.loads[worker_id] -= unit["duration"]
+        return unit
+
+    def _take_own_unit(self, worker_id):
+        for position, unit in enumerate(self.queues[worker_id]):
+            if self.is_eligible(worker_id, unit):
+                return self._take_unit_at(worker_id, position)
+        return None
+
+    def _steal_unit(self, worker_id):
+        victims = [victim for victim in range(self.workers_count)
+                   if victim != worker_id and self.queues[victim]]
+        victims.sort(key=lambda victim: self.loads[victim], reverse=True)
+
+        # -- PREFERRED: Work unit of the currently entered feature.
+        entered = self.entered[worker_id]
+        for victim in victims:
+            if not entered:
+                break
+            units = self.queues[victim]
+            for position in range(len(units)-1, -1, -1):
+                unit = units[position]
+                if (unit_containers(unit)[0] == entered[0] and
+                        self.is_eligible(worker_id, unit)):
+                    return self._take_unit_at(victim, position)
+
+        for victim in victims:
+            units = self.queues[victim]
+            for position in range(len(units)-1, -1, -1):
+                if self.is_eligible(worker_id, units[position]):
+                    return self._take_unit_at(victim, position)
+        return None
+
+    def _enter_containers(self, worker_id, containers):
+        for container in self.entered[worker_id]:
+            if container not in containers:
+                self.left[worker_id].add(container)
+        self.entered[worker_id] = containers
+
+
+# -----------------------------------------------------------------------------
+# WORKER SIDE:
+# -----------------------------------------------------------------------------
+class EnteredContainer:
+    """Feature or Rule that is currently entered by a worker."""
+    __slots__ = ("key", "feature_index", "container", "run_state")
+
+    def __init__(self, key, feature_index, container, run_state):
+        self.key = key
+        self.feature_index = feature_index
+        self.container = container
+        self.run_state = run_state
+
+
+class ParallelWorker(Runner):
+    """Runs the work units, that are provided by the parent process,
+    in a worker process and sends back their results.
+
+    A worker enters the containers (feature, rule) of a work unit
+    before it runs the scenario. It leaves them when it receives a work unit
+    of another container (or when all work units are processed).
+
+    MESSAGES (as dict with "type" key):
+
+    * ``container_started``: worker entered a feature/rule
+    * ``container_finished``: worker left a feature/rule (after its hooks)
+    * ``unit_done``: result of a work unit (scenario run)
+    * ``worker_error``: worker could not be started
+    * ``worker_done``: worker is finished (after ``after_all()`` hook)
+    """
+
+    def __init__(self, config, worker_id=0):
+        super(ParallelWorker, self).__init__(config)
+        self.worker_id = worker_id
+        self.step_registry = the_step_registry
+        self.recorder = FormatterEventRecorder()
+        self.feature_indexes = {}
+        self.entered_containers = []
+        self.result_queue = None
+        self.parse_cache = None
+        self.hook_durations_reporter = None
+
+    def run_worker(self, task_queue, result_queue, stop_event):
+        self.result_queue = result_queue
+        with self.path_manager:
+            try:
+                self.setup_paths()
+                self.context = Context(self)
+                self.load_hooks()
+                # -- HINT: Step-modules load report is shown by the main process.
+                self.config.steps_load_report = False
+                self.load_step_definitions()
+                self.parse_cache = self.make_parse_cache()
+            except Exception:   # pylint: disable=broad-except
+                result_queue.put(dict(type="worker_error",
+                                      worker=self.worker_id,
+                                      message=traceback.format_exc()))
+                return
+            self.run_units(task_queue, stop_event)
+
+    def send(self, message_type, **data):
+        data.update(type=message_type, worker=self.worker_id)
+        self.result_queue.put(data)
+
+    def run_units(self, task_queue, stop_event):
+        self.hook_failures = 0
+        self.setup_step_match_cache()
+        self.setup_hook_observers()
+        self.formatters = [self.recorder]
+        self.setup_event_loop()
+        try:
+            self._run_units(task_queue, stop_event)
+        finally:
+            self.teardown_event_loop()
+
+    def _run_units(self, task_queue, stop_event):
+        self.run_hook("before_all")
+        while True:
+            try:
+                unit = task_queue.get()
+            except KeyboardInterrupt:
+                self.abort(reason="KeyboardInterrupt")
+                continue
+            if unit is None:
+                # -- END-OF-UNITS: Sentinel was received.
+                break
+
+            if stop_event.is_set() or self.aborted:
+                result = dict(executed=False, failed=False)
+            else:
+                result = self.run_unit(unit)
+            self.send("unit_done", unit=unit["id"], aborted=self.aborted,
+                      **result)
+
+        # -- AFTER-ALL:
+        # pylint: disable=protected-access, broad-except
+        cleanups_failed = False
+        try:
+            self.leave_containers(0)
+        except KeyboardInterrupt:
+            self.abort(reason="KeyboardInterrupt")
+        self.formatters = []
+        self.run_hook_with_capture("after_all")
+        try:
+            self.context._do_remaining_cleanups()
+        except Exception:
+            cleanups_failed = True
+        hook_durations = []
+        if self.hook_durations_reporter:
+            hook_durations = self.hook_durations_reporter.make_hook_durations_data()
+        self.send("worker_done", hook_failures=self.hook_failures,
+                  cleanups_failed=cleanups_failed, aborted=self.aborted,
+                  hook_durations=hook_durations)
+
+    def setup_hook_observers(self):
+        """Records the hook durations in the worker (if needed).
+        They are sent back to the parent process (with: ``worker_done``).
+        """
+        self.hook_observers = []
+        config = self.config
+        if config.step_durations or config.step_durations_output:
+            self.hook_durations_reporter = StepDurationsReporter(config)
+            self.hook_observers = [
+                self.hook_durations_reporter.record_hook_duration
+            ]
+
+    def get_feature_index(self, unit):
+        feature_id = unit["feature"]
+        feature_index = self.feature_indexes.get(feature_id, None)
+        if feature_index is None:
+            locations = [FileLocation(filename, line)
+                         for filename, line in unit["locations"]]
+            features = parse_features(locations, language=self.config.lang,
+                                      parse_cache=self.parse_cache)
+            self.features.append(features[0])
+            feature_index = FeatureIndex(features[0])
+            self.feature_indexes[feature_id] = feature_index
+        return feature_index
+
+    def enter_containers(self, feature_index, keys):
+        """Leaves the entered containers that are not needed anymore
+        and enters the containers of the next work unit.
+
+        :return: True, if all containers were entered (and should run).
+        """
+        depth = 0
+        while (depth < len(self.entered_containers) and depth < len(keys) and
+               self.entered_containers[depth].key == keys[depth]):
+            depth += 1
+        self.leave_containers(depth)
+
+        for key in keys[depth:]:
+            if (self.entered_containers and
+                    self.entered_containers[-1].run_state.skip_untested):
+                # -- CASE: Outer container is skipped (or hook failed).
+                return False
+
+            container = feature_index.elements[key[1]]
+            if isinstance(container, Feature):
+                self.feature = container
+            run_state = container.start_run(self)
+            self.entered_containers.append(
+                EnteredContainer(key, feature_index, container, run_state))
+            self.send("container_started", feature=key[0], element=key[1],
+                      events=self.recorder.take_events_data(
+                          feature_index.make_key_map()))
+        return not self.entered_containers[-1].run_state.skip_untested
+
+    def leave_containers(self, depth):
+        """Leaves the entered containers (innermost first)
+        until only ``depth`` containers are entered.
+        """
+        while len(self.entered_containers) > depth:
+            entered = self.entered_containers.pop()
+            container = entered.container
+            failed = container.finish_run(self, entered.run_state)
+            background_state = None
+            if container.background:
+                background_state = make_element_state(container.background)
+            self.send("container_finished",
+                      feature=entered.key[0], element=entered.key[1],
+                      failed=failed, state=make_container_state(container),
+                      background_state=background_state,
+                      events=self.recorder.take_events_data(
+                          entered.feature_index.make_key_map()))
+            if isinstance(container, Feature):
+                self.feature_indexes.pop(entered.key[0], None)
+
+    def run_unit(self, unit):
+        undefined_steps_initial_size = len(self.undefined_steps)
+        feature_index = None
+        scenario = None
+        try:
+            feature_index = self.get_feature_index(unit)
+            failed = False
+            if self.enter_containers(feature_index, unit_containers(unit)):
+                if unit["scenario"] is not None:
+                    scenario = feature_index.elements[unit["scenario"]]
+                    container = self.entered_containers[-1].container
+                    failed = self.run_scenario(container, scenario)
+        except KeyboardInterrupt:
+            self.abort(reason="KeyboardInterrupt")
+            return dict(executed=False, failed=True)
+        except Exception:   # pylint: disable=broad-except
+            self.recorder.events = []
+            return dict(executed=False, failed=True,
+                        error=traceback.format_exc())
+
+        # -- STEP: Make serializable result.
+        key_map = feature_index.make_key_map(scenario)
+        undefined_steps = [step_to_data(step, key_map)
+                           for step in
+                           self.undefined_steps[undefined_steps_initial_size:]]
+        states = []
+        if scenario is not None:
+            states.append(make_element_state(scenario))
+            states.extend(make_element_state(step)
+                          for step in scenario.all_steps)
+        return dict(executed=True, failed=failed, states=states,
+                    events=self.recorder.take_events_data(key_map),
+                    undefined_steps=undefined_steps)
+
+    def run_scenario(self, container, scenario):
+        """Runs a scenario (or scenario outline row) in the same way as
+        its container/scenario outline would do it.
+        """
+        return run_scenario_in_container(self, container, scenario)
+
+
+def run_worker(config, worker_id, task_queue, result_queue, stop_event):
+    """Entry point of a worker process."""
+    worker = ParallelWorker(config, worker_id=worker_id)
+    worker.run_worker(task_queue, result_queue, stop_event)
+
+
+# -----------------------------------------------------------------------------
+# PARENT SIDE:
+# -----------------------------------------------------------------------------
+def group_feature_locations(feature_locations):
+    """Groups file locations that refer to the same feature file
+    (in the same way as :func:`behave.runner_util.parse_features()` does).
+
+    :param feature_locations: List of file locations.
+    :return: List of groups (as list of file locations).
+    """
+    groups = []
+    for location in feature_locations:
+        if not isinstance(location, FileLocation):
+            location = FileLocation(location)
+        if groups and groups[-1][0].filename == location.filename:
+            groups[-1].append(location)
+        else:
+            groups.append([location])
+    return groups
+
+
+def select_feature_location_groups(feature_locations, features):
+    """Selects the groups of file locations that belong to the parsed features
+    (groups of feature files without any feature are skipped).
+
+    :param feature_locations: List of file locations (used to parse features).
+    :param features: List of parsed features (from these file locations).
+    :return: List of groups (as list of file locations), one for each feature.
+    """
+    selected = []
+    features = list(features)
+    for locations in group_feature_locations(feature_locations):
+        if len(selected) == len(features):
+            break
+        feature = features[len(selected)]
+        filename = os.path.abspath(locations[0].filename)
+        if filename == os.path.abspath(feature.filename):
+            selected.append(locations)
+    return selected
+
+
+class FeatureResultCollector:
+    """Collects the results of a feature from the workers
+    until the feature is completed.
+    """
+    CLOSE_EVENTS = dict(feature=[["eof"]], rule=[["rule_finished"]])
+
+    def __init__(self, feature_index):
+        self.feature_index = feature_index
+        self.remaining_units = 0
+        self.entered_count = 0
+        self.failed = False
+        self.start_events = {}
+        self.finish_events = {}
+        self.container_states = {}
+        self.background_states = {}
+        self.unit_results = {}
+
+    @property
+    def feature(self):
+        return self.feature_index.feature
+
+    @property
+    def started(self):
+        return bool(self.start_events)
+
+    def is_completed(self):
+        return self.remaining_units == 0 and self.entered_count == 0
+
+    def add_container_started(self, message):
+        self.entered_count += 1
+        self.start_events.setdefault(message["element"], message["events"])
+
+    def add_container_finished(self, message):
+        element_index = message["element"]
+        self.entered_count -= 1
+        self.finish_events.setdefault(element_index, message["events"])
+        self.container_states.setdefault(element_index, []).append(
+            message["state"])
+        if message["background_state"] is not None:
+            self.background_states.setdefault(element_index,
+                                              message["background_state"])
+        if message["failed"]:
+            self.failed = True
+
+    def add_unit_result(self, unit, result):
+        self.remaining_units -= 1
+        if result.get("executed"):
+            self.unit_results[unit["scenario"]] = result
+        if result["failed"]:
+            self.failed = True
+
+    def apply_states(self):
+        feature_index = self.feature_index
+        for element_index, states in self.container_states.items():
+            container = feature_index.elements[element_index]
+            apply_container_states(container, states)
+            background_state = self.background_states.get(element_index)
+            if background_state:
+                apply_element_state(container.background, background_state)
+
+        for scenario_index, result in self.unit_results.items():
+            if scenario_index is None or not result["states"]:
+                continue
+            scenario = feature_index.elements[scenario_index]
+            scenario_state = result["states"][0]
+            apply_element_state(scenario, scenario_state)
+            for step, state in zip(scenario.all_steps, result["states"][1:]):
+                apply_element_state(step, state)
+
+    def compose_events(self, container=None):
+        """Composes the events in the original order of the model elements.
+
+        :return: List of events.
+        """
+        if container is None:
+            container = self.feature
+        element_index = self.feature_index.index_of(container)
+        if element_index not in self.start_events:
+            return []
+
+        events = list(self.start_events[element_index])
+        for run_item in container.run_items:
+            if isinstance(run_item, Rule):
+                events.extend(self.compose_events(run_item))
+                continue
+            for scenario in iter_run_item_scenarios(run_item):
+                result = self.unit_results.get(
+                    self.feature_index.index_of(scenario), None)
+                if result:
+                    events.extend(result["events"])
+        events.extend(self.finish_events.get(element_index,
+                                             self.CLOSE_EVENTS[container.type]))
+        return events
+
+    def iter_undefined_steps(self):
+        scenario_indexes = [scenario_index for scenario_index in self.unit_results
+                            if scenario_index is not None]
+        for scenario_index in sorted(scenario_indexes):
+            for data in self.unit_results[scenario_index]["undefined_steps"]:
+                yield data
+
+
+class ParallelRunner(Runner):
+    """Test runner that runs scenarios in parallel by using worker processes.
+    The number of worker processes is specified with the ``--jobs`` option.
+
+    Falls back to the behaviour of the :class:`behave.runner.Runner`
+    if only one job is used or in dry-run mode.
+    """
+
+    def __init__(self, config):
+        super(ParallelRunner, self).__init__(config)
+        self.feature_locations_data = []
+        self.workers = []
+        self.task_queues = []
+        self.result_queue = None
+        self.stop_event = None
+
+    @property
+    def jobs(self):
+        return self.config.jobs
+
+    def should_run_in_parallel(self):
+        return self.jobs > 1 and not self.config.dry_run
+
+    def make_worker_config(self):
+        # -- NOTE: Formatters and reporters are only used in this process.
+        config = copy.copy(self.config)
+        config.outputs = []
+        config.reporters = []
+        return config
+
+    def load_scenario_durations(self):
+        filename = getattr(self.config, "parallel_durations", None)
+        if not filename:
+            return {}
+        try:
+            return load_scenario_durations(filename)
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as e:
+            print("BAD-DURATIONS-FILE: %s (IGNORED; %s: %s)" % \
+                  (filename, e.__class__.__name__, e), file=sys.stderr)
+        return {}
+
+    def make_units(self, feature_indexes):
+        """Splits the features into work units (with estimated durations).
+
+        :param feature_indexes: Feature indexes (one per feature).
+        :return: List of work units.
+        """
+        durations = self.load_scenario_durations()
+        unit_params = []
+        for feature_id, feature_index in enumerate(feature_indexes):
+            for path, scenario_index in iter_feature_units(feature_index):
+                location = None
+                if scenario_index is not None:
+                    scenario = feature_index.elements[scenario_index]
+                    location = str(scenario.location)
+                unit_params.append((feature_id, path, scenario_index, location))
+
+        known_durations = [durations[params[3]] for params in unit_params
+                           if params[3] in durations]
+        default_duration = DEFAULT_SCENARIO_DURATION
+        if known_durations:
+            default_duration = sum(known_durations) / len(known_durations)
+
+        units = []
+        for feature_id, path, scenario_index, location in unit_params:
+            duration = 0.0
+            if location is not None:
+                duration = durations.get(location, default_duration)
+            units.append(dict(id=len(units), feature=feature_id, path=path,
+                              scenario=scenario_index, duration=duration,
+                              locations=self.feature_locations_data[feature_id]))
+        return units
+
+    def run_with_paths(self):
+        if not self.should_run_in_parallel():
+            return super(ParallelRunner, self).run_with_paths()
+
+        self.context = Context(self)
+
+        # -- STEP: Parse all feature files (by using their file location).
+        self.clear_parse_cache()
+        feature_locations = self.select_feature_locations()
+        features = parse_features(feature_locations, language=self.config.lang,
+                                  parse_cache=self.make_parse_cache(),
+                                  jobs=self.config.parse_jobs)
+        self.features.extend(features)
+        self.feature_locations_data = [
+            [[location.filename, location.line] for location in locations]
+            for locations in select_feature_location_groups(feature_locations,
+                                                            features)
+        ]
+        feature_indexes = [FeatureIndex(feature) for feature in self.features]
+        units = self.make_units(feature_indexes)
+
+        # -- STEP: Start workers before this process loads its step modules.
+        self.start_workers(min(self.jobs, len(units)))
+        try:
+            # -- NEEDED-FOR: Formatters that use the step registry and
+            #    to detect bad hooks/step modules in the same way as Runner.
+            self.load_hooks()
+            self.load_step_definitions()
+            stream_openers = self.config.outputs
+            self.formatters = make_formatters(self.config, stream_openers)
+        except Exception:
+            self.terminate_workers()
+            raise
+        return self.run_model_with_workers(feature_indexes, units)
+
+    # -- WORKER MANAGEMENT:
+    def start_workers(self, count):
+        # -- AVOID: Output duplication in forked processes.
+        sys.stdout.flush()
+        sys.stderr.flush()
+        mp_context = multiprocessing.get_context()
+        self.result_queue = mp_context.Queue()
+        self.stop_event = mp_context.Event()
+        worker_config = self.make_worker_config()
+        for worker_id in range(count):
+            task_queue = mp_context.Queue()
+            worker = mp_context.Process(target=run_worker,
+                                        args=(worker_config, worker_id,
+                                              task_queue,
+                                              self.result_queue,
+                                              self.stop_event),
+                                        name="behave-worker-%d" % worker_id,
+                                        daemon=True)
+            worker.start()
+            self.task_queues.append(task_queue)
+            self.workers.append(worker)
+
+    def terminate_workers(self):
+        for worker in self.workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+
+    def select_dead_workers(self, worker_ids):
+        return [worker_id for worker_id in worker_ids
+                if not self.workers[worker_id].is_alive()]
+
+    # -- RUN MODEL:
+    def run_model_with_workers(self, feature_indexes, units):
+        # pylint: disable=too-many-branches, too-many-statements
+        # pylint: disable=too-many-locals
+        collectors = [FeatureResultCollector(feature_index)
+                      for feature_index in feature_indexes]
+        for unit in units:
+            collectors[unit["feature"]].remaining_units += 1
+        scheduler = WorkStealingScheduler(units, len(self.workers))
+        outstanding_units = {}      # MAPS: worker_id -> unit
+        entered_containers = {}     # MAPS: worker_id -> set of (feature, element)
+        active_workers = set(range(len(self.workers)))
+        hook_failures = 0
+        cleanups_failed = False
+        next_index = 0
+        run_feature = True
+        failed_count = 0
+        undefined_steps_initial_size = len(self.undefined_steps)
+
+        def dispatch_unit(worker_id):
+            unit = None
+            if run_feature:
+                unit = scheduler.next_unit(worker_id)
+            if unit is None:
+                # -- NO MORE WORK: Worker should finish (after_all hook).
+                self.task_queues[worker_id].put(None)
+                return
+            outstanding_units[worker_id] = unit
+            self.task_queues[worker_id].put(unit)
+
+        def drop_worker(worker_id):
+            active_workers.discard(worker_id)
+            unit = outstanding_units.pop(worker_id, None)
+            if unit is not None:
+                collectors[unit["feature"]].add_unit_result(
+                    unit, dict(executed=False, failed=True))
+            for feature_id, _ in entered_containers.pop(worker_id, set()):
+                collectors[feature_id].entered_count -= 1
+
+        for worker_id in range(len(self.workers)):
+            dispatch_unit(worker_id)
+
+        while active_workers:
+            try:
+                message = self.result_queue.get(timeout=POLL_TIMEOUT)
+            except queue.Empty:
+                # -- DIAGNOSTICS: Detect workers that died unexpectedly.
+                for worker_id in self.select_dead_workers(active_workers):
+                    print("WORKER-ERROR: behave-worker-%d died (exitcode=%s)" % \
+                          (worker_id, self.workers[worker_id].exitcode),
+                          file=sys.stderr)
+                    drop_worker(worker_id)
+                message = None
+            except KeyboardInterrupt:
+                self.abort(reason="KeyboardInterrupt")
+                self.stop_event.set()
+                message = None
+
+            message_type = message and message["type"]
+            worker_id = message and message["worker"]
+            if message_type == "container_started":
+                collectors[message["feature"]].add_container_started(message)
+                entered_containers.setdefault(worker_id, set()).add(
+                    (message["feature"], message["element"]))
+            elif message_type == "container_finished":
+                collectors[message["feature"]].add_container_finished(message)
+                entered_containers.get(worker_id, set()).discard(
+                    (message["feature"], message["element"]))
+                if message["failed"]:
+                    failed_count += 1
+            elif message_type == "unit_done":
+                unit = outstanding_units.pop(worker_id)
+                collectors[unit["feature"]].add_unit_result(unit, message)
+                if message.get("error"):
+                    print(message["error"], file=sys.stderr)
+                if message["failed"]:
+                    failed_count += 1
+                if message["aborted"] and not self.aborted:
+                    self.abort(reason="ABORTED in worker")
+            elif message_type == "worker_error":
+                print("WORKER-ERROR: behave-worker-%d\n%s" % \
+                      (worker_id, message["message"]), file=sys.stderr)
+                drop_worker(worker_id)
+            elif message_type == "worker_done":
+                active_workers.discard(worker_id)
+                hook_failures += message["hook_failures"]
+                cleanups_failed = cleanups_failed or message["cleanups_failed"]
+                self.add_hook_durations_data(message["hook_durations"])
+                if message["aborted"] and not self.aborted:
+                    self.abort(reason="ABORTED in worker")
+
+            if run_feature and ((failed_count and self.config.stop)
+                                or self.aborted):
+                # -- FAIL-EARLY: After first failure (or if aborted).
+                run_feature = False
+                self.stop_event.set()
+                for unit in scheduler.clear():
+                    collectors[unit["feature"]].add_unit_result(
+                        unit, dict(executed=False, failed=False))
+            if message_type == "unit_done":
+                dispatch_unit(worker_id)
+
+            # -- REPORT RESULTS: In the original order of the features.
+            while (next_index < len(collectors) and
+                   collectors[next_index].is_completed()):
+                self.report_feature_result(collectors[next_index])
+                next_index += 1
+
+        # -- NOT-RUN UNITS: All workers are gone (dead or finished).
+        for unit in scheduler.clear():
+            collectors[unit["feature"]].add_unit_result(
+                unit, dict(executed=False, failed=run_feature))
+        for collector in collectors[next_index:]:
+            self.report_feature_result(collector)
+
+        for worker in self.workers:
+            worker.join(SHUTDOWN_TIMEOUT)
+        self.terminate_workers()
+        self.hook_failures += hook_failures
+        if self.aborted:
+            print("\nABORTED: By user.")
+        for formatter in self.formatters:
+            formatter.close()
+        for reporter in self.config.reporters:
+            reporter.end()
+
+        failed = ((failed_count > 0) or self.aborted or (self.hook_failures > 0)
+                  or (len(self.undefined_steps) > undefined_steps_initial_size)
+                  or cleanups_failed or any(c.failed for c in collectors))
+        return failed
+
+    def add_hook_durations_data(self, data):
+        """Adds the hook durations of a worker to the reporters
+        (like: step durations reporter).
+        """
+        for reporter in self.config.reporters:
+            if hasattr(reporter, "add_hook_durations_data"):
+                reporter.add_hook_durations_data(data)
+
+    def report_feature_result(self, collector):
+        """Replays the results of a feature (from the worker processes)
+        to the formatters and reporters (of this process).
+        """
+        feature = collector.feature
+        if collector.started:
+            self.replay_feature_result(collector)
+        for reporter in self.config.reporters:
+            reporter.feature(feature)
+
+    def replay_feature_result(self, collector):
+        feature_index = collector.feature_index
+        collector.apply_states()
+
+        self.feature = collector.feature
+        for formatter in self.formatters:
+            formatter.uri(collector.feature.filename)
+        for event in collector.compose_events():
+            self.replay_event(event, feature_index)
+
+        for data in collector.iter_undefined_steps():
+            key = data["element"]
+            if key is not None:
+                step = feature_index.get_element(key)
+            else:
+                step = Step(data["filename"], data["line"], data["keyword"],
+                            data["step_type"], data["name"], text=data["text"])
+            self.undefined_steps.append(step)
+
+    def replay_event(self, event, feature_index):
+        event_name = event[0]
+        if event_name in FormatterEventRecorder.ELEMENT_EVENTS:
+            key = event[1]
+            if key is None:
+                return  # -- UNKNOWN MODEL ELEMENT: Ignored.
+            args = (feature_index.get_element(key),)
+        elif event_name == "match":
+            args = (make_match_from_data(event[1]),)
+        elif event_name == "embedding":
+            args = (event[1], base64.b64decode(event[2]))
+        else:
+            # -- CASE: rule_finished, eof
+            args = ()
+
+        for formatter in self.formatters:
+            formatter_func = getattr(formatter, event_name, None)
+            if formatter_func:
+                formatter_func(*args)
+
+
+# -----------------------------------------------------------------------------
+# REGISTER RUNNER-CLASSES:
+# -----------------------------------------------------------------------------
+ITestRunner.register(ParallelRunner)
@@ -0,0 +1,172 @@
+"""
+This module provides a test runner that runs scenarios concurrently
+in a pool of worker threads (``--runner=threads``).
+
+It is intended for test suites with I/O-bound synchronous steps
+(like: blocking HTTP requests or database calls), where the GIL is not
+the bottleneck and where worker processes (``--runner=parallel``) would
+duplicate an expensive test environment setup.
+
+PRINCIPLE:
+
+* The features run one after another. The hooks of a feature or rule
+  run in the main thread (like with the default runner).
+* The scenarios of a feature (or rule) are run concurrently by the
+  worker threads. The number of worker threads is specified with ``--jobs``.
+* Each scenario uses its own context layer (on top of the context layers
+  of its feature and rule) and its own output capture
+  (by using thread-local stream proxies, see: :mod:`behave.capture_local`).
+* The formatter events and the (not captured) output of each scenario are
+  recorded and replayed in the original order of the scenarios.
+* Async-steps are run on the event loop of the test run
+  (that runs in a background thread while the scenarios run).
+
+EXAMPLE:
+
+.. code-block:: sh
+
+    $ behave --runner=threads --jobs=8 features/
+
+.. note::
+
+    The ``before_all()`` and ``after_all()`` hooks run once (in the main thread).
+    Resources that are created in the ``before_all()`` hook
+    (or in a feature/rule hook) are shared by the scenarios.
+    Therefore, they must be safe to use from several threads.
+
+.. versionadded:: 1.4.0
+"""
+
+import contextvars
+import threading
+
+from behave.api.runner import ITestRunner
+from behave.model import Rule
+from behave.runner_async import ConcurrentRunner
+from behave.runner_parallel import iter_run_item_scenarios
+
+
+# -----------------------------------------------------------------------------
+# CLASSES:
+# -----------------------------------------------------------------------------
+class ThreadPoolRunner(ConcurrentRunner):
+    """Test runner that runs the scenarios of a feature (or rule)
+    concurrently in a pool of worker threads.
+    The number of worker threads is specified with the ``--jobs`` option.
+
+    Falls back to the behaviour of the :class:`behave.runner.Runner`
+    if only one job is used or in dry-run mode.
+    """
+    THREAD_NAME_PREFIX = "behave-thread"
+
+    def __init__(self, config):
+        super(ThreadPoolRunner, self).__init__(config)
+        self.event_loop_thread = None
+
+    def run_features(self, features):
+        if not self.should_run_concurrently():
+            return super(ThreadPoolRunner, self).run_features(features)
+
+        self.setup_workers()
+        self.start_event_loop_thread()
+        failed_count = 0
+        try:
+            for feature in features:
+                if not self.should_stop():
+                    self.feature = feature
+                    for formatter in self.formatters:
+                        formatter.uri(feature.filename)
+                    if self.run_container(feature):
+                        failed_count += 1
+
+                # -- ALWAYS: Report run/not-run feature to reporters.
+                for reporter in self.config.reporters:
+                    reporter.feature(feature)
+        except KeyboardInterrupt:
+            self.abort(reason="KeyboardInterrupt")
+            failed_count += 1
+        finally:
+            self.teardown_workers()
+            self.stop_event_loop_thread()
+        return failed_count
+
+    def start_event_loop_thread(self):
+        """Runs the event loop of the test run in a background thread
+        (while the scenarios run). Async-steps of the worker threads
+        and async-hooks of the main thread are run on this event loop.
+        """
+        started = threading.Event()
+        self.event_loop.call_soon(started.set)
+        self.event_loop_thread = threading.Thread(
+            target=self.event_loop.run_forever,
+            name="%s.event_loop" % self.THREAD_NAME_PREFIX, daemon=True)
+        self.event_loop_thread.start()
+        started.wait()
+
+    def stop_event_loop_thread(self):
+        if self.event_loop_thread is None:
+            return
+
+        self.event_loop.call_soon_threadsafe(self.event_loop.stop)
+        self.event_loop_thread.join()
+        self.event_loop_thread = None
+
+    def run_container(self, container):
+        """Runs a feature or rule: Its hooks run in the main thread,
+        its scenarios run concurrently in the worker threads.
+        Its rules run one after another.
+
+        :return: True, if the feature or rule failed.
+        """
+        run_state = container.start_run(self)
+        if not run_state.skip_untested:
+            scenario_tasks = []
+            for run_item in container.run_items:
+                if isinstance(run_item, Rule):
+                    # -- ENSURE: Scenarios before the rule are reported first.
+                    self.report_scenario_tasks(scenario_tasks, run_state)
+                    scenario_tasks = []
+                    if not self.should_stop() and self.run_container(run_item):
+                        run_state.failed_count += 1
+                    continue
+                for scenario in iter_run_item_scenarios(run_item):
+                    scenario_tasks.append(self.submit_scenario(container,
+                                                               scenario))
+            self.report_scenario_tasks(scenario_tasks, run_state)
+
+        failed = container.finish_run(self, run_state)
+        if failed and self.config.stop:
+            self.stopped = True
+        return failed
+
+    def submit_scenario(self, container, scenario):
+        """Submits a scenario to the worker threads.
+
+        :return: Tuple (task_runner, future) of the scenario.
+        """
+        runner = self.make_task_runner(self)
+        context = contextvars.copy_context()
+        future = self.executor.submit(context.run, self._call_with_task_output,
+                                      runner, self.run_scenario,
+                                      runner, container, scenario)
+        return (runner, future)
+
+    def report_scenario_tasks(self, scenario_tasks, run_state):
+        """Waits until each scenario is finished and replays its events
+        (in the original order of the scenarios).
+        """
+        for runner, future in scenario_tasks:
+            failed = future.result()
+            if failed is None:
+                continue    # -- NOT RUN: After failure (or aborted).
+            result = self.make_task_result(runner, failed,
+                                           runner.recorder.take_events())
+            self.replay_events(result.events)
+            if failed:
+                run_state.failed_count += 1
+
+
+# -----------------------------------------------------------------------------
+# REGISTER RUNNER-CLASSES:
+# -----------------------------------------------------------------------------
+ITestRunner.register(ThreadPoolRunner)
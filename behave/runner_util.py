@@ -7,10 +7,13 @@ Contains utility functions and classes for Runners.
 
 from bisect import bisect
 from collections import OrderedDict
+from contextlib import contextmanager
+import gc
 import glob
 import os.path
 import re
 import sys
+import time
 
 from behave import parser as gherkin
 from behave._types import require_type, require_not_none
@@ -20,6 +23,7 @@ from behave.exception import (
 )
 from behave.model_type import FileLocation
 from behave.model import Feature, Rule, ScenarioOutline, Scenario
+from behave.parse_cache import FeatureParseCache, dump_feature, load_feature
 from behave.textutil import ensure_stream_with_encoder
 # USE-LAZY-IMPORT: from behave.step_registry import setup_step_decorators
 
@@ -461,10 +465,105 @@ class PathManager:
             self.paths.append(path)
 
 
+def _parse_feature_files(filenames, language=None, cache_dir=None):
+    """Parse feature files in a worker process of the process pool.
+
+    :return: List of tuple(data, error) for each feature file
+        (data: serialized feature, if the feature file contains one).
+    """
+    parse_cache = None
+    if cache_dir:
+        parse_cache = FeatureParseCache(cache_dir)
+
+    # -- HINT: No GC runs needed (worker process is stopped after parsing).
+    gc.disable()
+    results = []
+    for filename in filenames:
+        try:
+            if parse_cache is not None:
+                feature = parse_cache.parse_file(filename, language=language)
+            else:
+                feature = gherkin.parse_file(filename, language=language)
+            # -- HINT: Serialized here to load it faster in the parent process.
+            data = feature and dump_feature(feature)
+            results.append((data, None))
+        except Exception as e:  # pylint: disable=broad-except
+            results.append((None, e))
+    return results
+
+
+class FeatureFileParser:
+    """
+    Parses feature files (with the parse cache, if it is provided).
+    Feature files can be parsed in advance by using a process pool
+    (if more than one job is used).
+
+    The parsed features of the process pool are provided in the same way
+    as the serial path does. A :class:`~behave.parser.ParserError` is raised
+    when the feature file with the parse error is requested.
+
+    .. versionadded:: 1.4.0
+    """
+    CHUNKS_PER_JOB = 4
+
+    def __init__(self, language=None, parse_cache=None, jobs=1):
+        if not jobs:
+            jobs = os.cpu_count() or 1
+        self.language = language
+        self.parse_cache = parse_cache
+        self.jobs = jobs
+        self.prepared = {}
+
+    def prepare(self, filenames):
+        """Parse these feature files in advance by using a process pool.
+
+        :param filenames:  List of feature files (in the order of use).
+        """
+        # pylint: disable=import-outside-toplevel
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        jobs = min(self.jobs, len(filenames))
+        if jobs <= 1:
+            return
+
+        cache_dir = getattr(self.parse_cache, "directory", None)
+        chunk_size = max(1, len(filenames) // (jobs * self.CHUNKS_PER_JOB))
+        chunks = [filenames[index:index + chunk_size]
+                  for index in range(0, len(filenames), chunk_size)]
+        mp_context = multiprocessing.get_context()
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context) as pool:
+            futures = [pool.submit(_parse_feature_files, chunk,
+                                   self.language, cache_dir)
+                       for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                for filename, result in zip(chunk, future.result()):
+                    self.prepared.setdefault(filename, []).append(result)
+
+    def parse_file(self, filename):
+        """Provides the parsed feature of a feature file.
+
+        :param filename:  Feature file to parse.
+        :return: Feature object (or None, if the file contains no feature).
+        :raises ParserError: If the feature file could not be parsed.
+        """
+        results = self.prepared.get(filename, None)
+        if results:
+            data, error = results.pop(0)
+            if error is not None:
+                raise error
+            return data and load_feature(data)
+
+        # -- SERIAL PATH:
+        if self.parse_cache is not None:
+            return self.parse_cache.parse_file(filename, language=self.language)
+        return gherkin.parse_file(filename, language=self.language)
+
+
 # -----------------------------------------------------------------------------
 # FUNCTIONS:
 # -----------------------------------------------------------------------------
-def parse_features(feature_files, language=None):
+def parse_features(feature_files, language=None, parse_cache=None, jobs=1):
     """
     Parse feature files and return list of Feature model objects.
     Handles:
@@ -474,15 +573,42 @@ def parse_features(feature_files, language=None):
 
     :param feature_files: List of feature file names to parse.
     :param language:      Default language to use.
+    :param parse_cache:   Parse cache to use (optional, since: 1.4.0).
+    :param jobs:          Number of processes to parse the feature files
+                          (optional, since: 1.4.0).
     :return: List of feature objects.
     """
-    scenario_collector = FeatureScenarioLocationCollector2()
-    features = []
+    locations = []
     for location in feature_files:
         if not isinstance(location, FileLocation):
             require_type(location, str)
             location = FileLocation(os.path.normpath(location))
-
+        locations.append(location)
+
+    file_parser = FeatureFileParser(language, parse_cache, jobs=jobs)
+    if jobs != 1 and len(locations) > 1:
+        filenames = []
+        for location in locations:
+            filename = os.path.abspath(location.filename)
+            if not filenames or filenames[-1] != filename:
+                filenames.append(filename)
+        file_parser.prepare(filenames)
+
+    # -- HINT: Pause the garbage collector while the model objects are created.
+    # Otherwise, parsing many features is dominated by GC runs.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _collect_features(locations, file_parser)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _collect_features(locations, file_parser):
+    scenario_collector = FeatureScenarioLocationCollector2()
+    features = []
+    for location in locations:
         if location.filename == scenario_collector.filename:
             scenario_collector.add_location(location)
             continue
@@ -495,7 +621,7 @@ def parse_features(feature_files, language=None):
         # -- NEW FEATURE:
         require_type(location, FileLocation)
         filename = os.path.abspath(location.filename)
-        feature = gherkin.parse_file(filename, language=language)
+        feature = file_parser.parse_file(filename)
         if feature:
             # -- VALID FEATURE:
             # SKIP CORNER-CASE: Feature file without any feature(s).
@@ -508,6 +634,24 @@ def parse_features(feature_files, language=None):
     return features
 
 
+def collect_feature_tags(features):
+    """Collects the tags that are used in the features
+    (by the features, rules, scenario outlines and scenarios).
+
+    :param features: List of features to use.
+    :return: Set of tags.
+
+    .. versionadded:: 1.4.0
+    """
+    tags = set()
+    for feature in features:
+        tags.update(feature.tags)
+        for model_element in feature.walk_scenarios(with_outlines=True,
+                                                    with_rules=True):
+            tags.update(model_element.tags)
+    return tags
+
+
 def collect_feature_locations(paths, strict=True):
     """
     Collect feature file names by processing list of paths (from command line).
@@ -563,34 +707,167 @@ def exec_file(filename, globals_=None, locals_=None):
         exec(code, globals_, locals_)
 
 
-def load_step_modules(step_paths):
-    """Load step modules with step definitions from step_paths directories."""
+class StepModuleLoadTime:
+    """Load time of a step module (used by: "--steps-load-report").
+
+    .. attribute:: filename
+
+        Filename of the step module.
+
+    .. attribute:: duration
+
+        Time (in seconds) to import the step module
+        (includes the time to register its step-definitions).
+
+    .. attribute:: register_duration
+
+        Time (in seconds) to register its step-definitions.
+
+    .. attribute:: step_definitions
+
+        Number of step-definitions that were registered by the step module.
+
+    .. versionadded:: 1.4.0
+    """
+    def __init__(self, filename, duration=0.0, register_duration=0.0,
+                 step_definitions=0):
+        self.filename = filename
+        self.duration = duration
+        self.register_duration = register_duration
+        self.step_definitions = step_definitions
+
+    @property
+    def import_duration(self):
+        return max(0.0, self.duration - self.register_duration)
+
+
+def make_step_module_globals():
+    """Provides the globals for a step module (step decorators, ...)."""
     # pylint: disable=import-outside-toplevel
-    from behave.api.step_matchers import use_step_matcher, use_default_step_matcher
+    from behave.api.step_matchers import use_step_matcher
     from behave.api.step_matchers import step_matcher
-    from behave.matchers import use_current_step_matcher_as_default
     from behave.step_registry import setup_step_decorators
     step_globals = {
         "use_step_matcher": use_step_matcher,
         "step_matcher":     step_matcher, # -- DEPRECATING
     }
     setup_step_decorators(step_globals)
+    return step_globals
+
+
+def collect_step_module_filenames(step_paths):
+    """Collect the step modules in the step_paths directories
+    (in the order in which they are loaded).
+    """
+    filenames = []
+    for path in step_paths:
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".py"):
+                filenames.append(os.path.join(path, name))
+    return filenames
+
+
+def load_step_module(filename, step_globals, load_times=None):
+    """Load one step module (and register its step definitions).
+    The caller is responsible to provide the step paths (in ``sys.path``).
+
+    :param filename:     Step module to load.
+    :param step_globals: Globals for the step module (copied).
+    :param load_times:   Optional list to collect :class:`StepModuleLoadTime` items.
+    """
+    # pylint: disable=import-outside-toplevel
+    from behave.api.step_matchers import use_default_step_matcher
+    from behave.runner import the_step_registry
+
+    # -- LOAD STEP DEFINITION:
+    # Reset to default matcher after each step-definition.
+    # A step-definition may change the matcher 0..N times.
+    # ENSURE: Each step definition has clean globals.
+    step_module_globals = step_globals.copy()
+    if load_times is None:
+        exec_file(filename, step_module_globals)
+    else:
+        load_time = StepModuleLoadTime(filename)
+        load_times.append(load_time)
+        with measure_step_module_load_time(load_time, the_step_registry):
+            exec_file(filename, step_module_globals)
+    use_default_step_matcher()
+
+
+def load_step_modules(step_paths, load_times=None):
+    """Load step modules with step definitions from step_paths directories.
+
+    :param step_paths:  Directories with step modules.
+    :param load_times:  Optional list to collect :class:`StepModuleLoadTime` items.
+    """
+    # pylint: disable=import-outside-toplevel
+    from behave.matchers import use_current_step_matcher_as_default
+    step_globals = make_step_module_globals()
 
     # -- Allow steps to import other stuff from the steps dir
     # NOTE: Default matcher can be overridden in "environment.py" hook.
     with PathManager(step_paths):
         use_current_step_matcher_as_default()
-        for path in step_paths:
-            for name in sorted(os.listdir(path)):
-                if name.endswith(".py"):
-                    # -- LOAD STEP DEFINITION:
-                    # Reset to default matcher after each step-definition.
-                    # A step-definition may change the matcher 0..N times.
-                    # ENSURE: Each step definition has clean globals.
-                    # try:
-                    step_module_globals = step_globals.copy()
-                    exec_file(os.path.join(path, name), step_module_globals)
-                use_default_step_matcher()
+        for filename in collect_step_module_filenames(step_paths):
+            load_step_module(filename, step_globals, load_times)
+
+
+@contextmanager
+def measure_step_module_load_time(load_time, registry):
+    """Measures the load time of a step module.
+
+    :param load_time:  :class:`StepModuleLoadTime` object to update.
+    :param registry:   Step registry that is used by the step module.
+    """
+    def count_step_definitions():
+        return sum(len(step_definitions)
+                   for step_definitions in registry.steps.values())
+
+    initial_count = count_step_definitions()
+    initial_register_duration = registry.register_duration
+    start_time = time.perf_counter()
+    try:
+        yield load_time
+    finally:
+        load_time.duration = time.perf_counter() - start_time
+        load_time.register_duration = (registry.register_duration -
+                                       initial_register_duration)
+        load_time.step_definitions = count_step_definitions() - initial_count
+
+
+def print_step_module_load_times(load_times, stream=None):
+    """Print a report of the step module load times (slowest first).
+
+    :param load_times:  List of :class:`StepModuleLoadTime` items.
+    :param stream:      Output stream to use (default: sys.stdout).
+    """
+    if stream is None:
+        stream = sys.stdout
+
+    schema = u"  {0:>8}  {1:>8}  {2:>5}  {3}\n"
+    duration_schema = u"{0:.3f}s"
+    stream.write(u"STEP-MODULE LOAD TIMES:\n")
+    stream.write(schema.format("IMPORT", "REGISTER", "STEPS", "STEP MODULE"))
+    total = StepModuleLoadTime("TOTAL")
+    for load_time in sorted(load_times, key=lambda x: x.duration, reverse=True):
+        total.duration += load_time.duration
+        total.register_duration += load_time.register_duration
+        total.step_definitions += load_time.step_definitions
+        filename = load_time.filename
+        try:
+            filename = os.path.relpath(filename, os.getcwd())
+        except ValueError:
+            # -- CASE Windows: CWD and filename on different drives.
+            pass
+        stream.write(schema.format(
+            duration_schema.format(load_time.import_duration),
+            duration_schema.format(load_time.register_duration),
+            load_time.step_definitions, filename))
+    stream.write(schema.format(
+        duration_schema.format(total.import_duration),
+        duration_schema.format(total.register_duration),
+        total.step_definitions, total.filename))
+    stream.write(u"\n")
 
 
 def make_undefined_step_snippet(step, language=None, prefix=""):
@@ -689,7 +966,7 @@ def reset_runtime():
     from behave import step_registry
     from behave.matchers import get_step_matcher_factory
     # -- RESET STEP 1: behave.step_registry
-    step_registry.registry = step_registry.StepRegistry()
-    step_registry.setup_step_decorators(None, step_registry.registry)
+    # HINT: Keep the registry object (modules may have imported it already).
+    step_registry.registry.clear()
     # -- RESET STEP 2: behave.matchers
     get_step_matcher_factory().reset()
@@ -0,0 +1,209 @@
+"""
+This module provides a persistent index of the scenarios in feature files.
+
+The index stores for each feature file the name, line and effective tags
+of its scenarios (including the scenarios of scenario outlines and rules).
+It is stored in the cache directory (default: ``.behave_cache/``) and
+is updated incrementally: only new or changed feature files are parsed.
+
+If scenarios are selected by tags or by name, the index is used to
+determine which feature files contain selected scenarios.
+Only these feature files need to be parsed (and are run).
+
+EXAMPLE:
+
+.. code-block:: sh
+
+    # -- PARSE ONLY FEATURE FILES WITH SCENARIOS TAGGED WITH: @smoke
+    $ behave --scenario-index --tags=@smoke features/
+
+.. versionadded:: 1.4.0
+"""
+
+from collections import namedtuple
+from hashlib import sha256
+import os
+
+from behave import parser as gherkin
+from behave.parse_cache import (
+    DEFAULT_CACHE_DIR, FeatureParseCache, load_cache_file, store_cache_file
+)
+
+
+# -----------------------------------------------------------------------------
+# CLASSES:
+# -----------------------------------------------------------------------------
+ScenarioRecord = namedtuple("ScenarioRecord", ("name", "line", "tags"))
+FeatureRecord = namedtuple("FeatureRecord", (
+    "size", "mtime_ns", "digest", "language", "scenarios"
+))
+
+
+def make_scenario_records(feature):
+    """Make the index records for the scenarios of a parsed feature.
+
+    :param feature:  Feature object (or None).
+    :return: Tuple of scenario records (as :class:`ScenarioRecord`).
+    """
+    if not feature:
+        return ()
+    return tuple(ScenarioRecord(scenario.name, scenario.line,
+                                frozenset(str(tag) for tag in
+                                          scenario.effective_tags))
+                 for scenario in feature.walk_scenarios())
+
+
+class ScenarioIndex:
+    """
+    Persistent index of the scenarios in feature files.
+
+    RESPONSIBILITIES:
+
+    * Provides the scenario records of a feature file (indexed or parsed)
+    * Detects changed feature files by file size/mtime (and content hash)
+    * Selects the feature files that contain selected scenarios
+
+    .. attribute:: updates
+
+        Number of feature files that were parsed (to update the index).
+    """
+    FILENAME = "scenario_index.pickle"
+    SCHEMA_VERSION = 1
+
+    def __init__(self, directory=None, parse_cache=None):
+        if directory is None:
+            directory = DEFAULT_CACHE_DIR
+        self.directory = directory
+        self.parse_cache = parse_cache
+        self.updates = 0
+        self._records = None
+        self._changed = False
+        self._signature = None
+
+    @property
+    def filename(self):
+        return os.path.join(self.directory, self.FILENAME)
+
+    @property
+    def signature(self):
+        """Signature of the parser/model implementation (as text)."""
+        if self._signature is None:
+            self._signature = "index=%s|%s" % (
+                self.SCHEMA_VERSION, FeatureParseCache.make_signature())
+        return self._signature
+
+    @property
+    def records(self):
+        if self._records is None:
+            self._records = self.load()
+        return self._records
+
+    def load(self):
+        """Load the index from its file.
+        A missing, broken or outdated index file is ignored.
+
+        :return: Feature records (as dict: filename -> FeatureRecord).
+        """
+        records = load_cache_file(self.filename, self.signature)
+        if not isinstance(records, dict):
+            return {}
+        return records
+
+    def save(self):
+        """Store the index in its file (if it was changed).
+        Problems to store the index are ignored (best effort).
+        """
+        if self._changed:
+            if store_cache_file(self.filename, self.signature, self.records):
+                self._changed = False
+
+    def clear(self):
+        """Remove the index file."""
+        self._records = {}
+        self._changed = False
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+    def parse_feature(self, data, filename, language=None):
+        if self.parse_cache is not None:
+            return self.parse_cache.parse_file(filename, language=language)
+        # file encoding is assumed to be utf8 (same as: parser.parse_file()).
+        return gherkin.parse_feature(data.decode("utf8"), language, filename)
+
+    def get_scenarios(self, filename, language=None):
+        """Provides the scenario records of a feature file
+        (from the index, if the feature file was not changed).
+
+        :param filename:  Feature file to use.
+        :param language:  Default language to use (or None).
+        :return: Tuple of scenario records (as :class:`ScenarioRecord`).
+        :raises ParserError: If the feature file could not be parsed.
+        """
+        filename = os.path.abspath(filename)
+        stat = os.stat(filename)
+        record = self.records.get(filename, None)
+        if (record is not None and record.language == language and
+                record.size == stat.st_size and
+                record.mtime_ns == stat.st_mtime_ns):
+            return record.scenarios
+
+        with open(filename, "rb") as f:
+            data = f.read()
+        digest = sha256(data).hexdigest()
+        if (record is not None and record.language == language and
+                record.digest == digest):
+            # -- CASE: Only the file timestamp was changed.
+            scenarios = record.scenarios
+        else:
+            self.updates += 1
+            feature = self.parse_feature(data, filename, language=language)
+            scenarios = make_scenario_records(feature)
+
+        self.records[filename] = FeatureRecord(stat.st_size, stat.st_mtime_ns,
+                                               digest, language, scenarios)
+        self._changed = True
+        return scenarios
+
+    @staticmethod
+    def should_run_scenario(scenario, config):
+        """Checks if a scenario is selected by tags and by name.
+
+        :param scenario:  Scenario record to check.
+        :param config:    Configuration (with tag_expression, name_re).
+        :return: True, if scenario should run. False, otherwise.
+        """
+        if not config.tag_expression.check(scenario.tags):
+            return False
+        return not config.name or bool(config.name_re.search(scenario.name))
+
+    def select_locations(self, locations, config):
+        """Select the feature file locations that contain selected scenarios.
+        Feature file locations with a line number are always selected.
+        A feature file with a parse error is selected, too
+        (the parse error is reported when the feature file is parsed).
+
+        :param locations:  List of feature file locations (FileLocation).
+        :param config:     Configuration (with tag_expression, name_re, lang).
+        :return: List of selected feature file locations.
+        """
+        selected = []
+        for location in locations:
+            if location.line:
+                selected.append(location)
+                continue
+
+            try:
+                scenarios = self.get_scenarios(location.filename,
+                                               language=config.lang)
+            except Exception:   # pylint: disable=broad-except
+                # -- CASE: Unreadable feature file or parse error.
+                selected.append(location)
+                continue
+
+            if any(self.should_run_scenario(scenario, config)
+                   for scenario in scenarios):
+                selected.append(location)
+        self.save()
+        return selected
@@ -0,0 +1,262 @@
+"""
+This module provides lazy loading of step modules with a step manifest.
+
+The step manifest stores for each step module which step definitions
+(step type and leading literal text of the step pattern) it provides.
+It is stored in the cache directory (default: ``.behave_cache/``).
+A manifest entry is invalidated if the step module is changed
+(file size or modification time).
+
+With the step manifest, only the step modules are loaded whose
+step definitions may match the steps of the selected scenarios.
+The remaining step modules are loaded on demand (if an undefined step
+is detected, for example by using ``context.execute_steps()``).
+
+EXAMPLE:
+
+.. code-block:: sh
+
+    $ behave --lazy-step-modules --tags=@smoke features/
+
+.. versionadded:: 1.4.0
+"""
+
+from bisect import bisect_left
+from collections import namedtuple
+import os
+import sys
+
+from behave.parse_cache import (
+    DEFAULT_CACHE_DIR, load_cache_file, store_cache_file
+)
+from behave.runner_util import (
+    PathManager, collect_step_module_filenames, load_step_module,
+    make_step_module_globals
+)
+from behave.version import VERSION as BEHAVE_VERSION
+
+
+# -----------------------------------------------------------------------------
+# CLASSES:
+# -----------------------------------------------------------------------------
+StepModuleRecord = namedtuple("StepModuleRecord", (
+    "size", "mtime_ns", "always_load", "step_definitions"
+))
+
+
+class StepManifest:
+    """
+    Persistent manifest of the step definitions of step modules.
+
+    A step module is described by a :class:`StepModuleRecord` with
+    a tuple of ``(step_type, literal_prefix)`` items for its step definitions.
+    A step module that defines no step definitions or registers types
+    (for step parameters) is always loaded (``always_load``).
+    """
+    FILENAME = "step_manifest.pickle"
+    SCHEMA_VERSION = 1
+
+    def __init__(self, directory=None):
+        if directory is None:
+            directory = DEFAULT_CACHE_DIR
+        self.directory = directory
+        self._records = None
+        self._changed = False
+
+    @property
+    def filename(self):
+        return os.path.join(self.directory, self.FILENAME)
+
+    @property
+    def signature(self):
+        return "manifest=%s|behave=%s|python=%s.%s" % (
+            self.SCHEMA_VERSION, BEHAVE_VERSION, sys.version_info[0],
+            sys.version_info[1])
+
+    @property
+    def records(self):
+        if self._records is None:
+            records = load_cache_file(self.filename, self.signature)
+            if not isinstance(records, dict):
+                records = {}
+            self._records = records
+        return self._records
+
+    def get(self, filename):
+        """Provides the record of a step module
+        (or None, if the step module is unknown or was changed).
+        """
+        record = self.records.get(os.path.abspath(filename), None)
+        if record is None:
+            return None
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        if (record.size != stat.st_size or
+                record.mtime_ns != stat.st_mtime_ns):
+            return None
+        return record
+
+    def update(self, filename, always_load, step_definitions):
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return
+        record = StepModuleRecord(stat.st_size, stat.st_mtime_ns,
+                                  always_load, tuple(step_definitions))
+        self.records[os.path.abspath(filename)] = record
+        self._changed = True
+
+    def save(self):
+        """Store the manifest in its file (if it was changed)."""
+        if self._changed:
+            if store_cache_file(self.filename, self.signature, self.records):
+                self._changed = False
+
+    def clear(self):
+        """Remove the manifest file."""
+        self._records = {}
+        self._changed = False
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+
+class StepTextCatalog:
+    """
+    Sorted step texts (per step type) of the selected steps.
+    Checks if any step text starts with the literal prefix
+    of a step definition.
+    """
+    def __init__(self, steps):
+        step_texts = {}
+        for step in steps:
+            step_texts.setdefault(step.step_type, set()).add(step.name)
+        self.step_texts = dict((step_type, sorted(texts))
+                               for step_type, texts in step_texts.items())
+        all_texts = set()
+        for texts in step_texts.values():
+            all_texts.update(texts)
+        self.step_texts["step"] = sorted(all_texts)
+
+    @staticmethod
+    def _has_text_with_prefix(texts, prefix):
+        position = bisect_left(texts, prefix)
+        return position < len(texts) and texts[position].startswith(prefix)
+
+    def may_match(self, step_type, literal_prefix):
+        """Checks if a step definition may match any step text.
+
+        :param step_type:       Step type of the step definition.
+        :param literal_prefix:  Leading literal text of its step pattern.
+        """
+        texts = self.step_texts.get(step_type, None)
+        if not texts:
+            return False
+        return self._has_text_with_prefix(texts, literal_prefix)
+
+
+class LazyStepModuleLoader:
+    """
+    Loads only the step modules that are needed for the selected steps
+    (by using the step manifest). Unknown or changed step modules are
+    always loaded (and are described in the step manifest afterwards).
+
+    The remaining step modules can be loaded later (on demand),
+    for example when an undefined step is detected.
+
+    :param step_paths:  Directories with step modules.
+    :param manifest:    Step manifest to use (as :class:`StepManifest`).
+    :param registry:    Step registry that is used by the step modules.
+    :param load_times:  Optional list to collect step module load times.
+    """
+    REGISTER_TYPE_MARKER = "register_type"
+
+    def __init__(self, step_paths, manifest, registry, load_times=None):
+        self.step_paths = list(step_paths)
+        self.manifest = manifest
+        self.registry = registry
+        self.load_times = load_times
+        self.filenames = collect_step_module_filenames(self.step_paths)
+        self.loaded = set()
+
+    @property
+    def remaining(self):
+        return [filename for filename in self.filenames
+                if filename not in self.loaded]
+
+    def is_needed(self, filename, step_catalog):
+        record = self.manifest.get(filename)
+        if record is None or record.always_load:
+            return True
+        return any(step_catalog.may_match(step_type, literal_prefix)
+                   for step_type, literal_prefix in record.step_definitions)
+
+    def load_for_steps(self, steps):
+        """Load the step modules whose step definitions may match these steps.
+
+        :param steps:  Steps of the selected scenarios.
+        :return: Number of loaded step modules.
+        """
+        step_catalog = StepTextCatalog(steps)
+        filenames = [filename for filename in self.filenames
+                     if self.is_needed(filename, step_catalog)]
+        return self.load_modules(filenames)
+
+    def load_remaining(self, step=None):
+        """Load the remaining step modules (on demand).
+        Can be used as ``step_loader`` of the step registry.
+
+        :param step:  Undefined step that caused the on-demand load (ignored).
+        :return: True, if any step module was loaded. False, otherwise.
+        """
+        return self.load_modules(self.remaining) > 0
+
+    def load_modules(self, filenames):
+        # pylint: disable=import-outside-toplevel
+        from behave.matchers import use_current_step_matcher_as_default
+        step_globals = make_step_module_globals()
+        count = 0
+        with PathManager(self.step_paths):
+            use_current_step_matcher_as_default()
+            for filename in filenames:
+                if filename in self.loaded:
+                    continue
+                self.loaded.add(filename)
+                self.load_module(filename, step_globals)
+                count += 1
+        self.manifest.save()
+        return count
+
+    def load_module(self, filename, step_globals):
+        """Load a step module and describe it in the step manifest."""
+        initial_sizes = dict((step_type, len(step_definitions))
+                             for step_type, step_definitions
+                             in self.registry.steps.items())
+        load_step_module(filename, step_globals, self.load_times)
+        if self.manifest.get(filename) is not None:
+            return
+
+        step_definitions = []
+        for step_type, step_matchers in self.registry.steps.items():
+            for step_matcher in step_matchers[initial_sizes.get(step_type, 0):]:
+                literal_prefix = getattr(step_matcher, "literal_prefix", "")
+                if not isinstance(literal_prefix, str):
+                    literal_prefix = ""     # -- CASE: Unknown step-matcher type.
+                step_definitions.append((step_type, literal_prefix))
+        always_load = (not step_definitions or
+                       self.uses_register_type(filename))
+        self.manifest.update(filename, always_load, step_definitions)
+
+    @classmethod
+    def uses_register_type(cls, filename):
+        """Checks if a step module may register types for step parameters
+        (needed by step definitions of other step modules).
+        """
+        try:
+            with open(filename, "rb") as f:
+                return cls.REGISTER_TYPE_MARKER.encode("ascii") in f.read()
+        except OSError:
+            return True
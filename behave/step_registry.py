@@ -4,10 +4,16 @@ The step registry allows to match steps (model elements) with
 step implementations (step definitions). This is necessary to execute steps.
 """
 
+from bisect import insort
+from collections import OrderedDict
 import inspect
 import sys
+import time
 
-from behave.matchers import make_step_matcher
+from behave.matchers import (
+    Match, MatchWithError, is_immutable_value, make_step_matcher
+)
+from behave.model_type import Argument
 from behave.python_feature import PythonFeature
 from behave.textutil import text as _text
 
@@ -76,13 +82,170 @@ class BadStepDefinitionErrorHandler(BadStepDefinitionCollector):
         raise error
 
 
+class StepMatcherIndex:
+    """
+    Index of step-matchers (step-definitions) by the leading literal text
+    of their pattern (see: :attr:`behave.matchers.Matcher.literal_prefix`).
+    Selects the plausible step-matchers for a step text
+    instead of trying each step-matcher.
+
+    The selected step-matchers are provided in their original order.
+    Therefore, the first registered step-matcher still wins.
+
+    .. versionadded:: 1.4.0
+    """
+    MAX_PREFIX_SIZE = 64
+
+    def __init__(self, step_matchers, step_lists=None):
+        self.step_matchers = []
+        self.step_lists = list(step_lists or ())
+        self.buckets = {}
+        self.patterns = {}
+        self.prefix_sizes = []
+        for step_matcher in step_matchers:
+            self._add(step_matcher)
+
+    def _add(self, step_matcher):
+        position = len(self.step_matchers)
+        self.step_matchers.append(step_matcher)
+        prefix = getattr(step_matcher, "literal_prefix", "")
+        if not isinstance(prefix, str):
+            prefix = ""     # -- CASE: Unknown step-matcher type.
+        prefix = prefix[:self.MAX_PREFIX_SIZE]
+        bucket = self.buckets.get(prefix, None)
+        if bucket is None:
+            bucket = self.buckets[prefix] = []
+            prefix_size = len(prefix)
+            if prefix_size not in self.prefix_sizes:
+                insort(self.prefix_sizes, prefix_size)
+        bucket.append(position)
+        pattern = getattr(step_matcher, "pattern", None)
+        if isinstance(pattern, str):
+            self.patterns.setdefault(pattern, []).append(position)
+
+    def add(self, step_matcher):
+        """Adds a step-matcher that was appended to the last step-matcher list
+        (without rebuilding the index).
+        """
+        self._add(step_matcher)
+        if self.step_lists:
+            step_list, size = self.step_lists[-1]
+            self.step_lists[-1] = (step_list, size + 1)
+
+    def is_index_for(self, step_lists):
+        """Checks if this index is still valid for these step-matcher lists."""
+        if len(step_lists) != len(self.step_lists):
+            return False
+        # -- HINT: Detects added step-matchers and replaced lists.
+        return all((list1 is list2) and (len(list1) == size)
+                   for list1, (list2, size) in zip(step_lists, self.step_lists))
+
+    def select_positions(self, step_text):
+        """Select the positions of the step-matchers
+        that may match the step text (in ascending order).
+        """
+        positions = []
+        buckets_count = 0
+        text_size = len(step_text)
+        for prefix_size in self.prefix_sizes:
+            if prefix_size > text_size:
+                break
+            bucket = self.buckets.get(step_text[:prefix_size], None)
+            if bucket:
+                positions.extend(bucket)
+                buckets_count += 1
+        if buckets_count > 1:
+            positions.sort()
+        return positions
+
+    def select(self, step_text):
+        """Select the step-matchers that may match the step text.
+
+        :param step_text:  Step text to use (as string).
+        :return: List of step-matchers (in their original order).
+        """
+        return [self.step_matchers[position]
+                for position in self.select_positions(step_text)]
+
+    def select_candidates(self, step_text):
+        """Select the step-matchers that may match the step text
+        or that use it as pattern (used for the ambiguity check).
+
+        :param step_text:  Step text (or pattern of a new step-definition).
+        :return: List of step-matchers (in their original order).
+        """
+        positions = self.select_positions(step_text)
+        same_positions = self.patterns.get(step_text, None)
+        if same_positions:
+            positions = sorted(set(positions).union(same_positions))
+        return [self.step_matchers[position] for position in positions]
+
+
+class StepMatchCache:
+    """
+    Bounded LRU cache that maps ``(step_type, step_text)`` to the
+    matching step-matcher and its matched arguments.
+    Steps with the same text (in backgrounds, scenario outlines, ...)
+    need to be matched only once.
+
+    A cached ``None`` step-matcher denotes an undefined step.
+
+    .. versionadded:: 1.4.0
+    """
+    DEFAULT_MAXSIZE = 1024
+
+    def __init__(self, maxsize=None):
+        if maxsize is None:
+            maxsize = self.DEFAULT_MAXSIZE
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Provides the cache entry for this key (or None, if not cached).
+
+        :param key:  Tuple of (step_type, step_text).
+        :return: Tuple of (step_matcher, arguments) or None (cache miss).
+        """
+        entry = self.entries.get(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, step_matcher, arguments=None):
+        """Stores the step-matcher and its arguments for this key.
+        The least recently used entry is dropped if the cache is full.
+        """
+        self.entries[key] = (step_matcher, arguments)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
 class StepRegistry:
     BAD_STEP_DEFINITION_HANDLER_CLASS = BadStepDefinitionErrorHandler
     RAISE_ERROR_ON_BAD_STEP_DEFINITION = False
+    STEP_MATCHER_INDEX_CLASS = StepMatcherIndex
+    STEP_MATCH_CACHE_CLASS = StepMatchCache
 
     def __init__(self):
         self.steps = dict(given=[], when=[], then=[], step=[])
         self.error_handler = self.BAD_STEP_DEFINITION_HANDLER_CLASS(file=sys.stderr)
+        self.match_cache = None
+        self.register_duration = 0.0
+        self.step_loader = None
+        self._step_matcher_indexes = {}
+        self._step_definition_indexes = {}
 
     def clear(self):
         """
@@ -91,6 +254,29 @@ class StepRegistry:
         """
         self.steps = dict(given=[], when=[], then=[], step=[])
         self.error_handler.clear()
+        self.register_duration = 0.0
+        self.step_loader = None
+        self._step_matcher_indexes = {}
+        self._step_definition_indexes = {}
+        if self.match_cache is not None:
+            self.match_cache.clear()
+
+    def setup_match_cache(self, maxsize):
+        """
+        Enables (or disables) the step-match cache (disabled by default).
+        The cache maps a step text to its step-definition and its matched
+        arguments. Type conversion is redone on a cache hit
+        if a non-pure type converter is used by the step-definition
+        (see: :func:`behave.matchers.non_pure_type_converter`).
+
+        :param maxsize:  Maximal number of cache entries (0: disabled).
+
+        .. versionadded:: 1.4.0
+        """
+        if maxsize and maxsize > 0:
+            self.match_cache = self.STEP_MATCH_CACHE_CLASS(maxsize)
+        else:
+            self.match_cache = None
 
     @staticmethod
     def same_step_definition(step, other_pattern, other_location):
@@ -136,6 +322,13 @@ class StepRegistry:
         return False
 
     def add_step_definition(self, keyword, step_text, func):
+        start_time = time.perf_counter()
+        try:
+            self._add_step_definition(keyword, step_text, func)
+        finally:
+            self.register_duration += time.perf_counter() - start_time
+
+    def _add_step_definition(self, keyword, step_text, func):
         new_step_type = keyword.lower()
         step_text = _text(step_text)
         new_step_matcher = make_step_matcher(func, step_text, new_step_type)
@@ -143,10 +336,13 @@ class StepRegistry:
             # -- CASE: BAD STEP-DEFINITION -- Ignore it.
             return
 
-        # -- CURRENT:
-        step_location = new_step_matcher.location
+        # -- AMBIGUOUS-STEP CHECK: Only for plausible step-definitions.
+        # HINT: Other step-definitions can not match this step text
+        #       because their leading literal text is not a prefix of it.
         step_definitions = self.steps[new_step_type]
-        for existing in step_definitions:
+        index = self._get_index(self._step_definition_indexes, new_step_type,
+                                [step_definitions])
+        for existing in index.select_candidates(step_text):
             if self.same_step_matcher(existing, new_step_matcher):
                 # -- EXACT-STEP: Same step function is already registered.
                 # This may occur when a step module imports another one.
@@ -159,35 +355,138 @@ class StepRegistry:
                 existing_step = existing.describe(existing.SCHEMA_AT_LOCATION)
                 raise AmbiguousStep(message % (new_step, existing_step))
         step_definitions.append(new_step_matcher)
+        index.add(new_step_matcher)
+        if self.match_cache is not None:
+            # -- HINT: A cached undefined step may be defined now.
+            self.match_cache.clear()
+
+    def get_step_matcher_index(self, step_type):
+        """
+        Provides the index of step-matchers for a step type.
+        The index is (re-)built on demand after step-definitions were added.
+
+        :param step_type:  Step type to use (given, when, then, step).
+        :return: Step-matcher index (for this step type).
+
+        .. versionadded:: 1.4.0
+        """
+        step_lists = [self.steps[step_type]]
+        if step_type != "step":
+            # -- HINT: Generic step-definitions are tried last.
+            step_lists.append(self.steps["step"])
+
+        last_index = self._step_matcher_indexes.get(step_type, None)
+        index = self._get_index(self._step_matcher_indexes, step_type, step_lists)
+        if index is not last_index:
+            if self.match_cache is not None:
+                # -- HINT: Step-definitions were changed (added, replaced).
+                self.match_cache.clear()
+        return index
+
+    def _get_index(self, indexes, step_type, step_lists):
+        index = indexes.get(step_type, None)
+        if index is None or not index.is_index_for(step_lists):
+            step_matchers = [step_matcher for step_list in step_lists
+                             for step_matcher in step_list]
+            index_step_lists = [(step_list, len(step_list))
+                                for step_list in step_lists]
+            index = self.STEP_MATCHER_INDEX_CLASS(step_matchers, index_step_lists)
+            indexes[step_type] = index
+        return index
+
+    def load_more_step_definitions(self, step):
+        """Loads more step-definitions on demand for an undefined step
+        (if a step loader is used, like: lazy loading of step modules).
+        The step loader is only used once.
+
+        :param step:  Undefined step.
+        :return: True, if more step-definitions were loaded. False, otherwise.
+
+        .. versionadded:: 1.4.0
+        """
+        step_loader = self.step_loader
+        if step_loader is None:
+            return False
+        self.step_loader = None
+        return step_loader(step)
 
     def find_step_definition(self, step):
-        candidates = self.steps[step.step_type]
-        more_steps = self.steps["step"]
-        if step.step_type != "step" and more_steps:
-            # -- ENSURE: self.step_type lists are not modified/extended.
-            candidates = list(candidates)
-            candidates += more_steps
-
-        for step_definition in candidates:
+        step_definition = self._find_step_definition(step)
+        if step_definition is None and self.load_more_step_definitions(step):
+            step_definition = self._find_step_definition(step)
+        return step_definition
+
+    def _find_step_definition(self, step):
+        index = self.get_step_matcher_index(step.step_type)
+        if self.match_cache is not None:
+            entry = self.match_cache.get((step.step_type, step.name))
+            if entry is not None:
+                return entry[0]
+
+        for step_definition in index.select(step.name):
             if step_definition.match(step.name):
                 return step_definition
         return None
 
     def find_match(self, step):
-        candidates = self.steps[step.step_type]
-        more_steps = self.steps["step"]
-        if step.step_type != "step" and more_steps:
-            # -- ENSURE: self.step_type lists are not modified/extended.
-            candidates = list(candidates)
-            candidates += more_steps
-
-        for step_definition in candidates:
+        result = self._find_match(step)
+        if result is None and self.load_more_step_definitions(step):
+            result = self._find_match(step)
+        return result
+
+    def _find_match(self, step):
+        index = self.get_step_matcher_index(step.step_type)
+        if self.match_cache is not None:
+            return self._find_match_with_cache(index, step)
+
+        for step_definition in index.select(step.name):
+            result = step_definition.match(step.name)
+            if result:
+                return result
+
+        return None
+
+    def _find_match_with_cache(self, index, step):
+        key = (step.step_type, step.name)
+        entry = self.match_cache.get(key)
+        if entry is not None:
+            step_definition, arguments = entry
+            if step_definition is None:
+                return None     # -- CACHED: Undefined step.
+            if arguments is None:
+                # -- CASE: Non-pure type converter(s) -- Redo type conversion.
+                return step_definition.match(step.name)
+            # -- HINT: Each match uses its own Argument objects.
+            return Match(step_definition.func,
+                         [Argument(*data) for data in arguments])
+
+        for step_definition in index.select(step.name):
             result = step_definition.match(step.name)
             if result:
+                if not isinstance(result, MatchWithError):
+                    arguments = None
+                    if getattr(step_definition, "has_pure_type_converters", False):
+                        arguments = self._make_cached_arguments(result.arguments)
+                    self.match_cache.put(key, step_definition, arguments)
                 return result
 
+        self.match_cache.put(key, None)
         return None
 
+    @staticmethod
+    def _make_cached_arguments(arguments):
+        """Provides the argument data of a match for the step-match cache.
+
+        :return: Tuple of argument data, or None (if a value is mutable).
+        """
+        arguments = arguments or []
+        if not all(is_immutable_value(argument.value) for argument in arguments):
+            # -- CASE: Mutable value(s) -- Redo type conversion on each match.
+            return None
+        return tuple((argument.start, argument.end, argument.original,
+                      argument.value, argument.name)
+                     for argument in arguments)
+
     def make_decorator(self, step_type):
         """
         Creates a step decorator for this step type.
@@ -13,5 +13,6 @@ Common module for tag-expressions:
 from .builder import (
     TagExpressionProtocol,  # noqa: F401
     TagExpressionUtil,      # noqa: F401
+    compile_tag_expression, # noqa: F401
     make_tag_expression,    # noqa: F401
 )
@@ -1,7 +1,6 @@
 # -- TAG-EXPRESSIONS v2 (cucumber-tag-expressions with extensions):
 from enum import Enum
 from behave._types import require_type
-from .parser import TagExpressionParser
 
 
 # -----------------------------------------------------------------------------
@@ -31,6 +30,9 @@ def _parse_tag_expression_v2(text):
     Parse TagExpressions v2 (cucumber-tag-expressions) and
     build a TagExpression object.
     """
+    # -- LAZY IMPORT: Import the tag-expression parser when it is used.
+    # pylint: disable=import-outside-toplevel
+    from .parser import TagExpressionParser
     if not isinstance(text, str):
         raise TypeError(f"{text!r} (expected: string)")
 
@@ -137,3 +139,19 @@ def make_tag_expression(text_or_seq, protocol=None):
     if protocol is None:
         protocol = TagExpressionProtocol.current()
     return protocol.parse(text_or_seq)
+
+
+def compile_tag_expression(tag_expression):
+    """
+    Compile a TagExpression object for a fast evaluation
+    (see: :class:`behave.tag_expression.model.CompiledExpression`).
+
+    :param tag_expression:  TagExpression object to compile.
+    :return: Compiled TagExpression object to use.
+    """
+    # -- LAZY IMPORT: Import the tag-expression model when it is used.
+    # pylint: disable=import-outside-toplevel
+    from .model import CompiledExpression
+    if isinstance(tag_expression, CompiledExpression):
+        return tag_expression
+    return CompiledExpression(tag_expression)
@@ -159,3 +159,137 @@ class Never(Expression):
 
     def __repr__(self):
         return "Never()"
+
+
+# -----------------------------------------------------------------------------
+# TAG-EXPRESSION EXTENSION: Compiled tag-expression
+# -----------------------------------------------------------------------------
+class CachedMatcher:
+    """Matches tags with the pattern of a :class:`Matcher`
+    and caches the result for each tag.
+    """
+    # pylint: disable=too-few-public-methods
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.matched = {}   # MAPS: tag -> bool
+
+    def precompute(self, tags):
+        """Precomputes the result for some tags (like: tags of the model)."""
+        for tag in tags:
+            if tag not in self.matched:
+                self.matched[tag] = fnmatchcase(tag, self.pattern)
+
+    def __call__(self, tags):
+        matched = self.matched
+        for tag in tags:
+            result = matched.get(tag)
+            if result is None:
+                result = matched[tag] = fnmatchcase(tag, self.pattern)
+            if result:
+                return True
+        return False
+
+
+class CompiledExpression(Expression):
+    """Tag-expression that is compiled into one Python function
+    (instead of evaluating its expression tree recursively).
+
+    * The result is cached for each tag set (as frozenset).
+      Features, rules and scenarios often have the same effective tags.
+    * A :class:`Matcher` caches its result for each tag.
+      Use :meth:`use_known_tags()` to precompute it
+      for the tags of the parsed features.
+
+    .. code-block:: python
+
+        # -- Expression := (a.* or b) and not c
+        expression = CompiledExpression(
+            And(Or(Matcher("a.*"), Literal("b")), Not(Literal("c"))))
+        assert True  == expression.evaluate(["a.one"])
+        assert False == expression.evaluate(["b", "c"])
+
+    .. versionadded:: 1.4.0
+    """
+
+    def __init__(self, expression):
+        super(CompiledExpression, self).__init__()
+        self.expression = expression
+        self.matchers = []
+        self.results = {}   # MAPS: frozenset(tags) -> bool
+        self._evaluate = self._compile(expression)
+
+    def use_known_tags(self, tags):
+        """Precomputes the results of the matchers for the known tags."""
+        for matcher in self.matchers:
+            matcher.precompute(tags)
+
+    def evaluate(self, values):
+        tags = values
+        if not isinstance(tags, frozenset):
+            tags = frozenset(tags)
+        result = self.results.get(tags)
+        if result is None:
+            result = self.results[tags] = bool(self._evaluate(tags))
+        return result
+
+    def to_string(self, pretty=True):
+        return self.expression.to_string(pretty)
+
+    def __str__(self):
+        return str(self.expression)
+
+    def __repr__(self):
+        return repr(self.expression)
+
+    def _compile(self, expression):
+        namespace = {}
+        source = "def evaluate(tags):\n    return %s\n" % \
+                 self._make_source(expression, namespace)
+        try:
+            code = compile(source, "<tag-expression>", "exec")
+        except (SyntaxError, RecursionError, MemoryError):
+            # -- CASE: Very deeply nested tag-expression.
+            return expression.evaluate
+        exec(code, namespace)   # pylint: disable=exec-used
+        return namespace["evaluate"]
+
+    def _make_source(self, expression, namespace):
+        if isinstance(expression, Literal):
+            return "(%r in tags)" % str(expression.name)
+        if isinstance(expression, (And, Or)):
+            operator = "and" if isinstance(expression, And) else "or"
+            terms = [self._make_source(term, namespace)
+                     for term in _iter_flat_terms(expression)]
+            if not terms:
+                return "True" if operator == "and" else "False"
+            return "(%s)" % (" %s " % operator).join(terms)
+        if isinstance(expression, Not):
+            return "(not %s)" % self._make_source(expression.term, namespace)
+        if isinstance(expression, True_):
+            return "True"
+        if isinstance(expression, Never):
+            return "False"
+
+        # -- CASE: Matcher or other expression class (evaluated on its own).
+        name = "term%d" % len(namespace)
+        if isinstance(expression, Matcher):
+            matcher = CachedMatcher(expression.pattern)
+            self.matchers.append(matcher)
+            namespace[name] = matcher
+        else:
+            namespace[name] = expression.evaluate
+        return "%s(tags)" % name
+
+
+def _iter_flat_terms(expression):
+    """Provides the terms of an And/Or expression (and of its nested
+    And/Or expressions of the same class), like: a or (b or c) -> a, b, c
+    """
+    # -- HINT: Parser builds nested binary operations, like: Or(Or(a, b), c)
+    pending_terms = list(reversed(expression.terms))
+    while pending_terms:
+        term = pending_terms.pop()
+        if term.__class__ is expression.__class__:
+            pending_terms.extend(reversed(term.terms))
+        else:
+            yield term
@@ -0,0 +1,654 @@
+#!/usr/bin/env python
+"""
+Reproducible micro- and macro-benchmarks for behave internals.
+
+Measures the performance of:
+
+* parser:         Parse synthetic feature files (small, large, huge tables, i18n)
+* find_match:     StepRegistry.find_match() with 100/1000/10000 step definitions
+                  for each step-matcher type (parse, cfparse, re, re0, ...)
+* tag_expression: Tag-expression evaluation
+* context:        Context attribute assignment/lookup (per origin tracking mode)
+* capture:        Capture cycle (start, output, stop, captured delta)
+* e2e:            End-to-end test runs with null/plain/json/junit outputs
+
+The results are stored as JSON file. Two result files can be compared
+to detect performance regressions (or to verify an optimization).
+
+USAGE:
+    behave.benchmark.py list [--select=PATTERN]
+    behave.benchmark.py run [--select=PATTERN] [--quick] [--output=FILE]
+    behave.benchmark.py compare BASELINE_FILE CURRENT_FILE [--threshold=PERCENT]
+
+EXAMPLE:
+    # -- BEFORE CHANGE: Store the baseline results.
+    $ behave.benchmark.py run --output=build/benchmark/baseline.json
+    # -- AFTER CHANGE:
+    $ behave.benchmark.py run --output=build/benchmark/current.json
+    $ behave.benchmark.py compare build/benchmark/baseline.json \\
+            build/benchmark/current.json
+
+EXAMPLE OUTPUT (for: compare):
+    BENCHMARK                        BASELINE     CURRENT   CHANGE
+    context.set.lazy                 175.2 ns    181.0 ns    +3.3%
+    find_match.parse.10000            13.1 us      6.2 us   -52.7%  FASTER
+    parser.large_feature              95.3 ms    112.4 ms   +17.9%  SLOWER
+    ...
+    FAILED: 1 benchmark(s) are slower (threshold: 10.0%)
+"""
+
+from __future__ import print_function
+import argparse
+from collections import OrderedDict
+from datetime import datetime
+from fnmatch import fnmatch
+import json
+import logging
+import os.path
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from unittest.mock import Mock
+
+NAME = os.path.basename(__file__)
+VERSION = "0.1.0"
+HERE = os.path.dirname(os.path.abspath(__file__))
+TOPDIR = os.path.normpath(os.path.join(HERE, ".."))
+sys.path.insert(0, TOPDIR)
+
+# pylint: disable=wrong-import-position
+from behave.version import VERSION as BEHAVE_VERSION
+# pylint: enable=wrong-import-position
+
+RESULTS_SCHEMA_VERSION = 1
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 10.0    # -- PERCENT
+
+
+# -----------------------------------------------------------------------------
+# BENCHMARK REGISTRY:
+# -----------------------------------------------------------------------------
+class Benchmark:
+    """
+    Describes a benchmark.
+
+    :param name:        Benchmark name (as dotted name: "group.case").
+    :param make_func:   Callable ``make_func(quick)`` that prepares the
+                        benchmark and returns the function to measure.
+    :param operations:  Number of operations per function call
+                        (used to compute the time per operation).
+    :param group:       Benchmark group (micro, macro).
+    """
+    def __init__(self, name, make_func, operations=1, group="micro"):
+        self.name = name
+        self.make_func = make_func
+        self.operations = operations
+        self.group = group
+
+
+BENCHMARKS = []
+
+
+def add_benchmark(name, make_func, operations=1, group="micro"):
+    BENCHMARKS.append(Benchmark(name, make_func, operations, group))
+
+
+def select_benchmarks(patterns=None):
+    """Select benchmarks by name patterns (fnmatch-style, like: "parser.*")."""
+    if not patterns:
+        return list(BENCHMARKS)
+    return [benchmark for benchmark in BENCHMARKS
+            if any(fnmatch(benchmark.name, pattern) for pattern in patterns)]
+
+
+# -----------------------------------------------------------------------------
+# SYNTHETIC CORPUS:
+# -----------------------------------------------------------------------------
+def make_feature_text(scenarios=10, steps=5, table_rows=0, keywords=None):
+    """Generate the text of a synthetic feature file.
+
+    :param scenarios:   Number of scenarios.
+    :param steps:       Number of steps per scenario.
+    :param table_rows:  Number of table rows (for the first step; 0: no table).
+    :param keywords:    Gherkin keywords of a language (from: behave.i18n).
+    :return: Feature file text.
+    """
+    def keyword_for(name):
+        if keywords is None:
+            return {"feature": "Feature", "background": "Background",
+                    "scenario": "Scenario", "given": "Given ",
+                    "when": "When ", "then": "Then ", "and": "And "}[name]
+        # -- HINT: Step keyword "* " is always provided first.
+        return [value for value in keywords[name] if value.strip() != "*"][0]
+
+    lines = []
+    if keywords is not None:
+        lines.append(u"# language: %s" % keywords["__code__"])
+    lines.append(u"@feature_tag")
+    lines.append(u"%s: Synthetic feature" % keyword_for("feature"))
+    lines.append(u"")
+    lines.append(u"  %s:" % keyword_for("background"))
+    lines.append(u"    %sthe system is ready" % keyword_for("given"))
+    lines.append(u"")
+    step_keywords = ["given", "when", "then"]
+    for scenario_index in range(scenarios):
+        lines.append(u"  @tag%d @slow" % (scenario_index % 10))
+        lines.append(u"  %s: Scenario %d" % (keyword_for("scenario"),
+                                            scenario_index))
+        for step_index in range(steps):
+            step_keyword = step_keywords[min(step_index, 2)]
+            if step_index > 2:
+                step_keyword = "and"
+            lines.append(u"    %sthe user %d does step %d" % (
+                keyword_for(step_keyword), scenario_index, step_index))
+            if step_index == 0 and table_rows:
+                lines.append(u"      | name | value | description |")
+                for row_index in range(table_rows):
+                    lines.append(u"      | row%d | %d | some text %d |" % (
+                        row_index, row_index, row_index))
+        lines.append(u"")
+    return u"\n".join(lines)
+
+
+def make_language_keywords(language):
+    from behave.i18n import languages     # pylint: disable=import-outside-toplevel
+    keywords = dict(languages[language])
+    keywords["__code__"] = language
+    return keywords
+
+
+# -----------------------------------------------------------------------------
+# BENCHMARKS: parser
+# -----------------------------------------------------------------------------
+PARSER_LANGUAGES = ["de", "fr", "ru", "ja", "zh-CN"]
+
+
+def make_parser_benchmark(text_maker, language=None):
+    def make_func(quick):
+        # pylint: disable=import-outside-toplevel
+        from behave.parser import parse_feature
+        text = text_maker(quick)
+
+        def parse_feature_text():
+            parse_feature(text, language=language)
+        return parse_feature_text
+    return make_func
+
+
+add_benchmark("parser.small_feature", make_parser_benchmark(
+    lambda quick: make_feature_text(scenarios=5, steps=4)))
+add_benchmark("parser.large_feature", make_parser_benchmark(
+    lambda quick: make_feature_text(scenarios=(100 if quick else 1000),
+                                    steps=6)))
+add_benchmark("parser.huge_table", make_parser_benchmark(
+    lambda quick: make_feature_text(scenarios=1, steps=1,
+                                    table_rows=(1000 if quick else 10000))))
+for _language in PARSER_LANGUAGES:
+    add_benchmark("parser.language.%s" % _language, make_parser_benchmark(
+        lambda quick, language=_language: make_feature_text(
+            scenarios=50, steps=4, keywords=make_language_keywords(language))))
+
+
+# -----------------------------------------------------------------------------
+# BENCHMARKS: StepRegistry.find_match()
+# -----------------------------------------------------------------------------
+# -- STEP PATTERNS (per step-matcher type): With number placeholder.
+STEP_PATTERNS = OrderedDict([
+    ("parse", u"step %05d: the user {name} has {count:d} items"),
+    ("cfparse", u"step %05d: the user {name} has {count:d} items"),
+    ("re", u"step %05d: the user (?P<name>\\w+) has (?P<count>\\d+) items"),
+    ("re0", u"^step %05d: the user (?P<name>\\w+) has (?P<count>\\d+) items$"),
+    ("cucumber_expressions", u"step %05d: the user {word} has {int} items"),
+])
+FIND_MATCH_SIZES = [100, 1000, 10000]
+FIND_MATCH_SAMPLES = 20
+
+
+def make_step_matcher_class(matcher_name):
+    # pylint: disable=import-outside-toplevel
+    if matcher_name == "cucumber_expressions":
+        from behave.cucumber_expression import StepMatcher4CucumberExpressions
+        return StepMatcher4CucumberExpressions
+    from behave.matchers import StepMatcherFactory
+    mapping = StepMatcherFactory.make_step_matcher_class_mapping()
+    return mapping[matcher_name]
+
+
+def is_step_matcher_available(matcher_name):
+    try:
+        make_step_matcher_class(matcher_name)
+        return True
+    except ImportError:
+        return False
+
+
+def make_find_match_benchmark(matcher_name, size):
+    def make_func(quick):
+        # pylint: disable=import-outside-toplevel
+        from behave.model import Step
+        from behave.step_registry import StepRegistry
+
+        def step_func(ctx, **kwargs):
+            pass
+
+        step_matcher_class = make_step_matcher_class(matcher_name)
+        step_pattern = STEP_PATTERNS[matcher_name]
+        registry = StepRegistry()
+        step_definitions = registry.steps["given"]
+        for index in range(size):
+            step_definitions.append(step_matcher_class(step_func,
+                                                       step_pattern % index,
+                                                       step_type="given"))
+
+        # -- SAMPLE STEPS: Evenly spread over the step definitions + UNDEFINED.
+        stride = max(1, size // FIND_MATCH_SAMPLES)
+        steps = [Step("<benchmark>", 1, u"Given", "given",
+                      u"step %05d: the user Alice has %d items" % (index, index))
+                 for index in range(0, size, stride)]
+        steps.append(Step("<benchmark>", 1, u"Given", "given",
+                          u"an undefined step"))
+        for step in steps[:-1]:
+            assert registry.find_match(step) is not None, step.name
+
+        def find_matches():
+            for step in steps:
+                registry.find_match(step)
+        find_matches.operations = len(steps)
+        return find_matches
+    return make_func
+
+
+def add_find_match_benchmarks():
+    for matcher_name in STEP_PATTERNS:
+        if not is_step_matcher_available(matcher_name):
+            continue    # -- CASE: Optional step-matcher (missing package).
+        for size in FIND_MATCH_SIZES:
+            add_benchmark("find_match.%s.%d" % (matcher_name, size),
+                          make_find_match_benchmark(matcher_name, size))
+
+
+add_find_match_benchmarks()
+
+
+# -----------------------------------------------------------------------------
+# BENCHMARKS: Tag-expressions
+# -----------------------------------------------------------------------------
+TAG_EXPRESSIONS = OrderedDict([
+    ("simple", u"@smoke"),
+    ("not", u"not @wip"),
+    ("and_or", u"(@smoke or @fast) and not @slow and not @wip"),
+    ("wildcard", u"@prefix.* and not @wip"),
+])
+TAG_SETS = [
+    frozenset(),
+    frozenset([u"smoke"]),
+    frozenset([u"fast", u"slow"]),
+    frozenset([u"prefix.one", u"smoke", u"wip"]),
+    frozenset([u"tag%d" % index for index in range(10)]),
+]
+
+
+def make_tag_expression_benchmark(text):
+    def make_func(quick):
+        # pylint: disable=import-outside-toplevel
+        from behave.tag_expression import make_tag_expression
+        tag_expression = make_tag_expression(text)
+
+        def check_tags():
+            for tags in TAG_SETS:
+                tag_expression.check(tags)
+        check_tags.operations = len(TAG_SETS)
+        return check_tags
+    return make_func
+
+
+for _name, _text in TAG_EXPRESSIONS.items():
+    add_benchmark("tag_expression.%s" % _name,
+                  make_tag_expression_benchmark(_text))
+
+
+# -----------------------------------------------------------------------------
+# BENCHMARKS: Context
+# -----------------------------------------------------------------------------
+CONTEXT_ORIGIN_MODES = ["off", "lazy", "eager"]
+
+
+def make_context(origin_tracking):
+    # pylint: disable=import-outside-toplevel
+    from behave.configuration import Configuration
+    from behave.runner import Context
+    config = Configuration(command_args=[], load_config=False,
+                           context_origin=origin_tracking)
+    runner = Mock()
+    runner.config = config
+    context = Context(runner)
+    context._push(layer="feature")      # pylint: disable=protected-access
+    context.feature_thing = "feature"
+    context._push(layer="scenario")     # pylint: disable=protected-access
+    return context
+
+
+def make_context_set_benchmark(origin_tracking):
+    def make_func(quick):
+        context = make_context(origin_tracking)
+
+        def assign_attributes():
+            context.text = None
+            context.table = None
+            context.thing = 42
+            context.other = "value"
+        assign_attributes.operations = 4
+        return assign_attributes
+    return make_func
+
+
+def make_context_get_benchmark(origin_tracking):
+    def make_func(quick):
+        context = make_context(origin_tracking)
+        context.thing = 42
+
+        def lookup_attributes():
+            _ = context.thing
+            _ = context.feature_thing
+            _ = context.config
+            _ = context.thing
+        lookup_attributes.operations = 4
+        return lookup_attributes
+    return make_func
+
+
+for _origin_tracking in CONTEXT_ORIGIN_MODES:
+    add_benchmark("context.set.%s" % _origin_tracking,
+                  make_context_set_benchmark(_origin_tracking))
+add_benchmark("context.get", make_context_get_benchmark("lazy"))
+
+
+# -----------------------------------------------------------------------------
+# BENCHMARKS: Capture
+# -----------------------------------------------------------------------------
+def make_capture_benchmark(capture_log=False):
+    def make_func(quick):
+        # pylint: disable=import-outside-toplevel
+        from behave.capture import CaptureController
+        from behave.configuration import Configuration
+        config = Configuration(command_args=[], load_config=False,
+                               capture_stdout=True, capture_stderr=True,
+                               capture_log=capture_log)
+        controller = CaptureController(config)
+        controller.setup_capture()
+        logger = logging.getLogger("behave.benchmark")
+
+        def capture_cycle():
+            controller.start_capture()
+            try:
+                sys.stdout.write(u"Some output of a step.\n")
+                if capture_log:
+                    logger.warning(u"Some log record of a step.")
+            finally:
+                controller.stop_capture()
+            controller.make_captured_delta()
+        capture_cycle.teardown = controller.teardown_capture
+        return capture_cycle
+    return make_func
+
+
+add_benchmark("capture.cycle.stdout", make_capture_benchmark())
+add_benchmark("capture.cycle.log", make_capture_benchmark(capture_log=True))
+
+
+# -----------------------------------------------------------------------------
+# BENCHMARKS: End-to-end test runs
+# -----------------------------------------------------------------------------
+E2E_STEPS_TEXT = u'''\
+from behave import given, when, then, step
+
+@given(u'the system is ready')
+def step_system_is_ready(ctx):
+    pass
+
+@step(u'the user {user:d} does step {number:d}')
+def step_user_does_step(ctx, user, number):
+    print(u"user=%s, step=%s" % (user, number))
+'''
+E2E_OUTPUTS = OrderedDict([
+    ("null", ["-f", "null"]),
+    ("plain", ["-f", "plain", "-o", "{workdir}/output.txt"]),
+    ("json", ["-f", "json", "-o", "{workdir}/output.json"]),
+    ("junit", ["-f", "null", "--junit",
+               "--junit-directory={workdir}/reports"]),
+])
+
+
+def make_e2e_project(directory, features=10, scenarios=20):
+    """Generate a test project with synthetic features and step definitions."""
+    steps_dir = os.path.join(directory, "features", "steps")
+    os.makedirs(steps_dir)
+    with open(os.path.join(steps_dir, "steps.py"), "w") as f:
+        f.write(E2E_STEPS_TEXT)
+    for index in range(features):
+        filename = os.path.join(directory, "features", "f%03d.feature" % index)
+        with open(filename, "w") as f:
+            f.write(make_feature_text(scenarios=scenarios, steps=5))
+
+
+def make_e2e_benchmark(output_args):
+    def make_func(quick):
+        workdir = tempfile.mkdtemp(prefix="behave_benchmark_")
+        make_e2e_project(workdir, features=(3 if quick else 10))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [TOPDIR] + [p for p in env.get("PYTHONPATH", "").split(os.pathsep)
+                        if p])
+        command = [sys.executable, "-m", "behave", "--no-summary",
+                   "--no-parse-cache"]
+        command += [arg.format(workdir=workdir) for arg in output_args]
+        command.append("features")
+
+        def run_behave():
+            subprocess.run(command, cwd=workdir, env=env, check=True,
+                           stdout=subprocess.DEVNULL)
+        run_behave.teardown = lambda: shutil.rmtree(workdir,
+                                                    ignore_errors=True)
+        return run_behave
+    return make_func
+
+
+for _name, _output_args in E2E_OUTPUTS.items():
+    add_benchmark("e2e.%s" % _name, make_e2e_benchmark(_output_args),
+                  group="macro")
+
+
+# -----------------------------------------------------------------------------
+# MEASUREMENT:
+# -----------------------------------------------------------------------------
+def measure(benchmark, quick=False, repeat=DEFAULT_REPEAT):
+    """Measure the time per operation of a benchmark.
+
+    :return: Result (as dict) with best/median time per operation (in seconds).
+    """
+    func = benchmark.make_func(quick)
+    operations = getattr(func, "operations", benchmark.operations)
+    try:
+        timer = timeit.Timer(func)
+        if benchmark.group == "macro":
+            func()      # -- WARMUP: Imports, OS file caches, ...
+            number = 1
+        else:
+            number, _ = timer.autorange()
+        timings = timer.repeat(repeat=max(1, repeat), number=number)
+    finally:
+        teardown = getattr(func, "teardown", None)
+        if teardown is not None:
+            teardown()
+
+    scale = 1.0 / (number * operations)
+    return OrderedDict([
+        ("best", min(timings) * scale),
+        ("median", statistics.median(timings) * scale),
+        ("number", number),
+        ("operations", operations),
+        ("repeat", len(timings)),
+    ])
+
+
+def make_results(benchmarks, quick=False, repeat=DEFAULT_REPEAT, verbose=True):
+    results = OrderedDict()
+    for benchmark in benchmarks:
+        result = measure(benchmark, quick=quick, repeat=repeat)
+        results[benchmark.name] = result
+        if verbose:
+            print("%-40s  %s" % (benchmark.name, format_time(result["best"])))
+    return OrderedDict([
+        ("schema", RESULTS_SCHEMA_VERSION),
+        ("behave_version", BEHAVE_VERSION),
+        ("python", platform.python_version()),
+        ("python_implementation", platform.python_implementation()),
+        ("platform", platform.platform()),
+        ("created", datetime.now().isoformat(timespec="seconds")),
+        ("quick", quick),
+        ("results", results),
+    ])
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1.0), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1.0:
+            return "%7.1f %-2s" % (seconds * scale, unit)
+    return "%7.1f %-2s" % (seconds * 1e9, "ns")
+
+
+# -----------------------------------------------------------------------------
+# RESULTS: Store, load, compare
+# -----------------------------------------------------------------------------
+def store_results(results, filename):
+    directory = os.path.dirname(filename)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(filename, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+def load_results(filename):
+    with open(filename) as f:
+        results = json.load(f)
+    if results.get("schema") != RESULTS_SCHEMA_VERSION:
+        raise ValueError("%s: Unsupported results schema=%s" % \
+                         (filename, results.get("schema")))
+    return results
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Compare the best time per operation of two benchmark results.
+
+    :param baseline:    Baseline results (as dict).
+    :param current:     Current results (as dict).
+    :param threshold:   Change threshold in percent (to detect a slowdown).
+    :return: List of ``(name, baseline_time, current_time, change, status)``
+             items with relative change in percent and status
+             (SLOWER, FASTER or empty string).
+    """
+    baseline_results = baseline["results"]
+    current_results = current["results"]
+    rows = []
+    for name in sorted(set(baseline_results) & set(current_results)):
+        baseline_time = baseline_results[name]["best"]
+        current_time = current_results[name]["best"]
+        change = (current_time - baseline_time) * 100.0 / baseline_time
+        status = ""
+        if change > threshold:
+            status = "SLOWER"
+        elif change < -threshold:
+            status = "FASTER"
+        rows.append((name, baseline_time, current_time, change, status))
+    return rows
+
+
+# -----------------------------------------------------------------------------
+# COMMANDS:
+# -----------------------------------------------------------------------------
+def command_list(options):
+    for benchmark in select_benchmarks(options.select):
+        print("%-40s  %s" % (benchmark.name, benchmark.group))
+    return 0
+
+
+def command_run(options):
+    benchmarks = select_benchmarks(options.select)
+    if not benchmarks:
+        print("NO BENCHMARKS SELECTED: %s" % " ".join(options.select))
+        return 1
+    results = make_results(benchmarks, quick=options.quick,
+                           repeat=options.repeat)
+    if options.output:
+        store_results(results, options.output)
+        print("RESULTS: %s" % options.output)
+    return 0
+
+
+def command_compare(options):
+    baseline = load_results(options.baseline)
+    current = load_results(options.current)
+    rows = compare_results(baseline, current, threshold=options.threshold)
+    print("%-40s  %10s  %10s  %7s" % ("BENCHMARK", "BASELINE", "CURRENT",
+                                       "CHANGE"))
+    for name, baseline_time, current_time, change, status in rows:
+        print("%-40s  %s  %s  %+6.1f%%  %s" % (
+            name, format_time(baseline_time), format_time(current_time),
+            change, status))
+
+    slower = [row for row in rows if row[-1] == "SLOWER"]
+    if slower:
+        print("FAILED: %d benchmark(s) are slower (threshold: %.1f%%)" % \
+              (len(slower), options.threshold))
+        return 1
+    print("OK")
+    return 0
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parser = argparse.ArgumentParser(prog=NAME,
+        description="Benchmarks for behave internals")
+    parser.add_argument("--version", action="version", version=VERSION)
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    list_parser = subparsers.add_parser("list", help="List the benchmarks.")
+    list_parser.add_argument("--select", action="append", default=[],
+                             metavar="PATTERN",
+                             help="Select benchmarks by name pattern.")
+    list_parser.set_defaults(func=command_list)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks.")
+    run_parser.add_argument("--select", action="append", default=[],
+                            metavar="PATTERN",
+                            help="Select benchmarks by name pattern (like: parser.*).")
+    run_parser.add_argument("--quick", action="store_true",
+                            help="Use smaller corpora (faster, less precise).")
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                            help="Number of measurements (default: %(default)s).")
+    run_parser.add_argument("-o", "--output", metavar="FILE",
+                            help="Store results in this JSON file.")
+    run_parser.set_defaults(func=command_run)
+
+    compare_parser = subparsers.add_parser("compare",
+        help="Compare two result files.")
+    compare_parser.add_argument("baseline", help="Baseline results (JSON file).")
+    compare_parser.add_argument("current", help="Current results (JSON file).")
+    compare_parser.add_argument("--threshold", type=float,
+                                default=DEFAULT_THRESHOLD,
+                                help="Threshold in percent (default: %(default)s).")
+    compare_parser.set_defaults(func=command_compare)
+
+    options = parser.parse_args(args)
+    return options.func(options)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
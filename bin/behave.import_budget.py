@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+Check the import time budget of the behave command-line startup
+(by using: ``python -X importtime``).
+
+The startup of informational commands, like ``behave --version``, should
+only import the modules that are needed. Modules that are only needed
+for a test run (runner, model, formatters, ...) should not be imported.
+
+USAGE:
+    behave.import_budget.py [--budget=MSEC] [--repeat=N] [-- BEHAVE_ARGS]
+
+EXAMPLE OUTPUT:
+    IMPORT TIME: 38.2 msec (budget: 100.0 msec) for: behave --version
+    SLOWEST MODULES (self time):
+       9.1 msec  logging
+       ...
+    OK
+"""
+
+import argparse
+import os.path
+import subprocess
+import sys
+
+NAME = os.path.basename(__file__)
+VERSION = "0.1.0"
+HERE = os.path.dirname(os.path.abspath(__file__))
+TOPDIR = os.path.normpath(os.path.join(HERE, ".."))
+
+# -- MODULES: That should not be imported by "behave --version".
+UNWANTED_MODULES = [
+    "asyncio",
+    "behave.formatter.pretty",
+    "behave.matchers",
+    "behave.model",
+    "behave.parser",
+    "behave.reporter.junit",
+    "behave.reporter.summary",
+    "behave.runner",
+    "behave.step_registry",
+    "cucumber_expression",
+    "parse",
+]
+DEFAULT_BUDGET = 100.0      # msec
+STARTUP_CODE = """\
+import sys
+from behave.__main__ import main
+main(sys.argv[1:])
+"""
+
+
+def run_with_importtime(behave_args):
+    """Run behave (startup) with ``python -X importtime``.
+
+    :return: List of ``(self_usec, cumulative_usec, level, module_name)`` items.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [TOPDIR] + [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p])
+    command = [sys.executable, "-X", "importtime", "-c", STARTUP_CODE]
+    process = subprocess.run(command + list(behave_args), env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                             universal_newlines=True, check=False)
+    return parse_importtime_output(process.stderr)
+
+
+def parse_importtime_output(text):
+    """Parse the output of ``python -X importtime``, like::
+
+        import time: self [us] | cumulative | imported package
+        import time:       338 |       1040 |   behave.version
+    """
+    items = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue    # -- CASE: Header line.
+        name = parts[2].rstrip()
+        module_name = name.lstrip()
+        level = (len(name) - len(module_name) - 1) // 2
+        items.append((int(parts[0]), int(parts[1]), level, module_name))
+    return items
+
+
+def select_total_time(items):
+    """Total import time (in usec) as sum of the top-level imports."""
+    return sum(cumulative for _, cumulative, level, _ in items if level == 0)
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    parser = argparse.ArgumentParser(prog=NAME,
+        description="Check the import time budget of the behave startup")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET,
+                        help="Import time budget in msec (default: %(default)s).")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Number of measurements (best is used).")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Number of slowest modules to show.")
+    parser.add_argument("--version", action="version", version=VERSION)
+    parser.add_argument("behave_args", nargs="*", default=["--version"],
+                        help="Behave command-line args (default: --version).")
+    options = parser.parse_args(args)
+
+    best_items = None
+    best_total = None
+    for _ in range(max(1, options.repeat)):
+        items = run_with_importtime(options.behave_args)
+        total = select_total_time(items)
+        if best_total is None or total < best_total:
+            best_items, best_total = items, total
+
+    command = "behave %s" % " ".join(options.behave_args)
+    print("IMPORT TIME: %.1f msec (budget: %.1f msec) for: %s" % \
+          (best_total / 1000.0, options.budget, command))
+    print("SLOWEST MODULES (self time):")
+    slowest = sorted(best_items, key=lambda item: item[0], reverse=True)
+    for self_time, _, _, module_name in slowest[:options.top]:
+        print("  %6.1f msec  %s" % (self_time / 1000.0, module_name))
+
+    imported = set(item[3] for item in best_items)
+    unwanted = [name for name in UNWANTED_MODULES if name in imported]
+    problems = 0
+    if unwanted:
+        problems += 1
+        print("UNWANTED MODULES: %s" % ", ".join(unwanted))
+    if best_total / 1000.0 > options.budget:
+        problems += 1
+        print("BUDGET EXCEEDED: by %.1f msec" % \
+              (best_total / 1000.0 - options.budget))
+    print("FAILED" if problems else "OK")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
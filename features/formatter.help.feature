@@ -28,6 +28,7 @@ Feature: Help Formatter
           captured       Inspect captured output.
           json           JSON dump of test run
           json.pretty    JSON dump of test run (human readable)
+          json.stream    JSON dump of test run (written per scenario)
           null           Provides formatter that does not output anything.
           plain          Very basic formatter with maximum compatibility
           pretty         Standard colourised pretty formatter
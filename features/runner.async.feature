@@ -0,0 +1,197 @@
+Feature: Async Runner
+
+  As a tester
+  I want to run scenarios with async-steps concurrently (on one event loop)
+  So that a test run with many I/O-bound scenarios is finished faster.
+
+  . SPECIFICATION: Using "behave --runner=async --jobs=<NUMBER>"
+  .   * Scenarios of the features run concurrently (as asyncio tasks)
+  .   * The number of jobs is the concurrency limit
+  .   * Async-steps of different scenarios run on the same event loop
+  .   * Each scenario uses its own context layer and output capture
+  .   * Results are reported in the original order of the features/scenarios
+  .   * The async runner behaves like the default runner with "--jobs=1"
+
+  Background:
+    Given a new working directory
+    And a file named "features/steps/use_steplib_behave4cmd.py" with:
+        """
+        import behave4cmd0.passing_steps
+        import behave4cmd0.failing_steps
+        """
+    And a file named "features/steps/async_steps.py" with:
+        """
+        import asyncio
+        import logging
+        from behave import step
+
+        @step('I wait for {count:d} scenarios to run')
+        async def step_wait_for_scenarios(ctx, count):
+            # -- ONLY COMPLETES: If scenarios run concurrently.
+            ctx.shared.started += 1
+            print("STARTED: %s" % ctx.scenario.name)
+            logging.getLogger("async").warning("LOG: %s", ctx.scenario.name)
+            async with asyncio.timeout(5.0):
+                while ctx.shared.started < count:
+                    await asyncio.sleep(0.01)
+
+        @step('I remember the scenario name')
+        def step_remember_scenario_name(ctx):
+            ctx.scenario_name = ctx.scenario.name
+
+        @step('the remembered scenario name is correct')
+        def step_check_scenario_name(ctx):
+            assert ctx.scenario_name == ctx.scenario.name, ctx.scenario_name
+        """
+    And a file named "features/environment.py" with:
+        """
+        from types import SimpleNamespace
+
+        def before_all(ctx):
+            ctx.shared = SimpleNamespace(started=0)
+        """
+    And a file named "features/alice.feature" with:
+        """
+        Feature: Alice
+          Scenario: A1
+            Given I wait for 4 scenarios to run
+            And I remember the scenario name
+            Then the remembered scenario name is correct
+
+          Scenario Outline: A2 -- <name>
+            Given I wait for 4 scenarios to run
+            And I remember the scenario name
+            Then the remembered scenario name is correct
+
+            Examples:
+              | name  |
+              | Alice |
+              | Anna  |
+
+          Rule: R1
+            Scenario: A3
+              Given I wait for 4 scenarios to run
+              And I remember the scenario name
+              Then a step fails
+        """
+
+  Scenario: Use async runner with several jobs
+    When I run "behave --runner=async --jobs=4 -f plain -T features/alice.feature"
+    Then it should fail with:
+        """
+        0 features passed, 1 failed, 0 skipped
+        0 rules passed, 1 failed, 0 skipped
+        3 scenarios passed, 1 failed, 0 skipped
+        11 steps passed, 1 failed, 0 skipped
+        """
+    And the command output should contain:
+        """
+        Feature: Alice
+
+          Scenario: A1
+            Given I wait for 4 scenarios to run ... passed
+            And I remember the scenario name ... passed
+            Then the remembered scenario name is correct ... passed
+
+          Scenario Outline: A2 -- Alice -- @1.1
+            Given I wait for 4 scenarios to run ... passed
+            And I remember the scenario name ... passed
+            Then the remembered scenario name is correct ... passed
+
+          Scenario Outline: A2 -- Anna -- @1.2
+            Given I wait for 4 scenarios to run ... passed
+            And I remember the scenario name ... passed
+            Then the remembered scenario name is correct ... passed
+
+          Rule: R1
+
+            Scenario: A3
+              Given I wait for 4 scenarios to run ... passed
+              And I remember the scenario name ... passed
+              Then a step fails ... failed
+        ASSERT FAILED: EXPECT: Failing step
+        ----
+        CAPTURED STDOUT: scenario
+        STARTED: A3
+
+        CAPTURED LOG: scenario
+        LOG_WARNING:async: LOG: A3
+        """
+    But the command output should not contain "STARTED: A1"
+
+  Scenario: Use async runner with one job
+    Given a file named "features/bob.feature" with:
+        """
+        Feature: Bob
+          Scenario: B1
+            Given I wait for 1 scenarios to run
+            And I remember the scenario name
+            Then the remembered scenario name is correct
+        """
+    When I run "behave --runner=async --jobs=1 -f plain features/bob.feature"
+    Then it should pass with:
+        """
+        1 feature passed, 0 failed, 0 skipped
+        1 scenario passed, 0 failed, 0 skipped
+        3 steps passed, 0 failed, 0 skipped
+        """
+
+  Scenario: Use async runner with output that is not captured
+    When I run "behave --runner=async --jobs=4 -f plain -T --no-capture features/alice.feature"
+    Then it should fail with:
+        """
+        3 scenarios passed, 1 failed, 0 skipped
+        """
+    And the command output should contain:
+        """
+          Scenario: A1
+        STARTED: A1
+            Given I wait for 4 scenarios to run ... passed
+        """
+    And the command output should contain:
+        """
+            Scenario: A3
+        STARTED: A3
+              Given I wait for 4 scenarios to run ... passed
+        """
+
+  Scenario: Use async runner with log output that is not captured
+    Given a file named "features/environment.py" with:
+        """
+        import sys
+        from types import SimpleNamespace
+
+        def before_all(ctx):
+            ctx.shared = SimpleNamespace(started=0)
+            ctx.config.setup_logging(stream=sys.stdout)
+        """
+    When I run "behave --runner=async --jobs=4 -f plain -T --no-logcapture features/alice.feature"
+    Then it should fail with:
+        """
+        3 scenarios passed, 1 failed, 0 skipped
+        """
+    And note that "the log output of each scenario is shown in the original order (as with the default runner)"
+    And the command output should contain:
+        """
+          Scenario: A1
+        LOG_WARNING:async: LOG: A1
+            Given I wait for 4 scenarios to run ... passed
+            And I remember the scenario name ... passed
+            Then the remembered scenario name is correct ... passed
+
+          Scenario Outline: A2 -- Alice -- @1.1
+        LOG_WARNING:async: LOG: A2 -- Alice -- @1.1
+            Given I wait for 4 scenarios to run ... passed
+        """
+    And the command output should contain:
+        """
+          Scenario Outline: A2 -- Anna -- @1.2
+        LOG_WARNING:async: LOG: A2 -- Anna -- @1.2
+            Given I wait for 4 scenarios to run ... passed
+        """
+    And the command output should contain:
+        """
+            Scenario: A3
+        LOG_WARNING:async: LOG: A3
+              Given I wait for 4 scenarios to run ... passed
+        """
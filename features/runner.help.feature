@@ -27,7 +27,11 @@ Feature: Runner Help
       And the command output should contain:
         """
         AVAILABLE RUNNERS:
-          default  = behave.runner:Runner
+          async        = behave.runner_async:AsyncRunner
+          default      = behave.runner:Runner
+          distributed  = behave.runner_distributed:DistributedRunner
+          parallel     = behave.runner_parallel:ParallelRunner
+          threads      = behave.runner_threads:ThreadPoolRunner
         """
 
     Scenario: Good Runner by using a Runner-Alias
@@ -55,8 +59,12 @@ Feature: Runner Help
       Then it should pass
       And the command output should contain:
         """
-        default  = behave.runner:Runner
-        some     = behave4me.good_runner:SomeRunner
+        async        = behave.runner_async:AsyncRunner
+        default      = behave.runner:Runner
+        distributed  = behave.runner_distributed:DistributedRunner
+        parallel     = behave.runner_parallel:ParallelRunner
+        some         = behave4me.good_runner:SomeRunner
+        threads      = behave.runner_threads:ThreadPoolRunner
         """
       And note that "the new runner appears in the sorted list of runners"
       But the command output should not contain "UNAVAILABLE RUNNERS"
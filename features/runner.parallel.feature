@@ -0,0 +1,166 @@
+Feature: Parallel Runner
+
+  As a tester
+  I want to run features in parallel (with several worker processes)
+  So that a test run with many features is finished faster.
+
+  . SPECIFICATION: Using "behave --runner=parallel --jobs=<NUMBER>"
+  .   * Features are run in worker processes
+  .   * Results are reported in the original order of the features
+  .   * Formatters and reporters are used in the main process
+  .   * The parallel runner behaves like the default runner with "--jobs=1"
+
+  Background:
+    Given a new working directory
+    And a file named "features/steps/use_steplib_behave4cmd.py" with:
+        """
+        import behave4cmd0.passing_steps
+        import behave4cmd0.failing_steps
+        """
+    And a file named "features/environment.py" with:
+        """
+        import os
+
+        def before_all(ctx):
+            ctx.config.setup_logging()
+            print("BEFORE_ALL: pid=%s" % os.getpid())
+        """
+    And a file named "features/alice.feature" with:
+        """
+        Feature: Alice
+          Scenario: A1
+            Given a step passes
+            When another step passes
+
+          Scenario: A2
+            When some step passes
+        """
+    And a file named "features/bob.feature" with:
+        """
+        Feature: Bob
+          Scenario: B1
+            Given a step passes
+            Then a step fails
+
+          Scenario Outline: B2 -- <name>
+            Given a step passes
+
+            Examples:
+              | name  |
+              | Bob   |
+              | Betty |
+        """
+    And a file named "features/charly.feature" with:
+        """
+        Feature: Charly
+          Scenario: C1
+            Given a step passes
+            When an undefined step is used
+        """
+
+  Scenario: Use parallel runner with several jobs
+    When I run "behave --runner=parallel --jobs=3 -f plain features/"
+    Then it should fail with:
+        """
+        1 feature passed, 1 failed, 1 error, 0 skipped
+        4 scenarios passed, 1 failed, 1 error, 0 skipped
+        7 steps passed, 1 failed, 0 skipped, 1 undefined
+        """
+    And the command output should contain:
+        """
+        Feature: Alice
+          Scenario: A1
+            Given a step passes ... passed
+            When another step passes ... passed
+
+          Scenario: A2
+            When some step passes ... passed
+
+        Feature: Bob
+          Scenario: B1
+            Given a step passes ... passed
+            Then a step fails ... failed
+        ASSERT FAILED: EXPECT: Failing step
+        """
+    And the command output should contain:
+        """
+        Feature: Charly
+          Scenario: C1
+            Given a step passes ... passed
+            When an undefined step is used ... undefined
+        """
+    And the command output should contain:
+        """
+        You can implement step definitions for undefined steps with these snippets:
+        """
+
+  Scenario: Use parallel runner with one job
+    When I run "behave --runner=parallel --jobs=1 -f plain features/alice.feature"
+    Then it should pass with:
+        """
+        1 feature passed, 0 failed, 0 skipped
+        2 scenarios passed, 0 failed, 0 skipped
+        3 steps passed, 0 failed, 0 skipped
+        """
+    And the command output should contain 1 times:
+        """
+        BEFORE_ALL:
+        """
+
+  Scenario: Use parallel runner with JUnit reporter
+    When I run "behave --runner=parallel --jobs=2 -f plain --junit features/alice.feature features/bob.feature"
+    Then it should fail with:
+        """
+        1 feature passed, 1 failed, 0 skipped
+        """
+    And a file named "reports/TESTS-alice.xml" should exist
+    And a file named "reports/TESTS-bob.xml" should exist
+    And the file "reports/TESTS-bob.xml" should contain:
+        """
+        <failure type="AssertionError" message="EXPECT: Failing step">
+        """
+
+  Scenario: Use parallel runner with scenarios of one feature (and durations)
+    Given a file named "features/dave.feature" with:
+        """
+        Feature: Dave
+          Scenario: D1
+            Given a step passes
+
+          Rule: R1
+            Scenario: D2
+              Given a step passes
+
+            Scenario Outline: D3 -- <name>
+              When some step passes
+
+              Examples:
+                | name  |
+                | Dave  |
+                | Diana |
+        """
+    When I run "behave --runner=parallel --jobs=3 -f json.pretty -o reports/durations.json features/dave.feature"
+    Then it should pass with:
+        """
+        1 feature passed, 0 failed, 0 skipped
+        1 rule passed, 0 failed, 0 skipped
+        4 scenarios passed, 0 failed, 0 skipped
+        """
+    When I run "behave --runner=parallel --jobs=3 -f plain --parallel-durations=reports/durations.json features/dave.feature"
+    Then it should pass with:
+        """
+        Feature: Dave
+          Scenario: D1
+            Given a step passes ... passed
+
+          Rule: R1
+            Scenario: D2
+              Given a step passes ... passed
+
+            Scenario Outline: D3 -- Dave -- @1.1
+              When some step passes ... passed
+
+            Scenario Outline: D3 -- Diana -- @1.2
+              When some step passes ... passed
+        """
+    And the command output should not contain "BAD-DURATIONS-FILE"
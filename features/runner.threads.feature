@@ -0,0 +1,203 @@
+Feature: Thread-Pool Runner
+
+  As a tester
+  I want to run scenarios with blocking I/O-bound steps concurrently in threads
+  So that a test run is finished faster (without duplicating the test environment
+  in worker processes).
+
+  . SPECIFICATION: Using "behave --runner=threads --jobs=<NUMBER>"
+  .   * The scenarios of a feature (or rule) run concurrently in worker threads
+  .   * The number of jobs is the number of worker threads
+  .   * The features run one after another (feature/rule hooks run in the main thread)
+  .   * Each scenario uses its own context layer and output capture (per thread)
+  .   * Resources of the "before_all()" hook are shared by all scenarios
+  .   * Results are reported in the original order of the features/scenarios
+  .   * The thread-pool runner behaves like the default runner with "--jobs=1"
+
+  Background:
+    Given a new working directory
+    And a file named "features/steps/use_steplib_behave4cmd.py" with:
+        """
+        import behave4cmd0.passing_steps
+        import behave4cmd0.failing_steps
+        """
+    And a file named "features/steps/blocking_steps.py" with:
+        """
+        import logging
+        import threading
+        from behave import step
+
+        @step('I wait until {count:d} scenarios are blocked')
+        def step_wait_until_scenarios_are_blocked(ctx, count):
+            # -- ONLY COMPLETES: If scenarios run concurrently (in threads).
+            print("STARTED: %s" % ctx.scenario.name)
+            logging.getLogger("threads").warning("LOG: %s", ctx.scenario.name)
+            ctx.shared.barrier.wait(timeout=5.0)
+            ctx.thread_name = threading.current_thread().name
+
+        @step('I remember the scenario name')
+        def step_remember_scenario_name(ctx):
+            ctx.scenario_name = ctx.scenario.name
+
+        @step('the remembered scenario name is correct')
+        def step_check_scenario_name(ctx):
+            assert ctx.scenario_name == ctx.scenario.name, ctx.scenario_name
+            assert ctx.thread_name.startswith("behave-thread"), ctx.thread_name
+            assert ctx.feature_thread_name == "MainThread"
+        """
+    And a file named "features/environment.py" with:
+        """
+        import threading
+        from types import SimpleNamespace
+
+        def before_all(ctx):
+            ctx.shared = SimpleNamespace(barrier=threading.Barrier(3))
+
+        def before_feature(ctx, feature):
+            ctx.feature_thread_name = threading.current_thread().name
+        """
+    And a file named "features/alice.feature" with:
+        """
+        Feature: Alice
+          Scenario: A1
+            Given I wait until 3 scenarios are blocked
+            And I remember the scenario name
+            Then the remembered scenario name is correct
+
+          Scenario Outline: A2 -- <name>
+            Given I wait until 3 scenarios are blocked
+            And I remember the scenario name
+            Then the remembered scenario name is correct
+
+            Examples:
+              | name  |
+              | Alice |
+              | Anna  |
+        """
+
+  Scenario: Use thread-pool runner with several jobs
+    Given a file named "features/bob.feature" with:
+        """
+        Feature: Bob
+          Rule: R1
+            Scenario: B1
+              Given I wait until 3 scenarios are blocked
+              Then a step fails
+
+            Scenario: B2
+              Given I wait until 3 scenarios are blocked
+              Then a step passes
+
+            Scenario: B3
+              Given I wait until 3 scenarios are blocked
+              Then a step passes
+        """
+    When I run "behave --runner=threads --jobs=3 -f plain -T features/"
+    Then it should fail with:
+        """
+        1 feature passed, 1 failed, 0 skipped
+        0 rules passed, 1 failed, 0 skipped
+        5 scenarios passed, 1 failed, 0 skipped
+        14 steps passed, 1 failed, 0 skipped
+        """
+    And the command output should contain:
+        """
+        Feature: Alice
+
+          Scenario: A1
+            Given I wait until 3 scenarios are blocked ... passed
+            And I remember the scenario name ... passed
+            Then the remembered scenario name is correct ... passed
+
+          Scenario Outline: A2 -- Alice -- @1.1
+            Given I wait until 3 scenarios are blocked ... passed
+            And I remember the scenario name ... passed
+            Then the remembered scenario name is correct ... passed
+
+          Scenario Outline: A2 -- Anna -- @1.2
+            Given I wait until 3 scenarios are blocked ... passed
+            And I remember the scenario name ... passed
+            Then the remembered scenario name is correct ... passed
+        """
+    And the command output should contain:
+        """
+          Rule: R1
+
+            Scenario: B1
+              Given I wait until 3 scenarios are blocked ... passed
+              Then a step fails ... failed
+        ASSERT FAILED: EXPECT: Failing step
+        ----
+        CAPTURED STDOUT: scenario
+        STARTED: B1
+
+        CAPTURED LOG: scenario
+        LOG_WARNING:threads: LOG: B1
+        ---- CAPTURED_SCENARIO_OUTPUT_END ----
+
+            Scenario: B2
+              Given I wait until 3 scenarios are blocked ... passed
+              Then a step passes ... passed
+        """
+    But the command output should not contain "STARTED: B2"
+
+  Scenario: Use thread-pool runner with one job
+    Given a file named "features/environment.py" with:
+        """
+        import threading
+        from types import SimpleNamespace
+
+        def before_all(ctx):
+            ctx.shared = SimpleNamespace(barrier=threading.Barrier(1))
+
+        def before_feature(ctx, feature):
+            ctx.feature_thread_name = threading.current_thread().name
+        """
+    When I run "behave --runner=threads --jobs=1 -f plain features/alice.feature"
+    Then it should fail with:
+        """
+        0 features passed, 1 failed, 0 skipped
+        0 scenarios passed, 3 failed, 0 skipped
+        6 steps passed, 3 failed, 0 skipped
+        """
+    And note that "the default runner is used (scenarios run in the main thread)"
+    And the command output should contain "ASSERT FAILED: MainThread"
+
+  Scenario: Use thread-pool runner with log output that is not captured
+    Given a file named "features/environment.py" with:
+        """
+        import sys
+        import threading
+        from types import SimpleNamespace
+
+        def before_all(ctx):
+            ctx.shared = SimpleNamespace(barrier=threading.Barrier(3))
+            ctx.config.setup_logging(stream=sys.stdout)
+
+        def before_feature(ctx, feature):
+            ctx.feature_thread_name = threading.current_thread().name
+        """
+    When I run "behave --runner=threads --jobs=3 -f plain -T --no-logcapture features/alice.feature"
+    Then it should pass with:
+        """
+        3 scenarios passed, 0 failed, 0 skipped
+        """
+    And note that "the log output of each scenario is shown in the original order (as with the default runner)"
+    And the command output should contain:
+        """
+          Scenario: A1
+        LOG_WARNING:threads: LOG: A1
+            Given I wait until 3 scenarios are blocked ... passed
+            And I remember the scenario name ... passed
+            Then the remembered scenario name is correct ... passed
+
+          Scenario Outline: A2 -- Alice -- @1.1
+        LOG_WARNING:threads: LOG: A2 -- Alice -- @1.1
+            Given I wait until 3 scenarios are blocked ... passed
+            And I remember the scenario name ... passed
+            Then the remembered scenario name is correct ... passed
+
+          Scenario Outline: A2 -- Anna -- @1.2
+        LOG_WARNING:threads: LOG: A2 -- Anna -- @1.2
+            Given I wait until 3 scenarios are blocked ... passed
+        """
@@ -0,0 +1,146 @@
+Feature: Use one Event Loop for the Test Run
+
+  As a tester
+  I want to create async resources (like: connection pools) once
+  So that all async-steps can use them (without creating them per scenario).
+
+  . SPECIFICATION:
+  .   * The test runner provides one event loop for the test run
+  .     (one per worker process for: --runner=parallel)
+  .     (in a background thread for: --runner=threads)
+  .   * Async-steps, async-hooks and async-fixtures use this event loop
+  .   * Async hooks are supported in "environment.py", like:
+  .     async def before_all(ctx): ...
+  .   * Async fixtures are supported (use_fixture() in a non-async hook), like:
+  .     @fixture
+  .     async def db_pool(ctx): ...; yield pool; ...
+  .   * The event loop is closed at the end of the test run.
+  .
+  . RELATED: features/fixture.use_async_resource.feature
+
+  Background:
+    Given a new working directory
+    And a file named "features/steps/use_steplib_behave4cmd.py" with:
+      """
+      import behave4cmd0.passing_steps
+      """
+    And a file named "features/steps/async_pool_steps.py" with:
+      """
+      import asyncio
+      from behave import step
+
+      @step('I use a connection of the pool')
+      async def step_use_connection(ctx):
+          # -- HINT: asyncio.Queue is bound to the event loop of its first use.
+          connection = await ctx.pool.get()
+          print("USE: %s" % connection)
+          await asyncio.sleep(0.01)
+          await ctx.pool.put(connection)
+
+      @step('I use the service')
+      async def step_use_service(ctx):
+          assert ctx.service.started
+          assert ctx.service.loop is asyncio.get_running_loop()
+          assert ctx.scenario_loop is asyncio.get_running_loop()
+      """
+    And a file named "features/environment.py" with:
+      """
+      import asyncio
+      from behave import fixture, use_fixture
+
+      class Service:
+          def __init__(self):
+              self.started = False
+              self.loop = None
+
+      @fixture
+      async def service(ctx):
+          this_service = Service()
+          this_service.started = True
+          this_service.loop = asyncio.get_running_loop()
+          print("FIXTURE-SETUP: service")
+          ctx.service = this_service
+          yield this_service
+          await asyncio.sleep(0)
+          print("FIXTURE-CLEANUP: service")
+
+      async def before_all(ctx):
+          ctx.pool = asyncio.Queue()
+          for index in range(2):
+              await ctx.pool.put("connection_%d" % index)
+
+      def before_tag(ctx, tag):
+          if tag == "fixture.service":
+              use_fixture(service, ctx)
+
+      async def before_scenario(ctx, scenario):
+          await asyncio.sleep(0)
+          ctx.scenario_loop = asyncio.get_running_loop()
+
+      async def after_all(ctx):
+          assert ctx.pool.qsize() == 2, "CONNECTIONS: %d" % ctx.pool.qsize()
+          print("AFTER_ALL: All connections are returned.")
+      """
+    And a file named "features/pool.feature" with:
+      """
+      Feature: Pool
+        Scenario: S1
+          Given I use a connection of the pool
+          When I use a connection of the pool
+
+        @fixture.service
+        Scenario: S2
+          Given I use the service
+          And I use a connection of the pool
+
+        Scenario: S3
+          Given I use a connection of the pool
+      """
+
+  Scenario: Use async hooks and async fixtures with the default runner
+    When I run "behave -f plain --no-capture features/pool.feature"
+    Then it should pass with:
+      """
+      3 scenarios passed, 0 failed, 0 skipped
+      5 steps passed, 0 failed, 0 skipped
+      """
+    And the command output should contain:
+      """
+      FIXTURE-SETUP: service
+      """
+    And the command output should contain:
+      """
+      FIXTURE-CLEANUP: service
+      """
+    And the command output should contain:
+      """
+      AFTER_ALL: All connections are returned.
+      """
+    But the command output should not contain "HOOK-ERROR"
+
+  Scenario: Use async hooks and async fixtures with the async runner
+    When I run "behave -f plain --runner=async --jobs=3 features/pool.feature"
+    Then it should pass with:
+      """
+      3 scenarios passed, 0 failed, 0 skipped
+      5 steps passed, 0 failed, 0 skipped
+      """
+    But the command output should not contain "HOOK-ERROR"
+
+  Scenario: Use async hooks and async fixtures with the parallel runner (one event loop per worker)
+    When I run "behave -f plain --runner=parallel --jobs=2 features/pool.feature"
+    Then it should pass with:
+      """
+      3 scenarios passed, 0 failed, 0 skipped
+      5 steps passed, 0 failed, 0 skipped
+      """
+    But the command output should not contain "HOOK-ERROR"
+
+  Scenario: Use async hooks and async fixtures with the thread-pool runner
+    When I run "behave -f plain --runner=threads --jobs=3 features/pool.feature"
+    Then it should pass with:
+      """
+      3 scenarios passed, 0 failed, 0 skipped
+      5 steps passed, 0 failed, 0 skipped
+      """
+    But the command output should not contain "HOOK-ERROR"
@@ -43,6 +43,7 @@ from . import docs
 from . import test
 from . import release
 from . import develop
+from . import benchmark
 
 
 # -----------------------------------------------------------------------------
@@ -60,6 +61,7 @@ namespace.add_collection(Collection.from_module(docs))
 namespace.add_collection(Collection.from_module(test))
 namespace.add_collection(Collection.from_module(release))
 namespace.add_collection(Collection.from_module(develop))
+namespace.add_collection(Collection.from_module(benchmark))
 
 # -- ENSURE: python cleanup is used for this project.
 cleanup.cleanup_tasks.add_task(cleanup.clean_python)
@@ -67,6 +69,7 @@ cleanup.cleanup_tasks.add_task(cleanup.clean_python)
 # -- INJECT: clean configuration into this namespace
 namespace.configure(cleanup.namespace.configuration())
 namespace.configure(test.namespace.configuration())
+namespace.configure(benchmark.namespace.configuration())
 if sys.platform.startswith("win"):
     # -- OVERRIDE SETTINGS: For platform=win32, ... (Windows)
     from shutil import which
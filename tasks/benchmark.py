@@ -0,0 +1,100 @@
+"""
+Invoke benchmark tasks (performance tracking).
+
+EXAMPLE:
+
+.. code-block:: sh
+
+    # -- BEFORE CHANGE: Store the baseline results.
+    $ invoke benchmark.run --output=build/benchmark/baseline.json
+    # -- AFTER CHANGE: Run benchmarks and compare with baseline.
+    $ invoke benchmark.run
+    $ invoke benchmark.compare
+    # -- CHECK: Import time budget of the behave startup.
+    $ invoke benchmark.import-budget
+"""
+
+import sys
+from invoke import task, Collection
+
+
+# ---------------------------------------------------------------------------
+# TASKS
+# ---------------------------------------------------------------------------
+@task(name="run", help={
+    "select": "Select benchmarks by name pattern (like: parser.*).",
+    "quick": "Use smaller corpora (faster, less precise).",
+    "output": "Results file to use (as JSON file).",
+})
+def run_benchmarks(ctx, select="", quick=False, output=""):
+    """Run the benchmarks and store the results (as JSON file)."""
+    output = output or ctx.benchmark.current
+    options = ""
+    if select:
+        options += " --select='{0}'".format(select)
+    if quick:
+        options += " --quick"
+    ctx.run("{python} {script} run{options} --output={output}".format(
+        python=sys.executable, script=ctx.benchmark.script,
+        options=options, output=output))
+
+
+@task(help={
+    "baseline": "Baseline results file (as JSON file).",
+    "current": "Current results file (as JSON file).",
+    "threshold": "Threshold in percent to detect slower benchmarks.",
+})
+def compare(ctx, baseline="", current="", threshold=None):
+    """Compare current benchmark results with the baseline results."""
+    baseline = baseline or ctx.benchmark.baseline
+    current = current or ctx.benchmark.current
+    threshold = threshold or ctx.benchmark.threshold
+    ctx.run("{python} {script} compare {baseline} {current} "
+            "--threshold={threshold}".format(
+                python=sys.executable, script=ctx.benchmark.script,
+                baseline=baseline, current=current, threshold=threshold))
+
+
+@task(name="list")
+def list_benchmarks(ctx):
+    """List the available benchmarks."""
+    ctx.run("{python} {script} list".format(python=sys.executable,
+                                            script=ctx.benchmark.script))
+
+
+@task(help={
+    "budget": "Import time budget in msec.",
+    "repeat": "Number of measurements (best is used).",
+    "args": "Behave command-line args to use (default: --version).",
+})
+def import_budget(ctx, budget=None, repeat=None, args=""):
+    """Check the import time budget of the behave startup."""
+    budget = budget or ctx.benchmark.import_budget.budget
+    repeat = repeat or ctx.benchmark.import_budget.repeat
+    args = args or ctx.benchmark.import_budget.args
+    ctx.run("{python} {script} --budget={budget} --repeat={repeat} "
+            "-- {args}".format(
+                python=sys.executable,
+                script=ctx.benchmark.import_budget.script,
+                budget=budget, repeat=repeat, args=args))
+
+
+# ---------------------------------------------------------------------------
+# TASK MANAGEMENT / CONFIGURATION
+# ---------------------------------------------------------------------------
+namespace = Collection(run_benchmarks, compare, list_benchmarks,
+                       import_budget)
+namespace.configure({
+    "benchmark": {
+        "script": "bin/behave.benchmark.py",
+        "baseline": "build/benchmark/baseline.json",
+        "current": "build/benchmark/current.json",
+        "threshold": 10.0,
+        "import_budget": {
+            "script": "bin/behave.import_budget.py",
+            "budget": 100.0,
+            "repeat": 5,
+            "args": "--version",
+        },
+    },
+})
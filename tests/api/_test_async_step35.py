@@ -240,3 +240,114 @@ class TestAsyncStepRunPy35:
         context = make_context()
         with pytest.raises(ZeroDivisionError):
             when_async_step_raises_exception(context)
+
+
+@py35_or_newer
+class TestAsyncStepWithRunnerEventLoop:
+    """Ensure that async-steps use the event loop of the test run."""
+
+    def test_async_steps_use_same_event_loop_of_test_run(self):
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+        from behave.async_step import AsyncStepFunction
+
+        async def async_step(context, name):
+            context.used_loops.append((name, asyncio.get_running_loop()))
+
+        step_function = AsyncStepFunction(async_step)
+        runner = Runner(config=Configuration(load_config=False))
+        context = Context(runner)
+        context.used_loops = []
+        runner.setup_event_loop()
+        try:
+            loop = runner.event_loop
+            step_function(context, "step1")
+            step_function(context, "step2")
+        finally:
+            runner.teardown_event_loop()
+        assert context.used_loops == [("step1", loop), ("step2", loop)]
+        assert loop.is_closed()
+
+    def test_async_resource_of_hook_can_be_used_by_async_steps(self):
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+        from behave.async_step import AsyncStepFunction
+
+        async def before_all(context):
+            context.queue = asyncio.Queue()
+
+        async def async_step(context, item):
+            await context.queue.put(item)
+            context.items.append(await context.queue.get())
+
+        step_function = AsyncStepFunction(async_step)
+        runner = Runner(config=Configuration(load_config=False))
+        context = runner.context = Context(runner)
+        context.items = []
+        runner.hooks["before_all"] = before_all
+        runner.setup_event_loop()
+        try:
+            hook_passed = runner.run_hook("before_all")
+            step_function(context, "Alice")
+            step_function(context, "Bob")
+        finally:
+            runner.teardown_event_loop()
+        assert hook_passed is True
+        assert context.items == ["Alice", "Bob"]
+
+    def test_async_step_prefers_specified_event_loop(self):
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+        from behave.async_step import AsyncStepFunction
+
+        async def async_step(context):
+            context.used_loop = asyncio.get_running_loop()
+
+        my_loop = asyncio.new_event_loop()
+        with pytest.warns(DeprecationWarning):
+            step_function = AsyncStepFunction(async_step, loop=my_loop)
+        runner = Runner(config=Configuration(load_config=False))
+        context = Context(runner)
+        runner.setup_event_loop()
+        try:
+            step_function(context)
+        finally:
+            runner.teardown_event_loop()
+            my_loop.close()
+        assert context.used_loop is my_loop
+
+    def test_async_step_uses_event_loop_of_specified_async_context(self):
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+        from behave.async_step import AsyncStepFunction
+
+        async def async_step(context):
+            context.used_loop = asyncio.get_running_loop()
+
+        my_loop = asyncio.new_event_loop()
+        with pytest.warns(DeprecationWarning):
+            step_function = AsyncStepFunction(async_step,
+                                              async_context="my_async_context")
+        runner = Runner(config=Configuration(load_config=False))
+        context = Context(runner)
+        runner.setup_event_loop()
+        try:
+            context.my_async_context = AsyncContext(loop=my_loop)
+            step_function(context)
+        finally:
+            runner.teardown_event_loop()
+            my_loop.close()
+        assert context.used_loop is my_loop
+
+    def test_async_context_does_not_close_event_loop_of_test_run(self):
+        runner = Runner(config=Configuration(load_config=False))
+        runner.setup_event_loop()
+        try:
+            loop = runner.event_loop
+            async_context = AsyncContext(should_close=True)
+            assert async_context.loop is loop
+            async_context.close()
+            assert not loop.is_closed()
+        finally:
+            runner.teardown_event_loop()
+        assert loop.is_closed()
@@ -0,0 +1,149 @@
+"""
+Unit tests for :mod:`behave.formatter.json` module.
+"""
+
+from io import StringIO
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from behave.formatter.base import StreamOpener
+from behave.formatter.json import (
+    JSONFormatter, PrettyJSONFormatter, StreamJSONFormatter, recover_json_text
+)
+from behave.matchers import Match
+from behave.model import Feature, Scenario, Step
+from behave.model_type import Status
+
+
+# -----------------------------------------------------------------------------
+# TEST SUPPORT
+# -----------------------------------------------------------------------------
+def step_func(context):     # pylint: disable=unused-argument
+    pass
+
+
+def make_feature(name="Alice", scenario_count=3):
+    scenarios = []
+    for index in range(scenario_count):
+        line = 2 + index*2
+        steps = [Step("alice.feature", line+1, "Given", "given", "a step passes")]
+        scenarios.append(Scenario("alice.feature", line, "Scenario",
+                                  "%s_%s" % (name, index), steps=steps))
+    return Feature("alice.feature", 1, "Feature", name, scenarios=scenarios)
+
+
+def make_formatter(formatter_class, stream=None):
+    stream_opener = StreamOpener(stream=stream or StringIO())
+    return formatter_class(stream_opener, Mock())
+
+
+def run_feature(formatter, feature, stop_after=None):
+    formatter.uri(feature.filename)
+    formatter.feature(feature)
+    for index, scenario in enumerate(feature.scenarios):
+        if stop_after is not None and index >= stop_after:
+            return
+        formatter.scenario(scenario)
+        for step in scenario.steps:
+            formatter.step(step)
+            formatter.match(Match(step_func, []))
+            formatter.embedding("text/plain", b"DATA")
+            step.status = Status.passed
+            formatter.result(step)
+    formatter.eof()
+
+
+def without_durations(data):
+    if isinstance(data, dict):
+        return dict((name, without_durations(value))
+                    for name, value in data.items() if name != "duration")
+    if isinstance(data, list):
+        return [without_durations(value) for value in data]
+    return data
+
+
+# -----------------------------------------------------------------------------
+# TEST SUITE
+# -----------------------------------------------------------------------------
+class TestStreamJSONFormatter:
+
+    @pytest.mark.parametrize("scenario_count", [0, 1, 3])
+    def test_provides_same_data_as_json_formatter(self, scenario_count):
+        outputs = []
+        for formatter_class in (JSONFormatter, StreamJSONFormatter):
+            formatter = make_formatter(formatter_class)
+            stream = formatter.stream
+            run_feature(formatter, make_feature("Alice", scenario_count))
+            run_feature(formatter, make_feature("Bob", scenario_count))
+            formatter.close()
+            outputs.append(json.loads(stream.getvalue()))
+
+        expected, actual = outputs
+        assert without_durations(actual) == without_durations(expected)
+
+    def test_writes_finished_scenario_before_feature_is_finished(self):
+        formatter = make_formatter(StreamJSONFormatter)
+        run_feature(formatter, make_feature(scenario_count=3), stop_after=2)
+
+        written_text = formatter.stream.getvalue()
+        assert '"name": "Alice_0"' in written_text
+        assert '"name": "Alice_1"' not in written_text
+        assert len(formatter.current_feature_data["elements"]) == 1
+
+    def test_close_finishes_feature_of_aborted_run(self):
+        formatter = make_formatter(StreamJSONFormatter)
+        stream = formatter.stream
+        run_feature(formatter, make_feature(scenario_count=3), stop_after=2)
+        formatter.close()
+
+        features = json.loads(stream.getvalue())
+        assert len(features) == 1
+        assert len(features[0]["elements"]) == 2
+
+    def test_pretty_json_formatter_with_stream_elements(self):
+        class PrettyStreamJSONFormatter(PrettyJSONFormatter):
+            stream_elements = True
+
+        formatter = make_formatter(PrettyStreamJSONFormatter)
+        stream = formatter.stream
+        run_feature(formatter, make_feature(scenario_count=2))
+        formatter.close()
+
+        features = json.loads(stream.getvalue())
+        assert [element["name"] for element in features[0]["elements"]] == [
+            "Alice_0", "Alice_1"
+        ]
+
+
+class TestRecoverJSONText:
+
+    def test_recover_complete_text_is_unchanged(self):
+        text = '[\n{"name": "Alice", "elements": [\n{"name": "A1"}\n], "status": "passed"}\n]\n'
+        assert recover_json_text(text) == text
+
+    def test_recover_empty_text(self):
+        assert json.loads(recover_json_text("")) == []
+
+    def test_recover_drops_incomplete_feature_element(self):
+        text = '[\n{"name": "Alice", "elements": [\n{"name": "A1"},\n{"name": "A2", "steps": [{"na'
+        features = json.loads(recover_json_text(text))
+        assert features == [{"name": "Alice", "elements": [{"name": "A1"}]}]
+
+    def test_recover_ignores_brackets_in_strings(self):
+        text = '[\n{"name": "Alice", "elements": [\n{"name": "A1 ]}\\"[{"},\n{"name": "A'
+        features = json.loads(recover_json_text(text))
+        assert features[0]["elements"] == [{"name": "A1 ]}\"[{"}]
+
+    def test_recover_any_truncated_stream_output(self):
+        formatter = make_formatter(StreamJSONFormatter)
+        stream = formatter.stream
+        run_feature(formatter, make_feature("Alice", scenario_count=2))
+        run_feature(formatter, make_feature("Bob", scenario_count=2))
+        formatter.close()
+
+        text = stream.getvalue()
+        for size in range(len(text)):
+            features = json.loads(recover_json_text(text[:size]))
+            assert isinstance(features, list)
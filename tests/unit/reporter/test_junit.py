@@ -1,8 +1,27 @@
 """Tests for JUnitReporter."""
 
+from io import BytesIO
 from unittest.mock import patch, mock_open
+from xml.etree import ElementTree
 
-from behave.reporter.junit import JUnitReporter
+import pytest
+
+from behave.model import Feature, Scenario, Step
+from behave.model_type import Status
+from behave.reporter.junit import JUnitReporter, JUnitXMLWriter, iter_text_chunks
+
+
+def make_feature(name, scenario_statuses):
+    scenarios = []
+    for index, status in enumerate(scenario_statuses):
+        line = 2 + index*2
+        step = Step("features/test.feature", line+1, "Given", "given",
+                    "a step passes")
+        step.status = status
+        scenarios.append(Scenario("features/test.feature", line, "Scenario",
+                                  "S%s" % index, steps=[step]))
+    return Feature("features/test.feature", 1, "Feature", name,
+                   scenarios=scenarios)
 
 
 def test_feature_closes_report_file(mock_config, feature):
@@ -27,3 +46,69 @@ def test_feature_writes_report_file(mock_config, feature, tmp_path):
     assert len(report_files) == 1
     content = report_files[0].read_bytes()
     assert b"Test Feature" in content
+
+
+def test_feature_writes_testcase_for_each_scenario(mock_config, tmp_path):
+    reporter = JUnitReporter(mock_config)
+    feature = make_feature("Alice", [Status.passed, Status.passed])
+    reporter.feature(feature)
+
+    testsuite = ElementTree.parse(tmp_path/"TESTS-features.test.xml").getroot()
+    assert testsuite.get("name") == "features.test.Alice"
+    assert testsuite.get("tests") == "2"
+    assert [testcase.get("name") for testcase in testsuite] == ["S0", "S1"]
+    assert [testcase.get("status") for testcase in testsuite] == [
+        "passed", "passed"
+    ]
+
+
+def test_feature_writes_empty_testsuite_without_testcases(mock_config, tmp_path):
+    reporter = JUnitReporter(mock_config)
+    reporter.feature(make_feature("Alice", []))
+
+    content = (tmp_path/"TESTS-features.test.xml").read_text()
+    assert content.startswith("<testsuite ")
+    assert content.endswith(" />")
+
+
+def test_end_writes_aggregated_report(mock_config, tmp_path):
+    mock_config.junit_aggregate = True
+    reporter = JUnitReporter(mock_config)
+    reporter.feature(make_feature("Alice", [Status.passed]))
+    reporter.feature(make_feature("Bob", [Status.passed, Status.passed]))
+    reporter.end()
+
+    testsuites = ElementTree.parse(tmp_path/"TESTS-all.xml").getroot()
+    assert testsuites.tag == "testsuites"
+    assert [(testsuite.get("name"), len(testsuite)) for testsuite in testsuites] == [
+        ("features.test.Alice", 1), ("features.test.Bob", 2)
+    ]
+
+
+def test_xml_writer_escapes_cdata_text():
+    stream = BytesIO()
+    writer = JUnitXMLWriter(stream)
+    writer.write_cdata("Hello ]]> \x1b[31mAlice\x1b[0m \x01")
+    assert stream.getvalue() == b"\n<![CDATA[Hello ]]&gt; Alice U+0001]]>\n"
+
+
+def test_xml_writer_escapes_cdata_text_in_chunks():
+    text = "".join("Line %s: ]]> \x1b[31mred\x1b[0m\n" % i for i in range(100))
+    stream1 = BytesIO()
+    stream2 = BytesIO()
+    JUnitXMLWriter(stream1).write_cdata(text)
+    writer = JUnitXMLWriter(stream2)
+    writer.CDATA_CHUNK_SIZE = 50
+    writer.write_cdata(text)
+    assert stream2.getvalue() == stream1.getvalue()
+
+
+@pytest.mark.parametrize("text, size, expected", [
+    ("", 4, []),
+    ("Alice\nBob\n", 100, ["Alice\nBob\n"]),
+    ("Alice\nBob\n", 8, ["Alice\n", "Bob\n"]),
+    ("Alice\nBob\n", 2, ["Alice\n", "Bob\n"]),
+    ("Alice, Bob", 4, ["Alice, Bob"]),
+])
+def test_iter_text_chunks_splits_at_line_boundary(text, size, expected):
+    assert list(iter_text_chunks(text, size)) == expected
@@ -0,0 +1,119 @@
+"""Tests for StepDurationsReporter."""
+
+from io import StringIO
+import json
+
+import pytest
+
+from behave.model import Feature, Scenario, Step
+from behave.model_type import Status
+from behave.reporter.step_durations import (
+    StepDurationsReporter, percentile
+)
+from behave.step_registry import StepRegistry
+
+
+def step_func(context):
+    pass
+
+
+def hook_func(context, scenario):
+    pass
+
+
+def make_step(name, status, duration):
+    step = Step("features/test.feature", 3, "Given", "given", name)
+    step.status = status
+    step.duration = duration
+    return step
+
+
+def make_feature(steps):
+    scenario = Scenario("features/test.feature", 2, "Scenario", "S1",
+                        steps=steps)
+    return Feature("features/test.feature", 1, "Feature", "Alice",
+                   scenarios=[scenario])
+
+
+@pytest.fixture
+def reporter(mock_config, tmp_path):
+    mock_config.step_durations_output = str(tmp_path/"step_durations.json")
+    step_registry = StepRegistry()
+    step_registry.add_step_definition("given", "a step takes {seconds:d}s",
+                                      step_func)
+    reporter = StepDurationsReporter(mock_config)
+    reporter.step_registry = step_registry
+    reporter.stream = StringIO()
+    return reporter
+
+
+@pytest.mark.parametrize("values, percent, expected", [
+    ([1.0], 50, 1.0),
+    ([1.0, 2.0], 50, 1.0),
+    ([1.0, 2.0, 3.0], 50, 2.0),
+    (list(range(1, 101)), 95, 95),
+    (list(range(1, 101)), 100, 100),
+])
+def test_percentile(values, percent, expected):
+    assert percentile(values, percent) == expected
+
+
+def test_feature_records_durations_per_step_definition(reporter):
+    reporter.feature(make_feature([
+        make_step("a step takes 3s", Status.passed, 3.0),
+        make_step("a step takes 1s", Status.failed, 1.0),
+        make_step("a step takes 2s", Status.skipped, 0.0),
+        make_step("an undefined step", Status.undefined, 0.0),
+    ]))
+
+    stats_list = reporter.select_stats()
+    assert len(stats_list) == 1
+    stats = stats_list[0]
+    assert stats.name == "@given('a step takes {seconds:d}s')"
+    assert (stats.count, stats.total, stats.p50, stats.max) == (2, 4.0, 1.0, 3.0)
+
+
+def test_record_hook_duration_uses_hook_name_and_location(reporter):
+    reporter.record_hook_duration("before_scenario", hook_func, 0.5)
+    reporter.record_hook_duration("before_scenario", hook_func, 1.5)
+
+    stats = reporter.select_stats()[0]
+    assert stats.name == "hook:before_scenario"
+    assert stats.location.filename.endswith("test_step_durations.py")
+    assert (stats.count, stats.total, stats.max) == (2, 2.0, 1.5)
+
+
+def test_add_hook_durations_data_merges_hook_durations_of_worker(reporter,
+                                                                mock_config):
+    worker_reporter = StepDurationsReporter(mock_config)
+    worker_reporter.record_hook_duration("before_scenario", hook_func, 0.5)
+    worker_reporter.record_hook_duration("before_scenario", hook_func, 1.5)
+    reporter.record_hook_duration("before_scenario", hook_func, 1.0)
+
+    reporter.add_hook_durations_data(worker_reporter.make_hook_durations_data())
+    stats_list = reporter.select_stats()
+    assert len(stats_list) == 1
+    stats = stats_list[0]
+    assert stats.name == "hook:before_scenario"
+    assert (stats.count, stats.total, stats.p50) == (3, 3.0, 1.0)
+
+
+def test_end_shows_table_and_stores_json_file(reporter, tmp_path):
+    reporter.feature(make_feature([
+        make_step("a step takes 2s", Status.passed, 2.0),
+    ]))
+    reporter.record_hook_duration("before_all", hook_func, 1.0)
+    reporter.end()
+
+    lines = reporter.stream.getvalue().splitlines()
+    assert lines[1] == "STEP DURATIONS (slowest total first):"
+    assert lines[3].split()[:5] == ["1", "2.000s", "2.000s", "2.000s", "2.000s"]
+    assert lines[3].endswith("@given('a step takes {seconds:d}s')")
+    assert lines[4].endswith("hook:before_all")
+
+    data = json.loads((tmp_path/"step_durations.json").read_text())
+    assert [item["name"] for item in data["step_definitions"]] == [
+        "@given('a step takes {seconds:d}s')"
+    ]
+    assert data["hooks"][0]["name"] == "hook:before_all"
+    assert data["hooks"][0]["p95"] == 1.0
@@ -1,5 +1,8 @@
 # pylint: disable=bad-whitespace
-from behave.tag_expression.model import Literal, Matcher, Never
+from behave.tag_expression.model import (
+    And, CompiledExpression, Literal, Matcher, Never, Not, Or, True_
+)
+from behave.tag_expression.parser import TagExpressionParser
 import pytest
 
 
@@ -58,3 +61,64 @@ class TestNever:
     def test_evaluate_returns_false(self, tags, case):
         expression = Never()
         assert expression.evaluate(tags) is False
+
+
+class TestCompiledExpression:
+    @pytest.mark.parametrize("text", [
+        "a",
+        "not a",
+        "a and not (b or c)",
+        "(a or b.*) and not c",
+        "not (a and (b or not *.c))",
+        "",
+    ])
+    @pytest.mark.parametrize("tags", [
+        [], ["a"], ["b"], ["a", "b"], ["a", "c"], ["b.1"], ["a", "x.c"],
+    ])
+    def test_evaluate_same_as_expression(self, text, tags):
+        expression = TagExpressionParser.parse(text)
+        compiled = CompiledExpression(expression)
+        assert compiled.evaluate(tags) == expression.evaluate(tags)
+        assert compiled.check(set(tags)) == expression.check(tags)
+
+    @pytest.mark.parametrize("expression, tags, expected", [
+        (Never(), ["a"], False),
+        (True_(), [], True),
+        (And(), ["a"], True),
+        (Or(), ["a"], False),
+        (Not(Never()), [], True),
+    ])
+    def test_evaluate_with_special_expressions(self, expression, tags, expected):
+        assert CompiledExpression(expression).evaluate(tags) is expected
+
+    def test_evaluate_caches_result_per_tag_set(self):
+        compiled = CompiledExpression(Or(Literal("a"), Matcher("b.*")))
+        assert compiled.evaluate(["a", "x"]) is True
+        assert compiled.evaluate({"x", "a"}) is True
+        assert compiled.evaluate(["b.1"]) is True
+        assert compiled.results == {
+            frozenset(["a", "x"]): True,
+            frozenset(["b.1"]): True,
+        }
+
+    def test_use_known_tags_precomputes_matchers(self):
+        compiled = CompiledExpression(And(Matcher("b.*"), Not(Literal("c"))))
+        compiled.use_known_tags(["a", "b.1"])
+        assert compiled.matchers[0].matched == {"a": False, "b.1": True}
+        assert compiled.evaluate(["b.1"]) is True
+        assert compiled.evaluate(["other.b"]) is False
+        assert compiled.matchers[0].matched["other.b"] is False
+
+    def test_evaluate_with_many_nested_terms(self):
+        text = " or ".join("t%d" % index for index in range(2000))
+        compiled = CompiledExpression(TagExpressionParser.parse(text))
+        assert compiled.evaluate(["t1999"]) is True
+        assert compiled.evaluate(["other"]) is False
+
+    def test_string_conversion_same_as_expression(self):
+        expression = TagExpressionParser.parse("(a or b.*) and not c")
+        compiled = CompiledExpression(expression)
+        assert str(compiled) == str(expression)
+        assert repr(compiled) == repr(expression)
+        assert compiled.to_string() == expression.to_string()
+        assert CompiledExpression(True_()).to_string() == "true"
@@ -2,14 +2,17 @@
 Unittests for :mod:`behave.capture` module.
 """
 
+import logging
 import sys
+from unittest.mock import patch
 import pytest
 
 from behave.capture import (
-    Captured, CaptureBookmark, CaptureController,
+    Captured, CaptureBookmark, CaptureController, CapturePositionBookmark,
     ManyCaptured,
     NO_CAPTURED_DATA
 )
+from behave.capture_buffer import ChunkedTextBuffer, SpilledText
 from behave.configuration import Configuration
 # DISABLED: from behave4cmd0.failing_steps import then_it_should_fail_because
 
@@ -318,6 +321,34 @@ Charly
         expected = Captured.REPORT_TEMPLATE.format(output=expected_text)
         assert captured3.make_report() == expected
 
+    def test_large_output_is_spilled_to_file(self):
+        captured = Captured(stdout="A" * 11, stderr="B" * 10, spill_size=10)
+        assert isinstance(captured._stdout, SpilledText)
+        assert isinstance(captured._stderr, str)
+        assert captured.spilled is True
+        assert captured.has_output() is True
+        assert captured.stdout == "A" * 11
+        assert captured.output == "A" * 11 + "\n" + "B" * 10
+        assert captured._output is None     # -- NOT CACHED.
+
+    def test_spill_size_zero_disables_spill(self):
+        captured = Captured(stdout="A" * 100, spill_size=0)
+        assert isinstance(captured._stdout, str)
+        assert captured.spilled is False
+
+    def test_add_to__spills_output_if_it_becomes_too_large(self):
+        captured1 = Captured(stdout="stdout1", spill_size=10)
+        captured1.add_to(Captured(stdout="STDOUT2"))
+        assert captured1.spilled is True
+        captured1.add_to(Captured(stdout="STDOUT3"))
+        assert captured1.stdout == "stdout1\nSTDOUT2\nSTDOUT3"
+
+    def test_make_report__with_spilled_output(self):
+        captured1 = Captured(stdout="Alice", stderr="Bob", spill_size=1)
+        captured2 = Captured(stdout="Alice", stderr="Bob", spill_size=0)
+        assert captured1.spilled is True
+        assert captured1.make_report() == captured2.make_report()
+
 
 class TestManyCapture:
     def test_add_captured__with_empty_captured_data(self):
@@ -362,6 +393,18 @@ class TestManyCapture:
         assert collector.stderr == "Bob\nEmily"
         assert collector.log == "Charly\nFred"
 
+    def test_add_captured__with_spilled_output(self):
+        captured1 = Captured(stdout="Alice", spill_size=1)
+        captured2 = Captured(stdout="Bob", stderr="Charly", spill_size=1)
+        collector = ManyCaptured()
+        collector.add_captured(captured1)
+        collector.add_captured(captured2)
+        assert collector.spilled is True
+        assert collector.stdout == "Alice\nBob"
+        assert collector.output == "Alice\nBob\nCharly"
+        assert collector._stdout is None     # -- NOT CACHED.
+        assert collector._output is None
+
     def test_make_report__with_empty_captured_data(self):
         captured = Captured()
         collector = ManyCaptured()
@@ -777,6 +820,74 @@ class TestCaptureController:
         assert captured.failed is True
         assert captured is not NO_CAPTURED_DATA
 
+    def test_make_captured_since__with_log_output(self, capture_controller):
+        capture_controller.start_capture()
+        logging.getLogger("alice").warning("Hello Alice")
+        bookmark = capture_controller.make_bookmark()
+
+        logging.getLogger("bob").warning("Ciao Bob")
+        captured = capture_controller.make_captured_since(bookmark)
+        assert captured.log == "\nLOG_WARNING:bob: Ciao Bob"
+
+    def test_make_captured_since__with_log_output_same_as_text_slice(self, capture_controller):
+        capture_controller.start_capture()
+        logging.getLogger("alice").warning("Hello Alice")
+        text_bookmark = CaptureBookmark.from_captured(capture_controller.captured)
+        bookmark = capture_controller.make_bookmark()
+
+        logging.getLogger("bob").warning("Ciao Bob")
+        captured1 = capture_controller.make_captured_since(bookmark)
+        captured2 = text_bookmark.make_captured_since(capture_controller.captured)
+        assert captured1.log == captured2.log
+
+    def test_make_bookmark__provides_capture_positions(self, capture_controller):
+        capture_controller.start_capture()
+        logging.getLogger("alice").warning("Hello Alice")
+        bookmark = capture_controller.make_bookmark()
+        assert isinstance(bookmark, CapturePositionBookmark)
+        assert bookmark.offset_log == 1     # -- NUMBER OF LOG RECORDS.
+        with pytest.raises(TypeError):
+            bookmark.make_captured_since(capture_controller.captured)
+
+    def test_make_captured_delta__does_not_build_complete_output(self, capture_controller):
+        capture_controller.start_capture()
+        print("Hello Alice")
+        print("Hello Alice", file=sys.stderr)
+        capture_controller.make_captured_delta()
+
+        print("Ciao Bob")
+        with patch.object(ChunkedTextBuffer, "getvalue") as getvalue:
+            captured = capture_controller.make_captured_delta()
+            assert not getvalue.called
+        assert captured.stdout == "Ciao Bob\n"
+
+    def test_make_captured_delta__after_setup_of_new_capture(self, capture_controller):
+        capture_controller.start_capture()
+        print("Hello Alice, this is a rather long text.")
+        capture_controller.make_captured_delta()
+        capture_controller.stop_capture()
+
+        # -- WHEN: The capture is set up again (as for the next scenario).
+        capture_controller.setup_capture()
+        capture_controller.start_capture()
+        print("Ciao Bob")
+        captured = capture_controller.make_captured_delta()
+        capture_controller.stop_capture()
+        assert captured.stdout == "Ciao Bob\n"
+
+    def test_make_captured__uses_spill_size_from_config(self):
+        config = Configuration(load_config=False, capture_spill_size=5)
+        capture_controller = CaptureController(config)
+        capture_controller.setup_capture()
+        capture_controller.start_capture()
+        print("Hello Alice")
+        capture_controller.stop_capture()
+        captured = capture_controller.make_captured()
+        capture_controller.teardown_capture()
+        assert captured.spill_size == 5
+        assert captured.spilled is True
+        assert captured.stdout == "Hello Alice\n"
+
 @todo
 @not_implemented
 class TestCaptureSinkAsCollector:
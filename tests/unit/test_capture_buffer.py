@@ -0,0 +1,127 @@
+"""
+Unit tests for :mod:`behave.capture_buffer` module.
+"""
+
+import gc
+import os.path
+import pytest
+from behave.capture_buffer import ChunkedTextBuffer, SpilledText
+
+
+class TestChunkedTextBuffer:
+
+    def test_getvalue_without_text(self):
+        buffer = ChunkedTextBuffer()
+        assert buffer.getvalue() == ""
+        assert buffer.size == 0
+
+    def test_getvalue_with_text(self):
+        buffer = ChunkedTextBuffer()
+        buffer.write("Hello ")
+        buffer.write("Alice")
+        assert buffer.getvalue() == "Hello Alice"
+        assert buffer.size == len("Hello Alice")
+
+    def test_print_to_buffer(self):
+        buffer = ChunkedTextBuffer()
+        print("Hello Alice", file=buffer)
+        print("Ciao Bob", file=buffer)
+        assert buffer.getvalue() == "Hello Alice\nCiao Bob\n"
+
+    @pytest.mark.parametrize("offset, expected", [
+        (0, "Hello Alice, Ciao Bob"),
+        (6, "Alice, Ciao Bob"),
+        (8, "ice, Ciao Bob"),
+        (13, "Ciao Bob"),
+        (21, ""),
+        (100, ""),
+    ])
+    def test_getvalue_since(self, offset, expected):
+        buffer = ChunkedTextBuffer()
+        buffer.write("Hello ")
+        assert buffer.getvalue_since(0) == "Hello "
+        buffer.write("Alice")
+        buffer.write(", ")
+        assert buffer.getvalue_since(6) == "Alice, "
+        buffer.write("Ciao Bob")
+        assert buffer.getvalue_since(offset) == expected
+
+    def test_getvalue_since_after_getvalue(self):
+        buffer = ChunkedTextBuffer()
+        buffer.write("Hello ")
+        buffer.getvalue_since(0)
+        buffer.write("Alice")
+        assert buffer.getvalue() == "Hello Alice"
+        buffer.write(", Ciao Bob")
+        assert buffer.getvalue_since(6) == "Alice, Ciao Bob"
+
+    def test_write_with_bytes_raises_type_error(self):
+        buffer = ChunkedTextBuffer()
+        with pytest.raises(TypeError):
+            buffer.write(b"Hello Alice")
+
+    def test_write_after_close_raises_value_error(self):
+        buffer = ChunkedTextBuffer()
+        buffer.write("Hello Alice")
+        buffer.close()
+        with pytest.raises(ValueError):
+            buffer.write("Ciao Bob")
+        assert buffer.getvalue() == "Hello Alice"
+
+    def test_clear(self):
+        buffer = ChunkedTextBuffer()
+        buffer.write("Hello Alice")
+        buffer.clear()
+        assert buffer.getvalue() == ""
+        assert buffer.size == 0
+
+
+class TestSpilledText:
+
+    def test_read_without_text(self):
+        spilled_text = SpilledText()
+        assert spilled_text.read() == ""
+        assert spilled_text.size == 0
+        assert bool(spilled_text) is False
+
+    def test_read_with_text(self):
+        spilled_text = SpilledText("Hello Alice\n")
+        spilled_text.append("Grüezi Bob\n")
+        assert spilled_text.read() == "Hello Alice\nGrüezi Bob\n"
+        assert str(spilled_text) == spilled_text.read()
+        assert spilled_text.size == len("Hello Alice\nGrüezi Bob\n")
+
+    def test_iadd_appends_text(self):
+        spilled_text = SpilledText("Hello ")
+        spilled_text += "Alice"
+        assert isinstance(spilled_text, SpilledText)
+        assert spilled_text.read() == "Hello Alice"
+
+    def test_endswith_checks_end_of_text(self):
+        spilled_text = SpilledText("Hello Alice\n")
+        assert spilled_text.endswith("\n") is True
+        spilled_text.append("Ciao Bob")
+        assert spilled_text.endswith("\n") is False
+        assert spilled_text.endswith("Bob") is True
+
+    def test_text_is_stored_in_file(self):
+        spilled_text = SpilledText("Hello Alice")
+        with open(spilled_text.filename, encoding="utf-8") as f:
+            assert f.read() == "Hello Alice"
+
+    def test_close_removes_file(self):
+        spilled_text = SpilledText("Hello Alice")
+        filename = spilled_text.filename
+        spilled_text.close()
+        assert not os.path.exists(filename)
+        assert spilled_text.read() == ""
+        with pytest.raises(ValueError):
+            spilled_text.append("Ciao Bob")
+
+    def test_file_is_removed_when_object_is_garbage_collected(self):
+        spilled_text = SpilledText("Hello Alice")
+        filename = spilled_text.filename
+        assert os.path.exists(filename)
+        del spilled_text
+        gc.collect()
+        assert not os.path.exists(filename)
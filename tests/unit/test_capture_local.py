@@ -0,0 +1,195 @@
+"""
+Unit tests for :mod:`behave.capture_local`.
+"""
+
+import logging
+import sys
+import threading
+from contextlib import contextmanager
+from io import StringIO
+
+from behave import capture_local
+from behave.capture import CaptureController
+from behave.configuration import Configuration
+from behave.log_capture import LoggingCapture
+
+
+# -----------------------------------------------------------------------------
+# TEST SUPPORT:
+# -----------------------------------------------------------------------------
+def make_config(**kwargs):
+    config_data = dict(capture=True, capture_stdout=True, capture_stderr=True,
+                       capture_log=True, logging_filter=None,
+                       logging_level=logging.INFO,
+                       logging_format="LOG_%(levelname)s:%(name)s: %(message)s",
+                       logging_datefmt=None)
+    config_data.update(kwargs)
+    return Configuration(load_config=False, **config_data)
+
+
+def run_in_thread(func, *args):
+    thread = threading.Thread(target=func, args=args)
+    thread.start()
+    thread.join()
+
+
+@contextmanager
+def installed_capture():
+    # -- HINT: Installed in the test function (pytest replaces sys.stdout).
+    capture_local.install(log_level=logging.INFO)
+    try:
+        yield
+    finally:
+        capture_local.uninstall()
+
+
+# -----------------------------------------------------------------------------
+# TEST SUITE:
+# -----------------------------------------------------------------------------
+class TestContextLocalStream:
+    def test_write_uses_fallback_without_target(self):
+        fallback = StringIO()
+        stream = capture_local.ContextLocalStream("stdout", fallback)
+        stream.write("Hello")
+        assert fallback.getvalue() == "Hello"
+        assert stream.target is fallback
+
+    def test_write_uses_target_of_current_thread(self):
+        fallback = StringIO()
+        stream = capture_local.ContextLocalStream("stdout", fallback)
+        outputs = {}
+
+        def write_to_own_target(name):
+            outputs[name] = StringIO()
+            stream.use_target(outputs[name])
+            stream.write("Hello %s" % name)
+
+        run_in_thread(write_to_own_target, "Alice")
+        run_in_thread(write_to_own_target, "Bob")
+        stream.write("Hello main")
+        assert outputs["Alice"].getvalue() == "Hello Alice"
+        assert outputs["Bob"].getvalue() == "Hello Bob"
+        assert fallback.getvalue() == "Hello main"
+
+
+class TestInstall:
+    def test_install_replaces_streams_and_uninstall_restores_them(self):
+        original_stdout = sys.stdout
+        original_stderr = sys.stderr
+        capture_local.install()
+        try:
+            assert capture_local.is_installed()
+            assert isinstance(sys.stdout, capture_local.ContextLocalStream)
+            assert isinstance(sys.stderr, capture_local.ContextLocalStream)
+            assert capture_local.get_output_stream("stdout") is original_stdout
+        finally:
+            capture_local.uninstall()
+        assert not capture_local.is_installed()
+        assert sys.stdout is original_stdout
+        assert sys.stderr is original_stderr
+
+    def test_set_output_stream_replaces_stream_globally_if_not_installed(self):
+        original_stdout = sys.stdout
+        output = StringIO()
+        capture_local.set_output_stream("stdout", output)
+        try:
+            assert sys.stdout is output
+        finally:
+            sys.stdout = original_stdout
+
+    def test_set_output_stream_replaces_stream_of_current_thread(self):
+        output = StringIO()
+
+        def write_to_output():
+            capture_local.set_output_stream("stdout", output)
+            print("Hello")
+
+        with installed_capture():
+            proxy = sys.stdout
+            run_in_thread(write_to_output)
+            assert sys.stdout is proxy
+        assert output.getvalue() == "Hello\n"
+
+
+class TestCaptureWithContextLocalCapture:
+    def test_capture_controller_captures_only_output_of_its_thread(self):
+        config = make_config()
+        captured = {}
+
+        def run_with_capture(name):
+            controller = CaptureController(config)
+            controller.setup_capture()
+            controller.start_capture()
+            print("stdout:%s" % name)
+            sys.stderr.write("stderr:%s\n" % name)
+            logging.getLogger("test").warning("log:%s", name)
+            controller.stop_capture()
+            controller.teardown_capture()
+            captured[name] = controller.make_captured()
+
+        with installed_capture():
+            run_in_thread(run_with_capture, "Alice")
+            run_in_thread(run_with_capture, "Bob")
+        assert captured["Alice"].stdout == "stdout:Alice\n"
+        assert captured["Alice"].stderr == "stderr:Alice\n"
+        assert captured["Alice"].log == "LOG_WARNING:test: log:Alice"
+        assert captured["Bob"].stdout == "stdout:Bob\n"
+        assert captured["Bob"].log == "LOG_WARNING:test: log:Bob"
+
+    def test_nested_log_capture_restores_outer_log_capture(self):
+        config = make_config()
+        outer = LoggingCapture(config)
+        inner = LoggingCapture(config)
+        log = logging.getLogger("test")
+        with installed_capture():
+            outer.inveigle()
+            inner.inveigle()
+            log.warning("inner")
+            inner.abandon()
+            log.warning("outer")
+            outer.abandon()
+            log.warning("none")
+        assert [record.getMessage() for record in inner.buffer] == ["inner"]
+        assert [record.getMessage() for record in outer.buffer] == ["outer"]
+
+    def test_log_capture_uses_its_level(self):
+        config = make_config(logging_level=logging.WARNING)
+        log_capture = LoggingCapture(config)
+        with installed_capture():
+            log_capture.inveigle()
+            logging.getLogger("test").info("info")
+            logging.getLogger("test").error("error")
+            log_capture.abandon()
+        assert [record.getMessage() for record in log_capture.buffer] == ["error"]
+
+
+class TestLogHandlersWithContextLocalCapture:
+    def test_console_log_handler_writes_to_task_output_stream(self):
+        config = make_config()
+        original_stderr = sys.stderr
+        log_handler = logging.StreamHandler(sys.stderr)
+        root_logger = logging.getLogger()
+        root_logger.addHandler(log_handler)
+        outputs = {}
+
+        def run_task_with_capture(name):
+            outputs[name] = StringIO()
+            capture_local.set_task_output_stream("stderr", outputs[name])
+            controller = CaptureController(config)
+            controller.setup_capture()
+            controller.start_capture()
+            logging.getLogger("test").warning("log:%s", name)
+            controller.stop_capture()
+            controller.teardown_capture()
+
+        try:
+            with installed_capture():
+                assert log_handler.stream is not original_stderr
+                run_in_thread(run_task_with_capture, "Alice")
+                run_in_thread(run_task_with_capture, "Bob")
+        finally:
+            root_logger.removeHandler(log_handler)
+        # -- HINT: Log output of the console is not captured (as before).
+        assert outputs["Alice"].getvalue() == "log:Alice\n"
+        assert outputs["Bob"].getvalue() == "log:Bob\n"
+        assert log_handler.stream is original_stderr
@@ -235,12 +235,17 @@ class TestConfigFileParser:
         config_options = configfile_options_iter(None)
         config_options_names = [opt[0] for opt in config_options]
         expected_names = [
+            "cache_dir",
             "capture",
             "capture_hooks",
             "capture_log",
+            "capture_spill_size",
             "capture_stderr",
             "capture_stdout",
+            "clear_parse_cache",
             "color",
+            "context_origin",
+            "coordinator",
             "default_format",
             "default_tags",
             "dry_run",
@@ -249,8 +254,13 @@ class TestConfigFileParser:
             "include_re",
             "jobs",
             "junit",
+            "junit_aggregate",
             "junit_directory",
             "lang",
+            "lazy_step_modules",
+            "logging_capture_max_bytes",
+            "logging_capture_max_records",
+            "logging_capture_spill",
             "logging_clear_handlers",
             "logging_datefmt",
             "logging_filter",
@@ -258,9 +268,15 @@ class TestConfigFileParser:
             "logging_level",
             "name",
             "outfiles",
+            "parallel_durations",
+            "parse_cache",
+            "parse_jobs",
             "paths",
+            "profile",
+            "profile_output",
             "quiet",
             "runner",
+            "scenario_index",
             "scenario_outline_annotation_schema",
             "show_multiline",
             "show_skipped",
@@ -268,7 +284,11 @@ class TestConfigFileParser:
             "show_source",
             "show_timings",
             "stage",
+            "step_durations",
+            "step_durations_output",
+            "step_match_cache",
             "steps_catalog",
+            "steps_load_report",
             "stop",
             "summary",
             "tag_expression_protocol",
@@ -114,7 +114,26 @@ def parameter_type_registry():
 if HAVE_CUCUMBER_EXPRESSIONS:
     class TestBasics:
         """Tests that checks basic functionality."""
-        pass
+
+        @pytest.mark.parametrize("pattern, expected", [
+            ("a person named {string}", "a person named "),
+            ("I have {int} cucumber(s) in my belly", "I have "),
+            ("I have 1 cucumber(s)", "I have 1 cucumber"),
+            ("I have a/an apple", "I have "),
+            ("a. b* \\(x) {int}", "a. b* (x) "),
+            ("{int} apples", ""),
+            ("Hello World", "Hello World"),
+        ])
+        def test_literal_prefix(self, pattern, expected, parameter_type_registry):
+            step_matcher = StepMatcher4CucumberExpressions(
+                step_do_nothing, pattern, parameter_types=parameter_type_registry)
+            assert step_matcher.literal_prefix == expected
+            if expected:
+                step_text = pattern.replace("{int}", "2").replace("(s)", "s")
+                step_text = step_text.replace("\\", "").replace("a/an", "an")
+                step_text = step_text.replace("{string}", '"Alice"')
+                assert step_text.startswith(expected)
+                assert step_matcher.match(step_text) is not None
 
 
     class TestParameterType4Int:
@@ -2,11 +2,13 @@
 Unit tests for :mod:`behave.fixture` module.
 """
 
+import asyncio
 import inspect
 import pytest
 
 from behave.fixture import (
-    fixture, use_fixture, is_context_manager, InvalidFixtureError,
+    fixture, use_fixture, is_context_manager, is_async_context_manager,
+    InvalidFixtureError,
     use_fixture_by_tag, use_composite_fixture_with, fixture_call_params
 )
 from behave._types import Unknown
@@ -489,6 +491,90 @@ class TestUseFixture:
         assert isinstance(exc_info.value, FixtureCleanupError), "LAST-EXCEPTION-WINS"
 
 
+class TestUseAsyncFixture:
+    """Async fixtures run on the event loop of the test run."""
+
+    def test_with_async_generator_function(self):
+        @fixture
+        async def foo(context, checkpoints, *args, **kwargs):
+            checkpoints.append(("foo.setup", asyncio.get_running_loop()))
+            fixture_object = FooFixture.setup(*args, **kwargs)
+            context.foo = fixture_object
+            yield fixture_object
+            fixture_object.cleanup()
+            checkpoints.append(("foo.cleanup", asyncio.get_running_loop()))
+
+        checkpoints = []
+        runner = Runner(config=Configuration(load_config=False))
+        context = make_runtime_context(runner)
+        runner.setup_event_loop()
+        try:
+            loop = runner.event_loop
+            with scoped_context_layer(context):
+                the_fixture = use_fixture(foo, context, checkpoints)
+                assert_context_setup(context, "foo", FooFixture)
+                assert_fixture_cleanup_not_called(the_fixture)
+                assert checkpoints == [("foo.setup", loop)]
+            assert_context_cleanup(context, "foo")
+            assert_fixture_cleanup_called(the_fixture)
+            assert checkpoints == [("foo.setup", loop), ("foo.cleanup", loop)]
+        finally:
+            runner.teardown_event_loop()
+        assert loop.is_closed()
+
+    def test_with_async_function(self):
+        @fixture
+        async def bar(context, *args, **kwargs):
+            await asyncio.sleep(0)
+            fixture_object = BarFixture.setup(*args, **kwargs)
+            context.bar = fixture_object
+            return fixture_object
+
+        context = make_runtime_context()
+        with scoped_context_layer(context):
+            the_fixture = use_fixture(bar, context, name="bar")
+            assert context.bar is the_fixture
+            assert the_fixture.kwargs == dict(name="bar")
+        assert_fixture_cleanup_not_called(the_fixture)
+
+    def test_invalid_async_fixture_function(self):
+        @fixture
+        async def invalid_fixture(context, checkpoints):
+            checkpoints.append("bad.setup")
+            yield None
+            checkpoints.append("bad.cleanup")
+            yield None  # -- SYNDROME HERE: More than one yield-statement
+
+        checkpoints = []
+        context = make_runtime_context()
+        with pytest.raises(InvalidFixtureError):
+            with scoped_context_layer(context):
+                use_fixture(invalid_fixture, context, checkpoints)
+        assert checkpoints == ["bad.setup", "bad.cleanup"]
+
+    def test_async_fixture_function_without_yield_is_invalid(self):
+        @fixture
+        async def invalid_fixture(context):
+            if False:   # pylint: disable=using-constant-test
+                yield None
+
+        context = make_runtime_context()
+        with pytest.raises(InvalidFixtureError):
+            with scoped_context_layer(context):
+                use_fixture(invalid_fixture, context)
+
+    def test_is_async_context_manager(self):
+        async def async_gen_func(context):
+            yield None
+
+        async def async_func(context):
+            pass
+
+        assert is_async_context_manager(async_gen_func) is True
+        assert is_async_context_manager(async_func) is False
+        assert is_context_manager(async_gen_func) is False
+
+
 class TestUseFixtureByTag:
     def test_data_schema1(self):
         @fixture
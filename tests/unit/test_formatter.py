@@ -182,6 +182,10 @@ class TestJson(FormatterTests):
     formatter_name = "json"
 
 
+class TestJsonStream(FormatterTests):
+    formatter_name = "json.stream"
+
+
 class TestTagsCount(FormatterTests):
     formatter_name = "tags"
 
@@ -1,7 +1,30 @@
+import logging
 from unittest.mock import patch
+import pytest
 from behave.log_capture import LoggingCapture
 
 
+class FakeConfig:
+    logging_filter = None
+    logging_format = "%(levelname)s:%(message)s"
+    logging_datefmt = None
+    logging_level = None
+
+    def __init__(self, **kwargs):
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+
+def make_record(message, level=logging.INFO):
+    return logging.makeLogRecord(dict(msg=message, levelno=level,
+                                      levelname=logging.getLevelName(level)))
+
+
+def emit_records(handler, count, start=0):
+    for index in range(start, start + count):
+        handler.handle(make_record("record_%s" % index))
+
+
 class TestLogCapture:
     def test_get_value_returns_all_log_records(self):
         class FakeConfig:
@@ -23,3 +46,85 @@ class TestLogCapture:
 
             calls = [args[0][0] for args in format.call_args_list]
             assert calls == fake_records
+
+    def test_getvalue_since_formats_only_new_records(self):
+        handler = LoggingCapture(FakeConfig())
+        emit_records(handler, 3)
+        position = handler.position
+        emit_records(handler, 2, start=3)
+
+        with patch.object(handler.formatter, "format") as format:
+            format.return_value = "foo"
+            assert handler.getvalue_since(position) == "\nfoo\nfoo"
+            assert format.call_count == 2
+        assert position == 3
+        assert handler.getvalue_since(position) == "\nINFO:record_3\nINFO:record_4"
+
+
+class TestLogCaptureWithLimits:
+
+    def test_max_records_keeps_newest_records(self):
+        handler = LoggingCapture(FakeConfig(logging_capture_max_records=3))
+        emit_records(handler, 10)
+
+        assert len(handler.buffer) == 3
+        assert handler.dropped_count == 7
+        assert handler.position == 10
+        assert handler.getvalue() == """\
+LOG_CAPTURE: 7 log records dropped (capture limit)
+INFO:record_7
+INFO:record_8
+INFO:record_9"""
+
+    def test_max_records_with_position_after_dropped_records(self):
+        handler = LoggingCapture(FakeConfig(logging_capture_max_records=3))
+        emit_records(handler, 5)
+        position = handler.position
+        emit_records(handler, 2, start=5)
+
+        assert handler.getvalue_since(position) == "\nINFO:record_5\nINFO:record_6"
+
+    def test_max_bytes_keeps_newest_records(self):
+        handler = LoggingCapture(FakeConfig(logging_capture_max_bytes=20))
+        emit_records(handler, 5)
+
+        # -- HINT: len("record_N") == 8
+        assert len(handler.buffer) == 2
+        assert handler.dropped_count == 3
+        assert handler.getvalue().endswith("INFO:record_3\nINFO:record_4")
+
+    def test_max_bytes_keeps_last_record_that_exceeds_limit(self):
+        handler = LoggingCapture(FakeConfig(logging_capture_max_bytes=4))
+        emit_records(handler, 2)
+        assert len(handler.buffer) == 1
+        assert handler.dropped_count == 1
+
+    @pytest.mark.parametrize("position", [0, 2, 7, 8, 10])
+    def test_spill_provides_all_records(self, position):
+        handler = LoggingCapture(FakeConfig(logging_capture_max_records=2,
+                                            logging_capture_spill=True))
+        emit_records(handler, 10)
+
+        assert len(handler.buffer) == 2
+        assert handler.spilled_count == 8
+        assert handler.dropped_count == 0
+        expected_records = ["INFO:record_%s" % index
+                            for index in range(position, 10)]
+        if position < 8:
+            note = "LOG_CAPTURE: %d log records spilled to disk (capture limit)"
+            expected_records.insert(0, note % (8 - position))
+        else:
+            # -- TAIL OF LOG OUTPUT: Starts with separator (newline).
+            expected_records.insert(0, "")
+        assert handler.getvalue_since(position) == "\n".join(expected_records)
+
+    def test_spill_file_is_removed_on_truncate(self):
+        handler = LoggingCapture(FakeConfig(logging_capture_max_records=1,
+                                            logging_capture_spill=True))
+        emit_records(handler, 3)
+        spill_file = handler._spill_file
+        handler.truncate()
+
+        assert spill_file.closed
+        assert handler.position == 0
+        assert handler.getvalue() == ""
@@ -0,0 +1,74 @@
+"""
+Unit tests for the startup of the behave command-line (:mod:`behave.__main__`).
+"""
+
+import os
+import subprocess
+import sys
+import pytest
+import behave
+
+
+# -- MODULES: That are only needed for a test run (not for: behave --version).
+RUN_ONLY_MODULES = [
+    "asyncio",
+    "behave.matchers",
+    "behave.model",
+    "behave.parser",
+    "behave.reporter.summary",
+    "behave.runner",
+    "behave.step_registry",
+    "cucumber_expression",
+    "parse",
+]
+
+STARTUP_CODE = """\
+import sys
+from behave.__main__ import main
+main(sys.argv[1:])
+for module_name in sorted(sys.modules):
+    print("MODULE: %s" % module_name)
+"""
+
+
+def select_imported_modules(args, cwd):
+    # -- ENSURE: This behave package is used (even if it is not installed).
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.dirname(os.path.dirname(behave.__file__))
+    output = subprocess.check_output(
+        [sys.executable, "-c", STARTUP_CODE] + list(args),
+        cwd=str(cwd), env=env, universal_newlines=True)
+    return [line.split(":", 1)[1].strip() for line in output.splitlines()
+            if line.startswith("MODULE:")]
+
+
+class TestStartupImports:
+
+    @pytest.mark.parametrize("args", [
+        ["--version"], ["--lang-list"], ["--lang-help=de"]
+    ])
+    def test_startup_does_not_import_run_modules(self, args, tmp_path):
+        imported = select_imported_modules(args, tmp_path)
+        unwanted = [name for name in RUN_ONLY_MODULES if name in imported]
+        assert unwanted == []
+
+    def test_version_does_not_import_i18n_tables(self, tmp_path):
+        imported = select_imported_modules(["--version"], tmp_path)
+        assert "behave.i18n" not in imported
+
+
+class TestLazyAttributes:
+
+    @pytest.mark.parametrize("name", behave.__all__)
+    def test_attribute_is_provided(self, name):
+        assert callable(getattr(behave, name))
+        assert name in dir(behave)
+
+    def test_step_decorator_is_provided_by_step_registry(self):
+        from behave import given
+        from behave.step_registry import given as expected
+        assert given is expected
+
+    def test_unknown_attribute_raises_attribute_error(self):
+        with pytest.raises(AttributeError):
+            _ = behave.unknown_attribute
@@ -1,4 +1,5 @@
 # ruff: noqa: E731
+import re
 import pytest
 from unittest.mock import Mock, patch
 import parse
@@ -6,7 +7,8 @@ from behave.exception import NotSupportedWarning
 from behave.matchers import (
     Match, Matcher,
     ParseMatcher, CFParseMatcher,
-    RegexMatcher, SimplifiedRegexMatcher, CucumberRegexMatcher)
+    RegexMatcher, SimplifiedRegexMatcher, CucumberRegexMatcher,
+    is_immutable_value, make_literal_prefix, non_pure_type_converter)
 from behave import matchers, runner
 
 
@@ -389,6 +391,112 @@ class TestCucumberRegexMatcher(TestRegexMatcher):
         CucumberRegexMatcher(None, "^I do something$")
 
 
+class TestLiteralPrefix:
+    @pytest.mark.parametrize("regex_pattern, expected", [
+        (r"^a step passes$", "a step passes"),
+        (r"\Aa step with (?P<n>\d+|none)\Z", "a step with "),
+        (r"^a step\.txt$", "a step.txt"),
+        (r"^an? apple$", "a"),
+        (r"^apples*$", "apple"),
+        (r"^I see \d+ apples$", "I see "),
+        (r"^I (?:do|dont) x$", "I "),
+        (r"^I do|I dont$", ""),
+        (r"[ab] step", ""),
+        (r"(?i)a step", ""),
+        (r"a step without anchor", "a step without anchor"),
+    ])
+    def test_make_literal_prefix(self, regex_pattern, expected):
+        assert make_literal_prefix(regex_pattern) == expected
+
+    def test_make_literal_prefix__with_ignorecase_flag(self):
+        assert make_literal_prefix(r"^a step$", re.IGNORECASE) == ""
+
+    @pytest.mark.parametrize("matcher_class, pattern, expected", [
+        (ParseMatcher, "a step with {n:d} items", "a step with "),
+        (ParseMatcher, "{n:d} items", ""),
+        (CFParseMatcher, "a step with {n:d}", "a step with "),
+        (SimplifiedRegexMatcher, r"a step with (?P<n>\d+) items", "a step with "),
+        (CucumberRegexMatcher, r"^a step with (\d+) items$", "a step with "),
+        (DummyMatcher, "a step", ""),
+    ])
+    def test_literal_prefix_of_matcher(self, matcher_class, pattern, expected):
+        matcher = matcher_class(None, pattern)
+        assert matcher.literal_prefix == expected
+
+    def test_literal_prefix_is_unknown_if_check_match_is_overridden(self):
+        class SearchRegexMatcher(RegexMatcher):
+            def check_match(self, step_text):
+                return [] if self.regex.search(step_text) else None
+
+        matcher = SearchRegexMatcher(None, "a step")
+        assert matcher.literal_prefix == ""
+
+
+class TestPureTypeConverters:
+    @staticmethod
+    def parse_number(text):
+        return int(text)
+
+    @staticmethod
+    def make_non_pure_converter():
+        @non_pure_type_converter
+        def parse_names(text):
+            return text.split(",")
+        return parse_names
+
+    @pytest.mark.parametrize("matcher_class, pattern", [
+        (ParseMatcher, "a step with {n:d} items"),
+        (ParseMatcher, "a step with {n:Number} items"),
+        (CFParseMatcher, "a step with {n:Number} items"),
+        (SimplifiedRegexMatcher, r"a step with (?P<n>\d+) items"),
+    ])
+    def test_has_pure_type_converters(self, matcher_class, pattern):
+        custom_types = dict(Number=self.parse_number)
+        if matcher_class is SimplifiedRegexMatcher:
+            matcher = matcher_class(None, pattern)
+        else:
+            matcher = matcher_class(None, pattern, custom_types=custom_types)
+        assert matcher.has_pure_type_converters is True
+
+    @pytest.mark.parametrize("matcher_class, pattern", [
+        (ParseMatcher, "a step with {names:Names}"),
+        (CFParseMatcher, "a step with {names:Names+}"),
+    ])
+    def test_has_pure_type_converters__with_non_pure_converter(self, matcher_class, pattern):
+        custom_types = dict(Names=self.make_non_pure_converter())
+        matcher = matcher_class(None, pattern, custom_types=custom_types)
+        assert matcher.has_pure_type_converters is False
+
+    def test_has_pure_type_converters__is_unknown_for_other_matchers(self):
+        matcher = DummyMatcher(None, "a step")
+        assert matcher.has_pure_type_converters is False
+
+    @pytest.mark.parametrize("pattern", [
+        "a step with {n:Number+} items",
+        "a step with {n:Number*} items",
+        "a step with {n:Number?} items",
+    ])
+    def test_has_pure_type_converters__is_false_for_cardinality_field(self, pattern):
+        # -- HINT: Many-values cardinality fields provide a new (mutable) list.
+        custom_types = dict(Number=self.parse_number)
+        matcher = CFParseMatcher(None, pattern, custom_types=custom_types)
+        assert matcher.has_pure_type_converters is False
+
+    @pytest.mark.parametrize("value, expected", [
+        (None, True),
+        (42, True),
+        ("Alice", True),
+        (("Alice", 42), True),
+        (frozenset(["Alice"]), True),
+        (["Alice"], False),
+        (dict(name="Alice"), False),
+        (("Alice", ["Bob"]), False),
+        (object(), False),
+    ])
+    def test_is_immutable_value(self, value, expected):
+        assert is_immutable_value(value) is expected
+
+
 def test_step_matcher_current_matcher():
     step_matcher_factory = matchers.get_step_matcher_factory()
     for name, klass in list(step_matcher_factory.step_matcher_class_mapping.items()):
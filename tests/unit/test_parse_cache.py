@@ -0,0 +1,144 @@
+"""
+Unit tests for :mod:`behave.parse_cache`.
+"""
+
+import os
+from unittest.mock import patch
+import pytest
+from behave.model_type import FileLocation
+from behave.configuration import Configuration
+from behave.parse_cache import (
+    FeatureParseCache, load_cache_file, store_cache_file
+)
+from behave.parser import ParserError
+from behave.runner import Runner
+from behave.runner_util import parse_features
+
+
+FEATURE_TEXT = u"""
+@alice
+Feature: Alice
+  Scenario: A1
+    Given a step passes
+
+  Rule: R1
+    Scenario Outline: A2 -- <name>
+      When a step with "<name>" passes
+      Examples:
+        | name  |
+        | Alice |
+        | Bob   |
+"""
+
+
+@pytest.fixture
+def feature_file(tmp_path):
+    filename = tmp_path/"alice.feature"
+    filename.write_text(FEATURE_TEXT)
+    return filename
+
+
+@pytest.fixture
+def parse_cache(tmp_path):
+    return FeatureParseCache(str(tmp_path/".behave_cache"))
+
+
+def describe_feature(feature):
+    return [(scenario.name, scenario.location, scenario.effective_tags,
+             [(step.keyword, step.name) for step in scenario.steps])
+            for scenario in feature.walk_scenarios()]
+
+
+class TestFeatureParseCache:
+
+    def test_parse_file_stores_parsed_feature(self, feature_file, parse_cache):
+        feature = parse_cache.parse_file(str(feature_file))
+        assert feature.name == "Alice"
+        assert (parse_cache.hits, parse_cache.misses) == (0, 1)
+        assert len(os.listdir(parse_cache.features_directory)) == 1
+
+    def test_parse_file_uses_cached_feature(self, feature_file, parse_cache):
+        feature1 = parse_cache.parse_file(str(feature_file))
+        with patch("behave.parser.parse_feature") as parse_feature:
+            feature2 = parse_cache.parse_file(str(feature_file))
+            assert not parse_feature.called
+        assert (parse_cache.hits, parse_cache.misses) == (1, 1)
+        assert feature2 is not feature1
+        assert describe_feature(feature2) == describe_feature(feature1)
+        assert feature2.scenarios[0].feature is feature2
+        assert feature2.parser is not None
+
+    def test_parse_file_parses_changed_feature_file(self, feature_file, parse_cache):
+        parse_cache.parse_file(str(feature_file))
+        feature_file.write_text(FEATURE_TEXT.replace("Alice", "Charly"))
+        feature = parse_cache.parse_file(str(feature_file))
+        assert feature.name == "Charly"
+        assert (parse_cache.hits, parse_cache.misses) == (0, 2)
+
+    def test_parse_file_with_other_language_is_not_cached(self, feature_file, parse_cache):
+        parse_cache.parse_file(str(feature_file))
+        parse_cache.parse_file(str(feature_file), language="en")
+        assert (parse_cache.hits, parse_cache.misses) == (0, 2)
+
+    def test_parse_file_ignores_broken_cache_entry(self, feature_file, parse_cache):
+        parse_cache.parse_file(str(feature_file))
+        for name in os.listdir(parse_cache.features_directory):
+            filename = os.path.join(parse_cache.features_directory, name)
+            with open(filename, "wb") as f:
+                f.write(b"BROKEN")
+
+        feature = parse_cache.parse_file(str(feature_file))
+        assert feature.name == "Alice"
+        assert (parse_cache.hits, parse_cache.misses) == (0, 2)
+
+    def test_parse_file_raises_parser_error(self, tmp_path, parse_cache):
+        filename = tmp_path/"bad.feature"
+        filename.write_text(u"Feature: Bad\n  Scenario: B1\n    Given a step\n    Oops\n")
+        with pytest.raises(ParserError):
+            parse_cache.parse_file(str(filename))
+        assert not os.path.exists(parse_cache.features_directory)
+
+    def test_clear_removes_cached_features(self, feature_file, parse_cache):
+        parse_cache.parse_file(str(feature_file))
+        parse_cache.clear()
+        assert not os.path.exists(parse_cache.features_directory)
+        parse_cache.parse_file(str(feature_file))
+        assert (parse_cache.hits, parse_cache.misses) == (0, 2)
+
+    def test_parse_features_with_parse_cache(self, feature_file, parse_cache):
+        locations = [FileLocation(str(feature_file), 4)]
+        features1 = parse_features(locations, parse_cache=parse_cache)
+        features2 = parse_features(locations, parse_cache=parse_cache)
+        assert parse_cache.hits == 1
+        assert describe_feature(features2[0]) == describe_feature(features1[0])
+
+
+class TestStoreCacheFile:
+    def test_store_and_load_cache_file(self, tmp_path):
+        filename = str(tmp_path/"cache"/"data.pickle")
+        assert store_cache_file(filename, "SIGNATURE", dict(name="Alice"))
+        assert load_cache_file(filename, "SIGNATURE") == dict(name="Alice")
+        assert load_cache_file(filename, "OTHER") is None
+
+    def test_store_cache_file_ignores_not_serializable_data(self, tmp_path):
+        filename = str(tmp_path/"data.pickle")
+        assert not store_cache_file(filename, "SIGNATURE", dict(func=lambda: 42))
+        assert os.listdir(str(tmp_path)) == []
+
+    def test_store_cache_file_removes_temp_file_on_error(self, tmp_path):
+        filename = str(tmp_path/"data.pickle")
+        with patch("os.replace", side_effect=OSError("OOPS")):
+            assert not store_cache_file(filename, "SIGNATURE", [1, 2])
+        assert os.listdir(str(tmp_path)) == []
+
+
+class TestParseCacheConfiguration:
+    def test_parse_cache_is_disabled_by_default(self):
+        runner = Runner(Configuration(load_config=False))
+        assert runner.make_parse_cache() is None
+
+    def test_parse_cache_is_used_if_enabled(self, tmp_path):
+        config = Configuration(load_config=False, parse_cache=True,
+                               cache_dir=str(tmp_path/".behave_cache"))
+        parse_cache = Runner(config).make_parse_cache()
+        assert isinstance(parse_cache, FeatureParseCache)
@@ -0,0 +1,151 @@
+"""
+Unit tests for :mod:`behave.profiler`.
+"""
+
+from io import StringIO
+from types import SimpleNamespace
+import pytest
+from behave.profiler import (
+    NO_PROFILER, RunProfiler, SPEEDSCOPE_SCHEMA, make_profiler
+)
+
+
+class FakeTimer:
+    """Timer that advances by one second per call."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+class FakeMatch:
+    def __init__(self):
+        self.calls = 0
+
+    def run(self, context):
+        self.calls += 1
+
+
+class FakeStepRegistry:
+    def __init__(self):
+        self.step_loader = None
+
+    def find_match(self, step):
+        if step == "undefined":
+            return None
+        return FakeMatch()
+
+
+def make_runner(hooks=None):
+    capture_controller = SimpleNamespace(make_captured=lambda: None)
+    return SimpleNamespace(step_registry=FakeStepRegistry(),
+                           hooks=hooks or {},
+                           formatters=[],
+                           capture_controller=capture_controller,
+                           config=SimpleNamespace(reporters=[]))
+
+
+class TestRunProfiler:
+
+    def test_measure_counts_self_time_without_nested_phases(self):
+        profiler = RunProfiler(timer=FakeTimer())
+        with profiler.measure("hook.before_scenario"):
+            with profiler.measure("step.execute"):
+                pass
+        assert profiler.stats["step.execute"].duration == 1.0
+        assert profiler.stats["hook.before_scenario"].duration == 2.0
+        assert profiler.stats["hook.before_scenario"].calls == 1
+
+    def test_stop_run_stops_all_phases(self):
+        profiler = RunProfiler(timer=FakeTimer())
+        profiler.start_run()
+        profiler.start("parse")
+        profiler.stop_run()
+        assert sorted(profiler.stats) == ["parse", "runner"]
+        assert profiler.duration == profiler.end_time - profiler.start_time
+
+    def test_install_measures_step_match_and_step_execution(self):
+        runner = make_runner()
+        profiler = RunProfiler(timer=FakeTimer())
+        profiler.install(runner)
+        match = runner.step_registry.find_match("Given a step")
+        match.run(None)
+        assert runner.step_registry.find_match("undefined") is None
+        assert match.calls == 1
+        assert profiler.stats["step.match"].calls == 2
+        assert profiler.stats["step.execute"].calls == 1
+
+    def test_install_preserves_hook_attributes(self):
+        def before_scenario(context, scenario):
+            pass
+        before_scenario.capture = False
+
+        runner = make_runner(hooks=dict(before_scenario=before_scenario))
+        profiler = RunProfiler(timer=FakeTimer())
+        profiler.install(runner)
+        hook = runner.hooks["before_scenario"]
+        hook(None, None)
+        assert hook is not before_scenario
+        assert hook.capture is False
+        assert profiler.stats["hook.before_scenario"].calls == 1
+
+    def test_uninstall_restores_runner_objects(self):
+        def before_all(context):
+            pass
+
+        runner = make_runner(hooks=dict(before_all=before_all))
+        step_registry = runner.step_registry
+        profiler = RunProfiler(timer=FakeTimer())
+        profiler.install(runner)
+        profiler.uninstall()
+        assert runner.hooks["before_all"] is before_all
+        assert "find_match" not in vars(step_registry)
+        assert "make_captured" in vars(runner.capture_controller)
+
+    def test_report_stores_speedscope_file(self, tmp_path):
+        filename = str(tmp_path/"behave.speedscope.json")
+        profiler = RunProfiler(output=filename, timer=FakeTimer())
+        profiler.start_run()
+        with profiler.measure("parse"):
+            pass
+        profiler.stop_run()
+        stream = StringIO()
+        profiler.report(stream)
+
+        data = profiler.make_speedscope_data()
+        events = data["profiles"][0]["events"]
+        assert data["$schema"] == SPEEDSCOPE_SCHEMA
+        assert data["shared"]["frames"] == [dict(name="runner"),
+                                            dict(name="parse")]
+        assert [event["type"] for event in events] == ["O", "O", "C", "C"]
+        assert "PROFILE OUTPUT: %s" % filename in stream.getvalue()
+        assert (tmp_path/"behave.speedscope.json").exists()
+
+    def test_report_shows_summary_table(self):
+        profiler = RunProfiler(timer=FakeTimer())
+        profiler.start_run()
+        with profiler.measure("step.execute"):
+            pass
+        profiler.stop_run()
+        stream = StringIO()
+        profiler.report(stream)
+        lines = stream.getvalue().splitlines()
+        assert lines[0] == "PROFILE (self time per phase):"
+        assert lines[2].split() == ["1", "2.000s", "66.7%", "runner"]
+        assert lines[3].split() == ["1", "1.000s", "33.3%", "step.execute"]
+        assert lines[-1].split() == ["3.000s", "100.0%", "TOTAL"]
+
+
+@pytest.mark.parametrize("profile, profile_output, expected_enabled", [
+    (False, None, False),
+    (True, None, True),
+    (False, "behave.pstats", True),
+])
+def test_make_profiler(profile, profile_output, expected_enabled):
+    config = SimpleNamespace(profile=profile, profile_output=profile_output)
+    profiler = make_profiler(config)
+    assert profiler.enabled is expected_enabled
+    if not expected_enabled:
+        assert profiler is NO_PROFILER
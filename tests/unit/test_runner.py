@@ -3,10 +3,10 @@ from collections import defaultdict
 import os.path
 import sys
 import unittest
-from io import StringIO
 import pytest
 from unittest.mock import Mock, patch
 from behave import runner_util
+from behave.capture_buffer import ChunkedTextBuffer
 from behave.runner import Context, Runner
 from behave.exception import ConfigError
 from behave.formatter.base import StreamOpener
@@ -55,6 +55,38 @@ class TestRunner:
         call_args = (context, statement)
         hook.assert_called_with(*call_args)
 
+    def test_run_hook_records_hook_duration_for_hook_observers(self):
+        config = Mock()
+        config.dry_run = False
+        runner = Runner(config)
+        runner.context = Context(runner)
+        hook = Mock()
+        runner.hooks["before_lunch"] = hook
+        reporter = Mock()
+        config.reporters = [reporter, object()]
+        runner.setup_hook_observers()
+
+        runner.run_hook("before_lunch", Mock())
+        assert reporter.record_hook_duration.call_count == 1
+        hook_name, hook_func, duration = \
+            reporter.record_hook_duration.call_args[0]
+        assert (hook_name, hook_func) == ("before_lunch", hook)
+        assert duration >= 0.0
+
+    def test_run_hook_does_not_record_hook_duration_of_default_hook(self):
+        config = Mock()
+        config.dry_run = False
+        runner = Runner(config)
+        runner.context = Context(runner)
+        runner.hooks["before_all"] = runner.before_all_default_hook
+        reporter = Mock()
+        config.reporters = [reporter]
+        runner.setup_hook_observers()
+
+        runner.run_hook("before_all")
+        assert config.setup_logging.call_count == 1
+        assert reporter.record_hook_duration.call_count == 0
+
     def test_run_hook_does_not_runs_a_hook_that_exists_if_dry_run(self):
         config = Mock()
         config.dry_run = True
@@ -66,7 +98,7 @@ class TestRunner:
         runner.run_hook("before_lunch", statement)
         assert len(hook.call_args_list) == 0
 
-    def test_setup_capture_creates_stringio_for_stdout(self):
+    def test_setup_capture_creates_text_buffer_for_stdout(self):
         runner = Runner(Mock())
         runner.config.capture_stdout = True
         runner.config.capture_log = False
@@ -75,7 +107,8 @@ class TestRunner:
         runner.setup_capture()
 
         assert runner.capture_controller.capture_stdout is not None
-        assert isinstance(runner.capture_controller.capture_stdout, StringIO)
+        assert isinstance(runner.capture_controller.capture_stdout,
+                          ChunkedTextBuffer)
 
     def test_setup_capture_does_not_create_stringio_if_not_wanted(self):
         runner = Runner(Mock())
@@ -269,6 +302,7 @@ class TestRunWithPaths(unittest.TestCase):
         self.config.exclude = lambda s: False
         self.config.junit = False
         self.config.summary = False
+        self.config.parse_jobs = 1
         parse_file.return_value = feature
 
         self.runner.run_with_paths()
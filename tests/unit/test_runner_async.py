@@ -0,0 +1,167 @@
+"""
+Unit tests for :mod:`behave.runner_async`.
+"""
+
+import asyncio
+from unittest.mock import Mock
+import pytest
+
+from behave.async_step import AsyncFunction, runner_event_loop
+from behave.configuration import Configuration
+from behave.runner import Context, Runner
+from behave.runner_async import (
+    AsyncRunner, SynchronizedStepRegistry, TaskEventRecorder, TaskRunner
+)
+
+
+# -----------------------------------------------------------------------------
+# TEST SUPPORT:
+# -----------------------------------------------------------------------------
+def make_runner(**kwargs):
+    config = Configuration(load_config=False, **kwargs)
+    runner = AsyncRunner(config)
+    runner.context = Context(runner)
+    runner.task_step_registry = SynchronizedStepRegistry(Mock())
+    return runner
+
+
+# -----------------------------------------------------------------------------
+# TEST SUITE:
+# -----------------------------------------------------------------------------
+class TestContextFork:
+    def test_forked_context_shares_outer_layers(self):
+        runner = make_runner()
+        context = runner.context
+        context.shared = "ALL"
+        context._push(layer="feature")
+        context.feature_value = "FEATURE"
+
+        task_context = context._fork(runner)
+        assert task_context.shared == "ALL"
+        assert task_context.feature_value == "FEATURE"
+        assert task_context._stack[0] is context._stack[0]
+
+    def test_forked_context_uses_own_layers_and_root_attributes(self):
+        runner = make_runner()
+        context = runner.context
+        context._push(layer="feature")
+        task_context1 = context._fork(runner)
+        task_context2 = context._fork(runner)
+
+        task_context1._push(layer="scenario")
+        task_context1.value = 1
+        task_context1._set_root_attribute("active_outline", "ROW1")
+        task_context2._push(layer="scenario")
+        task_context2.value = 2
+        assert task_context1.value == 1
+        assert task_context2.value == 2
+        assert task_context1.active_outline == "ROW1"
+        assert task_context2.active_outline is None
+        assert context.active_outline is None
+        assert "value" not in context
+
+
+class TestTaskRunner:
+    def test_aborted_if_runner_is_aborted(self):
+        runner = make_runner()
+        task_runner = TaskRunner(runner, runner.context)
+        assert not task_runner.aborted
+        runner.aborted = True
+        assert task_runner.aborted
+
+    def test_abort_does_not_abort_runner_directly(self):
+        runner = make_runner()
+        task_runner = TaskRunner(runner, runner.context)
+        task_runner.aborted = True
+        assert task_runner.aborted
+        assert not runner.aborted
+
+    def test_make_task_result_collects_task_state(self):
+        runner = make_runner()
+        task_runner = TaskRunner(runner, runner.context)
+        task_runner.hook_failures = 2
+        task_runner.undefined_steps.append("UNDEFINED_STEP")
+        task_runner.context._set_root_attribute("failed", True)
+
+        result = runner.make_task_result(task_runner, True, [("eof",)])
+        assert result.failed is True
+        assert result.events == [("eof",), ("undefined_step", "UNDEFINED_STEP")]
+        assert runner.hook_failures == 2
+        assert runner.context.failed is True
+        assert not runner.stopped
+
+
+class TestTaskEventRecorder:
+    def test_records_formatter_events_and_output_in_order(self):
+        recorder = TaskEventRecorder()
+        recorder.scenario("SCENARIO")
+        recorder.stdout.write("Hello\n")
+        recorder.result("STEP")
+        recorder.stderr.write("Oops\n")
+        assert recorder.take_events() == [
+            ("scenario", "SCENARIO"),
+            ("output", "stdout", "Hello\n"),
+            ("result", "STEP"),
+            ("output", "stderr", "Oops\n"),
+        ]
+        assert recorder.events == []
+
+    def test_replay_events_to_formatters_and_streams(self, capsys):
+        runner = make_runner()
+        formatter = Mock()
+        runner.formatters = [formatter]
+        runner.replay_events([
+            ("scenario", "SCENARIO"),
+            ("output", "stdout", "Hello\n"),
+            ("undefined_step", "UNDEFINED_STEP"),
+            ("eof",),
+        ])
+        formatter.scenario.assert_called_once_with("SCENARIO")
+        formatter.eof.assert_called_once_with()
+        assert capsys.readouterr().out == "Hello\n"
+        assert runner.undefined_steps == ["UNDEFINED_STEP"]
+
+
+class TestAsyncRunner:
+    @pytest.mark.parametrize("jobs, dry_run, expected", [
+        (1, False, False),
+        (4, False, True),
+        (4, True, False),
+    ])
+    def test_should_run_concurrently(self, jobs, dry_run, expected):
+        runner = make_runner(jobs=jobs, dry_run=dry_run)
+        assert runner.should_run_concurrently() is expected
+
+    def test_is_a_runner(self):
+        assert issubclass(AsyncRunner, Runner)
+
+
+class TestAsyncFunctionWithRunnerEventLoop:
+    def test_coroutines_of_threads_run_concurrently_on_runner_loop(self):
+        loop = asyncio.new_event_loop()
+        started = []
+
+        async def async_step(name):
+            started.append(name)
+            # -- ONLY COMPLETES: If both coroutines run concurrently.
+            while len(started) < 2:
+                await asyncio.sleep(0.01)
+            return asyncio.get_running_loop()
+
+        async_function = AsyncFunction(async_step, timeout=5.0)
+
+        async def run_in_threads():
+            token = runner_event_loop.set(loop)
+            try:
+                return await asyncio.gather(
+                    asyncio.to_thread(async_function, "Alice"),
+                    asyncio.to_thread(async_function, "Bob"))
+            finally:
+                runner_event_loop.reset(token)
+
+        try:
+            used_loops = loop.run_until_complete(run_in_threads())
+        finally:
+            loop.close()
+        assert used_loops == [loop, loop]
+        assert sorted(started) == ["Alice", "Bob"]
@@ -88,6 +88,41 @@ class TestContext:
         context._push()
         assert "thing" in context
 
+    @pytest.mark.parametrize("origin_tracking", ["eager", "lazy"])
+    def test_masking_warning_shows_origin_with_origin_tracking(self, origin_tracking):
+        config = Configuration(load_config=False, context_origin=origin_tracking)
+        context = self.make_context(runner=self.make_runner(config))
+        assert context._origin_tracking == origin_tracking
+        with context.use_with_user_mode():
+            context.thing = "stuff"
+        context._push()
+        with pytest.warns(ContextMaskWarning) as records:
+            context.thing = "other stuff"
+
+        info = str(records[0].message)
+        filename = __file__.rsplit(".", 1)[0]
+        assert "'thing'" in info
+        assert filename in info
+        assert "test_masking_warning_shows_origin_with_origin_tracking" in info
+
+    def test_masking_warning_without_origin_tracking(self):
+        config = Configuration(load_config=False, context_origin="off")
+        context = self.make_context(runner=self.make_runner(config))
+        with context.use_with_user_mode():
+            context.thing = "stuff"
+        context._push()
+        with pytest.warns(ContextMaskWarning) as records:
+            context.thing = "other stuff"
+
+        info = str(records[0].message)
+        assert "'thing'" in info
+        assert "originally set in <unknown>" in info
+        assert not context._record
+
+    def test_origin_tracking_uses_default_with_unknown_mode(self):
+        context = self.make_context(runner=Mock())
+        assert context._origin_tracking == Context.ORIGIN_TRACKING
+
 
 class TestContext2(unittest.TestCase):
     # pylint: disable=invalid-name, protected-access, no-self-use
@@ -347,6 +382,67 @@ class TestContext2(unittest.TestCase):
         with pytest.raises(AttributeError):
             del self.context.thing
 
+    def test_masked_attribute_is_restored_after_pop(self):
+        self.context.thing = "stuff"
+        self.context._push()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ContextMaskWarning)
+            self.context.thing = "other stuff"
+        assert self.context.thing == "other stuff"
+        self.context._pop()
+        assert self.context.thing == "stuff"
+
+    def test_masked_attribute_is_restored_after_delete(self):
+        self.context.thing = "stuff"
+        self.context._push()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ContextMaskWarning)
+            self.context.thing = "other stuff"
+        del self.context.thing
+        assert self.context.thing == "stuff"
+        assert "thing" in self.context
+
+    def test_root_attribute_is_visible_unless_masked(self):
+        self.context._push()
+        self.context._set_root_attribute("failed", True)
+        assert self.context.failed is True
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ContextMaskWarning)
+            self.context.thing = "stuff"
+            self.context._set_root_attribute("thing", "root stuff")
+        assert self.context.thing == "stuff"
+        self.context._pop()
+        assert self.context.thing == "root stuff"
+
+    def test_lookup_view_matches_stack_frames(self):
+        def merge_stack_frames(context):
+            data = {}
+            for frame in reversed(context._stack):
+                data.update(frame)
+            return data
+
+        self.context.thing = "stuff"
+        self.context._push(layer="feature")
+        self.context.other_thing = "more stuff"
+        self.context._push(layer="scenario")
+        assert self.context._lookup == merge_stack_frames(self.context)
+        self.context._pop()
+        assert self.context._lookup == merge_stack_frames(self.context)
+        del self.context.other_thing
+        assert self.context._lookup == merge_stack_frames(self.context)
+
+    def test_cleanup_errors_are_counted_in_lookup_view(self):
+        def cleanup_fails():
+            raise RuntimeError("XFAIL-CLEANUP")
+
+        self.context.fail_on_cleanup_errors = False
+        self.context.on_cleanup_error = Context.ignore_cleanup_error
+        self.context._push()
+        self.context.add_cleanup(cleanup_fails)
+        self.context._pop()
+        assert self.context.cleanup_errors == 1
+
 
 class ExampleSteps:
     text = None
@@ -0,0 +1,266 @@
+"""
+Unit tests for :mod:`behave.runner_distributed`.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import textwrap
+import pytest
+
+import behave
+from behave.configuration import Configuration
+from behave.exception import ConfigError
+from behave.runner import Runner
+from behave.runner_distributed import (
+    CoordinatorConnection, DistributedRunner, DistributedScheduler,
+    MessageChannel, ProtocolError, MESSAGE_HEADER,
+    apply_worker_settings, parse_address
+)
+
+
+# -----------------------------------------------------------------------------
+# TEST SUPPORT:
+# -----------------------------------------------------------------------------
+def make_unit(unit_id, feature=0, duration=1.0):
+    return dict(id=unit_id, feature=feature, path=[0], scenario=unit_id + 1,
+                duration=duration, locations=[])
+
+
+def make_channels():
+    sock1, sock2 = socket.socketpair()
+    return MessageChannel(sock1), MessageChannel(sock2)
+
+
+STEPS_FILE = """\
+import os
+from behave import step
+
+@step('a step passes')
+def step_passes(context):
+    pass
+
+@step('a step loses its worker once')
+def step_loses_worker(context):
+    if not os.path.exists("worker_lost.marker"):
+        with open("worker_lost.marker", "w") as f:
+            f.write("LOST")
+        os._exit(1)
+"""
+
+FEATURE_FILE = """\
+Feature: Alice
+  Scenario: A1
+    Given a step passes
+
+  Scenario: A2
+    Given a step loses its worker once
+
+  Scenario Outline: A3 -- <row>
+    Given a step passes
+
+    Examples:
+      | row |
+      | 1   |
+      | 2   |
+"""
+
+
+def run_distributed(workdir, workers=2, args=()):
+    """Runs a coordinator and its workers on localhost.
+
+    :return: Tuple (coordinator_process, coordinator_output, worker_processes)
+    """
+    # -- ENSURE: This behave package is used (even if it is not installed).
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.path.dirname(os.path.dirname(behave.__file__))
+    command = [sys.executable, "-m", "behave"]
+    coordinator = subprocess.Popen(
+        command + ["--runner=distributed", "--coordinator=127.0.0.1:0",
+                   "--jobs=%d" % workers, "-f", "plain", "--no-timings"]
+        + list(args),
+        cwd=str(workdir), env=env, universal_newlines=True,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    lines = []
+    while True:
+        line = coordinator.stdout.readline()
+        lines.append(line)
+        if not line or line.startswith("COORDINATOR: Listening on"):
+            break
+    assert line, "".join(lines)
+    address = line.split()[3]
+
+    worker_processes = [
+        subprocess.Popen(command + ["--worker=%s" % address],
+                         cwd=str(workdir), env=env, universal_newlines=True,
+                         stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        for _ in range(workers)
+    ]
+    output = coordinator.communicate(timeout=300)[0]
+    for worker_process in worker_processes:
+        worker_process.communicate(timeout=60)
+    return coordinator, "".join(lines) + output, worker_processes
+
+
+# -----------------------------------------------------------------------------
+# TEST SUITE:
+# -----------------------------------------------------------------------------
+class TestParseAddress:
+    @pytest.mark.parametrize("text, expected", [
+        ("example.com:8733", ("example.com", 8733)),
+        ("8733", ("127.0.0.1", 8733)),
+        (":0", ("127.0.0.1", 0)),
+        ("[::1]:8733", ("::1", 8733)),
+    ])
+    def test_parse_address(self, text, expected):
+        assert parse_address(text) == expected
+
+    @pytest.mark.parametrize("text", ["example.com", "host:PORT", "host:65536"])
+    def test_parse_address_raises_config_error_if_invalid(self, text):
+        with pytest.raises(ConfigError):
+            parse_address(text)
+
+
+class TestMessageChannel:
+    def test_send_and_receive_messages(self):
+        channel1, channel2 = make_channels()
+        with channel1, channel2:
+            channel1.send(dict(type="hello", name="Alice"))
+            channel1.send(dict(type="unit", unit=make_unit(1)))
+            assert channel2.receive() == dict(type="hello", name="Alice")
+            assert channel2.receive() == dict(type="unit", unit=make_unit(1))
+
+    def test_receive_returns_none_if_connection_is_closed(self):
+        channel1, channel2 = make_channels()
+        channel1.close()
+        with channel2:
+            assert channel2.receive() is None
+
+    def test_take_message_waits_for_complete_message(self):
+        channel = MessageChannel(None)
+        payload = b'{"type": "end"}'
+        data = MESSAGE_HEADER.pack(len(payload)) + payload
+        channel.buffer.extend(data[:6])
+        assert channel.take_message() is None
+        channel.buffer.extend(data[6:])
+        assert channel.take_message() == dict(type="end")
+        assert channel.buffer == bytearray()
+
+    @pytest.mark.parametrize("payload", [b"NOT-JSON", b"[1, 2]", b"{}"])
+    def test_take_message_raises_protocol_error_on_bad_data(self, payload):
+        channel = MessageChannel(None)
+        channel.buffer.extend(MESSAGE_HEADER.pack(len(payload)) + payload)
+        with pytest.raises(ProtocolError):
+            channel.take_message()
+
+
+class TestCoordinatorConnection:
+    def test_get_provides_units_until_end(self):
+        channel1, channel2 = make_channels()
+        with channel1, channel2:
+            connection = CoordinatorConnection(channel2)
+            channel1.send(dict(type="unit", unit=make_unit(1)))
+            channel1.send(dict(type="stop"))
+            channel1.send(dict(type="end"))
+            assert connection.get() == make_unit(1)
+            assert not connection.stop_event.is_set()
+            assert connection.get() is None
+            assert connection.stop_event.is_set()
+            assert not connection.lost
+
+    def test_get_returns_none_if_connection_is_lost(self):
+        channel1, channel2 = make_channels()
+        channel1.close()
+        with channel2:
+            connection = CoordinatorConnection(channel2)
+            assert connection.get() is None
+            assert connection.lost
+
+
+class TestDistributedScheduler:
+    def test_add_worker_uses_free_slot_or_new_slot(self):
+        scheduler = DistributedScheduler([make_unit(0)], 1)
+        assert scheduler.add_worker() == 0
+        assert scheduler.add_worker() == 1
+        assert scheduler.next_unit(1) == make_unit(0)
+
+    def test_remove_worker_requeues_its_unit(self):
+        units = [make_unit(0), make_unit(1)]
+        scheduler = DistributedScheduler(units, 1)
+        worker_id = scheduler.add_worker()
+        unit = scheduler.next_unit(worker_id)
+        scheduler.remove_worker(worker_id, unit)
+
+        other_worker_id = scheduler.add_worker()
+        assert other_worker_id == worker_id
+        assert scheduler.next_unit(other_worker_id) == unit
+        assert len(scheduler) == 1
+
+    def test_relaxed_scheduler_ignores_left_containers(self):
+        units = [make_unit(0, feature=0), make_unit(1, feature=1)]
+        scheduler = DistributedScheduler(units, 1)
+        worker_id = scheduler.add_worker()
+        assert scheduler.next_unit(worker_id) == units[0]
+        assert scheduler.next_unit(worker_id) == units[1]  # -- LEAVES: Feature 0
+
+        unit = make_unit(2, feature=0)
+        scheduler.queues[worker_id].append(unit)
+        assert scheduler.next_unit(worker_id) is None
+        scheduler.relaxed = True
+        assert scheduler.next_unit(worker_id) == unit
+
+
+class TestApplyWorkerSettings:
+    def test_apply_worker_settings_selects_scenarios_in_same_way(self):
+        config = Configuration(load_config=False)
+        apply_worker_settings(config, dict(lang="de", stop=True, tags="@fast",
+                                           name=["Alice"], step_durations=True))
+        assert config.lang == "de"
+        assert config.stop is True
+        assert config.step_durations is True
+        assert config.tag_expression.check(["fast"])
+        assert not config.tag_expression.check(["slow"])
+        assert config.name_re.search("Alice in Wonderland")
+
+
+class TestDistributedRunner:
+    def test_is_a_runner(self):
+        assert issubclass(DistributedRunner, Runner)
+
+    @pytest.mark.parametrize("dry_run, expected", [(False, True), (True, False)])
+    def test_should_run_in_parallel(self, dry_run, expected):
+        config = Configuration(load_config=False, dry_run=dry_run)
+        runner = DistributedRunner(config)
+        assert runner.should_run_in_parallel() is expected
+
+    def test_start_workers_raises_config_error_if_port_is_used(self):
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            port = server.getsockname()[1]
+            config = Configuration(load_config=False,
+                                   coordinator="127.0.0.1:%d" % port)
+            runner = DistributedRunner(config)
+            with pytest.raises(ConfigError):
+                runner.start_workers(1)
+
+
+class TestDistributedTestRun:
+    def test_run_with_workers_on_localhost_and_requeue_lost_unit(self, tmp_path):
+        (tmp_path/"features"/"steps").mkdir(parents=True)
+        (tmp_path/"features"/"steps"/"steps.py").write_text(STEPS_FILE)
+        (tmp_path/"features"/"alice.feature").write_text(FEATURE_FILE)
+
+        coordinator, output, workers = run_distributed(tmp_path, workers=2)
+        assert coordinator.returncode == 0, output
+        assert "lost (connection closed)" in output
+        assert textwrap.dedent("""\
+            Feature: Alice
+
+              Scenario: A1
+                Given a step passes ... passed
+
+              Scenario: A2
+                Given a step loses its worker once ... passed
+            """) in output
+        assert "4 scenarios passed, 0 failed, 0 skipped" in output
+        assert sorted(worker.returncode for worker in workers) == [0, 1]
@@ -2,6 +2,7 @@
 Tests for :mod:`behave.runner` related to hook processing.
 """
 
+import asyncio
 from unittest.mock import Mock
 from behave.capture import CaptureSinkAsCollector
 from behave.configuration import Configuration
@@ -39,6 +40,18 @@ def bad_hook_error(ctx, *args, **kwargs):
     print("CALLED: bad_hook_error")
     raise SomeError("OOPS: bad_hook_error")
 
+# -- ASYNC HOOKS:
+async def good_async_hook(ctx, *args, **kwargs):
+    await asyncio.sleep(0)
+    ctx.used_loops.append(asyncio.get_running_loop())
+    print("CALLED: good_async_hook")
+
+
+async def bad_async_hook_error(ctx, *args, **kwargs):
+    await asyncio.sleep(0)
+    print("CALLED: bad_async_hook_error")
+    raise SomeError("OOPS: bad_async_hook_error")
+
 # -- HOOK FUNCTIONS WITH TAG:
 def good_tag_hook(ctx, tag):
     print("CALLED: good_tag_hook -- tag={}".format(tag))
@@ -328,3 +341,50 @@ CALLED: good_tag_hook -- tag=good_charly
         # -- INTENTION: Continues over tags even if error occurs.
         assert expected in output
         assert result is False  # -- SOME HOOK_FAILED
+
+
+class TestRunAsyncHooks:
+
+    @staticmethod
+    def make_runner_with_hook(hook_name, hook_func):
+        config = Configuration(load_config=False)
+        runner = ModelRunner(config)
+        runner.context = Context(runner)
+        runner.context.used_loops = []
+        runner.hooks[hook_name] = hook_func
+        return runner
+
+    def test_run_hook__runs_async_hook_on_event_loop_of_test_run(self):
+        runner = self.make_runner_with_hook("before_scenario", good_async_hook)
+        runner.setup_event_loop()
+        try:
+            result1 = runner.run_hook("before_scenario", "SCENARIO_1")
+            result2 = runner.run_hook("before_scenario", "SCENARIO_2")
+            expected = [runner.event_loop, runner.event_loop]
+            assert runner.context.used_loops == expected
+        finally:
+            runner.teardown_event_loop()
+        assert result1 is True   # -- HOOK_PASSED
+        assert result2 is True
+        assert runner.event_loop is None
+
+    def test_run_hook_with_capture__bad_case_if_async_hook_raises_error(self):
+        hook_name = "before_feature"
+        runner = self.make_runner_with_hook(hook_name, bad_async_hook_error)
+        feature = Mock(error_message=None)
+        capture_sink = CaptureSinkAsCollector()
+        runner.setup_event_loop()
+        try:
+            result = runner.run_hook_with_capture(hook_name, feature,
+                                                  capture_sink=capture_sink)
+        finally:
+            runner.teardown_event_loop()
+        output = capture_sink.make_report()
+        expected = """
+CAPTURED STDOUT: before_feature
+CALLED: bad_async_hook_error
+HOOK-ERROR in before_feature: SomeError: OOPS: bad_async_hook_error
+""".strip()
+        assert expected in output
+        assert result is False  # -- HOOK_FAILED
+        assert runner.hook_failures == 1
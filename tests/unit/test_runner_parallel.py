@@ -0,0 +1,363 @@
+"""
+Unit tests for :mod:`behave.runner_parallel`.
+"""
+
+import json
+from behave.capture import Captured
+from behave.matchers import Match, NoMatch
+from behave.model import Background, Step
+from behave.model_type import Argument, FileLocation, Status
+from behave.parser import parse_feature
+from behave.runner_parallel import (
+    FeatureIndex, FormatterEventRecorder, WorkStealingScheduler,
+    WorkerException,
+    apply_container_states, apply_element_state, group_feature_locations,
+    iter_feature_units, iter_model_elements, load_scenario_durations,
+    make_container_state, make_element_state, make_exception_from_data,
+    exception_to_data, make_match_from_data, match_to_data,
+    select_feature_location_groups,
+)
+import pytest
+
+
+# -----------------------------------------------------------------------------
+# TEST SUPPORT:
+# -----------------------------------------------------------------------------
+FEATURE_TEXT = """
+Feature: Alice
+  Background:
+    Given a background step
+
+  Scenario: A1
+    Given a step passes
+    When another step passes
+
+  Scenario Outline: A2 -- <name>
+    Given a person with name "<name>"
+
+    Examples:
+      | name  |
+      | Alice |
+      | Bob   |
+
+  Rule: R1
+    Background:
+      Given a rule background step
+
+    Scenario: R1.A3
+      Then a step fails
+"""
+
+
+def make_feature():
+    return parse_feature(FEATURE_TEXT, filename="alice.feature")
+
+
+def make_unit(feature, path, duration, scenario=None):
+    return dict(feature=feature, path=path, scenario=scenario,
+                duration=duration)
+
+
+def transfer_scenario_state(scenario1, feature2):
+    index1 = FeatureIndex(scenario1.feature)
+    index2 = FeatureIndex(feature2)
+    scenario2 = index2.elements[index1.index_of(scenario1)]
+    states = [make_element_state(scenario1)]
+    states.extend(make_element_state(step) for step in scenario1.all_steps)
+    apply_element_state(scenario2, states[0])
+    for step, state in zip(scenario2.all_steps, states[1:]):
+        apply_element_state(step, state)
+    return scenario2
+
+
+class UnknownError(Exception):
+    pass
+
+
+# -----------------------------------------------------------------------------
+# TEST SUITE:
+# -----------------------------------------------------------------------------
+class TestIterModelElements:
+    def test_walks_elements_in_model_order(self):
+        feature = make_feature()
+        elements = list(iter_model_elements(feature))
+        names = [e.name.split(" -- @")[0] for e in elements
+                 if not isinstance(e, Background)]
+        assert elements[0] is feature
+        assert isinstance(elements[1], Background)
+        assert names == ["Alice", "A1", "A2 -- <name>",
+                         "A2 -- Alice", "A2 -- Bob", "R1", "R1.A3"]
+        assert not any(isinstance(e, Step) for e in elements)
+
+    def test_is_deterministic_for_same_feature_text(self):
+        elements1 = list(iter_model_elements(make_feature()))
+        elements2 = list(iter_model_elements(make_feature()))
+        assert len(elements1) == len(elements2)
+        for element1, element2 in zip(elements1, elements2):
+            assert type(element1) is type(element2)
+            assert element1.location == element2.location
+
+
+class TestFeatureIndex:
+    def test_step_key_is_relative_to_scenario(self):
+        feature = make_feature()
+        feature_index = FeatureIndex(feature)
+        scenario = feature.scenarios[0]
+        key_map = feature_index.make_key_map(scenario)
+        steps = list(scenario.all_steps)
+        scenario_index = feature_index.index_of(scenario)
+        assert key_map[id(scenario)] == [scenario_index, None]
+        assert key_map[id(steps[0])] == [scenario_index, 0]
+        assert key_map[id(steps[2])] == [scenario_index, 2]
+
+    def test_get_element_with_key_from_other_process(self):
+        feature_index1 = FeatureIndex(make_feature())
+        scenario1 = feature_index1.feature.scenarios[0]
+        step1 = list(scenario1.all_steps)[1]
+        key = feature_index1.make_key_map(scenario1)[id(step1)]
+
+        feature_index2 = FeatureIndex(make_feature())
+        step2 = feature_index2.get_element(key)
+        assert step2.name == step1.name == "a step passes"
+        assert step2.location == step1.location
+
+
+class TestElementState:
+    def test_state_is_transferred_to_same_model_element(self):
+        feature1 = make_feature()
+        scenario1 = feature1.scenarios[0]
+        for step in scenario1.all_steps:
+            step.status = Status.passed
+        step1 = list(scenario1.all_steps)[-1]
+        step1.status = Status.failed
+        step1.duration = 1.5
+        step1.error_message = "ASSERT FAILED: OOPS"
+        step1.exception = AssertionError("OOPS")
+        step1.captured.add_captured(Captured(stdout="Hello", name="step"))
+
+        scenario2 = transfer_scenario_state(scenario1, make_feature())
+        step2 = list(scenario2.all_steps)[-1]
+        assert step2.status == Status.failed
+        assert step2.duration == 1.5
+        assert step2.error_message == "ASSERT FAILED: OOPS"
+        assert isinstance(step2.exception, AssertionError)
+        assert step2.captured.stdout == "Hello"
+        assert scenario2.status == Status.failed
+        assert scenario2.feature.status == Status.failed
+
+    def test_state_is_json_serializable(self):
+        feature = make_feature()
+        step = feature.scenarios[0].steps[0]
+        step.exception = UnknownError("OOPS")
+        states = [make_element_state(e) for e in iter_model_elements(feature)]
+        states.append(make_element_state(step))
+        assert json.loads(json.dumps(states)) == states
+
+    def test_state_disables_background_before_steps_are_walked(self):
+        feature1 = make_feature()
+        scenario1 = feature1.scenarios[0]
+        scenario1.use_background = False
+        for step in scenario1.all_steps:
+            step.status = Status.passed
+
+        scenario2 = transfer_scenario_state(scenario1, make_feature())
+        assert scenario2.use_background is False
+        assert len(list(scenario2.all_steps)) == 2
+        assert scenario2.status == Status.passed
+
+
+class TestContainerState:
+    def test_status_is_omitted_if_it_depends_on_scenarios(self):
+        feature = make_feature()
+        feature.run_starttime = feature.run_endtime = 1.0
+        assert make_container_state(feature)["status"] is None
+
+    def test_hook_error_status_is_provided(self):
+        feature = make_feature()
+        feature.run_starttime = feature.run_endtime = 1.0
+        feature.set_status(Status.hook_error)
+        assert make_container_state(feature)["status"] == "hook_error"
+
+    def test_states_from_several_workers_are_merged(self):
+        feature1 = make_feature()
+        feature1.run_starttime, feature1.run_endtime = (10.0, 20.0)
+        feature1.captured.add_captured(Captured(stdout="W1", name="feature"))
+        state1 = make_container_state(feature1)
+
+        feature2 = make_feature()
+        feature2.run_starttime, feature2.run_endtime = (5.0, 15.0)
+        feature2.hook_failed = True
+        feature2.error_message = "HOOK-ERROR in before_feature"
+        feature2.set_status(Status.hook_error)
+        feature2.captured.add_captured(Captured(stdout="W2", name="feature"))
+        state2 = make_container_state(feature2)
+
+        feature = make_feature()
+        apply_container_states(feature, [state1, state2])
+        assert feature.hook_failed is True
+        assert feature.error_message == "HOOK-ERROR in before_feature"
+        assert feature.status == Status.hook_error
+        assert (feature.run_starttime, feature.run_endtime) == (5.0, 20.0)
+        assert [part.stdout for part in feature.captured.captures] == ["W1", "W2"]
+
+
+class TestExceptionData:
+    def test_builtin_exception_class_is_reused(self):
+        data = exception_to_data(ValueError("BAD VALUE"))
+        exception = make_exception_from_data(data)
+        assert type(exception) is ValueError
+        assert str(exception) == "BAD VALUE"
+
+    def test_unknown_exception_class_is_emulated(self):
+        data = exception_to_data(UnknownError("OOPS"))
+        exception = make_exception_from_data(data)
+        assert isinstance(exception, WorkerException)
+        assert exception.__class__.__name__ == "UnknownError"
+        assert str(exception) == "OOPS"
+
+    def test_builtin_exception_with_other_constructor_is_emulated(self):
+        data = dict(type="UnicodeDecodeError", message="BAD BYTE")
+        exception = make_exception_from_data(data)
+        assert exception.__class__.__name__ == "UnicodeDecodeError"
+
+    def test_none_is_preserved(self):
+        assert exception_to_data(None) is None
+        assert make_exception_from_data(None) is None
+
+
+class TestMatchData:
+    def test_match_roundtrip(self):
+        arguments = [Argument(5, 10, "42", 42, "number"),
+                     Argument(12, 14, "xx", object(), None)]
+        match1 = Match(func=None, arguments=arguments)
+        match1.location = FileLocation("steps/alice.py", 10)
+        match2 = make_match_from_data(match_to_data(match1))
+        assert match2.location == match1.location
+        assert [a.value for a in match2.arguments] == [42, "xx"]
+        assert [a.name for a in match2.arguments] == ["number", None]
+
+    def test_no_match_roundtrip(self):
+        assert match_to_data(NoMatch()) is None
+        assert isinstance(make_match_from_data(None), NoMatch)
+
+
+class TestFormatterEventRecorder:
+    def test_events_refer_to_element_index(self):
+        feature = make_feature()
+        scenario = feature.scenarios[0]
+        recorder = FormatterEventRecorder()
+        recorder.feature(feature)
+        recorder.scenario(scenario)
+        recorder.match(NoMatch())
+        recorder.embedding("text/plain", b"Hello")
+        recorder.step(list(scenario.all_steps)[1])
+        recorder.eof()
+        key_map = FeatureIndex(feature).make_key_map(scenario)
+
+        events = recorder.take_events_data(key_map)
+        assert events == [
+            ["feature", [0, None]], ["scenario", [2, None]], ["match", None],
+            ["embedding", "text/plain", "SGVsbG8="], ["step", [2, 1]], ["eof"],
+        ]
+        assert recorder.events == []
+
+    def test_unknown_element_has_no_key(self):
+        recorder = FormatterEventRecorder()
+        recorder.step(Step("alice.feature", 1, "Given", "given", "a step"))
+        assert recorder.take_events_data({}) == [["step", None]]
+
+
+class TestIterFeatureUnits:
+    def test_units_are_scenarios_and_outline_rows(self):
+        feature_index = FeatureIndex(make_feature())
+        units = list(iter_feature_units(feature_index))
+        names = [feature_index.elements[scenario_index].name.split(" -- @")[0]
+                 for _, scenario_index in units]
+        assert names == ["A1", "A2 -- Alice", "A2 -- Bob", "R1.A3"]
+        rule_index = feature_index.index_of(feature_index.feature.rules[0])
+        assert [path for path, _ in units] == [[0], [0], [0], [0, rule_index]]
+
+    def test_container_without_scenarios_is_a_unit(self):
+        feature = parse_feature(u"""
+Feature: Empty
+  Rule: R1
+""", filename="empty.feature")
+        feature_index = FeatureIndex(feature)
+        assert list(iter_feature_units(feature_index)) == [([0, 1], None)]
+
+
+class TestLoadScenarioDurations:
+    def test_sums_step_durations_per_scenario(self, tmp_path):
+        data = [dict(name="Alice", elements=[
+            dict(type="background", location="alice.feature:2", steps=[]),
+            dict(type="scenario", location="alice.feature:5", steps=[
+                dict(result=dict(status="passed", duration=1.5)),
+                dict(result=dict(status="passed", duration=0.5)),
+                dict(name="untested step without result"),
+            ]),
+        ])]
+        filename = tmp_path/"durations.json"
+        filename.write_text(json.dumps(data))
+        assert load_scenario_durations(str(filename)) == {"alice.feature:5": 2.0}
+
+
+class TestWorkStealingScheduler:
+    def test_assigns_longest_feature_first_to_least_loaded_worker(self):
+        units = [make_unit(0, [0], 1.0), make_unit(1, [0], 5.0),
+                 make_unit(2, [0], 3.0), make_unit(2, [0], 1.0)]
+        scheduler = WorkStealingScheduler(units, 2)
+        assert [[u["feature"] for u in q] for q in scheduler.queues] == \
+               [[1], [2, 2, 0]]
+
+    def test_orders_units_of_container_longest_first(self):
+        units = [make_unit(0, [0], 1.0), make_unit(0, [0, 3], 2.0),
+                 make_unit(0, [0], 3.0)]
+        scheduler = WorkStealingScheduler(units, 1)
+        assert [u["duration"] for u in scheduler.queues[0]] == [3.0, 1.0, 2.0]
+
+    def test_idle_worker_steals_from_busy_worker(self):
+        units = [make_unit(0, [0], 1.0 + i) for i in range(6)]
+        scheduler = WorkStealingScheduler(units, 3)
+        taken = [scheduler.next_unit(worker_id) for worker_id in range(3)]
+        assert [u["duration"] for u in taken] == [6.0, 1.0, 2.0]
+        assert len(scheduler) == 3
+
+    def test_worker_never_reenters_a_left_feature(self):
+        units = [make_unit(0, [0], 1.0), make_unit(0, [0], 1.0),
+                 make_unit(1, [0], 1.0)]
+        scheduler = WorkStealingScheduler(units, 2)
+        assert scheduler.next_unit(1)["feature"] == 1
+        assert scheduler.next_unit(1)["feature"] == 0   # -- STOLEN: Leaves feature 1
+        scheduler.queues[0].append(make_unit(1, [0], 1.0))
+        assert scheduler.next_unit(1)["feature"] == 0
+        assert scheduler.next_unit(1) is None
+        assert scheduler.next_unit(0)["feature"] == 1
+
+    def test_clear_removes_remaining_units(self):
+        units = [make_unit(0, [0], 1.0), make_unit(1, [0], 1.0)]
+        scheduler = WorkStealingScheduler(units, 2)
+        assert len(scheduler.clear()) == 2
+        assert scheduler.next_unit(0) is None
+
+
+class TestGroupFeatureLocations:
+    @pytest.mark.parametrize("locations, expected", [
+        (["a.feature", "b.feature"], [["a.feature"], ["b.feature"]]),
+        ([FileLocation("a.feature", 3), FileLocation("a.feature", 7),
+          FileLocation("b.feature")],
+         [["a.feature:3", "a.feature:7"], ["b.feature"]]),
+        ([], []),
+    ])
+    def test_groups_consecutive_locations_of_same_file(self, locations, expected):
+        groups = group_feature_locations(locations)
+        assert [[str(location) for location in group]
+                for group in groups] == expected
+
+    def test_select_feature_location_groups_skips_files_without_feature(self):
+        alice = parse_feature("Feature: Alice", filename="a.feature")
+        bob = parse_feature("Feature: Bob", filename="b.feature")
+        locations = [FileLocation("a.feature", 3), FileLocation("empty.feature"),
+                     FileLocation("b.feature"), FileLocation("a.feature")]
+        groups = select_feature_location_groups(locations, [alice, bob, alice])
+        assert [[str(location) for location in group]
+                for group in groups] == [["a.feature:3"], ["b.feature"], ["a.feature"]]
@@ -0,0 +1,86 @@
+"""
+Unit tests for :mod:`behave.runner_threads`.
+"""
+
+import asyncio
+import contextvars
+import threading
+from unittest.mock import Mock
+
+from behave.async_step import AsyncFunction
+from behave.configuration import Configuration
+from behave.runner import Context
+from behave.runner_async import ConcurrentRunner
+from behave.runner_threads import ThreadPoolRunner
+
+
+# -----------------------------------------------------------------------------
+# TEST SUPPORT:
+# -----------------------------------------------------------------------------
+def make_runner(**kwargs):
+    config = Configuration(load_config=False, **kwargs)
+    runner = ThreadPoolRunner(config)
+    runner.context = Context(runner)
+    return runner
+
+
+# -----------------------------------------------------------------------------
+# TEST SUITE:
+# -----------------------------------------------------------------------------
+class TestThreadPoolRunner:
+    def test_is_a_concurrent_runner(self):
+        assert issubclass(ThreadPoolRunner, ConcurrentRunner)
+
+    def test_should_run_concurrently_with_several_jobs(self):
+        assert make_runner(jobs=4).should_run_concurrently() is True
+        assert make_runner(jobs=1).should_run_concurrently() is False
+
+    def test_report_scenario_tasks_in_original_order(self):
+        runner = make_runner(jobs=2)
+        formatter = Mock()
+        runner.formatters = [formatter]
+        run_state = Mock(failed_count=0)
+        task_runner1 = Mock(undefined_steps=[], hook_failures=0,
+                            context=Mock(_root={}))
+        task_runner1.recorder.take_events.return_value = [("scenario", "S1")]
+        task_runner2 = Mock(undefined_steps=[], hook_failures=0,
+                            context=Mock(_root={}))
+        task_runner2.recorder.take_events.return_value = [("scenario", "S2")]
+        future1 = Mock()
+        future1.result.return_value = True
+        future2 = Mock()
+        future2.result.return_value = None   # -- NOT RUN.
+
+        runner.report_scenario_tasks([(task_runner1, future1),
+                                      (task_runner2, future2)], run_state)
+        formatter.scenario.assert_called_once_with("S1")
+        assert run_state.failed_count == 1
+
+
+class TestEventLoopThread:
+    def test_async_functions_of_threads_use_event_loop_of_test_run(self):
+        runner = make_runner(jobs=2)
+        used_loops = []
+
+        async def async_func(name):
+            await asyncio.sleep(0)
+            used_loops.append((name, asyncio.get_running_loop()))
+
+        async_function = AsyncFunction(async_func)
+        runner.setup_event_loop()
+        try:
+            runner.start_event_loop_thread()
+            assert runner.event_loop.is_running()
+            # -- HINT: Worker threads use a copy of the context (see: runner).
+            context = contextvars.copy_context()
+            worker = threading.Thread(target=context.run,
+                                      args=(async_function, "worker"))
+            worker.start()
+            worker.join()
+            async_function("main")
+            runner.stop_event_loop_thread()
+            assert not runner.event_loop.is_running()
+            loop = runner.event_loop
+        finally:
+            runner.teardown_event_loop()
+        assert used_loops == [("worker", loop), ("main", loop)]
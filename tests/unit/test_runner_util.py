@@ -1,5 +1,12 @@
 from collections import OrderedDict
-from behave.runner_util import FeatureLineDatabase
+import gc
+from io import StringIO
+from behave.runner_util import (
+    FeatureLineDatabase, StepModuleLoadTime,
+    collect_feature_tags, load_step_modules, parse_features, print_step_module_load_times)
+from behave.model_type import FileLocation
+from behave.parser import ParserError
+from behave.runner import the_step_registry
 from behave.parser import parse_feature
 from behave.model import Feature
 import pytest
@@ -170,3 +177,146 @@ class TestFeatureLineDatabase:
 
             selected = line_database.select_run_item_by_line(next_line)
             assert selected is run_item
+
+
+# ---------------------------------------------------------------------------------------
+# TEST SUITE FOR: load_step_modules(), print_step_module_load_times()
+# ---------------------------------------------------------------------------------------
+class TestStepModuleLoadTimes:
+
+    def test_load_step_modules_collects_load_times(self, tmp_path, monkeypatch):
+        step_dir = tmp_path/"steps"
+        step_dir.mkdir()
+        (step_dir/"alice_steps.py").write_text(u"""
+@given(u'Alice has {count:d} apples')
+def step_alice_has_apples(ctx, count):
+    pass
+
+@when(u'Alice eats an apple')
+def step_alice_eats_apple(ctx):
+    pass
+""")
+        (step_dir/"bob_steps.py").write_text(u"""
+@then(u'Bob is hungry')
+def step_bob_is_hungry(ctx):
+    pass
+""")
+        # -- ENSURE: Step-definitions are registered in an empty registry.
+        monkeypatch.setattr(the_step_registry, "steps",
+                            dict(given=[], when=[], then=[], step=[]))
+        load_times = []
+        load_step_modules([str(step_dir)], load_times)
+
+        assert [x.filename for x in load_times] == [
+            str(step_dir/"alice_steps.py"), str(step_dir/"bob_steps.py")
+        ]
+        assert [x.step_definitions for x in load_times] == [2, 1]
+        assert all(x.duration >= x.register_duration > 0 for x in load_times)
+
+    def test_print_step_module_load_times(self):
+        load_times = [
+            StepModuleLoadTime("alice_steps.py", 0.010, 0.002, 2),
+            StepModuleLoadTime("bob_steps.py", 0.200, 0.100, 1),
+        ]
+        stream = StringIO()
+        print_step_module_load_times(load_times, stream=stream)
+        lines = stream.getvalue().splitlines()
+        assert lines[0] == "STEP-MODULE LOAD TIMES:"
+        assert lines[2].split() == ["0.100s", "0.100s", "1", "bob_steps.py"]
+        assert lines[3].split() == ["0.008s", "0.002s", "2", "alice_steps.py"]
+        assert lines[4].split() == ["0.108s", "0.102s", "3", "TOTAL"]
+
+
+# ---------------------------------------------------------------------------------------
+# TEST SUITE FOR: parse_features() with process pool
+# ---------------------------------------------------------------------------------------
+class TestParseFeaturesWithJobs:
+
+    @staticmethod
+    def make_feature_files(directory, names):
+        filenames = []
+        for name in names:
+            filename = directory/("%s.feature" % name.lower())
+            filename.write_text(u"""
+Feature: %s
+  Scenario: %s.1
+    Given a step passes
+
+  Scenario: %s.2
+    When another step passes
+""" % (name, name, name))
+            filenames.append(str(filename))
+        return filenames
+
+    @staticmethod
+    def describe(features):
+        return [(feature.name, feature.location, feature.parser is not None,
+                 [scenario.name for scenario in feature.scenarios])
+                for feature in features]
+
+    def test_parse_features_provides_features_in_same_order(self, tmp_path):
+        filenames = self.make_feature_files(tmp_path,
+                                            ["Alice", "Bob", "Charly", "Dora"])
+        locations = [
+            FileLocation(filenames[2]),
+            FileLocation(filenames[0], 6),
+            FileLocation(filenames[3]),
+            FileLocation(filenames[1], 3),
+            FileLocation(filenames[0], 3),
+        ]
+        features1 = parse_features(locations)
+        features2 = parse_features(locations, jobs=3)
+        assert self.describe(features2) == self.describe(features1)
+        assert [feature.name for feature in features2] == [
+            "Charly", "Alice", "Dora", "Bob", "Alice"
+        ]
+
+    def test_parse_features_pauses_garbage_collector_only(self, tmp_path):
+        filenames = self.make_feature_files(tmp_path, ["Alice"])
+        freeze_count = gc.get_freeze_count()
+        features = parse_features(filenames)
+        assert len(features) == 1
+        assert gc.isenabled()
+        assert gc.get_freeze_count() == freeze_count
+
+    def test_parse_features_raises_same_parser_error(self, tmp_path):
+        filenames = self.make_feature_files(tmp_path, ["Alice", "Bob"])
+        bad_filename = tmp_path/"bad.feature"
+        bad_filename.write_text(u"Feature: Bad\n  Scenario: B1\n    Given a step\n    Oops\n")
+        locations = [FileLocation(filenames[0]), FileLocation(str(bad_filename)),
+                     FileLocation(filenames[1])]
+
+        with pytest.raises(ParserError) as exc_info1:
+            parse_features(locations)
+        with pytest.raises(ParserError) as exc_info2:
+            parse_features(locations, jobs=2)
+        error1 = exc_info1.value
+        error2 = exc_info2.value
+        assert str(error2) == str(error1)
+        assert (error2.filename, error2.line, error2.line_text) == \
+               (error1.filename, error1.line, error1.line_text)
+
+
+# ---------------------------------------------------------------------------------------
+# TEST SUITE FOR: collect_feature_tags()
+# ---------------------------------------------------------------------------------------
+def test_collect_feature_tags_uses_tags_of_all_model_elements():
+    feature = parse_feature(u"""
+@feature.tag
+Feature: Alice
+  @scenario.tag
+  Scenario: A1
+    Given a step passes
+
+  Rule: R1
+    @outline.tag
+    Scenario Outline: A2
+      Given a step passes
+
+      @examples.tag
+      Examples:
+        | name |
+        | Bob  |
+""")
+    tags = collect_feature_tags([feature])
+    assert {"feature.tag", "scenario.tag", "outline.tag", "examples.tag"} <= tags
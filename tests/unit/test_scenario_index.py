@@ -0,0 +1,140 @@
+"""
+Unit tests for :mod:`behave.scenario_index`.
+"""
+
+import os
+import pytest
+from behave.configuration import Configuration
+from behave.model_type import FileLocation
+from behave.scenario_index import ScenarioIndex
+
+
+FEATURE_TEXT = u"""
+@alice
+Feature: Alice
+  @smoke
+  Scenario: A1
+    Given a step passes
+
+  Rule: R1
+    Scenario Outline: A2 -- <name>
+      When a step with "<name>" passes
+      @slow
+      Examples:
+        | name  |
+        | Alice |
+        | Bob   |
+"""
+
+OTHER_FEATURE_TEXT = u"""
+Feature: Bob
+  Scenario: B1
+    Given a step passes
+"""
+
+
+@pytest.fixture
+def feature_files(tmp_path):
+    filename1 = tmp_path/"alice.feature"
+    filename2 = tmp_path/"bob.feature"
+    filename1.write_text(FEATURE_TEXT)
+    filename2.write_text(OTHER_FEATURE_TEXT)
+    return [filename1, filename2]
+
+
+@pytest.fixture
+def scenario_index(tmp_path):
+    return ScenarioIndex(str(tmp_path/".behave_cache"))
+
+
+def make_config(*args):
+    return Configuration(command_args=list(args), load_config=False)
+
+
+def select_filenames(scenario_index, filenames, config):
+    locations = [FileLocation(str(filename)) for filename in filenames]
+    selected = scenario_index.select_locations(locations, config)
+    return [os.path.basename(location.filename) for location in selected]
+
+
+class TestScenarioIndex:
+
+    def test_get_scenarios_provides_scenario_records(self, feature_files,
+                                                     scenario_index):
+        scenarios = scenario_index.get_scenarios(str(feature_files[0]))
+        assert [(scenario.name, scenario.line, sorted(scenario.tags))
+                for scenario in scenarios] == [
+            ("A1", 5, ["alice", "smoke"]),
+            ("A2 -- Alice -- @1.1 ", 14, ["alice", "slow"]),
+            ("A2 -- Bob -- @1.2 ", 15, ["alice", "slow"]),
+        ]
+
+    def test_get_scenarios_uses_stored_index(self, feature_files,
+                                             scenario_index, tmp_path):
+        scenarios = scenario_index.get_scenarios(str(feature_files[0]))
+        scenario_index.save()
+        assert scenario_index.updates == 1
+
+        scenario_index2 = ScenarioIndex(str(tmp_path/".behave_cache"))
+        assert scenario_index2.get_scenarios(str(feature_files[0])) == scenarios
+        assert scenario_index2.updates == 0
+
+    def test_get_scenarios_parses_changed_feature_file(self, feature_files,
+                                                       scenario_index):
+        scenario_index.get_scenarios(str(feature_files[1]))
+        feature_files[1].write_text(OTHER_FEATURE_TEXT + u"""
+  Scenario: B2
+    Given a step passes
+""")
+        scenarios = scenario_index.get_scenarios(str(feature_files[1]))
+        assert [scenario.name for scenario in scenarios] == ["B1", "B2"]
+        assert scenario_index.updates == 2
+
+    def test_get_scenarios_ignores_touched_feature_file(self, feature_files,
+                                                        scenario_index):
+        scenarios = scenario_index.get_scenarios(str(feature_files[1]))
+        stat = os.stat(str(feature_files[1]))
+        os.utime(str(feature_files[1]), ns=(stat.st_atime_ns,
+                                            stat.st_mtime_ns + 10**9))
+        assert scenario_index.get_scenarios(str(feature_files[1])) == scenarios
+        assert scenario_index.updates == 1
+
+    @pytest.mark.parametrize("args, expected", [
+        ([], ["alice.feature", "bob.feature"]),
+        (["--tags=@smoke"], ["alice.feature"]),
+        (["--tags=@slow"], ["alice.feature"]),
+        (["--tags=not @alice"], ["bob.feature"]),
+        (["--tags=@unknown"], []),
+        (["--name=Bob"], ["alice.feature"]),
+        (["--name=B1"], ["bob.feature"]),
+        (["--tags=@smoke", "--name=Bob"], []),
+    ])
+    def test_select_locations_by_tags_and_name(self, feature_files,
+                                               scenario_index,
+                                               args, expected):
+        config = make_config(*args)
+        selected = select_filenames(scenario_index, feature_files, config)
+        assert selected == expected
+
+    def test_select_locations_keeps_location_with_line(self, feature_files,
+                                                       scenario_index):
+        config = make_config("--tags=@unknown")
+        location = FileLocation(str(feature_files[1]), 3)
+        assert scenario_index.select_locations([location], config) == [location]
+
+    def test_select_locations_keeps_feature_file_with_parse_error(
+            self, feature_files, scenario_index):
+        feature_files[1].write_text(OTHER_FEATURE_TEXT + u"""\
+      | a | b |
+      | 1 |
+""")
+        config = make_config("--tags=@unknown")
+        selected = select_filenames(scenario_index, feature_files, config)
+        assert selected == ["bob.feature"]
+
+    def test_clear_removes_index_file(self, feature_files, scenario_index):
+        scenario_index.get_scenarios(str(feature_files[0]))
+        scenario_index.save()
+        assert os.path.exists(scenario_index.filename)
+        scenario_index.clear()
+        assert not os.path.exists(scenario_index.filename)
@@ -0,0 +1,175 @@
+"""
+Unit tests for :mod:`behave.step_manifest`.
+"""
+
+import os
+from types import SimpleNamespace
+import pytest
+from behave.runner import the_step_registry
+from behave.step_manifest import (
+    LazyStepModuleLoader, StepManifest, StepTextCatalog
+)
+
+
+ALICE_STEPS = u"""
+@given(u'Alice has {count:d} apples')
+def step_alice_has_apples(ctx, count):
+    pass
+
+@when(u'Alice eats an apple')
+def step_alice_eats_apple(ctx):
+    pass
+"""
+
+BOB_STEPS = u"""
+@then(u'Bob is hungry')
+def step_bob_is_hungry(ctx):
+    pass
+"""
+
+COMMON_STEPS = u"""
+@step(u'{person} waits')
+def step_person_waits(ctx, person):
+    pass
+"""
+
+UTIL_STEPS = u"""
+# -- NO STEP DEFINITIONS: Helper module.
+"""
+
+
+def make_step(step_type, name):
+    return SimpleNamespace(step_type=step_type, name=name)
+
+
+@pytest.fixture
+def step_dir(tmp_path):
+    directory = tmp_path/"steps"
+    directory.mkdir()
+    (directory/"alice_steps.py").write_text(ALICE_STEPS)
+    (directory/"bob_steps.py").write_text(BOB_STEPS)
+    (directory/"common_steps.py").write_text(COMMON_STEPS)
+    (directory/"util.py").write_text(UTIL_STEPS)
+    return directory
+
+
+@pytest.fixture
+def step_registry(monkeypatch):
+    # -- ENSURE: Step-definitions are registered in an empty registry.
+    monkeypatch.setattr(the_step_registry, "steps",
+                        dict(given=[], when=[], then=[], step=[]))
+    monkeypatch.setattr(the_step_registry, "_step_matcher_indexes", {})
+    monkeypatch.setattr(the_step_registry, "step_loader", None)
+    return the_step_registry
+
+
+def make_loader(step_dir, tmp_path):
+    manifest = StepManifest(str(tmp_path/".behave_cache"))
+    return LazyStepModuleLoader([str(step_dir)], manifest, the_step_registry)
+
+
+def loaded_basenames(loader):
+    return sorted(os.path.basename(filename) for filename in loader.loaded)
+
+
+class TestStepTextCatalog:
+
+    @pytest.mark.parametrize("step_type, literal_prefix, expected", [
+        ("given", "Alice has ", True),
+        ("given", "", True),
+        ("given", "Bob", False),
+        ("when", "Alice eats", False),
+        ("then", "Bob is ", True),
+        ("step", "Alice has ", True),
+        ("step", "Charly", False),
+    ])
+    def test_may_match(self, step_type, literal_prefix, expected):
+        catalog = StepTextCatalog([
+            make_step("given", "Alice has 2 apples"),
+            make_step("then", "Bob is hungry"),
+        ])
+        assert catalog.may_match(step_type, literal_prefix) is expected
+
+
+class TestStepManifest:
+
+    def test_update_and_get_record(self, step_dir, tmp_path):
+        filename = str(step_dir/"bob_steps.py")
+        manifest = StepManifest(str(tmp_path/".behave_cache"))
+        assert manifest.get(filename) is None
+
+        manifest.update(filename, False, [("then", "Bob is hungry")])
+        manifest.save()
+        record = StepManifest(str(tmp_path/".behave_cache")).get(filename)
+        assert record.always_load is False
+        assert record.step_definitions == (("then", "Bob is hungry"),)
+
+    def test_get_ignores_changed_step_module(self, step_dir, tmp_path):
+        filename = str(step_dir/"bob_steps.py")
+        manifest = StepManifest(str(tmp_path/".behave_cache"))
+        manifest.update(filename, False, [("then", "Bob is hungry")])
+        stat = os.stat(filename)
+        os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert manifest.get(filename) is None
+
+    def test_clear_removes_manifest_file(self, step_dir, tmp_path):
+        manifest = StepManifest(str(tmp_path/".behave_cache"))
+        manifest.update(str(step_dir/"bob_steps.py"), True, [])
+        manifest.save()
+        assert os.path.exists(manifest.filename)
+        manifest.clear()
+        assert not os.path.exists(manifest.filename)
+
+
+class TestLazyStepModuleLoader:
+
+    def test_load_for_steps_loads_all_unknown_step_modules(self, step_dir,
+                                                           tmp_path,
+                                                           step_registry):
+        loader = make_loader(step_dir, tmp_path)
+        count = loader.load_for_steps([make_step("then", "Bob is hungry")])
+        assert count == 4
+        assert not loader.remaining
+        assert len(step_registry.steps["given"]) == 1
+        assert os.path.exists(loader.manifest.filename)
+
+    def test_load_for_steps_uses_manifest(self, step_dir, tmp_path,
+                                          step_registry):
+        make_loader(step_dir, tmp_path).load_for_steps([])
+        step_registry.clear()
+
+        loader = make_loader(step_dir, tmp_path)
+        loader.load_for_steps([make_step("then", "Bob is hungry")])
+        assert loaded_basenames(loader) == ["bob_steps.py",
+                                            "common_steps.py", "util.py"]
+        assert len(step_registry.steps["given"]) == 0
+        assert len(step_registry.steps["then"]) == 1
+
+    def test_load_for_steps_loads_changed_step_module(self, step_dir,
+                                                      tmp_path, step_registry):
+        make_loader(step_dir, tmp_path).load_for_steps([])
+        step_registry.clear()
+        (step_dir/"alice_steps.py").write_text(ALICE_STEPS + u"""
+@then(u'Alice is happy')
+def step_alice_is_happy(ctx):
+    pass
+""")
+        loader = make_loader(step_dir, tmp_path)
+        loader.load_for_steps([make_step("then", "Bob is hungry")])
+        assert "alice_steps.py" in loaded_basenames(loader)
+
+    def test_load_remaining_loads_step_modules_on_demand(self, step_dir,
+                                                         tmp_path,
+                                                         step_registry):
+        make_loader(step_dir, tmp_path).load_for_steps([])
+        step_registry.clear()
+
+        loader = make_loader(step_dir, tmp_path)
+        loader.load_for_steps([make_step("then", "Bob is hungry")])
+        step_registry.step_loader = loader.load_remaining
+        step = make_step("given", "Alice has 3 apples")
+        match = step_registry.find_match(step)
+        assert match.func.__name__ == "step_alice_has_apples"
+        assert not loader.remaining
+        assert step_registry.step_loader is None
+        assert loader.load_remaining() is False
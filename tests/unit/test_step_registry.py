@@ -2,7 +2,11 @@
 # ruff: noqa: E731
 
 from unittest.mock import Mock, patch
+import pytest
 from behave import step_registry
+from behave.matchers import (
+    CFParseMatcher, ParseMatcher, SimplifiedRegexMatcher,
+    non_pure_type_converter)
 
 
 class TestStepRegistry:
@@ -91,3 +95,254 @@ class TestStepRegistry:
         assert wrapper(func) is func
         add_step_definition.assert_called_with(step_type, step_pattern, func)
 
+
+
+def make_step_function():
+    def step_function(context):
+        pass
+    return step_function
+
+
+class TestStepRegistryWithIndex:
+
+    @staticmethod
+    def make_step(step_type, name):
+        step = make_step_function()
+        step.step_type = step_type
+        step.name = name
+        return step
+
+    def test_find_match_tries_only_plausible_step_definitions(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("given", "a person named {name}", make_step_function())
+        registry.add_step_definition("given", "an apple", make_step_function())
+        step_definitions = registry.steps["given"]
+        with patch.object(ParseMatcher, "match",
+                          autospec=True, side_effect=ParseMatcher.match) as match:
+            result = registry.find_match(self.make_step("given", "an apple"))
+            assert result.func is step_definitions[1].func
+            assert match.call_count == 1
+
+    def test_find_match_with_first_registered_step_definition_wins(self):
+        registry = step_registry.StepRegistry()
+        func1 = make_step_function()
+        func2 = make_step_function()
+        func3 = make_step_function()
+        registry.steps["given"].extend([
+            SimplifiedRegexMatcher(func1, r"(?P<who>\w+) is logged in", "given"),
+            SimplifiedRegexMatcher(func2, r"Alice is logged in", "given"),
+        ])
+        registry.steps["step"].append(
+            SimplifiedRegexMatcher(func3, r"Alice is .*", "step"))
+
+        assert registry.find_match(self.make_step("given", "Alice is logged in")).func is func1
+        assert registry.find_match(self.make_step("given", "Alice is here")).func is func3
+        assert registry.find_step_definition(self.make_step("given", "Bob is logged in")).func is func1
+
+    def test_find_match_uses_step_definitions_added_later(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("when", "Alice runs", make_step_function())
+        step = self.make_step("when", "Bob runs")
+        assert registry.find_match(step) is None
+
+        func = make_step_function()
+        registry.add_step_definition("step", "Bob runs", func)
+        assert registry.find_match(step).func is func
+
+    def test_clear_removes_index(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("then", "Alice sleeps", make_step_function())
+        step = self.make_step("then", "Alice sleeps")
+        assert registry.find_match(step) is not None
+
+        registry.clear()
+        assert registry.find_match(step) is None
+
+    def test_find_match_uses_step_loader_once_for_undefined_step(self):
+        registry = step_registry.StepRegistry()
+        func = make_step_function()
+        def step_loader(step):
+            registry.add_step_definition("when", "Bob runs", func)
+            return True
+
+        step_loader = Mock(side_effect=step_loader)
+        registry.step_loader = step_loader
+        assert registry.find_match(self.make_step("when", "Bob runs")).func is func
+        assert registry.find_match(self.make_step("when", "Alice runs")) is None
+        assert step_loader.call_count == 1
+        assert registry.step_loader is None
+
+
+class TestStepRegistryAmbiguousStep:
+
+    def test_add_step_definition_raises_ambiguous_step(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("given", "a person named {name}", make_step_function())
+        registry.add_step_definition("given", "an apple", make_step_function())
+        with pytest.raises(step_registry.AmbiguousStep):
+            registry.add_step_definition("given", "a person named Alice",
+                                         make_step_function())
+
+    def test_add_step_definition_raises_ambiguous_step_without_literal_prefix(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("when", "{count:d} apples", make_step_function())
+        with pytest.raises(step_registry.AmbiguousStep):
+            registry.add_step_definition("when", "10 apples", make_step_function())
+
+    def test_add_step_definition_checks_only_plausible_step_definitions(self):
+        registry = step_registry.StepRegistry()
+        for index in range(10):
+            registry.add_step_definition("then", "Alice has %d apples" % index,
+                                         make_step_function())
+        registry.add_step_definition("then", "Bob has {count:d} apples",
+                                     make_step_function())
+        with patch.object(ParseMatcher, "match",
+                          autospec=True, side_effect=ParseMatcher.match) as match:
+            registry.add_step_definition("then", "Bob has no apples",
+                                         make_step_function())
+            assert match.call_count == 1
+        assert len(registry.steps["then"]) == 12
+
+    def test_add_step_definition_ignores_same_step_definition(self):
+        registry = step_registry.StepRegistry()
+        func = make_step_function()
+        registry.add_step_definition("given", "a step with {param}", func)
+        registry.add_step_definition("given", "a step with {param}", func)
+        assert len(registry.steps["given"]) == 1
+
+    def test_add_step_definition_tracks_register_duration(self):
+        registry = step_registry.StepRegistry()
+        registry.add_step_definition("given", "a step", make_step_function())
+        assert registry.register_duration > 0
+        registry.clear()
+        assert registry.register_duration == 0
+
+
+class TestStepRegistryWithMatchCache:
+
+    @staticmethod
+    def make_step(step_type, name):
+        return TestStepRegistryWithIndex.make_step(step_type, name)
+
+    @staticmethod
+    def make_registry(maxsize=10):
+        registry = step_registry.StepRegistry()
+        registry.setup_match_cache(maxsize)
+        return registry
+
+    def test_find_match_reuses_cached_match(self):
+        registry = self.make_registry()
+        func = make_step_function()
+        registry.add_step_definition("given", "{count:d} apples", func)
+        step = self.make_step("given", "2 apples")
+        result1 = registry.find_match(step)
+        with patch.object(ParseMatcher, "match", autospec=True) as match:
+            result2 = registry.find_match(step)
+            assert match.call_count == 0
+        assert result2.func is func
+        assert [(arg.original, arg.value) for arg in result2.arguments] == \
+               [(arg.original, arg.value) for arg in result1.arguments]
+        assert result2.arguments[0].value == 2
+        assert registry.match_cache.hits == 1
+
+    def test_find_match_redoes_non_pure_type_conversion(self):
+        @non_pure_type_converter
+        def parse_names(text):
+            return text.split(",")
+
+        registry = self.make_registry()
+        registry.steps["given"].append(
+            ParseMatcher(make_step_function(), "the names {names:Names}", "given",
+                         custom_types=dict(Names=parse_names)))
+        step = self.make_step("given", "the names Alice,Bob")
+        result1 = registry.find_match(step)
+        result2 = registry.find_match(step)
+        assert result2.arguments[0].value == ["Alice", "Bob"]
+        assert result2.arguments[0].value is not result1.arguments[0].value
+
+    def test_find_match_provides_new_arguments_for_each_match(self):
+        registry = self.make_registry()
+        registry.add_step_definition("given", "{count:d} apples",
+                                     make_step_function())
+        step = self.make_step("given", "2 apples")
+        result1 = registry.find_match(step)
+        result2 = registry.find_match(step)
+        assert registry.match_cache.hits == 1
+        assert result2.arguments[0] is not result1.arguments[0]
+        result1.arguments[0].value = 42
+        assert registry.find_match(step).arguments[0].value == 2
+
+    @pytest.mark.parametrize("pattern, converter", [
+        ("the names {names:Name+}", lambda text: text),
+        ("the names {names:Names}", lambda text: text.split(", ")),
+    ])
+    def test_find_match_does_not_share_mutable_values(self, pattern, converter):
+        registry = self.make_registry()
+        registry.steps["given"].append(
+            CFParseMatcher(make_step_function(), pattern, "given",
+                           custom_types=dict(Name=converter, Names=converter)))
+        step = self.make_step("given", "the names Alice, Bob")
+        result1 = registry.find_match(step)
+        result1.arguments[0].value.append("Charly")
+        result2 = registry.find_match(step)
+        assert result2.arguments[0] is not result1.arguments[0]
+        assert result2.arguments[0].value == ["Alice", "Bob"]
+
+    def test_find_match_caches_undefined_step(self):
+        registry = self.make_registry()
+        step = self.make_step("when", "Bob runs")
+        assert registry.find_match(step) is None
+        assert registry.find_match(step) is None
+        assert registry.match_cache.hits == 1
+
+    def test_add_step_definition_clears_cache(self):
+        registry = self.make_registry()
+        step = self.make_step("when", "Bob runs")
+        assert registry.find_match(step) is None
+
+        func = make_step_function()
+        registry.add_step_definition("step", "Bob runs", func)
+        assert len(registry.match_cache) == 0
+        assert registry.find_match(step).func is func
+
+    def test_clear_clears_cache(self):
+        registry = self.make_registry()
+        registry.add_step_definition("then", "Alice sleeps", make_step_function())
+        step = self.make_step("then", "Alice sleeps")
+        assert registry.find_match(step) is not None
+
+        registry.clear()
+        assert registry.find_match(step) is None
+
+    def test_cache_drops_least_recently_used_entry(self):
+        registry = self.make_registry(maxsize=2)
+        for name in ("Alice runs", "Bob runs", "Alice runs", "Charly runs"):
+            registry.find_match(self.make_step("when", name))
+        assert list(registry.match_cache.entries) == [
+            ("when", "Alice runs"), ("when", "Charly runs")
+        ]
+
+    def test_setup_match_cache_with_zero_disables_cache(self):
+        registry = self.make_registry()
+        registry.setup_match_cache(0)
+        assert registry.match_cache is None
+
+
+class TestStepMatcherIndex:
+
+    def test_select_provides_step_matchers_in_original_order(self):
+        step_matchers = [
+            ParseMatcher(None, "an apple"),
+            ParseMatcher(None, "{n:d} apples"),
+            ParseMatcher(None, "a person named {name}"),
+            ParseMatcher(None, "a {thing}"),
+        ]
+        index = step_registry.StepMatcherIndex(step_matchers)
+        assert index.select("an apple") == step_matchers[:2]
+        assert index.select("a person named Alice") == step_matchers[1:]
+        assert index.select("Alice") == [step_matchers[1]]
+
+    def test_step_matcher_without_literal_prefix_is_always_selected(self):
+        step_matchers = [Mock(), ParseMatcher(None, "an apple"), Mock()]
+        index = step_registry.StepMatcherIndex(step_matchers)
+        assert index.select("a banana") == [step_matchers[0], step_matchers[2]]